@@ -0,0 +1,50 @@
+"""add_email_outbox
+
+Revision ID: 20260203_0001
+Revises: 20260127_1200
+Create Date: 2026-02-03 09:00:00.000000
+
+Durable outbox for notification emails. Leave submission, approval and
+rejection enqueue rows here instead of calling SMTP inline.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260203_0001'
+down_revision: Union[str, None] = '20260127_1200'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('to_email', sa.String(255), nullable=False),
+        sa.Column('subject', sa.String(500), nullable=False),
+        sa.Column('html_body', sa.Text(), nullable=False),
+        sa.Column('text_body', sa.Text(), nullable=True),
+        sa.Column('category', sa.String(50), nullable=True),
+        sa.Column('source_type', sa.String(50), nullable=True),
+        sa.Column('source_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_email_outbox_id', 'email_outbox', ['id'])
+    op.create_index('ix_email_outbox_status_next_attempt', 'email_outbox', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_status_next_attempt', table_name='email_outbox')
+    op.drop_index('ix_email_outbox_id', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,45 @@
+"""add_notification_counters
+
+Revision ID: 20260210_0001
+Revises: 20260203_0001
+Create Date: 2026-02-10 09:00:00.000000
+
+Per-user unread notification counters plus indexes for keyset pagination
+of the notification inbox. Counters are backfilled from existing rows.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260210_0001'
+down_revision: Union[str, None] = '20260203_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', sa.String(50), primary_key=True),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(
+        """
+        INSERT INTO notification_counters (user_id, unread_count)
+        SELECT user_id, COUNT(*)
+        FROM notifications
+        WHERE user_id IS NOT NULL AND is_read = false
+        GROUP BY user_id
+        """
+    )
+    op.create_index('ix_notifications_user_id_id', 'notifications', ['user_id', 'id'])
+    op.create_index('ix_notifications_user_id_is_read', 'notifications', ['user_id', 'is_read'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_id_is_read', table_name='notifications')
+    op.drop_index('ix_notifications_user_id_id', table_name='notifications')
+    op.drop_table('notification_counters')
@@ -0,0 +1,52 @@
+"""add_notification_digest_items
+
+Revision ID: 20260217_0001
+Revises: 20260210_0001
+Create Date: 2026-02-17 09:00:00.000000
+
+Buffer for routine notifications/emails that are coalesced into one
+digest per recipient.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260217_0001'
+down_revision: Union[str, None] = '20260210_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_digest_items',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('recipient_key', sa.String(300), nullable=False),
+        sa.Column('user_id', sa.String(50), nullable=True),
+        sa.Column('to_email', sa.String(255), nullable=True),
+        sa.Column('category', sa.String(50), nullable=True),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('link', sa.String(255), nullable=True),
+        sa.Column('subject', sa.String(500), nullable=True),
+        sa.Column('html_body', sa.Text(), nullable=True),
+        sa.Column('text_body', sa.Text(), nullable=True),
+        sa.Column('source_type', sa.String(50), nullable=True),
+        sa.Column('source_id', sa.Integer(), nullable=True),
+        sa.Column('deliver_after', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('dispatched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_notification_digest_items_id', 'notification_digest_items', ['id'])
+    op.create_index('ix_notification_digest_items_pending', 'notification_digest_items', ['dispatched_at', 'deliver_after'])
+    op.create_index('ix_notification_digest_items_recipient', 'notification_digest_items', ['recipient_key', 'dispatched_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_digest_items_recipient', table_name='notification_digest_items')
+    op.drop_index('ix_notification_digest_items_pending', table_name='notification_digest_items')
+    op.drop_index('ix_notification_digest_items_id', table_name='notification_digest_items')
+    op.drop_table('notification_digest_items')
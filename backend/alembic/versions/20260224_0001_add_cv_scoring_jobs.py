@@ -0,0 +1,50 @@
+"""add_cv_scoring_jobs
+
+Revision ID: 20260224_0001
+Revises: 20260217_0001
+Create Date: 2026-02-24 09:00:00.000000
+
+Queue for background CV scoring, so uploads no longer wait on the LLM.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260224_0001'
+down_revision: Union[str, None] = '20260217_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'cv_scoring_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('candidate_id', sa.Integer(), sa.ForeignKey('candidates.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('file_path', sa.String(500), nullable=False),
+        sa.Column('filename', sa.String(255), nullable=False),
+        sa.Column('requested_by', sa.String(50), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_cv_scoring_jobs_id', 'cv_scoring_jobs', ['id'])
+    op.create_index('ix_cv_scoring_jobs_candidate_id', 'cv_scoring_jobs', ['candidate_id'])
+    op.create_index('ix_cv_scoring_jobs_status_next_attempt', 'cv_scoring_jobs', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_cv_scoring_jobs_status_next_attempt', table_name='cv_scoring_jobs')
+    op.drop_index('ix_cv_scoring_jobs_candidate_id', table_name='cv_scoring_jobs')
+    op.drop_index('ix_cv_scoring_jobs_id', table_name='cv_scoring_jobs')
+    op.drop_table('cv_scoring_jobs')
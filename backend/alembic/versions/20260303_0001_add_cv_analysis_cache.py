@@ -0,0 +1,36 @@
+"""add_cv_analysis_cache
+
+Revision ID: 20260303_0001
+Revises: 20260224_0001
+Create Date: 2026-03-03 09:00:00.000000
+
+Content-hash cache of CV analysis results, so identical scoring inputs
+never reach the LLM twice.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260303_0001'
+down_revision: Union[str, None] = '20260224_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'cv_analysis_cache',
+        sa.Column('input_hash', sa.String(64), primary_key=True),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cv_analysis_cache')
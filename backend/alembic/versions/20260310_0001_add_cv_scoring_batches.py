@@ -0,0 +1,54 @@
+"""add_cv_scoring_batches
+
+Revision ID: 20260310_0001
+Revises: 20260303_0001
+Create Date: 2026-03-10 09:00:00.000000
+
+Batch rescoring of every candidate of a requisition, with progress.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260310_0001'
+down_revision: Union[str, None] = '20260303_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'cv_scoring_batches',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('recruitment_request_id', sa.Integer(), sa.ForeignKey('recruitment_requests.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('requested_by', sa.String(50), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('scored', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('skipped', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cache_hits', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_candidate_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_cv_scoring_batches_id', 'cv_scoring_batches', ['id'])
+    op.create_index('ix_cv_scoring_batches_recruitment_request_id', 'cv_scoring_batches', ['recruitment_request_id'])
+    op.create_index('ix_cv_scoring_batches_status', 'cv_scoring_batches', ['status'])
+    op.create_index('ix_candidates_request_id_id', 'candidates', ['recruitment_request_id', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidates_request_id_id', table_name='candidates')
+    op.drop_index('ix_cv_scoring_batches_status', table_name='cv_scoring_batches')
+    op.drop_index('ix_cv_scoring_batches_recruitment_request_id', table_name='cv_scoring_batches')
+    op.drop_index('ix_cv_scoring_batches_id', table_name='cv_scoring_batches')
+    op.drop_table('cv_scoring_batches')
@@ -0,0 +1,29 @@
+"""add_cv_scoring_batch_prefilter
+
+Revision ID: 20260317_0001
+Revises: 20260310_0001
+Create Date: 2026-03-17 09:00:00.000000
+
+Local ranking for batches: pre-filtered count and scoring method.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260317_0001'
+down_revision: Union[str, None] = '20260310_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cv_scoring_batches', sa.Column('filtered', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('cv_scoring_batches', sa.Column('method', sa.String(20), nullable=False, server_default='llm'))
+
+
+def downgrade() -> None:
+    op.drop_column('cv_scoring_batches', 'method')
+    op.drop_column('cv_scoring_batches', 'filtered')
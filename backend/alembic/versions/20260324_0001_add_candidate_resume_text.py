@@ -0,0 +1,29 @@
+"""add_candidate_resume_text
+
+Revision ID: 20260324_0001
+Revises: 20260317_0001
+Create Date: 2026-03-24 09:00:00.000000
+
+Store text extracted from a candidate's resume so it is extracted once.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260324_0001'
+down_revision: Union[str, None] = '20260317_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('candidates', sa.Column('resume_text', sa.Text(), nullable=True))
+    op.add_column('candidates', sa.Column('resume_text_extracted_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('candidates', 'resume_text_extracted_at')
+    op.drop_column('candidates', 'resume_text')
@@ -0,0 +1,93 @@
+"""add_candidate_search_index
+
+Revision ID: 20260331_0001
+Revises: 20260324_0001
+Create Date: 2026-03-31 09:00:00.000000
+
+Full-text search over candidate names, skills, recruiter notes and resume
+text: a tsvector column with a GIN index, kept in sync by a trigger
+(PostgreSQL), or an FTS5 table maintained by triggers (SQLite).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260331_0001'
+down_revision: Union[str, None] = '20260324_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGER_COLUMNS = "full_name, core_skills, technical_skills, recruiter_notes, resume_text"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE candidates ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_candidates_search_vector ON candidates USING GIN (search_vector)")
+        op.execute("""
+            CREATE OR REPLACE FUNCTION candidates_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector :=
+                    setweight(to_tsvector('english', coalesce(NEW.full_name, '')), 'A') ||
+                    setweight(to_tsvector('english',
+                        coalesce(NEW.core_skills::text, '') || ' ' || coalesce(NEW.technical_skills::text, '')), 'B') ||
+                    setweight(to_tsvector('english', coalesce(NEW.recruiter_notes, '')), 'C') ||
+                    setweight(to_tsvector('english', coalesce(NEW.resume_text, '')), 'D');
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute("DROP TRIGGER IF EXISTS candidates_search_vector_trigger ON candidates")
+        op.execute(f"""
+            CREATE TRIGGER candidates_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {TRIGGER_COLUMNS}
+            ON candidates FOR EACH ROW EXECUTE FUNCTION candidates_search_vector_update()
+        """)
+        op.execute("UPDATE candidates SET full_name = full_name WHERE search_vector IS NULL")
+    else:
+        values = (
+            "new.id, new.full_name, coalesce(new.core_skills, '') || ' ' || coalesce(new.technical_skills, ''), "
+            "new.recruiter_notes, new.resume_text"
+        )
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+                full_name, skills, recruiter_notes, resume_text, tokenize = 'porter unicode61'
+            )
+        """)
+        op.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS candidates_fts_insert AFTER INSERT ON candidates BEGIN
+                INSERT INTO candidates_fts (rowid, full_name, skills, recruiter_notes, resume_text) VALUES ({values});
+            END
+        """)
+        op.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS candidates_fts_update AFTER UPDATE OF {TRIGGER_COLUMNS} ON candidates BEGIN
+                DELETE FROM candidates_fts WHERE rowid = old.id;
+                INSERT INTO candidates_fts (rowid, full_name, skills, recruiter_notes, resume_text) VALUES ({values});
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS candidates_fts_delete AFTER DELETE ON candidates BEGIN
+                DELETE FROM candidates_fts WHERE rowid = old.id;
+            END
+        """)
+        op.execute("""
+            INSERT INTO candidates_fts (rowid, full_name, skills, recruiter_notes, resume_text)
+            SELECT id, full_name, coalesce(core_skills, '') || ' ' || coalesce(technical_skills, ''),
+                   recruiter_notes, resume_text
+            FROM candidates WHERE id NOT IN (SELECT rowid FROM candidates_fts)
+        """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS candidates_search_vector_trigger ON candidates")
+        op.execute("DROP FUNCTION IF EXISTS candidates_search_vector_update()")
+        op.execute("DROP INDEX IF EXISTS ix_candidates_search_vector")
+        op.execute("ALTER TABLE candidates DROP COLUMN IF EXISTS search_vector")
+    else:
+        op.execute("DROP TRIGGER IF EXISTS candidates_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS candidates_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS candidates_fts_insert")
+        op.execute("DROP TABLE IF EXISTS candidates_fts")
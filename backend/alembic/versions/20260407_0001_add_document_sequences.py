@@ -0,0 +1,61 @@
+"""add_document_sequences
+
+Revision ID: 20260407_0001
+Revises: 20260331_0001
+Create Date: 2026-04-07 09:00:00.000000
+
+Per-prefix, per-day counters for document numbers (PREFIX-YYYYMMDD-NNNN),
+replacing MAX(...) scans. Counters are seeded from the highest numbers
+already issued so numbering continues without collisions.
+"""
+import re
+from datetime import datetime
+from typing import Dict, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260407_0001'
+down_revision: Union[str, None] = '20260331_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NUMBERED_COLUMNS = [
+    ('recruitment_requests', 'request_number'),
+    ('candidates', 'candidate_number'),
+    ('interviews', 'interview_number'),
+    ('evaluations', 'evaluation_number'),
+    ('passes', 'pass_number'),
+]
+
+# UUID-suffixed fallback numbers from the old generator do not match
+NUMBER = re.compile(r'^([A-Z]{2,10})-(\d{8})-(\d+)$')
+
+
+def upgrade() -> None:
+    document_sequences = op.create_table(
+        'document_sequences',
+        sa.Column('prefix', sa.String(10), primary_key=True),
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('last_value', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    bind = op.get_bind()
+    last_values: Dict[Tuple[str, str], int] = {}
+    for table, column in NUMBERED_COLUMNS:
+        for (number,) in bind.execute(sa.text(f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL")):
+            match = NUMBER.match(number)
+            if match:
+                key = (match.group(1), match.group(2))
+                last_values[key] = max(last_values.get(key, 0), int(match.group(3)))
+    if last_values:
+        op.bulk_insert(document_sequences, [
+            {'prefix': prefix, 'day': datetime.strptime(day, '%Y%m%d').date(), 'last_value': value}
+            for (prefix, day), value in last_values.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('document_sequences')
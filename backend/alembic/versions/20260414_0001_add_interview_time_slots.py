@@ -0,0 +1,81 @@
+"""add_interview_time_slots
+
+Revision ID: 20260414_0001
+Revises: 20260407_0001
+Create Date: 2026-04-14 09:00:00.000000
+
+Interview slots move from the Interview.available_slots JSON into a table
+unique per (requisition, start, end), with at most one slot per booked
+interview. Slots already offered are copied over; a slot confirmed by an
+interview's candidate is recorded as booked by that interview.
+"""
+import json
+from datetime import datetime
+from typing import Dict, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260414_0001'
+down_revision: Union[str, None] = '20260407_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _parse(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def upgrade() -> None:
+    interview_time_slots = op.create_table(
+        'interview_time_slots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('recruitment_request_id', sa.Integer(), sa.ForeignKey('recruitment_requests.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('start_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('booked_interview_id', sa.Integer(), sa.ForeignKey('interviews.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('booked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint('recruitment_request_id', 'start_at', 'end_at', name='uq_interview_time_slot'),
+        sa.UniqueConstraint('booked_interview_id', name='uq_interview_time_slots_booked_interview_id'),
+    )
+    op.create_index('ix_interview_time_slots_id', 'interview_time_slots', ['id'])
+
+    bind = op.get_bind()
+    slots: Dict[Tuple[int, datetime, datetime], Dict] = {}
+    booked_interviews = set()
+    rows = bind.execute(sa.text(
+        "SELECT id, recruitment_request_id, candidate_id, status, confirmed_at, available_slots "
+        "FROM interviews WHERE available_slots IS NOT NULL"
+    ))
+    for interview_id, request_id, candidate_id, status, confirmed_at, available in rows:
+        if isinstance(available, str):
+            available = json.loads(available)
+        if isinstance(confirmed_at, str):
+            confirmed_at = _parse(confirmed_at)
+        for slot in (available or {}).get('slots', []):
+            try:
+                key = (request_id, _parse(slot['start']), _parse(slot['end']))
+            except (KeyError, TypeError, ValueError):
+                continue
+            entry = slots.setdefault(key, {
+                'recruitment_request_id': request_id, 'start_at': key[1], 'end_at': key[2],
+                'booked_interview_id': None, 'booked_at': None,
+            })
+            booked_here = (
+                status == 'scheduled' and slot.get('is_booked')
+                and slot.get('booked_by') == str(candidate_id)
+            )
+            if booked_here and entry['booked_interview_id'] is None and interview_id not in booked_interviews:
+                entry['booked_interview_id'] = interview_id
+                entry['booked_at'] = confirmed_at
+                booked_interviews.add(interview_id)
+    if slots:
+        op.bulk_insert(interview_time_slots, list(slots.values()))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_interview_time_slots_id', table_name='interview_time_slots')
+    op.drop_table('interview_time_slots')
@@ -0,0 +1,28 @@
+"""add_interview_slot_interviewer
+
+Revision ID: 20260421_0001
+Revises: 20260414_0001
+Create Date: 2026-04-21 09:00:00.000000
+
+Records which panel member takes an interview slot, as assigned by the
+schedule optimizer.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260421_0001'
+down_revision: Union[str, None] = '20260414_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('interview_slots', sa.Column('interviewer_id', sa.String(50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('interview_slots', 'interviewer_id')
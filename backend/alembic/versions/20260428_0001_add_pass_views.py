@@ -0,0 +1,45 @@
+"""add_pass_views
+
+Revision ID: 20260428_0001
+Revises: 20260421_0001
+Create Date: 2026-04-28 09:00:00.000000
+
+Prebuilt candidate/manager pass pages served by pass token. Views are
+built on first access, so nothing is backfilled.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20260428_0001'
+down_revision: Union[str, None] = '20260421_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'pass_views',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('pass_type', sa.String(20), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('holder_id', sa.String(50), nullable=False, server_default=''),
+        sa.Column('recruitment_request_id', sa.Integer(), nullable=False),
+        sa.Column('pass_token', sa.String(64), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('etag', sa.String(64), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('built_version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('built_at', sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint('pass_type', 'subject_id', 'holder_id', name='uq_pass_view_subject'),
+        sa.UniqueConstraint('pass_token', name='uq_pass_views_pass_token'),
+    )
+    op.create_index('ix_pass_views_recruitment_request_id', 'pass_views', ['recruitment_request_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pass_views_recruitment_request_id', table_name='pass_views')
+    op.drop_table('pass_views')
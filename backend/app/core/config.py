@@ -34,8 +34,66 @@ class Settings(BaseSettings):
     smtp_from_email: str = Field(default="hr@baynunah.ae", description="From email address")
     smtp_from_name: str = Field(default="Baynunah HR", description="From name")
     smtp_use_tls: bool = Field(default=True, description="Use TLS for SMTP")
+    smtp_timeout_seconds: float = Field(default=30.0, description="Socket timeout for SMTP connections")
+    smtp_pool_size: int = Field(default=4, description="Maximum authenticated SMTP connections kept open")
+    smtp_pool_idle_seconds: int = Field(default=60, description="Close pooled SMTP connections idle for longer than this")
     app_base_url: str = Field(default="http://localhost:5173", description="Base URL for email links")
     
+    # Email outbox worker
+    email_outbox_poll_seconds: float = Field(default=5.0, description="Seconds between outbox polls when idle")
+    email_outbox_batch_size: int = Field(default=50, description="Messages claimed per outbox drain")
+    email_outbox_concurrency: int = Field(default=4, description="Messages sent in parallel by the outbox worker")
+    email_outbox_max_attempts: int = Field(default=5, description="Send attempts before a message is marked failed")
+    email_outbox_retry_base_seconds: int = Field(default=30, description="Base delay for exponential retry backoff")
+    email_outbox_lock_timeout_seconds: int = Field(default=300, description="Reclaim messages stuck in 'sending' after this long")
+    email_outbox_shutdown_seconds: float = Field(default=10.0, description="Time allowed for an in-flight batch on shutdown")
+    
+    # Buffered activity log writer
+    log_writer_batch_size: int = Field(default=200, description="Buffered log rows that trigger an immediate bulk insert")
+    log_writer_flush_interval_ms: int = Field(default=500, description="Milliseconds between flushes of buffered log rows")
+    log_writer_max_buffer: int = Field(default=10_000, description="Buffered log rows kept while the database is unavailable; the oldest are dropped beyond this")
+    
+    # Notification digests
+    notification_digest_window_minutes: int = Field(default=15, description="Minutes routine notifications are buffered per recipient before one digest is sent (0 = send immediately)")
+    
+    # Live event stream (server-sent events)
+    event_bus_backend: str = Field(default="memory", description="Event fan-out backend: memory (single worker) or postgres (LISTEN/NOTIFY)")
+    event_stream_heartbeat_seconds: float = Field(default=15.0, description="Keepalive interval for idle event streams")
+    event_stream_retry_ms: int = Field(default=5000, description="Reconnect delay suggested to EventSource clients")
+    event_stream_queue_size: int = Field(default=100, description="Events buffered per stream before the oldest are dropped")
+    
+    # Template rendering
+    template_cache_max_entries: int = Field(default=256, description="Compiled template versions kept in memory")
+    template_batch_max_contexts: int = Field(default=5000, description="Maximum recipients per batch render request")
+    
+    # CV scoring jobs (LLM analysis of uploaded CVs)
+    cv_scoring_model: str = Field(default="gpt-4o-mini", description="Chat model used to analyze CVs")
+    cv_scoring_timeout_seconds: float = Field(default=60.0, description="Timeout for one LLM request")
+    cv_scoring_llm_retries: int = Field(default=2, description="Client retries for rate limits, 5xx and connection errors")
+    cv_scoring_concurrency: int = Field(default=2, description="CV scoring jobs run in parallel by the worker")
+    cv_scoring_max_attempts: int = Field(default=3, description="Attempts before a scoring job is marked failed")
+    cv_scoring_retry_base_seconds: int = Field(default=30, description="Base delay for exponential job retry backoff")
+    cv_scoring_job_timeout_seconds: float = Field(default=180.0, description="Time allowed for one scoring job (extraction + analysis)")
+    cv_scoring_poll_seconds: float = Field(default=10.0, description="Seconds between job queue polls when idle")
+    cv_scoring_batch_concurrency: int = Field(default=4, description="LLM requests in flight while rescoring a requisition")
+    cv_scoring_batch_chunk_size: int = Field(default=25, description="Candidates extracted, scored and written per batch step")
+    cv_analysis_cache_enabled: bool = Field(default=True, description="Reuse stored analyses for identical CV/job inputs instead of calling the LLM")
+    cv_scoring_prefilter_min_skills_match: int = Field(default=0, description="Batch rescoring sends only CVs with at least this local skill coverage (0-100) to the LLM; 0 disables the pre-filter")
+
+    # Document text extraction (CV uploads)
+    document_extraction_processes: int = Field(default=2, description="Worker processes for PDF/DOCX text extraction; 0 extracts in threads")
+    document_extraction_timeout_seconds: float = Field(default=30.0, description="Time allowed to extract one file before its worker is restarted")
+    document_extraction_max_pages: int = Field(default=20, description="PDF pages read per file")
+    document_extraction_max_chars: int = Field(default=100_000, description="Characters of text kept per file")
+
+    # Resume parsing (pyresparser/spaCy)
+    resume_parser_processes: int = Field(default=2, description="Worker processes that keep the NLP models loaded; 0 parses in threads")
+    resume_parser_timeout_seconds: float = Field(default=60.0, description="Time allowed to parse one resume before its worker is restarted")
+
+    # Recruitment dashboards
+    recruitment_metrics_cache_ttl_seconds: int = Field(default=60, description="Maximum age of the cached recruitment metrics snapshot before it is rebuilt")
+    pass_view_max_age_seconds: int = Field(default=300, description="Maximum age of a prebuilt candidate/manager pass page before it is rebuilt")
+    
     # Authentication settings (Employee ID + Password)
     auth_secret_key: str = Field(
         default="dev-secret-key-change-in-production",
@@ -78,6 +136,32 @@ class Settings(BaseSettings):
         description="Default password for encrypted insurance census Excel files",
     )
 
+    # Leave management settings
+    leave_calendar_cache_ttl_seconds: int = Field(
+        default=300,
+        description="Maximum age of a cached leave calendar month before it is rebuilt",
+    )
+    public_holiday_index_ttl_seconds: int = Field(
+        default=600,
+        description="Maximum age of the in-memory public holiday index for a year",
+    )
+    leave_min_team_staffing: int = Field(
+        default=1,
+        description="Default minimum number of team members present before a day is flagged",
+    )
+    leave_accrual_enabled: bool = Field(
+        default=False,
+        description="Run the nightly leave accrual and carry-forward job",
+    )
+    leave_carry_forward_cap_days: int = Field(
+        default=30,
+        description="Maximum annual leave days carried into the next year (Article 29.4)",
+    )
+    leave_carry_forward_expiry_month: int = Field(
+        default=3,
+        description="Carried-forward days expire after the end of this month (0 = never)",
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import re
 from pathlib import Path
@@ -63,9 +64,88 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Could not start attendance scheduler: {e}")
 
+    # Start email outbox worker (delivers queued notification emails)
+    try:
+        from app.services.email_outbox import get_outbox_worker
+        get_outbox_worker().start()
+    except Exception as e:
+        logger.warning(f"Could not start email outbox worker: {e}")
+
+    # Start buffered activity log writer
+    try:
+        from app.services.log_writer import get_log_writer
+        get_log_writer().start()
+    except Exception as e:
+        logger.warning(f"Could not start log writer: {e}")
+
+    # Warm up resume parser workers (loads the NLP models off the startup path)
+    try:
+        from app.services.resume_parser import resume_parser_service
+        if resume_parser_service.is_available():
+            asyncio.get_running_loop().create_task(resume_parser_service.warm_up())
+    except Exception as e:
+        logger.warning(f"Could not warm up resume parser: {e}")
+    
+    # Start CV scoring worker (scores uploaded CVs in the background)
+    try:
+        from app.services.cv_scoring_jobs import get_cv_scoring_worker
+        get_cv_scoring_worker().start()
+    except Exception as e:
+        logger.warning(f"Could not start CV scoring worker: {e}")
+
+    # Start live event bus (server-sent events fan-out)
+    try:
+        from app.services.event_bus import get_event_bus
+        await get_event_bus().start()
+    except Exception as e:
+        logger.warning(f"Could not start event bus: {e}")
+
     yield
     
     # Shutdown
+    try:
+        from app.services.event_bus import get_event_bus
+        await get_event_bus().stop()
+    except Exception as e:
+        logger.warning(f"Could not stop event bus: {e}")
+    
+    try:
+        from app.services.cv_scoring_jobs import get_cv_scoring_worker
+        await get_cv_scoring_worker().stop()
+    except Exception as e:
+        logger.warning(f"Could not stop CV scoring worker: {e}")
+    
+    try:
+        from app.services.resume_parser import resume_parser_service
+        resume_parser_service.shutdown()
+    except Exception as e:
+        logger.warning(f"Could not stop resume parser pool: {e}")
+    
+    try:
+        from app.services.document_extraction import shutdown_document_extractor
+        shutdown_document_extractor()
+    except Exception as e:
+        logger.warning(f"Could not stop document extraction pool: {e}")
+    
+    try:
+        from app.services.email_outbox import get_outbox_worker
+        await get_outbox_worker().stop()
+    except Exception as e:
+        logger.warning(f"Could not stop email outbox worker: {e}")
+    
+    try:
+        from app.services.email_service import shutdown_email_service
+        shutdown_email_service()
+    except Exception as e:
+        logger.warning(f"Could not close email service: {e}")
+    
+    # After the workers above, so log lines they wrote while stopping are flushed
+    try:
+        from app.services.log_writer import get_log_writer
+        await get_log_writer().stop()
+    except Exception as e:
+        logger.warning(f"Could not flush log writer: {e}")
+    
     try:
         from app.services.attendance_scheduler import stop_attendance_scheduler
         stop_attendance_scheduler()
@@ -105,11 +185,12 @@ def create_app() -> FastAPI:
     app.include_router(admin.router, prefix=settings.api_prefix)
     from app.routers import templates, audit_logs, notifications, activity_logs
     from app.routers import employee_compliance, employee_bank, employee_documents
-    from app.routers import recruitment, interview  # , performance
+    from app.routers import recruitment, interview, events  # , performance
     app.include_router(templates.router, prefix=settings.api_prefix)
     app.include_router(audit_logs.router, prefix=settings.api_prefix)
     app.include_router(notifications.router, prefix=settings.api_prefix)
     app.include_router(activity_logs.router, prefix=settings.api_prefix)
+    app.include_router(events.router, prefix=settings.api_prefix)
     app.include_router(employee_compliance.router)
     app.include_router(employee_bank.router)
     app.include_router(employee_documents.router)
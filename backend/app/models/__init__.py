@@ -15,9 +15,14 @@ from app.models.attendance import (
     FRIDAY_CLOCK_OUT, FRIDAY_WORK_HOURS, STANDARD_BREAK_MINUTES,
     OVERTIME_RATE_REGULAR, OVERTIME_RATE_NIGHT, OVERTIME_RATE_HOLIDAY
 )
-from app.models.interview import InterviewSetup, InterviewSlot, PassMessage, RecruitmentDocument, PassFeedback
+from app.models.interview import InterviewSetup, InterviewSlot, PassMessage, RecruitmentDocument, PassFeedback, PassView
 from app.models.performance import PerformanceCycle, PerformanceReview, PerformanceRating
 from app.models.activity_log import ActivityLog
+from app.models.email_outbox import EmailOutbox, OUTBOX_STATUSES
+from app.models.notification_digest import NotificationDigestItem
+from app.models.cv_scoring_job import CVScoringJob, CVScoringBatch, CV_SCORING_JOB_STATUSES
+from app.models.cv_analysis_cache import CVAnalysisCacheEntry
+from app.models.document_sequence import DocumentSequence
 from app.models.nomination import EoyNomination, NOMINATION_STATUSES, ELIGIBLE_JOB_LEVELS
 from app.models.nomination_settings import NominationSettings
 from app.models.insurance_census import InsuranceCensusRecord, InsuranceCensusImportBatch, MANDATORY_FIELDS, MANDATORY_FIELDS_FOR_RENEWAL
@@ -38,9 +43,14 @@ __all__ = [
     "STANDARD_CLOCK_IN", "STANDARD_CLOCK_OUT", "RAMADAN_CLOCK_OUT", "GRACE_PERIOD_MINUTES",
     "FRIDAY_CLOCK_OUT", "FRIDAY_WORK_HOURS", "STANDARD_BREAK_MINUTES",
     "OVERTIME_RATE_REGULAR", "OVERTIME_RATE_NIGHT", "OVERTIME_RATE_HOLIDAY",
-    "InterviewSetup", "InterviewSlot", "PassMessage", "RecruitmentDocument", "PassFeedback",
+    "InterviewSetup", "InterviewSlot", "PassMessage", "RecruitmentDocument", "PassFeedback", "PassView",
     "PerformanceCycle", "PerformanceReview", "PerformanceRating",
     "ActivityLog",
+    "EmailOutbox", "OUTBOX_STATUSES",
+    "NotificationDigestItem",
+    "CVScoringJob", "CVScoringBatch", "CV_SCORING_JOB_STATUSES",
+    "CVAnalysisCacheEntry",
+    "DocumentSequence",
     "EoyNomination", "NOMINATION_STATUSES", "ELIGIBLE_JOB_LEVELS",
     "NominationSettings",
     "InsuranceCensusRecord", "InsuranceCensusImportBatch", "MANDATORY_FIELDS", "MANDATORY_FIELDS_FOR_RENEWAL"
@@ -0,0 +1,26 @@
+"""Persistent cache of LLM CV analyses.
+
+An analysis depends only on the CV text, the job title, description and
+required skills (and the model/prompt used), so results are stored under a
+hash of those normalized inputs and reused on re-uploads and rescoring.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.renewal import Base
+
+
+class CVAnalysisCacheEntry(Base):
+    """Parsed analysis result for one set of scoring inputs."""
+    __tablename__ = "cv_analysis_cache"
+
+    input_hash: Mapped[str] = mapped_column(String(64), primary_key=True)  # SHA-256 hex
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    result: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_hit_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,96 @@
+"""Background CV scoring jobs.
+
+Uploading a CV saves the file and queues a job; the CV scoring worker
+extracts the text, asks the LLM for an analysis and writes the scores to the
+candidate. Clients poll the job (or listen for the ``cv_scoring`` event) for
+the outcome.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.renewal import Base
+
+
+CV_SCORING_JOB_STATUSES = [
+    "queued",           # Waiting for a worker slot (or a retry)
+    "running",          # Claimed by a worker
+    "completed",        # Scores written to the candidate
+    "failed"            # Not scorable, or gave up after max attempts
+]
+
+
+class CVScoringJob(Base):
+    """Queued CV analysis for one candidate."""
+    __tablename__ = "cv_scoring_jobs"
+    __table_args__ = (
+        Index("ix_cv_scoring_jobs_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    candidate_id: Mapped[int] = mapped_column(
+        ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+    # Input
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    requested_by: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # employee_id
+
+    # Execution state
+    status: Mapped[str] = mapped_column(String(20), default="queued", nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Output: normalized analysis as returned by analyze_cv
+    result: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class CVScoringBatch(Base):
+    """Rescoring of every candidate with a stored resume for one requisition.
+
+    Candidates are processed in id order; ``last_candidate_id`` is the
+    cursor, so a batch reclaimed after a crash resumes where it stopped.
+    """
+    __tablename__ = "cv_scoring_batches"
+    __table_args__ = (
+        Index("ix_cv_scoring_batches_status", "status"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    recruitment_request_id: Mapped[int] = mapped_column(
+        ForeignKey("recruitment_requests.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    requested_by: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # employee_id
+
+    # Execution state (same statuses as CVScoringJob)
+    status: Mapped[str] = mapped_column(String(20), default="queued", nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Progress
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    scored: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    skipped: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # No readable CV text
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # Analysis failed
+    cache_hits: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    filtered: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # Below the local pre-filter, not sent to the LLM
+    method: Mapped[str] = mapped_column(String(20), default="llm", nullable=False)  # llm | local
+    last_candidate_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
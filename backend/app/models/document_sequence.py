@@ -0,0 +1,16 @@
+"""Per-prefix, per-day counters behind document numbers (``RRF-20260407-0001``)."""
+from datetime import date
+
+from sqlalchemy import Date, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.renewal import Base
+
+
+class DocumentSequence(Base):
+    """Last number issued for one prefix on one day."""
+    __tablename__ = "document_sequences"
+
+    prefix: Mapped[str] = mapped_column(String(10), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    last_value: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -0,0 +1,54 @@
+"""Durable outbox for outgoing email.
+
+Request handlers insert messages in the same transaction as the business
+change (e.g. a leave request) and return as soon as it commits. A background
+worker drains the outbox and talks to SMTP, retrying failures with backoff.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.renewal import Base
+
+
+OUTBOX_STATUSES = [
+    "pending",          # Waiting to be sent (or retried)
+    "sending",          # Claimed by a worker
+    "sent",             # Delivered to the SMTP server
+    "failed"            # Gave up after max attempts
+]
+
+
+class EmailOutbox(Base):
+    """Queued email message."""
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # Message
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(500), nullable=False)
+    html_body: Mapped[str] = mapped_column(Text, nullable=False)
+    text_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # What produced the message, used to run follow-up hooks after delivery
+    category: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # e.g. "leave_submitted"
+    source_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    source_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # Delivery state
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
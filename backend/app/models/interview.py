@@ -1,7 +1,7 @@
 """Interview setup and scheduling models."""
 from datetime import datetime, date, time
 from typing import Optional
-from sqlalchemy import String, Integer, Boolean, Text, Date, Time, DateTime, ForeignKey, JSON
+from sqlalchemy import String, Integer, Boolean, Text, Date, Time, DateTime, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -51,6 +51,8 @@ class InterviewSlot(Base):
     status: Mapped[str] = mapped_column(String(20), default="available")  # available, booked, cancelled
     booked_by_candidate_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("candidates.id"), nullable=True)
     booked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Panel member assigned by the scheduling optimizer (employee ID)
+    interviewer_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     
     # Confirmation
     candidate_confirmed: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -140,3 +142,31 @@ class PassFeedback(Base):
     feedback_type: Mapped[str] = mapped_column(String(50), default="general")  # manager_experience, candidate_experience, general
     
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class PassView(Base):
+    """Prebuilt candidate/manager pass page, served by pass token.
+
+    ``version`` is bumped whenever data shown on the pass changes; the
+    payload is current while ``built_version`` matches it.
+    """
+    
+    __tablename__ = "pass_views"
+    __table_args__ = (
+        UniqueConstraint("pass_type", "subject_id", "holder_id", name="uq_pass_view_subject"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    pass_type: Mapped[str] = mapped_column(String(20), nullable=False)  # candidate, manager
+    subject_id: Mapped[int] = mapped_column(Integer, nullable=False)  # candidate ID or recruitment request ID
+    holder_id: Mapped[str] = mapped_column(String(50), nullable=False, default="")  # manager ID; empty for candidates
+    recruitment_request_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    pass_token: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    
+    # Serialized CandidatePassData / ManagerPassData
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    etag: Mapped[str] = mapped_column(String(64), nullable=False)
+    
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    built_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    built_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,10 +1,15 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, Text, Boolean
+from sqlalchemy import String, Integer, DateTime, Text, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.employee import Base
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Keyset pagination of a user's inbox (newest first) and unread filters
+        Index("ix_notifications_user_id_id", "user_id", "id"),
+        Index("ix_notifications_user_id_is_read", "user_id", "is_read"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[str] = mapped_column(String(50), nullable=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -13,3 +18,9 @@ class Notification(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     type: Mapped[str] = mapped_column(String(30), nullable=True)
     link: Mapped[str] = mapped_column(String(255), nullable=True)
+
+class NotificationCounter(Base):
+    """Per-user unread notification count, maintained on insert and read."""
+    __tablename__ = "notification_counters"
+    user_id: Mapped[str] = mapped_column(String(50), primary_key=True)
+    unread_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
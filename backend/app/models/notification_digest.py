@@ -0,0 +1,48 @@
+"""Buffered notifications waiting to be coalesced into a digest.
+
+Producers that would otherwise create a Notification row and/or an email
+per event add an item here instead. When a recipient's window closes the
+digest dispatcher turns all of their pending items into one notification
+and one email (or the original ones if only a single item arrived).
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.renewal import Base
+
+
+class NotificationDigestItem(Base):
+    """One buffered notification/email for a recipient."""
+    __tablename__ = "notification_digest_items"
+    __table_args__ = (
+        Index("ix_notification_digest_items_pending", "dispatched_at", "deliver_after"),
+        Index("ix_notification_digest_items_recipient", "recipient_key", "dispatched_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # "user:<notification user id>" or "email:<address>"
+    recipient_key: Mapped[str] = mapped_column(String(300), nullable=False)
+    user_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # In-app notification target
+    to_email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # Email target
+
+    # In-app notification content (also the digest line for this item)
+    category: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    link: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+
+    # Original email, sent as-is when the digest holds a single item
+    subject: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    html_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    text_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    source_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    source_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # Window
+    deliver_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    dispatched_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
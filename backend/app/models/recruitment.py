@@ -3,8 +3,8 @@ from datetime import date, datetime
 from typing import List, Optional, TYPE_CHECKING
 
 from sqlalchemy import (
-    Boolean, Date, DateTime, ForeignKey, Integer,
-    String, Text, DECIMAL, JSON, func
+    Boolean, Date, DateTime, ForeignKey, Index, Integer,
+    String, Text, DECIMAL, JSON, UniqueConstraint, func
 )
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -98,6 +98,10 @@ class Candidate(Base):
     """Candidate/applicant for a position."""
 
     __tablename__ = "candidates"
+    __table_args__ = (
+        # Keyset iteration over a requisition's candidates (batch rescoring)
+        Index("ix_candidates_request_id_id", "recruitment_request_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     candidate_number: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
@@ -141,6 +145,8 @@ class Candidate(Base):
 
     # Resume & Documents
     resume_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    resume_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Extracted from resume_path; NULL until extracted
+    resume_text_extracted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     linkedin_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     portfolio_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     documents: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # {cv: path, portfolio: path, certificates: [], passport: path, visa: path}
@@ -240,9 +246,10 @@ class Interview(Base):
     # phone_screen, technical, hr, manager, panel
     interview_round: Mapped[int] = mapped_column(Integer, default=1)
 
-    # Availability slots (from hiring manager) - JSON array
+    # Slots offered to the candidate (from hiring manager) - JSON array; booking
+    # state is kept in interview_time_slots and added to API responses
     available_slots: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
-    # [{"start": "2026-01-10T10:00:00Z", "end": "2026-01-10T11:00:00Z"}, ...]
+    # {"slots": [{"id": "slot-0", "start": "2026-01-10T10:00:00Z", "end": "2026-01-10T11:00:00Z", ...}]}
 
     # Scheduled slot (selected by candidate)
     scheduled_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
@@ -273,6 +280,35 @@ class Interview(Base):
     evaluations: Mapped[List["Evaluation"]] = relationship(back_populates="interview", cascade="all, delete-orphan")
 
 
+class InterviewTimeSlot(Base):
+    """A hiring manager time slot for a requisition, bookable by one interview.
+
+    Slots are unique per requisition and time range, so the same time offered
+    in several interviews is one row; booking sets ``booked_interview_id``
+    with a conditional UPDATE, and each interview holds at most one slot.
+    """
+
+    __tablename__ = "interview_time_slots"
+    __table_args__ = (
+        UniqueConstraint("recruitment_request_id", "start_at", "end_at", name="uq_interview_time_slot"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    recruitment_request_id: Mapped[int] = mapped_column(
+        ForeignKey("recruitment_requests.id", ondelete="CASCADE"), nullable=False
+    )
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # Booking
+    booked_interview_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("interviews.id", ondelete="SET NULL"), nullable=True, unique=True
+    )
+    booked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class Evaluation(Base):
     """Interview evaluation/feedback."""
 
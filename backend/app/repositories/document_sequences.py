@@ -0,0 +1,38 @@
+"""Sequential document numbers: ``PREFIX-YYYYMMDD-NNNN``.
+
+Every numbered entity (requisitions ``RRF``, candidates ``CAN``, interviews
+``INT``, evaluations ``EVL``, passes ``MGR``/``REC``/``ONB``/...) draws its
+sequence from one row per prefix and day in ``document_sequences``. The row
+is created and incremented by a single upsert with ``RETURNING``, so
+concurrent writers never read the same value and no range scan over the
+numbered table is needed.
+
+The increment runs in the caller's transaction: it is rolled back along with
+the entity (no gaps), and on PostgreSQL the row lock is held until commit,
+which serializes writers of the same prefix only.
+"""
+from datetime import date
+from typing import Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document_sequence import DocumentSequence
+
+
+async def next_sequence_value(session: AsyncSession, prefix: str, day: date) -> int:
+    """Increment and return the counter for ``prefix`` on ``day`` (1 for the first)."""
+    dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(DocumentSequence).values(prefix=prefix, day=day, last_value=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DocumentSequence.prefix, DocumentSequence.day],
+        set_={"last_value": DocumentSequence.last_value + 1}
+    ).returning(DocumentSequence.last_value)
+    return (await session.execute(stmt)).scalar_one()
+
+
+async def next_document_number(session: AsyncSession, prefix: str, day: Optional[date] = None) -> str:
+    """Next number for ``prefix``, e.g. ``CAN-20260407-0003`` (caller commits)."""
+    day = day or date.today()
+    value = await next_sequence_value(session, prefix, day)
+    return f"{prefix}-{day:%Y%m%d}-{value:04d}"
@@ -1,29 +1,132 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models.notification import Notification
+from sqlalchemy import select, update, case
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.notification import Notification, NotificationCounter
+from app.services.event_bus import publish_on_commit
 from typing import List, Optional
 
+
+async def _adjust_unread(session: AsyncSession, user_id: Optional[str], delta: int) -> None:
+    """Add ``delta`` to a user's unread counter in the current transaction."""
+    if not user_id or not delta:
+        return
+    if delta < 0:
+        new_count = NotificationCounter.unread_count + delta
+        await session.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=case((new_count < 0, 0), else_=new_count))
+        )
+        return
+    dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(NotificationCounter).values(user_id=user_id, unread_count=delta)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={"unread_count": NotificationCounter.unread_count + delta}
+        )
+    )
+
+
+async def add_notification(session: AsyncSession, **kwargs) -> Notification:
+    """Add a notification and count it as unread, without committing."""
+    notification = Notification(**kwargs)
+    session.add(notification)
+    if not notification.is_read:
+        await _adjust_unread(session, notification.user_id, 1)
+    publish_on_commit(session, notification.user_id, "notification", lambda: _event_payload(notification))
+    return notification
+
+
+def _event_payload(notification: Notification) -> dict:
+    return {
+        "id": notification.id,
+        "title": notification.title,
+        "message": notification.message,
+        "type": notification.type,
+        "link": notification.link,
+        "is_read": bool(notification.is_read),
+        "created_at": notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
 class NotificationRepository:
     async def create(self, session: AsyncSession, **kwargs) -> Notification:
-        notification = Notification(**kwargs)
-        session.add(notification)
+        notification = await add_notification(session, **kwargs)
         await session.commit()
         await session.refresh(notification)
         return notification
 
-    async def list(self, session: AsyncSession, user_id: Optional[str] = None, unread_only: bool = False) -> List[Notification]:
+    async def list(
+        self,
+        session: AsyncSession,
+        user_id: Optional[str] = None,
+        unread_only: bool = False,
+        before_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Notification]:
+        """List notifications newest first; ``before_id`` is the keyset cursor."""
         query = select(Notification)
         if user_id:
             query = query.where(Notification.user_id == user_id)
         if unread_only:
             query = query.where(Notification.is_read == False)
-        result = await session.execute(query.order_by(Notification.created_at.desc()))
+        if before_id is not None:
+            query = query.where(Notification.id < before_id)
+        query = query.order_by(Notification.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        result = await session.execute(query)
         return result.scalars().all()
 
-    async def mark_read(self, session: AsyncSession, notification_id: int) -> Optional[Notification]:
-        notification = await session.get(Notification, notification_id)
+    async def unread_count(self, session: AsyncSession, user_id: str) -> int:
+        result = await session.execute(
+            select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def mark_read(self, session: AsyncSession, notification_id: int, user_id: Optional[str] = None) -> Optional[Notification]:
+        query = select(Notification).where(Notification.id == notification_id)
+        if user_id:
+            query = query.where(Notification.user_id == user_id)
+        notification = (await session.execute(query)).scalar_one_or_none()
         if notification:
-            notification.is_read = True
+            if not notification.is_read:
+                notification.is_read = True
+                await _adjust_unread(session, notification.user_id, -1)
             await session.commit()
             await session.refresh(notification)
         return notification
+
+    async def mark_many_read(self, session: AsyncSession, user_id: str, notification_ids: List[int]) -> int:
+        """Mark the given notifications read in one UPDATE; returns rows changed."""
+        if not notification_ids:
+            return 0
+        result = await session.execute(
+            update(Notification)
+            .where(
+                Notification.user_id == user_id,
+                Notification.id.in_(notification_ids),
+                Notification.is_read == False
+            )
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        await _adjust_unread(session, user_id, -result.rowcount)
+        await session.commit()
+        return result.rowcount
+
+    async def mark_all_read(self, session: AsyncSession, user_id: str, up_to_id: Optional[int] = None) -> int:
+        """Mark every unread notification (optionally up to an id) read in one UPDATE."""
+        query = update(Notification).where(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        )
+        if up_to_id is not None:
+            query = query.where(Notification.id <= up_to_id)
+        result = await session.execute(
+            query.values(is_read=True).execution_options(synchronize_session=False)
+        )
+        await _adjust_unread(session, user_id, -result.rowcount)
+        await session.commit()
+        return result.rowcount
@@ -5,6 +5,7 @@ from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.passes import Pass
+from app.repositories.document_sequences import next_document_number
 
 
 class PassRepository:
@@ -153,15 +154,9 @@ class PassRepository:
 
     async def get_next_pass_number(self, session: AsyncSession, pass_type: str) -> str:
         """
-        Generate next pass number with race condition protection.
-        Uses MAX-based approach with retry logic and UUID fallback.
+        Generate next pass number from the shared per-day sequence.
         Format: TYPE-YYYYMMDD-XXXX (e.g., REC-20241231-0001)
         """
-        from datetime import datetime
-        from sqlalchemy.exc import IntegrityError
-        import uuid
-        import logging
-        
         prefix_map = {
             "recruitment": "REC",
             "onboarding": "ONB",
@@ -169,37 +164,4 @@ class PassRepository:
             "contractor": "CON",
             "temporary": "TMP",
         }
-        prefix = prefix_map.get(pass_type, "PAS")
-        date_str = datetime.now().strftime("%Y%m%d")
-        today_prefix = f"{prefix}-{date_str}-"
-        
-        max_attempts = 5
-        for attempt in range(max_attempts):
-            try:
-                # Get max sequence number for today using MAX (more race-condition resistant)
-                result = await session.execute(
-                    select(func.max(Pass.pass_number))
-                    .where(Pass.pass_number.like(f"{today_prefix}%"))
-                )
-                max_number = result.scalar()
-                
-                if max_number:
-                    try:
-                        last_seq = int(max_number.split('-')[-1])
-                        next_seq = last_seq + 1
-                    except (ValueError, IndexError):
-                        next_seq = 1
-                else:
-                    next_seq = 1
-                
-                return f"{today_prefix}{next_seq:04d}"
-                
-            except IntegrityError:
-                # Race condition detected - retry
-                await session.rollback()
-                continue
-        
-        # Fallback: Use UUID suffix to guarantee uniqueness
-        unique_suffix = str(uuid.uuid4())[:8].upper()
-        logging.warning(f"Failed to generate sequential pass number after {max_attempts} attempts. Using UUID fallback.")
-        return f"{today_prefix}{unique_suffix}"
+        return await next_document_number(session, prefix_map.get(pass_type, "PAS"))
@@ -22,6 +22,7 @@ from app.models.attendance import (
     WORK_LOCATIONS, WORK_LOCATIONS_REQUIRE_REMARKS
 )
 from app.models.system_settings import SystemSetting
+from app.services.event_bus import get_event_bus
 from app.schemas.attendance import (
     ClockInRequest, ClockOutRequest, BreakRequest,
     AttendanceResponse, AttendanceDashboard, EmployeeWorkSettings,
@@ -300,6 +301,15 @@ def build_response(record: AttendanceRecord, employee_name: str) -> AttendanceRe
     )
 
 
+async def publish_attendance_update(employee: Employee, response: AttendanceResponse) -> None:
+    """Push a changed attendance record to the employee's and their manager's event streams."""
+    bus = get_event_bus()
+    data = response.model_dump(mode="json")
+    await bus.publish(employee.employee_id, "attendance", data)
+    if employee.line_manager_id:
+        await bus.publish(str(employee.line_manager_id), "team_attendance", data)
+
+
 @router.get("/employee-work-settings/{employee_id}", response_model=EmployeeWorkSettings)
 async def get_employee_attendance_settings(
     employee_id: int,
@@ -530,7 +540,9 @@ async def clock_in(
     await session.commit()
     await session.refresh(record)
     
-    return build_response(record, current_user.name)
+    response = build_response(record, current_user.name)
+    await publish_attendance_update(current_user, response)
+    return response
 
 
 @router.post("/clock-out", response_model=AttendanceResponse)
@@ -639,7 +651,9 @@ async def clock_out(
     await session.commit()
     await session.refresh(record)
     
-    return build_response(record, current_user.name)
+    response = build_response(record, current_user.name)
+    await publish_attendance_update(current_user, response)
+    return response
 
 
 @router.post("/break/start", response_model=AttendanceResponse)
@@ -686,7 +700,9 @@ async def start_break(
     await session.commit()
     await session.refresh(record)
     
-    return build_response(record, current_user.name)
+    response = build_response(record, current_user.name)
+    await publish_attendance_update(current_user, response)
+    return response
 
 
 @router.post("/break/end", response_model=AttendanceResponse)
@@ -729,7 +745,9 @@ async def end_break(
     await session.commit()
     await session.refresh(record)
     
-    return build_response(record, current_user.name)
+    response = build_response(record, current_user.name)
+    await publish_attendance_update(current_user, response)
+    return response
 
 
 @router.post("/manual-entry", response_model=AttendanceResponse)
@@ -22,6 +22,7 @@ from app.schemas.employee_document import (
     DocumentListResponse,
 )
 from app.auth.dependencies import require_auth, require_hr
+from app.services.file_storage import UploadTooLarge, store_upload
 
 logger = logging.getLogger(__name__)
 
@@ -229,23 +230,15 @@ async def upload_document_file(
     if ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(status_code=400, detail=f"File type not allowed. Allowed: {ALLOWED_EXTENSIONS}")
     
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
+    # Streamed to storage in chunks; identical files are stored once
+    try:
+        stored = await store_upload(file, UPLOAD_DIR, MAX_FILE_SIZE, suffix=ext)
+    except UploadTooLarge:
         raise HTTPException(status_code=400, detail="File too large. Maximum 10MB")
     
-    employee_dir = os.path.join(UPLOAD_DIR, employee_id)
-    os.makedirs(employee_dir, exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_name = f"{document.document_type}_{timestamp}{ext}"
-    file_path = os.path.join(employee_dir, safe_name)
-    
-    with open(file_path, "wb") as f:
-        f.write(content)
-    
-    document.file_path = file_path
+    document.file_path = stored.path
     document.file_name = file.filename
-    document.file_size = len(content)
+    document.file_size = stored.size
     document.file_type = file.content_type
     document.uploaded_at = datetime.now()
     document.uploaded_by = current_user.employee_id
@@ -487,8 +480,16 @@ async def delete_document(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
+    # Stored files are shared by documents with identical content
     if document.file_path and os.path.exists(document.file_path):
-        os.remove(document.file_path)
+        shared = await session.execute(
+            select(func.count(EmployeeDocument.id)).where(
+                EmployeeDocument.file_path == document.file_path,
+                EmployeeDocument.id != document.id,
+            )
+        )
+        if not shared.scalar():
+            os.remove(document.file_path)
     
     await session.delete(document)
     await session.commit()
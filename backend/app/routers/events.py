@@ -0,0 +1,103 @@
+"""Server-sent events stream for live notifications and attendance status.
+
+Browsers' ``EventSource`` cannot set headers, so the stream accepts the JWT
+either as the usual ``Authorization: Bearer`` header or as ``?token=``.
+"""
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+import jwt
+from jwt.exceptions import PyJWTError
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.employee import Employee
+from app.services.event_bus import Subscription, get_event_bus
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+async def _authenticate_stream(authorization: Optional[str], token: Optional[str]) -> Employee:
+    if authorization:
+        scheme, _, header_token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not header_token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authorization header")
+        token = header_token
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authorization required")
+
+    try:
+        payload = jwt.decode(token.strip(), get_settings().auth_secret_key, algorithms=["HS256"])
+    except PyJWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    employee_id = payload.get("sub")
+    if not employee_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    # Short-lived session: the stream itself must not hold a DB connection
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Employee).where(Employee.employee_id == employee_id)
+        )
+        employee = result.scalar_one_or_none()
+    if not employee:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Employee not found")
+    if not employee.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account inactive")
+    return employee
+
+
+def format_sse(event: str, data: str) -> str:
+    """Encode one server-sent event frame."""
+    lines = "".join(f"data: {line}\n" for line in data.splitlines() or [""])
+    return f"event: {event}\n{lines}\n"
+
+
+async def event_stream(request: Request, subscription: Subscription) -> AsyncIterator[str]:
+    """Yield events for a subscription until the client disconnects."""
+    settings = get_settings()
+    bus = get_event_bus()
+    try:
+        yield f"retry: {settings.event_stream_retry_ms}\n\n"
+        yield format_sse("ready", "{}")
+        while True:
+            bus_event = await subscription.get(timeout=settings.event_stream_heartbeat_seconds)
+            if await request.is_disconnected():
+                break
+            if bus_event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield format_sse(bus_event.event, bus_event.data)
+    finally:
+        bus.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    token: Optional[str] = Query(None, description="JWT for clients that cannot send headers (EventSource)"),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Push channel for the signed-in user.
+
+    Events:
+    - `notification`: a new notification row for the user
+    - `attendance`: the user's attendance record for today changed
+    - `team_attendance`: a direct report's attendance record changed (managers)
+
+    Replaces polling `/notifications` and `/attendance/today`.
+    """
+    employee = await _authenticate_stream(authorization, token)
+    # Notifications are addressed by employee ID or by internal ID depending on the producer
+    subscription = get_event_bus().subscribe({employee.employee_id, str(employee.id)})
+    return StreamingResponse(
+        event_stream(request, subscription),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering
+        },
+    )
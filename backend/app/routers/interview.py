@@ -1,15 +1,19 @@
 """Interview scheduling API endpoints."""
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
 from app.auth.dependencies import require_role
 from app.routers.auth import get_current_employee_id
+from app.models.interview import PassView
 from app.services.interview_service import interview_service
+from app.services.leave_calendar_cache import etag_matches
+from app.services.pass_views import get_candidate_pass_view, get_manager_pass_view, get_pass_view_by_token
 from app.schemas.interview import (
     InterviewSetupCreate, InterviewSetupUpdate, InterviewSetupResponse,
     InterviewSlotBulkCreate, InterviewSlotResponse,
+    ScheduleOptimizeRequest, ScheduleOptimizeResponse,
     SlotBookingRequest, SlotConfirmRequest,
     PassMessageCreate, PassMessageResponse,
     RecruitmentDocumentCreate, RecruitmentDocumentResponse,
@@ -62,6 +66,17 @@ async def create_slots_bulk(
     return await interview_service.create_slots_bulk(session, data)
 
 
+@router.post("/slots/optimize", response_model=ScheduleOptimizeResponse)
+async def optimize_schedule(
+    data: ScheduleOptimizeRequest,
+    session: AsyncSession = Depends(get_session),
+    current_employee_id: str = Depends(get_current_employee_id),
+    _: str = Depends(require_role(["admin", "hr"]))
+):
+    """Book the maximum number of candidates into open slots from everyone's availability."""
+    return await interview_service.optimize_schedule(session, data, current_employee_id)
+
+
 @router.get("/slots/{recruitment_request_id}", response_model=List[InterviewSlotResponse])
 async def get_available_slots(
     recruitment_request_id: int,
@@ -150,24 +165,48 @@ async def get_documents(
     return await interview_service.get_documents(session, recruitment_request_id)
 
 
+def _pass_view_response(view: PassView, if_none_match: Optional[str]) -> Response:
+    """Send a prebuilt pass document, or 304 when the client's copy is current."""
+    etag = f'"{view.etag}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    return Response(content=view.payload, media_type="application/json", headers=cache_headers)
+
+
+@router.get("/pass/token/{pass_token}", response_model=Union[CandidatePassData, ManagerPassData])
+async def get_pass_by_token(
+    pass_token: str,
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_session)
+):
+    """Get candidate or manager pass data by pass token (supports If-None-Match)."""
+    view = await get_pass_view_by_token(session, pass_token)
+    return _pass_view_response(view, if_none_match)
+
+
 @router.get("/pass/candidate/{candidate_id}", response_model=CandidatePassData)
 async def get_candidate_pass(
     candidate_id: int,
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session)
 ):
-    """Get candidate pass data."""
-    return await interview_service.get_candidate_pass_data(session, candidate_id)
+    """Get candidate pass data (supports If-None-Match)."""
+    view = await get_candidate_pass_view(session, candidate_id)
+    return _pass_view_response(view, if_none_match)
 
 
 @router.get("/pass/manager/{recruitment_request_id}", response_model=ManagerPassData)
 async def get_manager_pass(
     recruitment_request_id: int,
     manager_id: str = Query(...),
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
     _: str = Depends(require_role(["admin", "hr"]))
 ):
-    """Get manager pass data."""
-    return await interview_service.get_manager_pass_data(session, recruitment_request_id, manager_id)
+    """Get manager pass data (supports If-None-Match)."""
+    view = await get_manager_pass_view(session, recruitment_request_id, manager_id)
+    return _pass_view_response(view, if_none_match)
 
 
 @router.post("/feedback", response_model=FeedbackResponse)
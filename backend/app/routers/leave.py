@@ -1,8 +1,10 @@
 """Leave management router with enhanced features and UAE compliance."""
+from dataclasses import asdict
 from datetime import date, datetime, timezone
+from decimal import Decimal
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 import jwt
 from jwt.exceptions import PyJWTError
 from sqlalchemy import and_, select
@@ -12,11 +14,17 @@ from app.core.config import get_settings
 from app.database import get_session
 from app.models.employee import Employee
 from app.models.leave import LeaveRequest, LeaveBalance, LEAVE_TYPES
-from app.models.public_holiday import PublicHoliday
 from app.schemas.leave import (
     LeaveBalanceResponse, LeaveBalanceSummary, LeaveRequestCreate,
     LeaveRequestResponse, LeaveApprovalRequest, LeaveCalendarEntry,
-    PublicHolidayResponse
+    PublicHolidayResponse, TeamCoverageResponse, LeaveAccrualRunResponse
+)
+from app.services.email_outbox import wake_outbox_worker
+from app.services.holiday_index import get_holiday_index
+from app.services.leave_accrual import LeaveAccrualEngine
+from app.services.leave_calendar_cache import (
+    calendar_etag, collect_entries, etag_matches, get_leave_calendar_cache,
+    month_bounds, months_in_range, render_ical
 )
 from app.services.leave_service import get_leave_service
 
@@ -135,8 +143,6 @@ async def create_leave_request(
     session: AsyncSession = Depends(get_session)
 ):
     """Create a new leave request with enhanced validation."""
-    from decimal import Decimal
-    
     # Get leave service
     leave_service = await get_leave_service(session)
     
@@ -174,18 +180,20 @@ async def create_leave_request(
     )
     
     session.add(leave_request)
-    await session.commit()
-    await session.refresh(leave_request)
+    await session.flush()
     
-    # Send manager notification
+    # Queue manager notification in the same transaction; the outbox worker
+    # delivers it after commit so submission never waits on SMTP
+    queued = False
     if manager and manager.email:
-        notification_sent = await leave_service.send_manager_notification(
+        queued = await leave_service.enqueue_manager_notification(
             leave_request, current_user, manager
         )
-        if notification_sent:
-            leave_request.manager_notified = True
-            leave_request.notification_sent_at = datetime.now(timezone.utc)
-            await session.commit()
+    
+    await session.commit()
+    await session.refresh(leave_request)
+    if queued:
+        wake_outbox_worker()
     
     return LeaveRequestResponse(
         id=leave_request.id,
@@ -270,12 +278,13 @@ async def approve_leave_request(
     if leave_request.status != "pending":
         raise HTTPException(status_code=400, detail="Leave request is not pending")
     
+    emp_result = await session.execute(
+        select(Employee).where(Employee.id == leave_request.employee_id)
+    )
+    employee = emp_result.scalar_one_or_none()
+    
     # For managers, verify they manage this employee
     if current_user.role == "manager":
-        emp_result = await session.execute(
-            select(Employee).where(Employee.id == leave_request.employee_id)
-        )
-        employee = emp_result.scalar_one_or_none()
         if not employee or employee.line_manager_id != current_user.id:
             raise HTTPException(status_code=403, detail="You can only approve leave for your direct reports")
     
@@ -303,8 +312,22 @@ async def approve_leave_request(
         leave_request.status = "rejected"
         leave_request.rejection_reason = approval.rejection_reason
     
+    queued = False
+    if employee:
+        leave_service = await get_leave_service(session)
+        queued = await leave_service.enqueue_decision_notification(
+            leave_request, employee, current_user
+        )
+    
     await session.commit()
     await session.refresh(leave_request)
+    if queued:
+        wake_outbox_worker()
+    
+    if approval.approved:
+        get_leave_calendar_cache().invalidate_range(
+            leave_request.start_date, leave_request.end_date
+        )
     
     return LeaveRequestResponse(
         id=leave_request.id,
@@ -324,13 +347,128 @@ async def approve_leave_request(
     )
 
 
+@router.post("/{request_id}/cancel", response_model=LeaveRequestResponse)
+async def cancel_leave_request(
+    request_id: int,
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Cancel a pending or approved leave request (owner or HR/admin)."""
+    result = await session.execute(
+        select(LeaveRequest).where(LeaveRequest.id == request_id)
+    )
+    leave_request = result.scalar_one_or_none()
+    
+    if not leave_request:
+        raise HTTPException(status_code=404, detail="Leave request not found")
+    
+    if current_user.role not in ["admin", "hr"] and leave_request.employee_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    if leave_request.status not in ["pending", "approved"]:
+        raise HTTPException(status_code=400, detail="Only pending or approved leave can be cancelled")
+    
+    was_approved = leave_request.status == "approved"
+    leave_request.status = "cancelled"
+    
+    if was_approved:
+        # Release the days reserved on approval
+        balance_result = await session.execute(
+            select(LeaveBalance).where(
+                and_(
+                    LeaveBalance.employee_id == leave_request.employee_id,
+                    LeaveBalance.year == leave_request.start_date.year,
+                    LeaveBalance.leave_type == leave_request.leave_type
+                )
+            )
+        )
+        balance = balance_result.scalar_one_or_none()
+        if balance:
+            balance.pending = max(balance.pending - leave_request.total_days, Decimal("0"))
+    
+    await session.commit()
+    await session.refresh(leave_request)
+    
+    if was_approved:
+        get_leave_calendar_cache().invalidate_range(
+            leave_request.start_date, leave_request.end_date
+        )
+    
+    return LeaveRequestResponse(
+        id=leave_request.id,
+        employee_id=leave_request.employee_id,
+        leave_type=leave_request.leave_type,
+        start_date=leave_request.start_date,
+        end_date=leave_request.end_date,
+        is_half_day=leave_request.is_half_day,
+        half_day_type=leave_request.half_day_type,
+        total_days=leave_request.total_days,
+        reason=leave_request.reason,
+        status=leave_request.status,
+        approved_by=leave_request.approved_by,
+        approved_at=leave_request.approved_at,
+        created_at=leave_request.created_at
+    )
+
+
+@router.get("/team-coverage", response_model=TeamCoverageResponse)
+async def get_team_coverage(
+    start_date: date = Query(..., description="Range start date"),
+    end_date: date = Query(..., description="Range end date"),
+    manager_id: Optional[int] = Query(None, description="Manager whose team to check (HR/admin only)"),
+    min_staffing: Optional[int] = Query(None, ge=0, description="Minimum team members present per day"),
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Per-day count of team members on pending or approved leave.
+    
+    Days where fewer than ``min_staffing`` team members remain are flagged,
+    so managers can check coverage before approving a request.
+    """
+    if current_user.role not in ["admin", "hr", "manager"]:
+        raise HTTPException(status_code=403, detail="Only managers and HR can view team coverage")
+    
+    if manager_id is None or current_user.role == "manager":
+        manager_id = current_user.id
+    
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="End date must be after start date")
+    if (end_date - start_date).days > 366:
+        raise HTTPException(status_code=400, detail="Date range cannot exceed one year")
+    
+    if min_staffing is None:
+        min_staffing = get_settings().leave_min_team_staffing
+    
+    leave_service = await get_leave_service(session)
+    coverage = await leave_service.get_team_coverage(
+        manager_id, start_date, end_date, min_staffing
+    )
+    return TeamCoverageResponse(**coverage)
+
+
+def _resolve_calendar_range(
+    start_date: date,
+    end_date: date,
+    month: Optional[int],
+    year: Optional[int]
+) -> tuple:
+    """Apply the optional month/year filters to a calendar date range."""
+    if month and year:
+        return month_bounds(year, month)
+    if year:
+        return date(year, 1, 1), date(year, 12, 31)
+    return start_date, end_date
+
+
 @router.get("/calendar", response_model=List[LeaveCalendarEntry])
 async def get_leave_calendar(
+    response: Response,
     start_date: date = Query(..., description="Calendar start date"),
     end_date: date = Query(..., description="Calendar end date"),
     month: Optional[int] = Query(None, description="Filter by month (1-12)"),
     year: Optional[int] = Query(None, description="Filter by year"),
     include_holidays: bool = Query(True, description="Include public holidays"),
+    if_none_match: Optional[str] = Header(None),
     current_user: Employee = Depends(get_current_employee),
     session: AsyncSession = Depends(get_session)
 ):
@@ -338,77 +476,72 @@ async def get_leave_calendar(
     
     Shows approved leaves only for transparency. Optionally filters by month/year.
     If include_holidays is True, public holidays are included in the response.
+    Served from the per-month calendar cache; returns 304 when the client's
+    ETag is still current.
     """
-    # Apply month/year filters if provided
-    if month and year:
-        from calendar import monthrange
-        last_day = monthrange(year, month)[1]
-        start_date = date(year, month, 1)
-        end_date = date(year, month, last_day)
-    elif year:
-        start_date = date(year, 1, 1)
-        end_date = date(year, 12, 31)
-    
-    # Get approved leaves
-    result = await session.execute(
-        select(LeaveRequest, Employee).join(
-            Employee, LeaveRequest.employee_id == Employee.id
-        ).where(
-            and_(
-                LeaveRequest.status == "approved",
-                LeaveRequest.start_date <= end_date,
-                LeaveRequest.end_date >= start_date
-            )
-        ).order_by(LeaveRequest.start_date)
-    )
-    leaves = result.all()
+    start_date, end_date = _resolve_calendar_range(start_date, end_date, month, year)
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="End date must be after start date")
+    
+    cache = get_leave_calendar_cache()
+    snapshots = await cache.get_months(session, months_in_range(start_date, end_date))
+    etag = calendar_etag(snapshots, start_date, end_date, include_holidays)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
     
-    calendar_entries = [
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    
+    response.headers.update(cache_headers)
+    return [
         LeaveCalendarEntry(
-            employee_id=leave.employee_id,
-            employee_name=emp.name,
-            leave_type=leave.leave_type,
-            start_date=leave.start_date,
-            end_date=leave.end_date,
-            status=leave.status,
-            is_half_day=leave.is_half_day,
-            is_holiday=False
+            employee_id=entry["employee_id"],
+            employee_name=entry["employee_name"],
+            leave_type=entry["leave_type"],
+            start_date=entry["start_date"],
+            end_date=entry["end_date"],
+            status=entry["status"],
+            is_half_day=entry["is_half_day"],
+            is_holiday=entry["is_holiday"]
         )
-        for leave, emp in leaves
+        for entry in collect_entries(snapshots, start_date, end_date, include_holidays)
     ]
+
+
+@router.get("/calendar/ical")
+async def get_leave_calendar_ical(
+    year: Optional[int] = Query(None, description="Year (defaults to current year)"),
+    month: Optional[int] = Query(None, ge=1, le=12, description="Limit the feed to one month"),
+    include_holidays: bool = Query(True, description="Include public holidays"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """iCalendar feed of approved leave and public holidays.
     
-    # Add public holidays if requested
-    if include_holidays:
-        holiday_result = await session.execute(
-            select(PublicHoliday).where(
-                and_(
-                    PublicHoliday.is_active == True,
-                    PublicHoliday.start_date <= end_date,
-                    PublicHoliday.end_date >= start_date
-                )
-            ).order_by(PublicHoliday.start_date)
-        )
-        holidays = holiday_result.scalars().all()
-        
-        # Add holidays as calendar entries
-        for holiday in holidays:
-            calendar_entries.append(
-                LeaveCalendarEntry(
-                    employee_id=0,  # System entry
-                    employee_name=holiday.name,
-                    leave_type="public_holiday",
-                    start_date=holiday.start_date,
-                    end_date=holiday.end_date,
-                    status="approved",
-                    is_half_day=False,
-                    is_holiday=True
-                )
-            )
-    
-    # Sort by start date
-    calendar_entries.sort(key=lambda x: x.start_date)
-    
-    return calendar_entries
+    Built from the same per-month cache as the calendar view, with ETag
+    support so subscribed calendar clients can poll cheaply.
+    """
+    if not year:
+        year = date.today().year
+    start_date, end_date = _resolve_calendar_range(None, None, month, year)
+    
+    cache = get_leave_calendar_cache()
+    snapshots = await cache.get_months(session, months_in_range(start_date, end_date))
+    etag = calendar_etag(snapshots, start_date, end_date, include_holidays, variant="ical")
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    
+    body = render_ical(collect_entries(snapshots, start_date, end_date, include_holidays))
+    return Response(
+        content=body,
+        media_type="text/calendar; charset=utf-8",
+        headers={
+            **cache_headers,
+            "Content-Disposition": f'inline; filename="leave-calendar-{year}.ics"',
+        },
+    )
 
 
 @router.get("/holidays", response_model=List[PublicHolidayResponse])
@@ -418,15 +551,7 @@ async def get_public_holidays(
     session: AsyncSession = Depends(get_session)
 ):
     """Get all public holidays for a specific year."""
-    result = await session.execute(
-        select(PublicHoliday).where(
-            and_(
-                PublicHoliday.year == year,
-                PublicHoliday.is_active == True
-            )
-        ).order_by(PublicHoliday.start_date)
-    )
-    holidays = result.scalars().all()
+    holidays = await get_holiday_index().holidays_for_year(session, year)
     
     return [
         PublicHolidayResponse(
@@ -454,16 +579,7 @@ async def check_if_holiday(
     
     Returns holiday details if the date is a holiday, otherwise returns null.
     """
-    result = await session.execute(
-        select(PublicHoliday).where(
-            and_(
-                PublicHoliday.is_active == True,
-                PublicHoliday.start_date <= check_date,
-                PublicHoliday.end_date >= check_date
-            )
-        )
-    )
-    holiday = result.scalar_one_or_none()
+    holiday = await get_holiday_index().holiday_on(session, check_date)
     
     if holiday:
         return {
@@ -527,3 +643,22 @@ async def get_my_leave_balance(
             for b in balances
         ]
     )
+
+
+@router.post("/accrual/run", response_model=LeaveAccrualRunResponse)
+async def run_leave_accrual(
+    as_of: Optional[date] = Query(None, description="Accrual date (defaults to today)"),
+    dry_run: bool = Query(True, description="Report changes without writing balances"),
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Run annual leave accrual and carry-forward for all active employees (HR/Admin only).
+    
+    Defaults to a dry run that lists the balance changes that would be made.
+    """
+    if current_user.role not in ["admin", "hr"]:
+        raise HTTPException(status_code=403, detail="Only HR/Admin can run leave accrual")
+    
+    engine = LeaveAccrualEngine(session)
+    result = await engine.run(as_of or date.today(), dry_run=dry_run)
+    return LeaveAccrualRunResponse(**asdict(result))
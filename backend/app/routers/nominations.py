@@ -13,7 +13,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_session
 from app.models import Employee, EoyNomination, ELIGIBLE_JOB_LEVELS
 from app.models.audit_log import AuditLog
-from app.models.notification import Notification
 from app.schemas.nomination import (
     NominationCreate, NominationResponse, NominationUpdate, NominationContentUpdate,
     EligibleEmployee, NominationListResponse, NominationStats, EligibleManager,
@@ -23,7 +22,9 @@ from app.schemas.nomination import (
     NominationReportEntry, ManagementReportResponse, PublicNominationInfo, ACHIEVEMENT_CATEGORIES
 )
 from app.models.nomination_settings import NominationSettings
-from app.services.email_service import send_nomination_confirmation_email
+from app.services.email_outbox import wake_outbox_worker
+from app.services.email_service import build_nomination_confirmation_email
+from app.services.notification_digest import queue_digest_item
 from app.auth.dependencies import require_role
 
 VERIFICATION_SECRET = os.environ.get("AUTH_SECRET_KEY", "nomination-verify-secret-key")
@@ -405,31 +406,33 @@ async def submit_nomination_secure(
     )
     session.add(audit_log)
     
-    # Create notification for the manager with link to view/revise (same transaction)
+    # Notify the manager in-app and by email, with link to view/revise (same transaction)
     nomination_url = f"/nomination-pass?view={new_nomination.id}"
-    notification = Notification(
+    email = None
+    if nominator and nominator.email:
+        email = build_nomination_confirmation_email(
+            manager_name=nominator.name,
+            nominee_name=nominee.name,
+            nomination_year=year,
+            nomination_id=new_nomination.id
+        )
+    await queue_digest_item(
+        session,
         user_id=str(nominator_id),
         title="EOY Nomination Submitted",
         message=f"Your nomination of {nominee.name} for Employee of the Year {year} has been submitted successfully. Click to view details.",
-        type="eoy_nomination",
+        category="eoy_nomination",
         link=nomination_url,
-        is_read=False
+        to_email=nominator.email if email else None,
+        email=email,
+        source_type="eoy_nomination",
+        source_id=new_nomination.id
     )
-    session.add(notification)
     
     # Commit all changes atomically
     await session.commit()
     await session.refresh(new_nomination)
-    
-    # Send confirmation email to manager (async, non-blocking)
-    if nominator and nominator.email:
-        await send_nomination_confirmation_email(
-            manager_email=nominator.email,
-            manager_name=nominator.name,
-            nominee_name=nominee.name,
-            nomination_year=year,
-            nomination_id=new_nomination.id
-        )
+    wake_outbox_worker()
     
     return NominationResponse(
         id=new_nomination.id,
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.notification import NotificationService
 from app.repositories.notification import NotificationRepository
-from app.schemas.notification import NotificationCreate, NotificationResponse
+from app.schemas.notification import (
+    NotificationCreate, NotificationResponse, NotificationPage,
+    NotificationMarkRead, NotificationMarkAllRead, NotificationReadResult
+)
 from app.auth.dependencies import authenticate_token
 from app.database import get_session
 from typing import List, Optional, Any
@@ -18,14 +21,42 @@ async def create_notification(
 ):
     return await service.create(session, data)
 
-@router.get("", response_model=List[NotificationResponse])
+@router.get("", response_model=NotificationPage)
 async def list_notifications(
     unread_only: bool = False,
+    before_id: Optional[int] = Query(None, description="Cursor: return notifications older than this id"),
+    limit: int = Query(50, ge=1, le=200),
     session: AsyncSession = Depends(get_session),
     claims: dict[str, Any] = Depends(authenticate_token)
 ):
     employee_id = claims.get("sub")
-    return await service.list(session, employee_id, unread_only)
+    return await service.page(session, employee_id, unread_only, before_id, limit)
+
+@router.get("/unread-count")
+async def get_unread_count(
+    session: AsyncSession = Depends(get_session),
+    claims: dict[str, Any] = Depends(authenticate_token)
+):
+    employee_id = claims.get("sub")
+    return {"unread_count": await service.unread_count(session, employee_id)}
+
+@router.post("/read", response_model=NotificationReadResult)
+async def mark_many_read(
+    data: NotificationMarkRead,
+    session: AsyncSession = Depends(get_session),
+    claims: dict[str, Any] = Depends(authenticate_token)
+):
+    employee_id = claims.get("sub")
+    return await service.mark_many_read(session, employee_id, data.ids)
+
+@router.post("/read-all", response_model=NotificationReadResult)
+async def mark_all_read(
+    data: Optional[NotificationMarkAllRead] = None,
+    session: AsyncSession = Depends(get_session),
+    claims: dict[str, Any] = Depends(authenticate_token)
+):
+    employee_id = claims.get("sub")
+    return await service.mark_all_read(session, employee_id, data.up_to_id if data else None)
 
 @router.post("/{notification_id}/read", response_model=NotificationResponse)
 async def mark_read(
@@ -33,4 +64,8 @@ async def mark_read(
     session: AsyncSession = Depends(get_session),
     claims: dict[str, Any] = Depends(authenticate_token)
 ):
-    return await service.mark_read(session, notification_id)
+    employee_id = claims.get("sub")
+    notification = await service.mark_read(session, notification_id, employee_id)
+    if not notification:
+        raise HTTPException(404, "Notification not found")
+    return notification
@@ -4,7 +4,7 @@ from datetime import date
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 import jwt
 from jwt.exceptions import PyJWTError
-from sqlalchemy import and_, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
@@ -15,6 +15,8 @@ from app.schemas.public_holiday import (
     PublicHolidayCreate, PublicHolidayUpdate, PublicHolidayResponse,
     HolidayCalendar, IsHolidayResponse
 )
+from app.services.holiday_index import get_holiday_index
+from app.services.leave_calendar_cache import get_leave_calendar_cache
 
 router = APIRouter(prefix="/holidays", tags=["Public Holidays"])
 
@@ -55,15 +57,7 @@ async def get_holidays_by_year(
     session: AsyncSession = Depends(get_session)
 ):
     """Get all public holidays for a year."""
-    result = await session.execute(
-        select(PublicHoliday).where(
-            and_(
-                PublicHoliday.year == year,
-                PublicHoliday.is_active == True
-            )
-        ).order_by(PublicHoliday.start_date)
-    )
-    holidays = result.scalars().all()
+    holidays = await get_holiday_index().holidays_for_year(session, year)
     
     # Calculate total days off
     total_days = sum((h.end_date - h.start_date).days + 1 for h in holidays)
@@ -98,16 +92,7 @@ async def check_if_holiday(
     session: AsyncSession = Depends(get_session)
 ):
     """Check if a specific date is a public holiday."""
-    result = await session.execute(
-        select(PublicHoliday).where(
-            and_(
-                PublicHoliday.is_active == True,
-                PublicHoliday.start_date <= check_date,
-                PublicHoliday.end_date >= check_date
-            )
-        )
-    )
-    holiday = result.scalar_one_or_none()
+    holiday = await get_holiday_index().holiday_on(session, check_date)
     
     if holiday:
         return IsHolidayResponse(
@@ -160,6 +145,8 @@ async def create_holiday(
     session.add(new_holiday)
     await session.commit()
     await session.refresh(new_holiday)
+    get_holiday_index().invalidate()
+    get_leave_calendar_cache().invalidate_range(new_holiday.start_date, new_holiday.end_date)
     
     return PublicHolidayResponse(
         id=new_holiday.id,
@@ -195,6 +182,8 @@ async def update_holiday(
     if not holiday:
         raise HTTPException(status_code=404, detail="Holiday not found")
     
+    previous_range = (holiday.start_date, holiday.end_date)
+    
     # Update fields
     if update.name is not None:
         holiday.name = update.name
@@ -216,6 +205,11 @@ async def update_holiday(
     await session.commit()
     await session.refresh(holiday)
     
+    get_holiday_index().invalidate()
+    calendar_cache = get_leave_calendar_cache()
+    calendar_cache.invalidate_range(*previous_range)
+    calendar_cache.invalidate_range(holiday.start_date, holiday.end_date)
+    
     return PublicHolidayResponse(
         id=holiday.id,
         name=holiday.name,
@@ -271,6 +265,8 @@ async def initialize_default_holidays(
         created.append(h["name"])
     
     await session.commit()
+    get_holiday_index().invalidate(year)
+    get_leave_calendar_cache().invalidate_range(date(year, 1, 1), date(year, 12, 31))
     
     return {
         "status": "success",
@@ -1,13 +1,13 @@
 """API endpoints for recruitment module."""
 import hmac
+import time
+from datetime import datetime
 from typing import List, Optional
 from fastapi import (
     APIRouter, Depends, HTTPException, File, UploadFile,
     Query, status, Request
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-import tempfile
-import os
 from pathlib import Path
 
 from app.auth.dependencies import require_role
@@ -18,18 +18,29 @@ from app.schemas.recruitment import (
     RecruitmentRequestCreate, RecruitmentRequestUpdate, RecruitmentRequestResponse,
     CandidateCreate, CandidateUpdate, CandidateResponse, CandidateSelfServiceUpdate,
     InterviewCreate, InterviewUpdate, InterviewResponse,
-    InterviewSlotsProvide, InterviewSlotConfirm,
+    InterviewSlotsProvide, InterviewSlotConfirm, InterviewTimeSlotResponse,
     EvaluationCreate, EvaluationResponse,
     ParsedResumeData, RecruitmentStats, RecruitmentMetrics,
     StageInfo, InterviewTypeInfo, EmploymentTypeInfo,
-    BulkCandidateStageUpdate, BulkCandidateReject, BulkOperationResult
+    BulkCandidateStageUpdate, BulkCandidateReject, BulkOperationResult,
+    CVUploadResponse, CVScoringJobResponse, CVScoringBatchResponse, CVAnalysisCacheStats,
+    CandidateRankingResponse, CandidateSearchResponse
 )
 from app.services.recruitment_service import recruitment_service
 from app.services.resume_parser import resume_parser_service
-from app.services.cv_scoring_service import score_candidate_cv
+from app.services import candidate_search
+from app.services.cv_analysis_cache import get_cv_analysis_cache
+from app.services.cv_ranking import rank_request_candidates
+from app.services.cv_scoring_batch import BatchAlreadyActive, batch_progress, create_rescore_batch
+from app.services.cv_scoring_jobs import enqueue_cv_scoring, wake_cv_scoring_worker
+from app.services.file_storage import UploadTooLarge, discard_upload, read_upload, store_upload
+from app.models.cv_scoring_job import CVScoringBatch, CVScoringJob
 
 router = APIRouter(prefix="/recruitment", tags=["recruitment"])
 
+RESUME_STORAGE_DIR = "storage/resumes"
+MAX_RESUME_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+
 
 # ============================================================================
 # METADATA ENDPOINTS
@@ -94,6 +105,7 @@ async def get_metrics(
 async def bulk_update_candidate_stage(
     data: BulkCandidateStageUpdate,
     role: str = Depends(require_role(["admin", "hr"])),
+    employee_id: str = Depends(get_current_employee_id),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -118,12 +130,17 @@ async def bulk_update_candidate_stage(
     
     **Admin and HR only.**
     """
-    return await recruitment_service.bulk_update_candidate_stage(
-        session,
-        data.candidate_ids,
-        data.new_stage,
-        data.notes
-    )
+    try:
+        return await recruitment_service.bulk_update_candidate_stage(
+            session,
+            data.candidate_ids,
+            data.new_stage,
+            data.notes,
+            performed_by=role,
+            performed_by_id=employee_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post(
@@ -134,6 +151,7 @@ async def bulk_update_candidate_stage(
 async def bulk_reject_candidates(
     data: BulkCandidateReject,
     role: str = Depends(require_role(["admin", "hr"])),
+    employee_id: str = Depends(get_current_employee_id),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -147,7 +165,7 @@ async def bulk_reject_candidates(
     }
     ```
     
-    All selected candidates will be:
+    All selected candidates (except hired ones) will be:
     - Moved to "rejected" stage
     - Status set to "rejected"
     - Rejection reason recorded
@@ -158,7 +176,9 @@ async def bulk_reject_candidates(
     return await recruitment_service.bulk_reject_candidates(
         session,
         data.candidate_ids,
-        data.rejection_reason
+        data.rejection_reason,
+        performed_by=role,
+        performed_by_id=employee_id
     )
 
 
@@ -539,6 +559,42 @@ async def list_candidates(
     )
 
 
+@router.get(
+    "/candidates/search",
+    response_model=CandidateSearchResponse,
+    summary="Search candidates"
+)
+async def search_candidates(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find (all must match, prefixes allowed)"),
+    recruitment_request_id: Optional[int] = Query(None, description="Filter by request"),
+    stage: Optional[str] = Query(None, description="Filter by stage"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Full-text search over candidate names, skills, recruiter notes and
+    resume text, best matches first.
+
+    Name and skill matches rank above matches in notes and resume text.
+
+    **Admin and HR only.**
+    """
+    hits, total = await candidate_search.search_candidates(
+        session, q, recruitment_request_id, stage, status_filter, page, page_size
+    )
+    return {
+        "query": q,
+        "results": [{"candidate": candidate, "score": score} for candidate, score in hits],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": (total + page_size - 1) // page_size,
+    }
+
+
 @router.get(
     "/candidates/{candidate_id}",
     response_model=CandidateResponse,
@@ -709,16 +765,23 @@ async def get_pipeline_counts(
 
 @router.post(
     "/candidates/{candidate_id}/upload-cv",
+    response_model=CVUploadResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Upload CV and trigger scoring"
 )
 async def upload_candidate_cv(
     candidate_id: int,
     file: UploadFile = File(...),
+    employee_id: str = Depends(get_current_employee_id),
     role: str = Depends(require_role(["admin", "hr"])),
     session: AsyncSession = Depends(get_session)
 ):
     """
-    Upload a CV for an existing candidate and automatically score it.
+    Upload a CV for an existing candidate and queue it for automatic scoring.
+    
+    Returns immediately with a scoring job ID; poll
+    `GET /recruitment/cv-scoring/jobs/{job_id}` (or listen for the
+    `cv_scoring` event on `/events/stream`) for the scores.
     
     Supports: PDF, DOCX, TXT files.
     
@@ -734,9 +797,6 @@ async def upload_candidate_cv(
     - Maximum file size: 10 MB
     - Allowed types: PDF, DOCX, DOC, TXT
     """
-    # SECURITY: Validate file size (10 MB limit)
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB in bytes
-    
     # SECURITY: Validate file type
     ALLOWED_MIME_TYPES = {
         'application/pdf',
@@ -777,67 +837,189 @@ async def upload_candidate_cv(
     if not request:
         raise HTTPException(status_code=404, detail="Recruitment request not found")
     
-    # Read file content with size limit
-    content = await file.read(MAX_FILE_SIZE + 1)  # Read one extra byte to detect oversized files
+    # SECURITY: Sanitize filename to prevent path traversal
+    safe_filename = Path(file.filename).name  # This removes any directory components
     
-    # SECURITY: Check file size
-    if len(content) > MAX_FILE_SIZE:
+    # Stream the CV to storage (deduplicated by content), enforcing the size limit
+    try:
+        stored = await store_upload(file, RESUME_STORAGE_DIR, MAX_RESUME_FILE_SIZE, suffix=file_ext)
+    except UploadTooLarge:
         raise HTTPException(
             status_code=413,
             detail=f"File too large. Maximum size is 10 MB"
         )
+    resume_path = stored.path
     
-    # SECURITY: Sanitize filename to prevent path traversal
-    safe_filename = Path(file.filename).name  # This removes any directory components
-    # SECURITY: Sanitize filename to prevent path traversal
-    safe_filename = Path(file.filename).name  # This removes any directory components
-    
-    # Save CV to storage
-    resume_dir = Path("storage/resumes")
-    resume_dir.mkdir(parents=True, exist_ok=True)
-    resume_path = resume_dir / f"{candidate.candidate_number}_{safe_filename}"
-    
-    with open(resume_path, 'wb') as f:
-        f.write(content)
-    
-    # Score the CV against job requirements
-    job_description = request.job_description or f"Position: {request.position_title}"
-    required_skills = getattr(request, 'required_skills', None) or []
-    
-    scores = await score_candidate_cv(
+    # Score the CV against job requirements in the background
+    candidate.resume_path = resume_path
+    candidate.resume_text = None  # Re-extracted by the scoring job
+    job = enqueue_cv_scoring(
+        session,
         candidate_id=candidate_id,
-        cv_content=content,
+        file_path=resume_path,
         filename=safe_filename,
-        job_title=request.position_title,
-        job_description=job_description,
-        required_skills=required_skills,
-        db_session=session
+        requested_by=employee_id
     )
+    await session.commit()
+    wake_cv_scoring_worker()
+    
+    return {
+        "success": True,
+        "candidate_id": candidate_id,
+        "filename": safe_filename,
+        "resume_path": resume_path,
+        "job_id": job.id,
+        "status": job.status,
+        "message": "CV uploaded and queued for scoring"
+    }
+
+
+@router.get(
+    "/cv-scoring/jobs/{job_id}",
+    response_model=CVScoringJobResponse,
+    summary="Get CV scoring job status"
+)
+async def get_cv_scoring_job(
+    job_id: int,
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get the status of a queued CV scoring job.
     
-    if scores:
-        return {
-            "success": True,
-            "candidate_id": candidate_id,
-            "filename": safe_filename,
-            "resume_path": str(resume_path),
-            "scores": {
-                "cv_scoring": scores["cv_scoring"],
-                "skills_match_score": scores["skills_match_score"],
-                "education_level": scores["education_level"],
-                "years_experience": scores["years_experience"],
-                "current_position": scores["current_position"]
+    `status` is one of queued, running, completed or failed; `result`
+    holds the scores once completed.
+    
+    **Admin and HR only.**
+    """
+    job = await session.get(CVScoringJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="CV scoring job not found")
+    return job
+
+
+@router.post(
+    "/requests/{request_id}/rescore-cvs",
+    response_model=CVScoringBatchResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Rescore all candidate CVs for a request"
+)
+async def rescore_request_cvs(
+    request_id: int,
+    employee_id: str = Depends(get_current_employee_id),
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Queue rescoring of every candidate with a stored CV against the
+    request's current title, description and required skills.
+
+    Use after editing `required_skills`. Poll
+    `GET /recruitment/cv-scoring/batches/{batch_id}` for progress and ETA.
+
+    **Admin and HR only.**
+    """
+    request = await recruitment_service.get_request(session, request_id)
+    if not request:
+        raise HTTPException(status_code=404, detail="Recruitment request not found")
+    try:
+        batch = await create_rescore_batch(session, request_id, requested_by=employee_id)
+    except BatchAlreadyActive as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Rescoring already in progress (batch {e.batch.id})"
+        )
+    wake_cv_scoring_worker()
+    return batch_progress(batch)
+
+
+@router.get(
+    "/cv-scoring/batches/{batch_id}",
+    response_model=CVScoringBatchResponse,
+    summary="Get CV rescoring progress"
+)
+async def get_cv_scoring_batch(
+    batch_id: int,
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get progress of a rescoring batch, with throughput and estimated time
+    remaining.
+
+    **Admin and HR only.**
+    """
+    batch = await session.get(CVScoringBatch, batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="CV scoring batch not found")
+    return batch_progress(batch)
+
+
+@router.get(
+    "/cv-scoring/cache-stats",
+    response_model=CVAnalysisCacheStats,
+    summary="Get CV analysis cache metrics"
+)
+async def get_cv_analysis_cache_stats(
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Hit/miss metrics for the CV analysis cache.
+
+    A hit means a CV was scored from a stored analysis of identical inputs
+    without calling the LLM.
+
+    **Admin and HR only.**
+    """
+    return await get_cv_analysis_cache().stats(session)
+
+
+@router.post(
+    "/requests/{request_id}/rank-candidates",
+    response_model=CandidateRankingResponse,
+    summary="Rank candidates locally without the LLM"
+)
+async def rank_candidates(
+    request_id: int,
+    persist: bool = Query(True, description="Store screening_rank and skills_match_score"),
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Rank every candidate of a request against its required skills and job
+    description using TF-IDF and skill-token vectors built from CV text and
+    profile skills. No OpenAI key is needed and results are immediate.
+
+    `skills_match_score` is the share of required skills found; ties are
+    broken by text relevance.
+
+    **Admin and HR only.**
+    """
+    request = await recruitment_service.get_request(session, request_id)
+    if not request:
+        raise HTTPException(status_code=404, detail="Recruitment request not found")
+    started = time.perf_counter()
+    ranked = await rank_request_candidates(session, request, persist=persist)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    if persist:
+        await session.commit()
+    return {
+        "recruitment_request_id": request_id,
+        "total": len(ranked),
+        "elapsed_ms": elapsed_ms,
+        "candidates": [
+            {
+                "candidate_id": candidate.id,
+                "full_name": candidate.full_name,
+                "rank": result.rank,
+                "skills_match_score": result.skills_match_score,
+                "relevance": result.relevance,
+                "matched_skills": result.matched_skills,
             }
-        }
-    else:
-        # CV saved but scoring failed
-        return {
-            "success": True,
-            "candidate_id": candidate_id,
-            "filename": safe_filename,
-            "resume_path": str(resume_path),
-            "scores": None,
-            "message": "CV uploaded but automatic scoring could not be completed"
-        }
+            for candidate, result in ranked
+        ],
+    }
 
 
 # ============================================================================
@@ -867,27 +1049,18 @@ async def parse_resume(
 
     **Admin and HR only.**
     """
-    # Save uploaded file temporarily
-    suffix = Path(file.filename).suffix if file.filename else '.pdf'
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_file_path = tmp_file.name
-
     try:
-        # Parse resume
-        parsed_data = await resume_parser_service.parse_resume(tmp_file_path)
+        content = await read_upload(file, MAX_RESUME_FILE_SIZE)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="File too large. Maximum size is 10 MB")
+    # Parsed in a warm worker process; the upload is passed as bytes
+    parsed_data = await resume_parser_service.parse_resume_bytes(content, file.filename or "resume.pdf")
 
-        return {
-            "success": parsed_data.get('parsed', False),
-            "filename": file.filename,
-            "data": parsed_data
-        }
-
-    finally:
-        # Clean up temp file
-        if os.path.exists(tmp_file_path):
-            os.remove(tmp_file_path)
+    return {
+        "success": parsed_data.get('parsed', False),
+        "filename": file.filename,
+        "data": parsed_data
+    }
 
 
 @router.post(
@@ -911,102 +1084,89 @@ async def create_candidate_from_resume(
 
     **Admin and HR only.**
     """
-    # Save uploaded file temporarily
-    suffix = Path(file.filename).suffix if file.filename else '.pdf'
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_file_path = tmp_file.name
-
+    # Stream the resume to storage (deduplicated by content), then parse the stored file
     try:
-        # Parse resume
-        parsed_data = await resume_parser_service.parse_resume(tmp_file_path)
-
-        if not parsed_data.get('parsed'):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Failed to parse resume: {parsed_data.get('error', 'Unknown error')}"
-            )
-
-        # Validate we got minimum required data
-        if not parsed_data.get('name') and not parsed_data.get('email'):
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract name or email from resume. Please add candidate manually."
-            )
-
-        # Build notes from parsed data
-        notes_parts = []
-        if parsed_data.get('skills'):
-            notes_parts.append(f"Skills: {', '.join(parsed_data['skills'][:10])}")
-        if parsed_data.get('education'):
-            notes_parts.append(f"Education: {', '.join(parsed_data['education'][:3])}")
-        if parsed_data.get('company_names'):
-            notes_parts.append(f"Previous companies: {', '.join(parsed_data['company_names'][:3])}")
-
-        # Create candidate from parsed data
-        candidate_data = CandidateCreate(
-            recruitment_request_id=recruitment_request_id,
-            full_name=parsed_data.get('name') or 'Unknown',
-            email=parsed_data.get('email') or 'unknown@example.com',
-            phone=parsed_data.get('mobile_number'),
-            current_position=(
-                parsed_data.get('designation', [''])[0]
-                if parsed_data.get('designation') else None
-            ),
-            current_company=(
-                parsed_data.get('company_names', [''])[0]
-                if parsed_data.get('company_names') else None
-            ),
-            years_experience=parsed_data.get('total_experience'),
-            source=source,
-            notes='\n'.join(notes_parts) if notes_parts else None,
-            emirates_id=parsed_data.get('emirates_id'),
-            visa_status=parsed_data.get('visa_status')
+        stored = await store_upload(
+            file, RESUME_STORAGE_DIR, MAX_RESUME_FILE_SIZE,
+            suffix=Path(file.filename or "resume.pdf").suffix
         )
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="File too large. Maximum size is 10 MB")
+    resume_path = stored.path
+    parsed_data = await resume_parser_service.parse_resume(resume_path)
 
-        # Create candidate
-        candidate = await recruitment_service.add_candidate(session, candidate_data, employee_id)
-
-        # Save resume file
-        resume_dir = Path("storage/resumes")
-        resume_dir.mkdir(parents=True, exist_ok=True)
-        resume_path = resume_dir / f"{candidate.candidate_number}_{file.filename}"
-
-        with open(resume_path, 'wb') as f:
-            f.write(content)
+    if not parsed_data.get('parsed'):
+        await discard_upload(stored)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to parse resume: {parsed_data.get('error', 'Unknown error')}"
+        )
 
-        # Update candidate with resume path
-        await recruitment_service.update_candidate(
-            session, candidate.id,
-            CandidateUpdate(notes=f"{candidate.notes or ''}\nResume: {resume_path}".strip())
+    # Validate we got minimum required data
+    if not parsed_data.get('name') and not parsed_data.get('email'):
+        await discard_upload(stored)
+        raise HTTPException(
+            status_code=400,
+            detail="Could not extract name or email from resume. Please add candidate manually."
         )
 
-        # Get recruitment request for job details
-        request = await recruitment_service.get_request(session, recruitment_request_id)
-        if request:
-            # Automatically score the CV against job requirements
-            job_description = request.job_description or f"Position: {request.position_title}"
-            required_skills = getattr(request, 'required_skills', None) or []
-            
-            await score_candidate_cv(
-                candidate_id=candidate.id,
-                cv_content=content,
-                filename=file.filename or "resume.pdf",
-                job_title=request.position_title,
-                job_description=job_description,
-                required_skills=required_skills,
-                db_session=session
-            )
+    # Build notes from parsed data
+    notes_parts = []
+    if parsed_data.get('skills'):
+        notes_parts.append(f"Skills: {', '.join(parsed_data['skills'][:10])}")
+    if parsed_data.get('education'):
+        notes_parts.append(f"Education: {', '.join(parsed_data['education'][:3])}")
+    if parsed_data.get('company_names'):
+        notes_parts.append(f"Previous companies: {', '.join(parsed_data['company_names'][:3])}")
+
+    # Create candidate from parsed data
+    candidate_data = CandidateCreate(
+        recruitment_request_id=recruitment_request_id,
+        full_name=parsed_data.get('name') or 'Unknown',
+        email=parsed_data.get('email') or 'unknown@example.com',
+        phone=parsed_data.get('mobile_number'),
+        current_position=(
+            parsed_data.get('designation', [''])[0]
+            if parsed_data.get('designation') else None
+        ),
+        current_company=(
+            parsed_data.get('company_names', [''])[0]
+            if parsed_data.get('company_names') else None
+        ),
+        years_experience=parsed_data.get('total_experience'),
+        source=source,
+        notes='\n'.join(notes_parts) if notes_parts else None,
+        emirates_id=parsed_data.get('emirates_id'),
+        visa_status=parsed_data.get('visa_status')
+    )
+
+    # Create candidate
+    candidate = await recruitment_service.add_candidate(session, candidate_data, employee_id)
 
-        # Refresh to get updated data including scores
-        candidate = await recruitment_service.get_candidate(session, candidate.id)
+    # Update candidate with resume path
+    await recruitment_service.update_candidate(
+        session, candidate.id,
+        CandidateUpdate(notes=f"{candidate.notes or ''}\nResume: {resume_path}".strip())
+    )
 
-        return candidate
+    # Queue the CV to be scored against the job requirements
+    candidate = await recruitment_service.get_candidate(session, candidate.id)
+    candidate.resume_path = resume_path
+    candidate.resume_text = None  # Re-extracted by the scoring job
+    job = enqueue_cv_scoring(
+        session,
+        candidate_id=candidate.id,
+        file_path=resume_path,
+        filename=file.filename or "resume.pdf",
+        requested_by=employee_id
+    )
+    await session.commit()
+    wake_cv_scoring_worker()
 
-    finally:
-        if os.path.exists(tmp_file_path):
-            os.remove(tmp_file_path)
+    candidate = await recruitment_service.get_candidate(session, candidate.id)
+    response = CandidateResponse.model_validate(candidate)
+    response.cv_scoring_job_id = job.id
+    return response
 
 
 # ============================================================================
@@ -1031,7 +1191,8 @@ async def schedule_interview(
 
     **Admin and HR only.**
     """
-    return await recruitment_service.create_interview(session, data)
+    interview = await recruitment_service.create_interview(session, data)
+    return await recruitment_service.interview_response(session, interview)
 
 
 @router.get(
@@ -1051,9 +1212,10 @@ async def list_interviews(
 
     **Admin and HR only.**
     """
-    return await recruitment_service.list_interviews(
+    interviews = await recruitment_service.list_interviews(
         session, candidate_id, recruitment_request_id, status_filter
     )
+    return await recruitment_service.interview_responses(session, interviews)
 
 
 @router.get(
@@ -1074,7 +1236,30 @@ async def get_interview(
     interview = await recruitment_service.get_interview(session, interview_id)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
-    return interview
+    return await recruitment_service.interview_response(session, interview)
+
+
+@router.get(
+    "/requests/{request_id}/interview-slots",
+    response_model=List[InterviewTimeSlotResponse],
+    summary="List interview slots for a request"
+)
+async def list_interview_time_slots(
+    request_id: int,
+    available_only: bool = Query(True, description="Only slots no interview has booked"),
+    start: Optional[datetime] = Query(None, description="Slots starting at or after"),
+    end: Optional[datetime] = Query(None, description="Slots starting before"),
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    List the hiring manager's interview slots for a request, by start time.
+
+    **Admin and HR only.**
+    """
+    return await recruitment_service.list_interview_time_slots(
+        session, request_id, available_only, start, end
+    )
 
 
 @router.post(
@@ -1094,9 +1279,10 @@ async def provide_interview_slots(
     **Admin and HR only.**
     """
     try:
-        return await recruitment_service.provide_interview_slots(session, interview_id, slots)
+        interview = await recruitment_service.provide_interview_slots(session, interview_id, slots)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return await recruitment_service.interview_response(session, interview)
 
 
 @router.post(
@@ -1115,11 +1301,12 @@ async def confirm_interview_slot(
     This endpoint does not require admin/hr role as it's accessed via candidate pass.
     """
     try:
-        return await recruitment_service.confirm_interview_slot(
+        interview = await recruitment_service.confirm_interview_slot(
             session, interview_id, confirmation
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return await recruitment_service.interview_response(session, interview)
 
 
 class CandidateSlotSelection(InterviewSlotConfirm):
@@ -1172,11 +1359,12 @@ async def select_interview_slot(
         raise HTTPException(status_code=403, detail="Interview does not belong to this candidate")
     
     try:
-        return await recruitment_service.confirm_interview_slot(
+        interview = await recruitment_service.confirm_interview_slot(
             session, interview_id, selection, candidate_id=candidate.id
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return await recruitment_service.interview_response(session, interview)
 
 
 @router.post(
@@ -1196,9 +1384,10 @@ async def complete_interview(
     **Admin and HR only.**
     """
     try:
-        return await recruitment_service.complete_interview(session, interview_id, notes)
+        interview = await recruitment_service.complete_interview(session, interview_id, notes)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return await recruitment_service.interview_response(session, interview)
 
 
 # ============================================================================
@@ -1279,6 +1468,7 @@ async def get_evaluation(
 async def bulk_reject_candidates_alt(
     data: BulkCandidateReject,
     role: str = Depends(require_role(["admin", "hr"])),
+    employee_id: str = Depends(get_current_employee_id),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -1287,12 +1477,13 @@ async def bulk_reject_candidates_alt(
     Efficiently rejects multiple candidates with a single reason,
     reducing processing time for screening decisions.
     
-    Maximum 100 candidates per request.
+    Maximum 500 candidates per request.
 
     **Admin and HR only.**
     """
     result = await recruitment_service.bulk_reject_candidates(
-        session, data.candidate_ids, data.rejection_reason
+        session, data.candidate_ids, data.rejection_reason,
+        performed_by=role, performed_by_id=employee_id
     )
     return BulkOperationResult(**result)
 
@@ -1,7 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.template import TemplateCreate, TemplateUpdate, TemplateResponse
+from app.schemas.template import (
+    TemplateCreate, TemplateUpdate, TemplateResponse,
+    TemplateRenderRequest, TemplateRenderResponse,
+    TemplateBatchRenderRequest, TemplateBatchRenderResponse
+)
+from app.core.config import get_settings
 from app.services.template import TemplateService
+from app.services.template_renderer import TemplateRenderError, TemplateSyntaxError
 from app.repositories.template import TemplateRepository
 from app.auth.dependencies import require_role, authenticate_token
 from app.database import get_session
@@ -71,3 +77,40 @@ async def deactivate_template(
     if not deactivated:
         raise HTTPException(404, "Template not found")
     return deactivated
+
+@router.post("/{template_id}/render", response_model=TemplateRenderResponse)
+async def render_template(
+    template_id: int,
+    data: TemplateRenderRequest,
+    session: AsyncSession = Depends(get_session),
+    role: str = Depends(require_role(["admin", "hr"]))
+):
+    try:
+        rendered = await service.render(session, template_id, data.context, data.autoescape, data.strict)
+    except TemplateSyntaxError as e:
+        raise HTTPException(422, f"Template content is invalid: {e}")
+    except TemplateRenderError as e:
+        raise HTTPException(422, f"Missing value for template field {e}")
+    if not rendered:
+        raise HTTPException(404, "Template not found")
+    return rendered
+
+@router.post("/{template_id}/render-batch", response_model=TemplateBatchRenderResponse)
+async def render_template_batch(
+    template_id: int,
+    data: TemplateBatchRenderRequest,
+    session: AsyncSession = Depends(get_session),
+    role: str = Depends(require_role(["admin", "hr"]))
+):
+    max_contexts = get_settings().template_batch_max_contexts
+    if len(data.contexts) > max_contexts:
+        raise HTTPException(413, f"At most {max_contexts} contexts can be rendered per request")
+    try:
+        rendered = await service.render_batch(session, template_id, data.contexts, data.autoescape, data.strict)
+    except TemplateSyntaxError as e:
+        raise HTTPException(422, f"Template content is invalid: {e}")
+    except TemplateRenderError as e:
+        raise HTTPException(422, f"Missing value for template field {e}")
+    if not rendered:
+        raise HTTPException(404, "Template not found")
+    return rendered
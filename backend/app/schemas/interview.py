@@ -66,6 +66,7 @@ class InterviewSlotResponse(InterviewSlotBase):
     status: str
     booked_by_candidate_id: Optional[int] = None
     booked_at: Optional[datetime] = None
+    interviewer_id: Optional[str] = None
     candidate_confirmed: bool = False
     candidate_confirmed_at: Optional[datetime] = None
     created_at: datetime
@@ -87,6 +88,59 @@ class SlotConfirmRequest(BaseModel):
     slot_id: int
 
 
+class AvailabilityWindow(BaseModel):
+    """A period someone is available (local time, like slot dates and times)."""
+    start: datetime
+    end: datetime
+
+
+class CandidateAvailability(BaseModel):
+    """Availability of one candidate."""
+    candidate_id: int
+    availability: List[AvailabilityWindow] = Field(..., min_length=1)
+
+
+class InterviewerAvailability(BaseModel):
+    """Availability of one panel member."""
+    interviewer_id: str = Field(..., max_length=50)
+    availability: List[AvailabilityWindow] = Field(..., min_length=1)
+
+
+class ScheduleOptimizeRequest(BaseModel):
+    """Request to assign candidates to interview slots automatically."""
+    recruitment_request_id: int
+    round_number: int = Field(default=1, ge=1)
+    candidates: List[CandidateAvailability] = Field(..., min_length=1, max_length=2000, description="In priority order")
+    interviewers: List[InterviewerAvailability] = Field(
+        default_factory=list,
+        description="Panel members; when given, each interview needs a free interviewer for its slot"
+    )
+    slot_capacity: int = Field(default=1, ge=1, le=20, description="Parallel interviews per slot time")
+    dry_run: bool = Field(default=False, description="Compute the schedule without booking")
+
+
+class ScheduledInterview(BaseModel):
+    """One booking produced by the optimizer."""
+    candidate_id: int
+    slot_id: Optional[int] = None  # None in a dry run when the slot would be created
+    slot_date: date
+    start_time: time
+    end_time: time
+    interviewer_id: Optional[str] = None
+
+
+class ScheduleOptimizeResponse(BaseModel):
+    """Result of automatic interview scheduling."""
+    recruitment_request_id: int
+    round_number: int
+    dry_run: bool
+    scheduled: int
+    assignments: List[ScheduledInterview]
+    unscheduled_candidate_ids: List[int]
+    already_scheduled_candidate_ids: List[int]
+    elapsed_ms: float
+
+
 class PassMessageBase(BaseModel):
     """Base schema for pass message."""
     subject: Optional[str] = None
@@ -89,6 +89,52 @@ class LeaveCalendarEntry(BaseModel):
     is_holiday: bool = False
 
 
+class TeamCoverageDay(BaseModel):
+    """Absence counts for a single day."""
+    date: date
+    absent_count: int
+    approved_count: int
+    pending_count: int
+    present_count: int
+    below_minimum: bool = False
+
+
+class TeamCoverageResponse(BaseModel):
+    """Per-day team coverage for a manager's direct reports."""
+    manager_id: int
+    start_date: date
+    end_date: date
+    team_size: int
+    min_staffing: int
+    days: List[TeamCoverageDay] = []
+    understaffed_dates: List[date] = []
+
+
+class LeaveAccrualChange(BaseModel):
+    """Balance change computed by an accrual run for one employee."""
+    employee_id: int
+    employee_name: str
+    action: str
+    entitlement_before: Optional[Decimal] = None
+    entitlement_after: Decimal
+    carried_forward_before: Optional[Decimal] = None
+    carried_forward_after: Decimal
+    expired_days: Decimal = Decimal("0")
+
+
+class LeaveAccrualRunResponse(BaseModel):
+    """Summary of a leave accrual run."""
+    as_of: date
+    year: int
+    dry_run: bool
+    employees_processed: int
+    created: int
+    updated: int
+    unchanged: int
+    expired_days: Decimal
+    changes: List[LeaveAccrualChange] = []
+
+
 class PublicHolidayResponse(BaseModel):
     """Public holiday response."""
     id: int
@@ -1,6 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
 
 class NotificationBase(BaseModel):
     user_id: Optional[str] = None
@@ -17,3 +17,18 @@ class NotificationResponse(NotificationBase):
     is_read: bool
     created_at: datetime
     model_config = ConfigDict(from_attributes=True)
+
+class NotificationPage(BaseModel):
+    items: List[NotificationResponse]
+    next_before_id: Optional[int] = None  # Pass as before_id to fetch the next page
+    unread_count: int
+
+class NotificationMarkRead(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=500)
+
+class NotificationMarkAllRead(BaseModel):
+    up_to_id: Optional[int] = None  # Newest id the client has seen
+
+class NotificationReadResult(BaseModel):
+    updated: int
+    unread_count: int
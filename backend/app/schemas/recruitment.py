@@ -185,6 +185,7 @@ class CandidateResponse(CandidateBase):
     last_updated_by: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    cv_scoring_job_id: Optional[int] = None  # Set when a CV was queued for scoring
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -264,6 +265,18 @@ class InterviewResponse(InterviewBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class InterviewTimeSlotResponse(BaseModel):
+    """Response schema for a requisition interview slot and its booking."""
+    id: int
+    recruitment_request_id: int
+    start_at: datetime
+    end_at: datetime
+    booked_interview_id: Optional[int] = None
+    booked_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # Evaluation Schemas
 class EvaluationBase(BaseModel):
     """Base schema for evaluations."""
@@ -369,14 +382,14 @@ class EmploymentTypeInfo(BaseModel):
 # Bulk Operations Schemas
 class BulkCandidateStageUpdate(BaseModel):
     """Schema for bulk updating candidate stages."""
-    candidate_ids: List[int] = Field(..., min_length=1, max_length=100, description="List of candidate IDs")
+    candidate_ids: List[int] = Field(..., min_length=1, max_length=500, description="List of candidate IDs")
     new_stage: str = Field(..., description="New stage: applied, screening, interview, offer, hired, rejected")
     notes: Optional[str] = Field(None, description="Optional notes for the stage change")
 
 
 class BulkCandidateReject(BaseModel):
     """Schema for bulk rejecting candidates."""
-    candidate_ids: List[int] = Field(..., min_length=1, max_length=100, description="List of candidate IDs")
+    candidate_ids: List[int] = Field(..., min_length=1, max_length=500, description="List of candidate IDs")
     rejection_reason: str = Field(..., min_length=1, description="Reason for rejection")
 
 
@@ -388,7 +401,108 @@ class BulkOperationResult(BaseModel):
     message: str
 
 
+class CVUploadResponse(BaseModel):
+    """Schema for a CV upload queued for scoring."""
+    success: bool
+    candidate_id: int
+    filename: str
+    resume_path: str
+    job_id: int
+    status: str
+    message: str
+
+
+class CVScoringJobResponse(BaseModel):
+    """Schema for CV scoring job status."""
+    id: int
+    candidate_id: int
+    filename: str
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    next_attempt_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CVScoringBatchResponse(BaseModel):
+    """Schema for requisition-wide CV rescoring progress."""
+    id: int
+    recruitment_request_id: int
+    status: str
+    total: int
+    processed: int
+    scored: int
+    skipped: int = Field(..., description="Candidates whose CV yielded no usable text")
+    failed: int = Field(..., description="Candidates whose analysis failed")
+    cache_hits: int
+    filtered: int = Field(0, description="Candidates below the local skills pre-filter, not sent to the LLM")
+    method: str = Field("llm", description="llm, or local when no OpenAI key is configured")
+    percent_complete: float
+    candidates_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+
+
+class CandidateSearchHit(BaseModel):
+    """One full-text search match."""
+    candidate: CandidateResponse
+    score: float = Field(..., description="Relevance, higher is better (comparable within one search)")
+
+
+class CandidateSearchResponse(BaseModel):
+    """Schema for ranked, paginated candidate search results."""
+    query: str
+    results: List[CandidateSearchHit]
+    total: int
+    page: int
+    page_size: int
+    total_pages: int
+
+
+class CandidateRankingEntry(BaseModel):
+    """One candidate in a local ranking."""
+    candidate_id: int
+    full_name: str
+    rank: int
+    skills_match_score: Optional[int] = Field(None, description="Share of required skills found (0-100); null when none are listed")
+    relevance: float = Field(..., description="TF-IDF cosine similarity to the requisition (0-1)")
+    matched_skills: List[str] = []
+
+
+class CandidateRankingResponse(BaseModel):
+    """Schema for a local, LLM-free ranking of a requisition's candidates."""
+    recruitment_request_id: int
+    total: int
+    elapsed_ms: float
+    candidates: List[CandidateRankingEntry]
+
+
+class CVAnalysisCacheStats(BaseModel):
+    """Schema for CV analysis cache metrics."""
+    enabled: bool
+    hits: int = Field(..., description="Cache hits in this process since startup")
+    misses: int = Field(..., description="Cache misses (LLM calls) in this process since startup")
+    hit_rate: float
+    entries: int = Field(..., description="Stored analyses")
+    total_hits: int = Field(..., description="Hits recorded across all processes")
+
+
 # Enhanced Analytics Schemas
+class SourceEffectiveness(BaseModel):
+    """Candidates and hires from one source."""
+    total: int
+    hired: int
+    conversion_rate: float
+
+
 class RecruitmentMetrics(BaseModel):
     """Schema for detailed recruitment metrics."""
     # Overview
@@ -407,6 +521,7 @@ class RecruitmentMetrics(BaseModel):
     avg_time_to_fill: Optional[float] = None
     avg_time_in_screening: Optional[float] = None
     avg_time_to_offer: Optional[float] = None
+    avg_time_to_hire_days: Optional[float] = None
     
     # Conversion rates (percentages)
     application_to_screening_rate: Optional[float] = None
@@ -423,6 +538,9 @@ class RecruitmentMetrics(BaseModel):
     overdue_requests: int
     requests_by_priority: Dict[str, int]
 
+    # Source effectiveness (applied -> hired per source)
+    source_effectiveness: Dict[str, SourceEffectiveness] = {}
+
 
 # Assessment Schemas - LOCKED DESIGN DECISION
 # Assessments are NOT stages - they are action-triggered events inside Screening/Interview
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, ConfigDict, Field
 
 class TemplateBase(BaseModel):
@@ -22,3 +22,24 @@ class TemplateResponse(TemplateBase):
     created_at: datetime
     is_active: bool
     model_config = ConfigDict(from_attributes=True)
+
+class TemplateRenderRequest(BaseModel):
+    context: Dict[str, Any] = Field(default_factory=dict)
+    autoescape: bool = True
+    strict: bool = False
+
+class TemplateBatchRenderRequest(BaseModel):
+    contexts: List[Dict[str, Any]] = Field(..., min_length=1)
+    autoescape: bool = True
+    strict: bool = False
+
+class TemplateRenderResponse(BaseModel):
+    template_id: int
+    version: int
+    content: str
+
+class TemplateBatchRenderResponse(BaseModel):
+    template_id: int
+    version: int
+    count: int
+    rendered: List[str]
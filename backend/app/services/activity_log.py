@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.activity_log import ActivityLog
 from app.schemas.activity_log import ActivityLogCreate
+from app.services.log_writer import get_log_writer
 
 
 class ActivityLogService:
@@ -13,7 +14,10 @@ class ActivityLogService:
         session: AsyncSession,
         data: ActivityLogCreate
     ) -> ActivityLog:
-        log_entry = ActivityLog(
+        # Buffered and bulk-inserted by the log writer while it is running
+        return await get_log_writer().write(
+            session,
+            ActivityLog,
             candidate_id=data.candidate_id,
             stage=data.stage,
             action_type=data.action_type,
@@ -23,10 +27,6 @@ class ActivityLogService:
             timestamp=datetime.utcnow(),
             visibility=data.visibility
         )
-        session.add(log_entry)
-        await session.commit()
-        await session.refresh(log_entry)
-        return log_entry
 
     async def get_candidate_logs(
         self,
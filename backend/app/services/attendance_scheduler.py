@@ -4,6 +4,7 @@ This module provides:
 - 10:00 AM daily manager email
 - 9:30 AM missing clock-in reminder
 - 5:30 PM missing clock-out reminder
+- 00:30 AM nightly leave accrual (when LEAVE_ACCRUAL_ENABLED)
 
 Uses APScheduler for task scheduling.
 Install with: pip install apscheduler
@@ -22,9 +23,13 @@ except ImportError:
 
 from sqlalchemy import select
 
+from app.core.config import get_settings
+from app.core.time import get_uae_today
 from app.database import async_session_maker
 from app.models.employee import Employee
 from app.services.attendance_service import AttendanceService
+from app.services.email_outbox import wake_outbox_worker
+from app.services.leave_accrual import LeaveAccrualEngine
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +78,15 @@ class AttendanceScheduler:
             name="Clock-out Reminder"
         )
         
+        # 00:30 AM UAE (20:30 UTC) - Leave accrual and carry-forward
+        if get_settings().leave_accrual_enabled:
+            self.scheduler.add_job(
+                self._run_leave_accrual,
+                CronTrigger(hour=20, minute=30, timezone="UTC"),  # 00:30 AM UAE
+                id="leave_accrual",
+                name="Nightly Leave Accrual"
+            )
+        
         self.scheduler.start()
         self.is_running = True
         logger.info("Attendance scheduler started")
@@ -136,15 +150,32 @@ class AttendanceScheduler:
                         if success:
                             success_count += 1
                 
-                logger.info(f"Sent {success_count} manager summary emails")
+                await session.commit()
+                wake_outbox_worker()
+                logger.info(f"Queued {success_count} manager summary emails")
         except Exception as e:
             logger.error(f"Error sending manager summaries: {e}")
     
+    async def _run_leave_accrual(self):
+        """Accrue annual leave and apply carry-forward for all active employees."""
+        logger.info("Running leave accrual task")
+        try:
+            async with async_session_maker() as session:
+                engine = LeaveAccrualEngine(session)
+                result = await engine.run(get_uae_today(), dry_run=False)
+                logger.info(
+                    f"Leave accrual: {result.created} created, {result.updated} updated, "
+                    f"{result.unchanged} unchanged"
+                )
+        except Exception as e:
+            logger.error(f"Error running leave accrual: {e}")
+    
     async def trigger_now(self, task_name: str) -> dict:
         """Manually trigger a task immediately.
         
         Args:
-            task_name: One of "clockin_reminder", "clockout_reminder", "manager_summary"
+            task_name: One of "clockin_reminder", "clockout_reminder", "manager_summary",
+                "leave_accrual"
         
         Returns:
             Result dictionary with status
@@ -152,7 +183,8 @@ class AttendanceScheduler:
         tasks = {
             "clockin_reminder": self._send_clockin_reminders,
             "clockout_reminder": self._send_clockout_reminders,
-            "manager_summary": self._send_manager_summaries
+            "manager_summary": self._send_manager_summaries,
+            "leave_accrual": self._run_leave_accrual
         }
         
         if task_name not in tasks:
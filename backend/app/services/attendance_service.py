@@ -20,22 +20,118 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.employee import Employee
 from app.models.attendance import AttendanceRecord, WORK_LOCATIONS
 from app.models.leave import LeaveRequest, LeaveBalance
-from app.models.public_holiday import PublicHoliday
 from app.models.timesheet import Timesheet
 from app.models.geofence import Geofence, is_within_geofence
 from app.models.notification import Notification
-from app.services.email_service import get_email_service
+from app.repositories.notification import add_notification
+from app.services.email_outbox import enqueue_email
+from app.services.notification_digest import queue_digest_item
+from app.services.holiday_index import HolidayEntry, get_holiday_index
+from app.services.template_renderer import CompiledTemplate
 from app.core.time import get_uae_today
 
 logger = logging.getLogger(__name__)
 
 
+# ==================== MANAGER SUMMARY TEMPLATES ====================
+# Compiled once at import; the summary job renders them for every manager.
+
+SUMMARY_STATUS_COLORS = {
+    "Present": "#22c55e",
+    "On Leave": "#3b82f6",
+    "Not Checked In": "#ef4444"
+}
+
+SUMMARY_TABLE_HEAD = """
+        <table style="border-collapse: collapse; width: 100%; font-family: Arial, sans-serif;">
+            <thead>
+                <tr style="background-color: #1e293b; color: white;">
+                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Employee</th>
+                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Status</th>
+                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Work Location</th>
+                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Last Update</th>
+                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Remarks</th>
+                </tr>
+            </thead>
+            <tbody>
+        """
+
+SUMMARY_ROW_TEMPLATE = CompiledTemplate.from_source("""
+                <tr>
+                    <td style="padding: 10px; border: 1px solid #e2e8f0;">{{ name }}</td>
+                    <td style="padding: 10px; border: 1px solid #e2e8f0; color: {{ status_color }}; font-weight: bold;">{{ status }}</td>
+                    <td style="padding: 10px; border: 1px solid #e2e8f0;">{{ location }}</td>
+                    <td style="padding: 10px; border: 1px solid #e2e8f0;">{{ last_update }}</td>
+                    <td style="padding: 10px; border: 1px solid #e2e8f0;">{{ remarks }}</td>
+                </tr>
+            """)
+
+SUMMARY_EMAIL_TEMPLATE = CompiledTemplate.from_source("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                .container { max-width: 800px; margin: 0 auto; padding: 20px; }
+                .header { background-color: #1e293b; color: white; padding: 20px; text-align: center; border-radius: 8px 8px 0 0; }
+                .content { background-color: #f8fafc; padding: 20px; border: 1px solid #e2e8f0; }
+                .footer { background-color: #1e293b; color: #94a3b8; padding: 15px; text-align: center; border-radius: 0 0 8px 8px; font-size: 12px; }
+                .summary { display: flex; gap: 20px; margin-bottom: 20px; }
+                .stat { background: white; padding: 15px; border-radius: 8px; text-align: center; flex: 1; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }
+                .stat-value { font-size: 24px; font-weight: bold; }
+                .stat-label { color: #6b7280; font-size: 12px; }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>📋 Daily Attendance Summary</h1>
+                    <p>{{ date_label }}</p>
+                </div>
+                <div class="content">
+                    <p>Good morning {{ manager_name }},</p>
+                    <p>Here's your team's attendance status as of 10:00 AM:</p>
+                    
+                    <div class="summary">
+                        <div class="stat">
+                            <div class="stat-value" style="color: #22c55e;">{{ present_count }}</div>
+                            <div class="stat-label">Present</div>
+                        </div>
+                        <div class="stat">
+                            <div class="stat-value" style="color: #3b82f6;">{{ leave_count }}</div>
+                            <div class="stat-label">On Leave</div>
+                        </div>
+                        <div class="stat">
+                            <div class="stat-value" style="color: #ef4444;">{{ not_in_count }}</div>
+                            <div class="stat-label">Not Checked In</div>
+                        </div>
+                        <div class="stat">
+                            <div class="stat-value">{{ total_count }}</div>
+                            <div class="stat-label">Total Team</div>
+                        </div>
+                    </div>
+                    
+                    {{ table_html|safe }}
+                    
+                    <p style="margin-top: 20px; color: #6b7280; font-size: 12px;">
+                        This is an automated daily summary. For detailed attendance data, please log in to the HR Portal.
+                    </p>
+                </div>
+                <div class="footer">
+                    <p>This is an automated message from Baynunah HR Portal.<br>
+                    For questions, contact <a href="mailto:hr@baynunah.ae" style="color: #94a3b8;">hr@baynunah.ae</a></p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+
 class AttendanceService:
     """Enhanced attendance service with all integrations."""
     
     def __init__(self, session: AsyncSession):
         self.session = session
-        self.email_service = get_email_service()
     
     # ==================== LEAVE INTEGRATION ====================
     
@@ -105,30 +201,13 @@ class AttendanceService:
     
     # ==================== PUBLIC HOLIDAY INTEGRATION ====================
     
-    async def is_public_holiday(self, check_date: date) -> Optional[PublicHoliday]:
+    async def is_public_holiday(self, check_date: date) -> Optional[HolidayEntry]:
         """Check if a date is a public holiday."""
-        result = await self.session.execute(
-            select(PublicHoliday).where(
-                and_(
-                    PublicHoliday.is_active == True,
-                    PublicHoliday.start_date <= check_date,
-                    PublicHoliday.end_date >= check_date
-                )
-            )
-        )
-        return result.scalar_one_or_none()
+        return await get_holiday_index().holiday_on(self.session, check_date)
     
-    async def get_holidays_for_year(self, year: int) -> List[PublicHoliday]:
+    async def get_holidays_for_year(self, year: int) -> List[HolidayEntry]:
         """Get all public holidays for a year."""
-        result = await self.session.execute(
-            select(PublicHoliday).where(
-                and_(
-                    PublicHoliday.year == year,
-                    PublicHoliday.is_active == True
-                )
-            ).order_by(PublicHoliday.start_date)
-        )
-        return result.scalars().all()
+        return await get_holiday_index().holidays_for_year(self.session, year)
     
     # ==================== GEOFENCE VALIDATION ====================
     
@@ -473,14 +552,14 @@ class AttendanceService:
         link: Optional[str] = None
     ) -> Notification:
         """Create an attendance-related notification."""
-        notification = Notification(
+        notification = await add_notification(
+            self.session,
             user_id=user_id,
             title=title,
             message=message,
             type=notification_type,
             link=link
         )
-        self.session.add(notification)
         await self.session.commit()
         return notification
     
@@ -519,12 +598,13 @@ class AttendanceService:
                 if holiday:
                     continue
                 
-                # Send notification
-                await self.create_attendance_notification(
+                # Queue notification (coalesced into the employee's digest)
+                await queue_digest_item(
+                    self.session,
                     user_id=str(emp.id),
                     title="Clock-in Reminder",
                     message="You haven't clocked in yet today. Please clock in to record your attendance.",
-                    notification_type="reminder",
+                    category="reminder",
                     link="/attendance"
                 )
                 count += 1
@@ -554,11 +634,12 @@ class AttendanceService:
         
         count = 0
         for record in records:
-            await self.create_attendance_notification(
+            await queue_digest_item(
+                self.session,
                 user_id=str(record.employee_id),
                 title="Clock-out Reminder",
                 message="Don't forget to clock out before leaving. Your attendance record is incomplete.",
-                notification_type="reminder",
+                category="reminder",
                 link="/attendance"
             )
             count += 1
@@ -569,9 +650,10 @@ class AttendanceService:
     # ==================== MANAGER EMAIL ====================
     
     async def send_manager_daily_summary_email(self, manager_id: int) -> bool:
-        """Send daily attendance summary email to manager.
+        """Queue daily attendance summary email to manager.
         
-        Should be called at 10:00 AM.
+        Should be called at 10:00 AM. The message is added to the email
+        outbox; the caller commits the session to release it for delivery.
         """
         # Get manager
         manager_result = await self.session.execute(
@@ -640,109 +722,38 @@ class AttendanceService:
                 "remarks": remarks
             })
         
-        # Generate HTML table
-        table_html = """
-        <table style="border-collapse: collapse; width: 100%; font-family: Arial, sans-serif;">
-            <thead>
-                <tr style="background-color: #1e293b; color: white;">
-                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Employee</th>
-                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Status</th>
-                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Work Location</th>
-                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Last Update</th>
-                    <th style="padding: 12px; text-align: left; border: 1px solid #e2e8f0;">Remarks</th>
-                </tr>
-            </thead>
-            <tbody>
-        """
-        
-        for row in rows:
-            status_color = {
-                "Present": "#22c55e",
-                "On Leave": "#3b82f6",
-                "Not Checked In": "#ef4444"
-            }.get(row["status"], "#6b7280")
-            
-            table_html += f"""
-                <tr>
-                    <td style="padding: 10px; border: 1px solid #e2e8f0;">{row['name']}</td>
-                    <td style="padding: 10px; border: 1px solid #e2e8f0; color: {status_color}; font-weight: bold;">{row['status']}</td>
-                    <td style="padding: 10px; border: 1px solid #e2e8f0;">{row['location']}</td>
-                    <td style="padding: 10px; border: 1px solid #e2e8f0;">{row['last_update']}</td>
-                    <td style="padding: 10px; border: 1px solid #e2e8f0;">{row['remarks']}</td>
-                </tr>
-            """
-        
-        table_html += "</tbody></table>"
-        
         # Counts
         present_count = sum(1 for r in rows if r["status"] == "Present")
         leave_count = sum(1 for r in rows if r["status"] == "On Leave")
         not_in_count = sum(1 for r in rows if r["status"] == "Not Checked In")
         
-        html_body = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 800px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #1e293b; color: white; padding: 20px; text-align: center; border-radius: 8px 8px 0 0; }}
-                .content {{ background-color: #f8fafc; padding: 20px; border: 1px solid #e2e8f0; }}
-                .footer {{ background-color: #1e293b; color: #94a3b8; padding: 15px; text-align: center; border-radius: 0 0 8px 8px; font-size: 12px; }}
-                .summary {{ display: flex; gap: 20px; margin-bottom: 20px; }}
-                .stat {{ background: white; padding: 15px; border-radius: 8px; text-align: center; flex: 1; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
-                .stat-value {{ font-size: 24px; font-weight: bold; }}
-                .stat-label {{ color: #6b7280; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>📋 Daily Attendance Summary</h1>
-                    <p>{today.strftime('%A, %B %d, %Y')}</p>
-                </div>
-                <div class="content">
-                    <p>Good morning {manager.name},</p>
-                    <p>Here's your team's attendance status as of 10:00 AM:</p>
-                    
-                    <div class="summary">
-                        <div class="stat">
-                            <div class="stat-value" style="color: #22c55e;">{present_count}</div>
-                            <div class="stat-label">Present</div>
-                        </div>
-                        <div class="stat">
-                            <div class="stat-value" style="color: #3b82f6;">{leave_count}</div>
-                            <div class="stat-label">On Leave</div>
-                        </div>
-                        <div class="stat">
-                            <div class="stat-value" style="color: #ef4444;">{not_in_count}</div>
-                            <div class="stat-label">Not Checked In</div>
-                        </div>
-                        <div class="stat">
-                            <div class="stat-value">{len(rows)}</div>
-                            <div class="stat-label">Total Team</div>
-                        </div>
-                    </div>
-                    
-                    {table_html}
-                    
-                    <p style="margin-top: 20px; color: #6b7280; font-size: 12px;">
-                        This is an automated daily summary. For detailed attendance data, please log in to the HR Portal.
-                    </p>
-                </div>
-                <div class="footer">
-                    <p>This is an automated message from Baynunah HR Portal.<br>
-                    For questions, contact <a href="mailto:hr@baynunah.ae" style="color: #94a3b8;">hr@baynunah.ae</a></p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        for row in rows:
+            row["status_color"] = SUMMARY_STATUS_COLORS.get(row["status"], "#6b7280")
+        table_html = (
+            SUMMARY_TABLE_HEAD
+            + "".join(SUMMARY_ROW_TEMPLATE.render_many(rows))
+            + "</tbody></table>"
+        )
+        
+        html_body = SUMMARY_EMAIL_TEMPLATE.render({
+            "date_label": today.strftime('%A, %B %d, %Y'),
+            "manager_name": manager.name,
+            "present_count": present_count,
+            "leave_count": leave_count,
+            "not_in_count": not_in_count,
+            "total_count": len(rows),
+            "table_html": table_html,
+        })
         
         subject = f"📋 Team Attendance Summary - {today.strftime('%B %d, %Y')}"
         
-        return await self.email_service.send_email(
+        enqueue_email(
+            self.session,
             to_email=manager.email,
             subject=subject,
-            html_body=html_body
+            html_body=html_body,
+            category="attendance_summary",
+            source_type="employee",
+            source_id=manager.id
         )
+        return True
@@ -0,0 +1,194 @@
+"""Full-text search over candidates.
+
+Indexed text per candidate, by weight: name, skills (``core_skills`` and
+``technical_skills``), ``recruiter_notes`` and the extracted resume text
+(``resume_text``). The index is maintained by database triggers, so every
+write path (ORM, bulk UPDATE, raw SQL) keeps it in sync:
+
+- PostgreSQL: a ``candidates.search_vector`` tsvector column (GIN index)
+  set by a BEFORE INSERT/UPDATE trigger, ranked with ``ts_rank_cd``;
+- SQLite (local mode): an FTS5 table ``candidates_fts`` keyed by candidate
+  id, maintained by AFTER INSERT/UPDATE/DELETE triggers, ranked with
+  ``bm25``.
+
+:func:`ensure_candidate_search_index` creates either idempotently and
+backfills existing candidates; it runs with the startup migrations (the
+Alembic revision does the same for PostgreSQL deployments). On PostgreSQL it
+does nothing once the column and trigger exist, so a restart takes no locks
+on ``candidates``; changes to the trigger function ship as Alembic revisions.
+
+Queries are reduced to word tokens that must all match, each as a prefix,
+so user input cannot inject search syntax.
+"""
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, column, func, literal_column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.recruitment import Candidate
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+MAX_QUERY_TERMS = 10
+
+POSTGRES_DDL = [
+    "ALTER TABLE candidates ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_candidates_search_vector ON candidates USING GIN (search_vector)",
+    """
+    CREATE OR REPLACE FUNCTION candidates_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.full_name, '')), 'A') ||
+            setweight(to_tsvector('english',
+                coalesce(NEW.core_skills::text, '') || ' ' || coalesce(NEW.technical_skills::text, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.recruiter_notes, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.resume_text, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS candidates_search_vector_trigger ON candidates",
+    """
+    CREATE TRIGGER candidates_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF full_name, core_skills, technical_skills, recruiter_notes, resume_text
+    ON candidates FOR EACH ROW EXECUTE FUNCTION candidates_search_vector_update()
+    """,
+    # Backfill through the trigger
+    "UPDATE candidates SET full_name = full_name WHERE search_vector IS NULL",
+]
+
+# The PostgreSQL DDL is skipped when this is true
+POSTGRES_INDEX_EXISTS = """
+    SELECT EXISTS (
+        SELECT 1 FROM pg_trigger
+        WHERE tgrelid = to_regclass('candidates') AND tgname = 'candidates_search_vector_trigger'
+    ) AND EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'candidates' AND column_name = 'search_vector'
+    )
+"""
+
+_SQLITE_FTS_VALUES = """
+    new.id, new.full_name,
+    coalesce(new.core_skills, '') || ' ' || coalesce(new.technical_skills, ''),
+    new.recruiter_notes, new.resume_text
+"""
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+        full_name, skills, recruiter_notes, resume_text, tokenize = 'porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_insert AFTER INSERT ON candidates BEGIN
+        INSERT INTO candidates_fts (rowid, full_name, skills, recruiter_notes, resume_text)
+        VALUES ({_SQLITE_FTS_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_update
+    AFTER UPDATE OF full_name, core_skills, technical_skills, recruiter_notes, resume_text ON candidates BEGIN
+        DELETE FROM candidates_fts WHERE rowid = old.id;
+        INSERT INTO candidates_fts (rowid, full_name, skills, recruiter_notes, resume_text)
+        VALUES ({_SQLITE_FTS_VALUES});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_delete AFTER DELETE ON candidates BEGIN
+        DELETE FROM candidates_fts WHERE rowid = old.id;
+    END
+    """,
+    # Backfill candidates created before the index existed
+    """
+    INSERT INTO candidates_fts (rowid, full_name, skills, recruiter_notes, resume_text)
+    SELECT id, full_name,
+           coalesce(core_skills, '') || ' ' || coalesce(technical_skills, ''),
+           recruiter_notes, resume_text
+    FROM candidates WHERE id NOT IN (SELECT rowid FROM candidates_fts)
+    """,
+]
+
+# bm25 weights for the FTS5 columns: name, skills, notes, resume text
+_SQLITE_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+_candidates_fts = table("candidates_fts", column("rowid"))
+
+
+async def ensure_candidate_search_index(session: AsyncSession) -> None:
+    """Create the search index and its triggers if missing (caller commits)."""
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        if (await session.execute(text(POSTGRES_INDEX_EXISTS))).scalar():
+            return
+        logger.info("Creating candidate search index")
+    statements = POSTGRES_DDL if dialect == "postgresql" else SQLITE_DDL if dialect == "sqlite" else []
+    for statement in statements:
+        await session.execute(text(statement))
+
+
+def query_terms(query: str) -> List[str]:
+    """Word tokens of a search query (lowercased, de-duplicated, capped)."""
+    terms: List[str] = []
+    for term in _WORD.findall((query or "").lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+async def search_candidates(
+    session: AsyncSession,
+    query: str,
+    recruitment_request_id: Optional[int] = None,
+    stage: Optional[str] = None,
+    status: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 20
+) -> Tuple[List[Tuple[Candidate, float]], int]:
+    """Ranked candidates matching every query term, and the total match count.
+
+    Scores are higher-is-better, comparable within one result set only.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return [], 0
+
+    if session.bind.dialect.name == "postgresql":
+        tsquery = func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+        vector = literal_column("candidates.search_vector")
+        score = func.ts_rank_cd(vector, tsquery)
+        match = vector.op("@@")(tsquery)
+        base = select(Candidate).where(match)
+    else:
+        fts_query = " ".join(f'"{term}"*' for term in terms)
+        # bm25 is lower-is-better; negate for a higher-is-better score
+        score = -func.bm25(literal_column("candidates_fts"), *_SQLITE_WEIGHTS)
+        match = literal_column("candidates_fts").op("MATCH")(fts_query)
+        base = select(Candidate).join(_candidates_fts, _candidates_fts.c.rowid == Candidate.id).where(match)
+
+    filters = []
+    if recruitment_request_id:
+        filters.append(Candidate.recruitment_request_id == recruitment_request_id)
+    if stage:
+        filters.append(Candidate.stage == stage)
+    if status:
+        filters.append(Candidate.status == status)
+    if filters:
+        base = base.where(and_(*filters))
+
+    total = (await session.execute(
+        select(func.count()).select_from(base.with_only_columns(Candidate.id).subquery())
+    )).scalar_one()
+    if not total:
+        return [], 0
+
+    result = await session.execute(
+        base.add_columns(score.label("score"))
+        .order_by(score.desc(), Candidate.id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    return [(candidate, round(float(score_value), 4)) for candidate, score_value in result.all()], total
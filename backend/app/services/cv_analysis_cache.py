@@ -0,0 +1,166 @@
+"""Content-hash cache for CV analysis results.
+
+``analyze_cv`` output depends only on its inputs, so the parsed result is
+stored in ``cv_analysis_cache`` under a SHA-256 of the normalized CV text,
+job title, description, required skills, model and prompt version.
+Re-uploading the same CV or rescoring after an unrelated requisition edit
+then costs one primary-key lookup instead of an LLM call.
+
+Process-wide hit/miss counters are exposed through :meth:`CVAnalysisCache.stats`
+alongside the persistent per-entry hit counts.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.cv_analysis_cache import CVAnalysisCacheEntry
+from app.services.cv_scoring_service import (
+    PROMPT_VERSION, normalize_scoring_inputs, request_cv_analysis
+)
+
+logger = logging.getLogger(__name__)
+
+
+def analysis_input_hash(
+    model: str,
+    cv_text: str,
+    job_title: str,
+    job_description: str,
+    required_skills: Optional[List[str]] = None
+) -> str:
+    """Cache key for one set of analysis inputs."""
+    payload = json.dumps(
+        [PROMPT_VERSION, model, *normalize_scoring_inputs(cv_text, job_title, job_description, required_skills)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CVAnalysisCache:
+    """Database-backed cache in front of :func:`request_cv_analysis`."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, session: AsyncSession, input_hash: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result and count the hit (in the caller's transaction)."""
+        result = await session.execute(
+            select(CVAnalysisCacheEntry.result).where(CVAnalysisCacheEntry.input_hash == input_hash)
+        )
+        cached = result.scalar_one_or_none()
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        await session.execute(
+            update(CVAnalysisCacheEntry)
+            .where(CVAnalysisCacheEntry.input_hash == input_hash)
+            .values(
+                hit_count=CVAnalysisCacheEntry.hit_count + 1,
+                last_hit_at=datetime.now(timezone.utc)
+            )
+        )
+        return cached
+
+    async def put(self, session: AsyncSession, input_hash: str, model: str, result: Dict[str, Any]) -> None:
+        """Store a result; a concurrent insert of the same key wins silently."""
+        dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(CVAnalysisCacheEntry).values(
+            input_hash=input_hash, model=model, result=result, hit_count=0
+        )
+        await session.execute(stmt.on_conflict_do_nothing(index_elements=[CVAnalysisCacheEntry.input_hash]))
+
+    async def get_many(self, session: AsyncSession, input_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up several keys in one query; found entries count as hits."""
+        if not input_hashes:
+            return {}
+        result = await session.execute(
+            select(CVAnalysisCacheEntry.input_hash, CVAnalysisCacheEntry.result)
+            .where(CVAnalysisCacheEntry.input_hash.in_(input_hashes))
+        )
+        found = {input_hash: cached for input_hash, cached in result.all()}
+        self.hits += len(found)
+        self.misses += len(set(input_hashes)) - len(found)
+        if found:
+            await session.execute(
+                update(CVAnalysisCacheEntry)
+                .where(CVAnalysisCacheEntry.input_hash.in_(list(found)))
+                .values(
+                    hit_count=CVAnalysisCacheEntry.hit_count + 1,
+                    last_hit_at=datetime.now(timezone.utc)
+                )
+            )
+        return found
+
+    async def put_many(self, session: AsyncSession, model: str, results: Dict[str, Dict[str, Any]]) -> None:
+        """Store several results in one INSERT."""
+        if not results:
+            return
+        dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(CVAnalysisCacheEntry).values([
+            {"input_hash": input_hash, "model": model, "result": result, "hit_count": 0}
+            for input_hash, result in results.items()
+        ])
+        await session.execute(stmt.on_conflict_do_nothing(index_elements=[CVAnalysisCacheEntry.input_hash]))
+
+    async def analyze(
+        self,
+        session: AsyncSession,
+        cv_text: str,
+        job_title: str,
+        job_description: str,
+        required_skills: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Cached :func:`request_cv_analysis`; the caller commits.
+
+        Raises:
+            CVScoringError: on a miss, when the analysis fails
+        """
+        settings = get_settings()
+        if not settings.cv_analysis_cache_enabled:
+            return await request_cv_analysis(cv_text, job_title, job_description, required_skills)
+
+        model = settings.cv_scoring_model
+        input_hash = analysis_input_hash(model, cv_text, job_title, job_description, required_skills)
+        cached = await self.get(session, input_hash)
+        if cached is not None:
+            return cached
+
+        result = await request_cv_analysis(cv_text, job_title, job_description, required_skills)
+        await self.put(session, input_hash, model, result)
+        return result
+
+    async def stats(self, session: AsyncSession) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus persistent totals."""
+        entries, stored_hits = (await session.execute(
+            select(func.count(), func.coalesce(func.sum(CVAnalysisCacheEntry.hit_count), 0))
+        )).one()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": get_settings().cv_analysis_cache_enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "total_hits": int(stored_hits),
+        }
+
+
+# Singleton instance
+_cv_analysis_cache: Optional[CVAnalysisCache] = None
+
+
+def get_cv_analysis_cache() -> CVAnalysisCache:
+    """Get or create the CV analysis cache singleton."""
+    global _cv_analysis_cache
+    if _cv_analysis_cache is None:
+        _cv_analysis_cache = CVAnalysisCache()
+    return _cv_analysis_cache
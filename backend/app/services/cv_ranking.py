@@ -0,0 +1,272 @@
+"""Local, LLM-free ranking of candidates against a requisition.
+
+Each candidate becomes a document: extracted CV text plus the structured
+skill fields (``core_skills``, ``programming_languages``, ...). Documents
+are tokenized with a skill-aware tokenizer (keeps ``c++``, ``c#``,
+``.net``, ``node.js``) and multi-word required skills are matched as
+phrases. The corpus is held as a CSR term matrix in numpy arrays, so
+scoring the whole requisition is a sparse matrix-vector product:
+
+- ``skills_match_score``: presence matrix x required-skill indicator,
+  i.e. the share of required skills found in the document (0-100);
+- ``relevance``: L2-normalized sublinear TF-IDF rows x the query vector
+  (required skills weighted above job description terms), a cosine in
+  0-1 used to break ties and to rank when no skills are listed.
+
+Used when no OpenAI key is configured, and as a cheap pre-filter that
+keeps low-coverage CVs away from the LLM during batch rescoring.
+"""
+import asyncio
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.document_extraction import DocumentExtractionError, candidate_cv_text
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:[.\-/][a-z0-9+#]+)*")
+
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to
+was we will with you your who what which within across per via etc able ability strong
+experience experienced years year work working role position team candidate candidates
+""".split())
+
+SKILL_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Structured candidate fields folded into the ranking document
+SKILL_FIELDS = ("core_skills", "programming_languages", "hardware_platforms", "protocols_tools")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping symbols used in skill names."""
+    return _TOKEN.findall((text or "").lower())
+
+
+def skill_term(skill: str) -> str:
+    """Canonical term for a required skill ("Machine  Learning" -> "machine learning")."""
+    return " ".join(tokenize(skill))
+
+
+@dataclass
+class RankingQuery:
+    """Requisition terms and their weights before IDF."""
+    skills: List[str]
+    weights: Dict[str, float]
+    phrases: Tuple[str, ...]  # Multi-word skills, matched on token boundaries
+
+    @classmethod
+    def build(cls, required_skills: Optional[Sequence[str]], job_description: Optional[str]) -> "RankingQuery":
+        skills: List[str] = []
+        for skill in required_skills or []:
+            term = skill_term(str(skill))
+            if term and term not in skills:
+                skills.append(term)
+        weights: Dict[str, float] = {}
+        for token in tokenize(job_description or ""):
+            if token not in _STOPWORDS and len(token) > 1:
+                weights[token] = DESCRIPTION_WEIGHT
+        for term in skills:
+            weights[term] = SKILL_WEIGHT
+        return cls(skills=skills, weights=weights, phrases=tuple(term for term in skills if " " in term))
+
+    def document_terms(self, text: str) -> Counter:
+        """Term counts for a document: unigrams plus any skill phrases."""
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        if self.phrases:
+            padded = f" {' '.join(tokens)} "
+            for phrase in self.phrases:
+                found = padded.count(f" {phrase} ")
+                if found:
+                    counts[phrase] = found
+        return counts
+
+
+@dataclass
+class TermMatrix:
+    """Documents x terms in CSR form."""
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    vocabulary: Dict[str, int]
+    _rows: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rows = np.repeat(np.arange(self.n_documents), np.diff(self.indptr))
+
+    @property
+    def n_documents(self) -> int:
+        return len(self.indptr) - 1
+
+    @classmethod
+    def from_counts(cls, documents: Iterable[Counter]) -> "TermMatrix":
+        vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for counts in documents:
+            for term in counts.keys() - vocabulary.keys():
+                vocabulary[term] = len(vocabulary)
+            indices.extend(map(vocabulary.__getitem__, counts))
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        return cls(
+            indptr=np.asarray(indptr, dtype=np.int64),
+            indices=np.asarray(indices, dtype=np.int64),
+            data=np.asarray(data, dtype=np.float64),
+            vocabulary=vocabulary,
+        )
+
+    def dot(self, vector: np.ndarray, data: Optional[np.ndarray] = None) -> np.ndarray:
+        """Sparse matrix-vector product (optionally with replacement values)."""
+        values = self.data if data is None else data
+        return np.bincount(self._rows, weights=values * vector[self.indices], minlength=self.n_documents)
+
+    def tfidf(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Sublinear TF-IDF values with rows L2-normalized (aligned with ``data``), and the IDF."""
+        df = np.bincount(self.indices, minlength=len(self.vocabulary))
+        idf = np.log((1 + self.n_documents) / (1 + df)) + 1.0
+        values = (1.0 + np.log(self.data)) * idf[self.indices]
+        norms = np.sqrt(np.bincount(self._rows, weights=values ** 2, minlength=self.n_documents))
+        norms[norms == 0] = 1.0
+        return values / norms[self._rows], idf
+
+
+@dataclass
+class RankedDocument:
+    index: int
+    rank: int
+    skills_match_score: Optional[int]
+    relevance: float
+    matched_skills: List[str]
+
+
+def rank_documents(
+    documents: Sequence[str],
+    required_skills: Optional[Sequence[str]],
+    job_description: Optional[str]
+) -> List[RankedDocument]:
+    """Rank documents against a requisition, best first."""
+    if not documents:
+        return []
+    query = RankingQuery.build(required_skills, job_description)
+    matrix = TermMatrix.from_counts(query.document_terms(text) for text in documents)
+    vocabulary = matrix.vocabulary
+    n_terms = len(vocabulary)
+
+    tfidf, idf = matrix.tfidf()
+    query_vector = np.zeros(n_terms)
+    for term, weight in query.weights.items():
+        column = vocabulary.get(term)
+        if column is not None:
+            query_vector[column] = weight * idf[column]
+    query_norm = np.linalg.norm(query_vector)
+    relevance = matrix.dot(query_vector / query_norm, tfidf) if query_norm else np.zeros(matrix.n_documents)
+
+    skill_columns = [vocabulary[term] for term in query.skills if term in vocabulary]
+    coverage: Optional[np.ndarray] = None
+    if query.skills:
+        indicator = np.zeros(n_terms)
+        indicator[skill_columns] = 1.0
+        coverage = 100.0 * matrix.dot(indicator, np.ones_like(matrix.data)) / len(query.skills)
+
+    order = np.lexsort((-relevance, -(coverage if coverage is not None else relevance)))
+    skill_set = set(skill_columns)
+    terms = list(vocabulary)
+    ranked = []
+    for rank, index in enumerate(order, start=1):
+        row = matrix.indices[matrix.indptr[index]:matrix.indptr[index + 1]]
+        ranked.append(RankedDocument(
+            index=int(index),
+            rank=rank,
+            skills_match_score=int(round(coverage[index])) if coverage is not None else None,
+            relevance=round(float(relevance[index]), 4),
+            matched_skills=[terms[column] for column in row if column in skill_set],
+        ))
+    return ranked
+
+
+def skill_coverage(text: str, required_skills: Optional[Sequence[str]]) -> Tuple[Optional[int], List[str]]:
+    """Share of required skills found in one document (0-100) and which matched."""
+    query = RankingQuery.build(required_skills, None)
+    if not query.skills:
+        return None, []
+    terms = query.document_terms(text)
+    matched = [term for term in query.skills if term in terms]
+    return int(round(100.0 * len(matched) / len(query.skills))), matched
+
+
+def local_analysis(candidate: Candidate, cv_text: Optional[str], request: RecruitmentRequest) -> Dict[str, Any]:
+    """Scoring result for one candidate without the LLM (``method`` is ``local``)."""
+    score, matched = skill_coverage(candidate_document(candidate, cv_text), request.required_skills)
+    return {"method": "local", "skills_match_score": score, "matched_skills": matched}
+
+
+def candidate_document(candidate: Candidate, cv_text: Optional[str]) -> str:
+    """Ranking text for a candidate: structured skills plus CV text."""
+    parts: List[str] = []
+    for field_name in SKILL_FIELDS:
+        values = getattr(candidate, field_name, None) or []
+        parts.append(", ".join(str(value) for value in values))
+    if candidate.technical_skills:
+        parts.append(", ".join(str(key) for key in candidate.technical_skills))
+    if candidate.current_position:
+        parts.append(candidate.current_position)
+    if cv_text:
+        parts.append(cv_text)
+    return "\n".join(part for part in parts if part)
+
+
+async def _resume_text(candidate: Candidate) -> Optional[str]:
+    try:
+        return await candidate_cv_text(candidate)
+    except DocumentExtractionError as e:
+        logger.warning(str(e))
+        return None
+
+
+async def rank_request_candidates(
+    session: AsyncSession,
+    request: RecruitmentRequest,
+    persist: bool = True
+) -> List[Tuple[Candidate, RankedDocument]]:
+    """Rank every candidate of a requisition locally.
+
+    With ``persist`` the ranks are written to ``screening_rank`` and, when
+    the requisition lists required skills, ``skills_match_score`` (one bulk
+    UPDATE; the caller commits). Resume text extracted on the way is stored
+    on the candidates either way.
+    """
+    candidates = list((await session.execute(
+        select(Candidate)
+        .where(Candidate.recruitment_request_id == request.id)
+        .order_by(Candidate.id)
+    )).scalars().all())
+    if not candidates:
+        return []
+
+    # Stored text; only resumes not extracted yet go to the extraction pool
+    texts = await asyncio.gather(*(_resume_text(candidate) for candidate in candidates))
+    documents = [candidate_document(candidate, text) for candidate, text in zip(candidates, texts)]
+    ranked = rank_documents(documents, request.required_skills, request.job_description)
+
+    if persist:
+        rows = []
+        for result in ranked:
+            row = {"id": candidates[result.index].id, "screening_rank": result.rank}
+            if result.skills_match_score is not None:
+                row["skills_match_score"] = result.skills_match_score
+            rows.append(row)
+        # ORM bulk UPDATE by primary key: one executemany for the requisition
+        await session.execute(update(Candidate), rows)
+    return [(candidates[result.index], result) for result in ranked]
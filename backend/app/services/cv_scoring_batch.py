@@ -0,0 +1,343 @@
+"""Batch rescoring of every candidate of a requisition.
+
+``POST /recruitment/requests/{id}/rescore-cvs`` queues a
+:class:`CVScoringBatch`; the CV scoring worker runs one batch at a time
+alongside single-upload jobs. The batch walks the requisition's candidates
+with a stored resume in chunks of ``cv_scoring_batch_chunk_size``
+(keyset on candidate id, so no cursor is held across commits) and for each
+chunk:
+
+1. takes each CV's stored text, extracting the missing ones in parallel in
+   the extraction process pool and storing them;
+2. resolves all cached analyses with one lookup and sends only the misses
+   to the LLM, at most ``cv_scoring_batch_concurrency`` at a time (identical
+   CVs within a chunk share one call);
+3. writes scores with one bulk UPDATE and one cache INSERT, then commits
+   progress and publishes a ``cv_scoring_batch`` event with the ETA.
+
+With ``cv_scoring_prefilter_min_skills_match`` set, each chunk is first
+ranked locally (``app.services.cv_ranking``) and CVs below that skill
+coverage only get the local ``skills_match_score``. Without an OpenAI key
+the whole requisition is ranked locally in one step (``method='local'``).
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.cv_scoring_job import CVScoringBatch
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.cv_analysis_cache import analysis_input_hash, get_cv_analysis_cache
+from app.services.cv_ranking import rank_documents, rank_request_candidates
+from app.services.cv_scoring_service import (
+    MIN_CV_TEXT_LENGTH, CVScoringError, llm_scoring_available, request_cv_analysis
+)
+from app.services.document_extraction import DocumentExtractionError, get_document_extractor
+from app.services.event_bus import publish_on_commit
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_BATCH_STATUSES = ("queued", "running")
+
+
+class BatchAlreadyActive(Exception):
+    """Raised when a requisition already has a queued or running batch."""
+
+    def __init__(self, batch: CVScoringBatch):
+        super().__init__(f"Batch {batch.id} is already {batch.status}")
+        self.batch = batch
+
+
+def _resume_candidates(recruitment_request_id: int):
+    return select(Candidate).where(
+        Candidate.recruitment_request_id == recruitment_request_id,
+        Candidate.resume_path.isnot(None)
+    )
+
+
+async def create_rescore_batch(
+    session: AsyncSession,
+    recruitment_request_id: int,
+    requested_by: Optional[str] = None
+) -> CVScoringBatch:
+    """Queue a rescoring batch for a requisition and commit it.
+
+    Raises:
+        BatchAlreadyActive: a batch for the requisition is queued or running
+    """
+    active = (await session.execute(
+        select(CVScoringBatch).where(
+            CVScoringBatch.recruitment_request_id == recruitment_request_id,
+            CVScoringBatch.status.in_(ACTIVE_BATCH_STATUSES)
+        ).limit(1)
+    )).scalar_one_or_none()
+    if active is not None:
+        raise BatchAlreadyActive(active)
+
+    total = (await session.execute(
+        select(func.count()).select_from(_resume_candidates(recruitment_request_id).subquery())
+    )).scalar_one()
+    batch = CVScoringBatch(
+        recruitment_request_id=recruitment_request_id,
+        requested_by=requested_by,
+        status="queued",
+        total=total,
+    )
+    session.add(batch)
+    await session.commit()
+    await session.refresh(batch)
+    return batch
+
+
+def batch_progress(batch: CVScoringBatch, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Progress fields for a batch, including an ETA from the observed rate."""
+    now = now or datetime.now(timezone.utc)
+    percent = round(100.0 * batch.processed / batch.total, 1) if batch.total else 100.0
+    eta_seconds = None
+    rate = None
+    started_at = batch.started_at
+    if started_at is not None and started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    if batch.status == "running" and started_at and batch.processed:
+        elapsed = max((now - started_at).total_seconds(), 1e-6)
+        rate = batch.processed / elapsed
+        eta_seconds = round(max(batch.total - batch.processed, 0) / rate, 1)
+        rate = round(rate, 3)
+    elif batch.status == "completed":
+        eta_seconds = 0.0
+    return {
+        "id": batch.id,
+        "recruitment_request_id": batch.recruitment_request_id,
+        "status": batch.status,
+        "total": batch.total,
+        "processed": batch.processed,
+        "scored": batch.scored,
+        "skipped": batch.skipped,
+        "failed": batch.failed,
+        "cache_hits": batch.cache_hits,
+        "filtered": batch.filtered,
+        "method": batch.method,
+        "percent_complete": min(percent, 100.0),
+        "candidates_per_second": rate,
+        "eta_seconds": eta_seconds,
+        "last_error": batch.last_error,
+        "started_at": batch.started_at,
+        "finished_at": batch.finished_at,
+        "created_at": batch.created_at,
+    }
+
+
+async def _resume_texts(
+    session: AsyncSession,
+    candidates: List[Tuple[int, str, Optional[str]]]
+) -> List[Optional[str]]:
+    """Stored resume text per candidate, extracting (and storing) what is missing."""
+    extractor = get_document_extractor()
+
+    async def extract(resume_path: str) -> Optional[str]:
+        try:
+            return await extractor.extract_file(resume_path)
+        except DocumentExtractionError as e:
+            logger.warning(str(e))
+            return None
+
+    missing = [index for index, (_, _, text) in enumerate(candidates) if text is None]
+    extracted = await asyncio.gather(*(extract(candidates[index][1]) for index in missing))
+    texts = [text for _, _, text in candidates]
+    now = datetime.now(timezone.utc)
+    rows = []
+    for index, text in zip(missing, extracted):
+        texts[index] = text
+        if text is not None:
+            rows.append({"id": candidates[index][0], "resume_text": text, "resume_text_extracted_at": now})
+    if rows:
+        await session.execute(update(Candidate), rows)
+    return texts
+
+
+async def _score_chunk(
+    session: AsyncSession,
+    candidates: List[Tuple[int, str, Optional[str]]],
+    job: Tuple[str, str, List[str]],
+    semaphore: asyncio.Semaphore
+) -> Dict[str, int]:
+    """Score one chunk of ``(candidate_id, resume_path, resume_text)``; returns counters."""
+    settings = get_settings()
+    cache = get_cv_analysis_cache()
+    job_title, job_description, required_skills = job
+    counts = {"scored": 0, "skipped": 0, "failed": 0, "cache_hits": 0, "filtered": 0}
+
+    texts = await _resume_texts(session, candidates)
+    usable: List[Tuple[int, str]] = []
+    for (candidate_id, _, _), text in zip(candidates, texts):
+        if not text or len(text.strip()) < MIN_CV_TEXT_LENGTH:
+            counts["skipped"] += 1
+        else:
+            usable.append((candidate_id, text))
+
+    threshold = settings.cv_scoring_prefilter_min_skills_match
+    if threshold > 0 and required_skills and usable:
+        ranked = rank_documents([text for _, text in usable], required_skills, job_description)
+        below = {result.index: result.skills_match_score for result in ranked if result.skills_match_score < threshold}
+        if below:
+            await session.execute(update(Candidate), [
+                {"id": usable[index][0], "skills_match_score": score} for index, score in below.items()
+            ])
+            counts["filtered"] = len(below)
+            usable = [item for index, item in enumerate(usable) if index not in below]
+
+    # candidate id -> cache key, for candidates with usable text
+    keys: Dict[int, str] = {}
+    texts_by_key: Dict[str, str] = {}
+    for candidate_id, text in usable:
+        key = analysis_input_hash(settings.cv_scoring_model, text, job_title, job_description, required_skills)
+        keys[candidate_id] = key
+        texts_by_key.setdefault(key, text)
+
+    use_cache = settings.cv_analysis_cache_enabled
+    results = await cache.get_many(session, list(texts_by_key)) if use_cache else {}
+    hit_keys = set(results)
+
+    async def analyze(key: str):
+        async with semaphore:
+            try:
+                return key, await request_cv_analysis(
+                    texts_by_key[key], job_title, job_description, required_skills
+                )
+            except CVScoringError as e:
+                logger.warning(f"Batch analysis failed: {e}")
+                return key, None
+
+    fresh = dict(await asyncio.gather(*(analyze(key) for key in texts_by_key if key not in hit_keys)))
+    fresh = {key: result for key, result in fresh.items() if result is not None}
+    results.update(fresh)
+    if use_cache:
+        await cache.put_many(session, settings.cv_scoring_model, fresh)
+
+    now = datetime.utcnow()
+    rows = []
+    for candidate_id, key in keys.items():
+        scores = results.get(key)
+        if scores is None:
+            counts["failed"] += 1
+            continue
+        counts["scored"] += 1
+        if key in hit_keys:
+            counts["cache_hits"] += 1
+        rows.append({
+            "id": candidate_id,
+            "cv_scoring": scores["cv_scoring"],
+            "skills_match_score": scores["skills_match_score"],
+            "education_level": scores["education_level"],
+            "years_experience": scores["years_experience"],
+            "current_position": scores["current_position"],
+            "cv_scored_at": now,
+        })
+    if rows:
+        # ORM bulk UPDATE by primary key: one executemany for the chunk
+        await session.execute(update(Candidate), rows)
+    return counts
+
+
+async def _rank_locally(
+    session: AsyncSession,
+    batch: CVScoringBatch,
+    request: RecruitmentRequest
+) -> CVScoringBatch:
+    """Complete a batch with local ranking of the whole requisition."""
+    batch.method = "local"
+    try:
+        ranked = await rank_request_candidates(session, request)
+    except Exception as e:
+        logger.exception(f"Local ranking for batch {batch.id} failed")
+        await session.rollback()
+        await session.refresh(batch)
+        batch.method = "local"
+        batch.status = "failed"
+        batch.last_error = str(e)
+    else:
+        batch.status = "completed"
+        batch.total = batch.processed = batch.scored = len(ranked)
+        logger.info(f"CV scoring batch {batch.id} ranked {len(ranked)} candidates locally")
+    batch.locked_at = None
+    batch.finished_at = datetime.now(timezone.utc)
+    publish_on_commit(session, batch.requested_by, "cv_scoring_batch", batch_progress(batch))
+    await session.commit()
+    return batch
+
+
+async def run_batch(session_factory, batch_id: int) -> Optional[CVScoringBatch]:
+    """Run (or resume) a claimed batch to completion."""
+    settings = get_settings()
+    semaphore = asyncio.Semaphore(max(1, settings.cv_scoring_batch_concurrency))
+    chunk_size = max(1, settings.cv_scoring_batch_chunk_size)
+
+    async with session_factory() as session:
+        batch = await session.get(CVScoringBatch, batch_id)
+        if batch is None:
+            return None
+        request = await session.get(RecruitmentRequest, batch.recruitment_request_id)
+        if request is None:
+            batch.status = "failed"
+            batch.last_error = "Recruitment request not found"
+            batch.finished_at = datetime.now(timezone.utc)
+            await session.commit()
+            return batch
+        job = (
+            request.position_title,
+            request.job_description or f"Position: {request.position_title}",
+            request.required_skills or [],
+        )
+
+        if not llm_scoring_available():
+            return await _rank_locally(session, batch, request)
+
+        try:
+            while True:
+                chunk = (await session.execute(
+                    select(Candidate.id, Candidate.resume_path, Candidate.resume_text)
+                    .where(
+                        Candidate.recruitment_request_id == batch.recruitment_request_id,
+                        Candidate.resume_path.isnot(None),
+                        Candidate.id > batch.last_candidate_id
+                    )
+                    .order_by(Candidate.id)
+                    .limit(chunk_size)
+                )).all()
+                if not chunk:
+                    break
+
+                counts = await _score_chunk(session, [tuple(row) for row in chunk], job, semaphore)
+                batch.processed += len(chunk)
+                batch.scored += counts["scored"]
+                batch.skipped += counts["skipped"]
+                batch.failed += counts["failed"]
+                batch.cache_hits += counts["cache_hits"]
+                batch.filtered += counts["filtered"]
+                batch.last_candidate_id = chunk[-1][0]
+                batch.total = max(batch.total, batch.processed)
+                batch.locked_at = datetime.now(timezone.utc)
+                publish_on_commit(session, batch.requested_by, "cv_scoring_batch", batch_progress(batch))
+                await session.commit()
+        except Exception as e:
+            logger.exception(f"CV scoring batch {batch_id} failed")
+            await session.rollback()
+            await session.refresh(batch)
+            batch.status = "failed"
+            batch.last_error = str(e)
+        else:
+            batch.status = "completed"
+            logger.info(
+                f"CV scoring batch {batch_id} done: {batch.scored} scored, "
+                f"{batch.skipped} skipped, {batch.failed} failed, {batch.cache_hits} from cache, "
+                f"{batch.filtered} below the pre-filter"
+            )
+        batch.locked_at = None
+        batch.finished_at = datetime.now(timezone.utc)
+        publish_on_commit(session, batch.requested_by, "cv_scoring_batch", batch_progress(batch))
+        await session.commit()
+        return batch
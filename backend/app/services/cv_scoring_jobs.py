@@ -0,0 +1,322 @@
+"""CV scoring job queue and background worker.
+
+Upload endpoints save the CV, call :func:`enqueue_cv_scoring` in their own
+transaction and return the job id straight away. The worker is started from
+the application lifespan and runs up to ``cv_scoring_concurrency`` jobs at
+once; each job extracts the saved file's text (in the extraction process
+pool, stored on the candidate) and awaits the async LLM client (through the
+content-hash analysis cache), bounded by
+``cv_scoring_job_timeout_seconds``. Transient failures (timeouts, rate
+limits, malformed replies) are retried with exponential backoff until
+``cv_scoring_max_attempts`` is reached. Without an OpenAI key the job still
+completes, with ``skills_match_score`` from local skill ranking
+(``app.services.cv_ranking``).
+
+Job state is polled from ``GET /recruitment/cv-scoring/jobs/{id}``; the
+requesting user also receives a ``cv_scoring`` event on the live stream
+when a job finishes. The same worker runs requisition-wide rescoring
+batches (``app.services.cv_scoring_batch``), one at a time.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.cv_scoring_job import CVScoringBatch, CVScoringJob
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.cv_analysis_cache import get_cv_analysis_cache
+from app.services.cv_ranking import local_analysis
+from app.services.cv_scoring_batch import run_batch
+from app.services.cv_scoring_service import (
+    MIN_CV_TEXT_LENGTH, CVScoringError, llm_scoring_available, save_candidate_scores
+)
+from app.services.document_extraction import DocumentExtractionError, candidate_cv_text
+from app.services.event_bus import publish_on_commit
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_cv_scoring(
+    session: AsyncSession,
+    candidate_id: int,
+    file_path: str,
+    filename: str,
+    requested_by: Optional[str] = None
+) -> CVScoringJob:
+    """Queue a saved CV for scoring as part of the caller's transaction.
+
+    The caller commits, then calls :func:`wake_cv_scoring_worker`.
+    """
+    job = CVScoringJob(
+        candidate_id=candidate_id,
+        file_path=file_path,
+        filename=filename,
+        requested_by=requested_by,
+        status="queued",
+        attempts=0,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+    session.add(job)
+    return job
+
+
+def job_event_payload(job: CVScoringJob) -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "candidate_id": job.candidate_id,
+        "status": job.status,
+        "scores": job.result,
+        "error": job.last_error,
+    }
+
+
+class CVScoringWorker:
+    """Background task that runs queued CV scoring jobs."""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._active: Set[asyncio.Task] = set()
+        self._batch_task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def active_jobs(self) -> int:
+        return len(self._active)
+
+    def start(self):
+        """Start the worker loop on the running event loop."""
+        if self.is_running:
+            logger.warning("CV scoring worker already running")
+            return
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("CV scoring worker started")
+
+    async def stop(self):
+        """Stop claiming jobs and give running ones the job timeout to finish.
+
+        Jobs and batches cut short stay 'running' and are reclaimed once
+        their lock goes stale; a reclaimed batch resumes after the last
+        candidate it committed.
+        """
+        if not self.is_running:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+        running = set(self._active)
+        if self._batch_task is not None and not self._batch_task.done():
+            running.add(self._batch_task)
+        if running:
+            _, pending = await asyncio.wait(
+                running, timeout=self.settings.cv_scoring_job_timeout_seconds
+            )
+            for task in pending:
+                task.cancel()
+        self._batch_task = None
+        logger.info("CV scoring worker stopped")
+
+    def wake(self):
+        """Signal that new jobs were committed."""
+        self._wake.set()
+
+    async def _run(self):
+        while not self._stopping:
+            free_slots = max(1, self.settings.cv_scoring_concurrency) - len(self._active)
+            if free_slots > 0:
+                try:
+                    async with self.session_factory() as session:
+                        job_ids = await self._claim(session, free_slots)
+                except Exception as e:
+                    logger.error(f"CV scoring job claim failed: {e}")
+                    job_ids = []
+                for job_id in job_ids:
+                    task = asyncio.get_running_loop().create_task(self.run_job(job_id))
+                    self._active.add(task)
+                    task.add_done_callback(self._job_done)
+            if self._batch_task is None or self._batch_task.done():
+                try:
+                    async with self.session_factory() as session:
+                        batch_id = await self._claim_batch(session)
+                except Exception as e:
+                    logger.error(f"CV scoring batch claim failed: {e}")
+                    batch_id = None
+                if batch_id is not None:
+                    self._batch_task = asyncio.get_running_loop().create_task(
+                        run_batch(self.session_factory, batch_id)
+                    )
+                    self._batch_task.add_done_callback(lambda task: self._wake.set())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.settings.cv_scoring_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def _job_done(self, task: asyncio.Task):
+        self._active.discard(task)
+        # A slot opened up
+        self._wake.set()
+
+    async def _claim(self, session: AsyncSession, limit: int) -> List[int]:
+        """Claim due jobs, including ones stuck in 'running' after a crash."""
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=self.settings.cv_scoring_job_timeout_seconds * 2)
+        result = await session.execute(
+            select(CVScoringJob).where(
+                or_(
+                    and_(CVScoringJob.status == "queued", CVScoringJob.next_attempt_at <= now),
+                    and_(CVScoringJob.status == "running", CVScoringJob.locked_at < stale_before)
+                )
+            ).order_by(CVScoringJob.id).limit(limit).with_for_update(skip_locked=True)
+        )
+        jobs = list(result.scalars().all())
+        for job in jobs:
+            job.status = "running"
+            job.locked_at = now
+            job.started_at = now
+            job.attempts += 1
+        await session.commit()
+        return [job.id for job in jobs]
+
+    async def _claim_batch(self, session: AsyncSession) -> Optional[int]:
+        """Claim the oldest queued batch, or one whose worker stopped heartbeating."""
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=self.settings.cv_scoring_job_timeout_seconds * 2)
+        result = await session.execute(
+            select(CVScoringBatch).where(
+                or_(
+                    CVScoringBatch.status == "queued",
+                    and_(CVScoringBatch.status == "running", CVScoringBatch.locked_at < stale_before)
+                )
+            ).order_by(CVScoringBatch.id).limit(1).with_for_update(skip_locked=True)
+        )
+        batch = result.scalar_one_or_none()
+        if batch is None:
+            return None
+        batch.status = "running"
+        batch.locked_at = now
+        if batch.started_at is None:
+            batch.started_at = now
+        await session.commit()
+        return batch.id
+
+    def _retry_delay(self, attempts: int) -> timedelta:
+        base = self.settings.cv_scoring_retry_base_seconds
+        return timedelta(seconds=min(base * (2 ** (attempts - 1)), 3600))
+
+    async def _score(self, session: AsyncSession, job: CVScoringJob) -> Dict[str, Any]:
+        candidate = await session.get(Candidate, job.candidate_id)
+        if candidate is None:
+            raise CVScoringError("Candidate no longer exists")
+        request = await session.get(RecruitmentRequest, candidate.recruitment_request_id)
+        if request is None:
+            raise CVScoringError("Recruitment request not found")
+
+        try:
+            # Stored on the candidate, so rescoring and ranking reuse it
+            cv_text = await candidate_cv_text(candidate, job.file_path)
+        except DocumentExtractionError as e:
+            raise CVScoringError(str(e), retryable=e.retryable) from e
+        if not cv_text or len(cv_text.strip()) < MIN_CV_TEXT_LENGTH:
+            raise CVScoringError("Insufficient text extracted from CV")
+        if not llm_scoring_available():
+            return local_analysis(candidate, cv_text, request)
+
+        return await get_cv_analysis_cache().analyze(
+            session,
+            cv_text=cv_text,
+            job_title=request.position_title,
+            job_description=request.job_description or f"Position: {request.position_title}",
+            required_skills=request.required_skills or []
+        )
+
+    async def run_job(self, job_id: int) -> Optional[CVScoringJob]:
+        """Run one claimed job and record its outcome."""
+        async with self.session_factory() as session:
+            job = await session.get(CVScoringJob, job_id)
+            if job is None:
+                return None
+            scores: Optional[Dict[str, Any]] = None
+            error: Optional[str] = None
+            retryable = False
+            try:
+                scores = await asyncio.wait_for(
+                    self._score(session, job), timeout=self.settings.cv_scoring_job_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                error, retryable = "CV scoring timed out", True
+            except CVScoringError as e:
+                error, retryable = str(e), e.retryable
+            except Exception as e:
+                logger.exception(f"CV scoring job {job_id} crashed")
+                error, retryable = f"Unexpected error: {e}", True
+
+            if scores is None:
+                # A failed or cancelled query leaves the transaction unusable;
+                # start clean so the outcome can be recorded
+                await session.rollback()
+                await session.refresh(job)
+
+            now = datetime.now(timezone.utc)
+            job.locked_at = None
+            if scores is not None:
+                if scores.get("method") == "local":
+                    if scores["skills_match_score"] is not None:
+                        await session.execute(
+                            update(Candidate).where(Candidate.id == job.candidate_id)
+                            .values(skills_match_score=scores["skills_match_score"])
+                        )
+                    logger.info(f"Ranked candidate {job.candidate_id} locally: {scores['skills_match_score']}% skills match")
+                else:
+                    await save_candidate_scores(session, job.candidate_id, scores)
+                    logger.info(f"Scored candidate {job.candidate_id}: {scores['cv_scoring']}%")
+                job.status = "completed"
+                job.result = scores
+                job.last_error = None
+                job.finished_at = now
+            elif retryable and job.attempts < self.settings.cv_scoring_max_attempts:
+                job.status = "queued"
+                job.last_error = error
+                job.next_attempt_at = now + self._retry_delay(job.attempts)
+                logger.warning(f"CV scoring job {job_id} will retry: {error}")
+            else:
+                job.status = "failed"
+                job.last_error = error
+                job.finished_at = now
+                logger.error(f"CV scoring job {job_id} failed: {error}")
+
+            if job.status != "queued":
+                publish_on_commit(session, job.requested_by, "cv_scoring", job_event_payload(job))
+            await session.commit()
+            return job
+
+
+# Singleton instance
+_cv_scoring_worker: Optional[CVScoringWorker] = None
+
+
+def get_cv_scoring_worker() -> CVScoringWorker:
+    """Get or create the CV scoring worker singleton."""
+    global _cv_scoring_worker
+    if _cv_scoring_worker is None:
+        _cv_scoring_worker = CVScoringWorker()
+    return _cv_scoring_worker
+
+
+def wake_cv_scoring_worker():
+    """Nudge the worker after committing new jobs (no-op if it is not running)."""
+    if _cv_scoring_worker is not None and _cv_scoring_worker.is_running:
+        _cv_scoring_worker.wake()
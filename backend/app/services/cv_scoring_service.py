@@ -1,58 +1,88 @@
 """
 CV Scoring Service - Automatically analyzes CVs and LinkedIn profiles 
 to generate candidate scores against job requirements.
+
+Uploads are scored in the background by the CV scoring job worker
+(``app.services.cv_scoring_jobs``); this module holds the (async) LLM call.
+Text extraction runs in the process pool of ``app.services.document_extraction``.
 """
 import os
 import json
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
-from openai import OpenAI
+from typing import Optional, Dict, Any, Tuple
+from openai import AsyncOpenAI, APIError
+
+from app.core.config import get_settings
+from app.services.document_extraction import DocumentExtractionError, get_document_extractor
 
 logger = logging.getLogger(__name__)
 
-_client: Optional[OpenAI] = None
+_client: Optional[AsyncOpenAI] = None
+
+# Bump when the prompt or result normalization changes (part of the analysis cache key)
+PROMPT_VERSION = 1
+# Only this much of each input reaches the model
+CV_TEXT_LIMIT = 4000
+JOB_DESCRIPTION_LIMIT = 2000
+# Extracted text shorter than this is not worth sending to the model
+MIN_CV_TEXT_LENGTH = 50
+
+
+class CVScoringError(Exception):
+    """Raised when a CV cannot be scored.
+
+    ``retryable`` is set for transient failures (timeouts, rate limits,
+    unparseable model output) that are worth another attempt.
+    """
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
 
 
-def _build_openai_client() -> Optional[OpenAI]:
+def _build_openai_client() -> Optional[AsyncOpenAI]:
     """Construct a client only when credentials are present."""
     api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("AI_INTEGRATIONS_OPENAI_API_KEY")
     if not api_key:
-        logger.warning("OpenAI API key missing; CV scoring disabled.")
+        logger.warning("OpenAI API key missing; CV scoring falls back to local skill ranking.")
         return None
 
-    return OpenAI(
+    settings = get_settings()
+    return AsyncOpenAI(
         api_key=api_key,
         base_url=os.environ.get("OPENAI_BASE_URL") or os.environ.get("AI_INTEGRATIONS_OPENAI_BASE_URL"),
+        timeout=settings.cv_scoring_timeout_seconds,
+        max_retries=settings.cv_scoring_llm_retries,
     )
 
-async def analyze_cv(
-    cv_text: str,
-    job_title: str,
-    job_description: str,
-    required_skills: list[str] = None
-) -> Optional[Dict[str, Any]]:
-    """
-    Analyze CV text against job requirements and return scoring.
-    
-    Returns:
-        Dict with cv_scoring, skills_match_score, education_level, 
-        years_experience, current_position or None when disabled/failed.
-    """
-    required_skills = required_skills or []
+
+def _get_client() -> Optional[AsyncOpenAI]:
+    global _client
+    if _client is None:
+        _client = _build_openai_client()
+    return _client
+
+
+def llm_scoring_available() -> bool:
+    """Whether an OpenAI client can be built; otherwise scoring falls back to local ranking."""
+    return _get_client() is not None
+
+
+def _build_prompt(cv_text: str, job_title: str, job_description: str, required_skills: list[str]) -> str:
     skills_list = ", ".join(required_skills) if required_skills else "Not specified"
     
-    prompt = f"""Analyze this CV/resume against the job requirements and provide a JSON response.
+    return f"""Analyze this CV/resume against the job requirements and provide a JSON response.
 
 JOB TITLE: {job_title}
 
 JOB DESCRIPTION:
-{job_description[:2000]}
+{job_description[:JOB_DESCRIPTION_LIMIT]}
 
 REQUIRED SKILLS: {skills_list}
 
 CV/RESUME TEXT:
-{cv_text[:4000]}
+{cv_text[:CV_TEXT_LIMIT]}
 
 Provide a JSON response with these exact fields:
 {{
@@ -68,15 +98,80 @@ Provide a JSON response with these exact fields:
 Be accurate and fair in scoring. A score of 80+ indicates excellent match, 60-79 good match, 40-59 moderate match, below 40 poor match.
 Return ONLY valid JSON, no additional text."""
 
-    global _client
-    client = _client or _build_openai_client()
-    _client = client
+
+def _normalize_text(text: str) -> str:
+    """Collapse all runs of whitespace (extractors differ in line wrapping)."""
+    return " ".join((text or "").split())
+
+
+def normalize_scoring_inputs(
+    cv_text: str,
+    job_title: str,
+    job_description: str,
+    required_skills: Optional[list[str]]
+) -> Tuple[str, str, str, list[str]]:
+    """Canonical form of the analysis inputs.
+
+    Inputs that differ only in whitespace, skill order/duplicates or text
+    beyond what the prompt includes produce the same prompt (and cache key).
+    """
+    skills = {_normalize_text(str(skill)) for skill in required_skills or []}
+    return (
+        _normalize_text(cv_text)[:CV_TEXT_LIMIT],
+        _normalize_text(job_title),
+        _normalize_text(job_description)[:JOB_DESCRIPTION_LIMIT],
+        sorted((skill for skill in skills if skill), key=str.casefold),
+    )
+
+
+def _parse_analysis(result_text: str) -> Dict[str, Any]:
+    """Parse the model's JSON reply into normalized scores."""
+    result_text = result_text.strip()
+    # Clean up response (remove markdown if present)
+    if result_text.startswith("```"):
+        result_text = result_text.split("```")[1]
+        if result_text.startswith("json"):
+            result_text = result_text[4:]
+    result_text = result_text.strip()
+    
+    result = json.loads(result_text)
+    
+    # Validate and normalize values
+    return {
+        "cv_scoring": max(0, min(100, int(result.get("cv_scoring", 0)))),
+        "skills_match_score": max(0, min(100, int(result.get("skills_match_score", 0)))),
+        "education_level": result.get("education_level", "Not Specified"),
+        "years_experience": max(0, int(result.get("years_experience", 0))),
+        "current_position": result.get("current_position", ""),
+        "key_strengths": result.get("key_strengths", []),
+        "areas_of_concern": result.get("areas_of_concern", [])
+    }
+
+
+async def request_cv_analysis(
+    cv_text: str,
+    job_title: str,
+    job_description: str,
+    required_skills: list[str] = None
+) -> Dict[str, Any]:
+    """
+    Analyze CV text against job requirements.
+    
+    The request is bounded by ``cv_scoring_timeout_seconds`` and retried by
+    the client (``cv_scoring_llm_retries``) on rate limits, server errors
+    and dropped connections.
+    
+    Raises:
+        CVScoringError: scoring disabled or the analysis failed
+    """
+    client = _get_client()
     if client is None:
-        return None
+        raise CVScoringError("CV scoring is disabled (no OpenAI API key)")
 
+    prompt = _build_prompt(*normalize_scoring_inputs(cv_text, job_title, job_description, required_skills))
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await client.chat.completions.create(
+            model=get_settings().cv_scoring_model,
             messages=[
                 {
                     "role": "system",
@@ -90,84 +185,71 @@ Return ONLY valid JSON, no additional text."""
             temperature=0.3,
             max_tokens=500
         )
-        
-        result_text = response.choices[0].message.content.strip()
-        
-        # Clean up response (remove markdown if present)
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-        result_text = result_text.strip()
-        
-        result = json.loads(result_text)
-        
-        # Validate and normalize values
-        return {
-            "cv_scoring": max(0, min(100, int(result.get("cv_scoring", 0)))),
-            "skills_match_score": max(0, min(100, int(result.get("skills_match_score", 0)))),
-            "education_level": result.get("education_level", "Not Specified"),
-            "years_experience": max(0, int(result.get("years_experience", 0))),
-            "current_position": result.get("current_position", ""),
-            "key_strengths": result.get("key_strengths", []),
-            "areas_of_concern": result.get("areas_of_concern", [])
-        }
-        
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse CV analysis response: {e}")
+    except APIError as e:
+        status_code = getattr(e, "status_code", None)
+        # Client errors other than rate limiting will fail the same way again
+        retryable = status_code is None or status_code == 429 or status_code >= 500
+        raise CVScoringError(f"CV analysis request failed: {e}", retryable=retryable) from e
+
+    try:
+        return _parse_analysis(response.choices[0].message.content or "")
+    except (AttributeError, TypeError, ValueError) as e:
+        raise CVScoringError(f"Failed to parse CV analysis response: {e}", retryable=True) from e
+
+
+async def analyze_cv(
+    cv_text: str,
+    job_title: str,
+    job_description: str,
+    required_skills: list[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Analyze CV text against job requirements and return scoring.
+    
+    Returns:
+        Dict with cv_scoring, skills_match_score, education_level, 
+        years_experience, current_position or None when disabled/failed.
+    """
+    try:
+        return await request_cv_analysis(cv_text, job_title, job_description, required_skills)
+    except CVScoringError as e:
+        logger.error(str(e))
         return None
-    except Exception as e:
-        logger.error(f"CV analysis failed: {e}")
+
+
+async def extract_cv_text(cv_content: bytes, filename: str) -> Optional[str]:
+    """Extract text from a CV file in the extraction process pool."""
+    try:
+        return await get_document_extractor().extract(cv_content, filename)
+    except DocumentExtractionError as e:
+        logger.error(str(e))
         return None
 
 
 async def extract_text_from_pdf(pdf_content: bytes) -> Optional[str]:
     """Extract text from PDF content."""
-    try:
-        import io
-        # Try using pdfplumber if available
-        try:
-            import pdfplumber
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-                return text
-        except ImportError:
-            pass
-        
-        # Fallback to PyPDF2
-        try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(io.BytesIO(pdf_content))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() or ""
-            return text
-        except ImportError:
-            pass
-            
-        logger.warning("No PDF library available for text extraction")
-        return None
-    except Exception as e:
-        logger.error(f"PDF extraction failed: {e}")
-        return None
+    return await extract_cv_text(pdf_content, "document.pdf")
 
 
 async def extract_text_from_docx(docx_content: bytes) -> Optional[str]:
     """Extract text from DOCX content."""
-    try:
-        import io
-        from docx import Document
-        doc = Document(io.BytesIO(docx_content))
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text
-    except ImportError:
-        logger.warning("python-docx not available for DOCX extraction")
-        return None
-    except Exception as e:
-        logger.error(f"DOCX extraction failed: {e}")
-        return None
+    return await extract_cv_text(docx_content, "document.docx")
+
+
+async def save_candidate_scores(db_session, candidate_id: int, scores: Dict[str, Any]) -> None:
+    """Write analysis results to the candidate record (caller commits)."""
+    from sqlalchemy import update
+    from app.models.recruitment import Candidate
+    
+    stmt = update(Candidate).where(Candidate.id == candidate_id).values(
+        cv_scoring=scores["cv_scoring"],
+        skills_match_score=scores["skills_match_score"],
+        education_level=scores["education_level"],
+        years_experience=scores["years_experience"],
+        current_position=scores["current_position"],
+        cv_scored_at=datetime.utcnow()
+    )
+    await db_session.execute(stmt)
 
 
 async def score_candidate_cv(
@@ -194,20 +276,8 @@ async def score_candidate_cv(
     Returns:
         Scoring results or None on failure
     """
-    # Extract text based on file type
-    ext = filename.lower().split('.')[-1]
-    
-    if ext == 'pdf':
-        cv_text = await extract_text_from_pdf(cv_content)
-    elif ext in ('docx', 'doc'):
-        cv_text = await extract_text_from_docx(cv_content)
-    elif ext == 'txt':
-        cv_text = cv_content.decode('utf-8', errors='ignore')
-    else:
-        logger.warning(f"Unsupported file type: {ext}")
-        return None
-    
-    if not cv_text or len(cv_text.strip()) < 50:
+    cv_text = await extract_cv_text(cv_content, filename)
+    if not cv_text or len(cv_text.strip()) < MIN_CV_TEXT_LENGTH:
         logger.warning("Insufficient text extracted from CV")
         return None
     
@@ -220,19 +290,7 @@ async def score_candidate_cv(
     )
     
     if scores and db_session:
-        # Update candidate record
-        from sqlalchemy import update
-        from app.models.recruitment import Candidate
-        
-        stmt = update(Candidate).where(Candidate.id == candidate_id).values(
-            cv_scoring=scores["cv_scoring"],
-            skills_match_score=scores["skills_match_score"],
-            education_level=scores["education_level"],
-            years_experience=scores["years_experience"],
-            current_position=scores["current_position"],
-            cv_scored_at=datetime.utcnow()
-        )
-        await db_session.execute(stmt)
+        await save_candidate_scores(db_session, candidate_id, scores)
         await db_session.commit()
         
         logger.info(f"Updated candidate {candidate_id} with CV scores: {scores['cv_scoring']}%")
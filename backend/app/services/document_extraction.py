@@ -0,0 +1,211 @@
+"""Text extraction from uploaded documents (CVs) in a process pool.
+
+pdfplumber, PyPDF2 and python-docx are pure-Python and CPU bound, and a
+malformed PDF can keep them busy indefinitely. Extraction therefore runs in
+``document_extraction_processes`` worker processes
+(:class:`~app.services.process_pool.TimedProcessPool`):
+
+- each file is bounded by ``document_extraction_timeout_seconds``, counted
+  from when a worker picks it up; on a timeout the workers are restarted;
+- at most ``document_extraction_max_pages`` pages are read, one page at a
+  time, and reading stops once ``document_extraction_max_chars`` have been
+  collected; pages are joined once at the end.
+
+Extracted text is stored on the candidate (``Candidate.resume_text``) by
+:func:`candidate_cv_text`; scoring, ranking and search read it from there and
+only extract again after a new resume is uploaded.
+"""
+import asyncio
+import io
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import get_settings
+from app.services.process_pool import TimedProcessPool, WorkerExited, WorkerTimeout
+
+logger = logging.getLogger(__name__)
+
+# Recycle worker processes periodically; PDF libraries hold on to memory
+TASKS_PER_PROCESS = 200
+
+
+class DocumentExtractionError(Exception):
+    """Raised when extraction did not finish (timeout or crashed worker).
+
+    ``retryable`` is set when the file itself was not at fault, e.g. its
+    worker was terminated because another file timed out.
+    """
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _join(parts: List[str], max_chars: int) -> str:
+    return "\n".join(parts)[:max_chars]
+
+
+def _pdf_text(content: bytes, max_pages: int, max_chars: int) -> Optional[str]:
+    try:
+        # Try using pdfplumber if available
+        try:
+            import pdfplumber
+            parts: List[str] = []
+            collected = 0
+            with pdfplumber.open(io.BytesIO(content)) as pdf:
+                for page in pdf.pages[:max_pages]:
+                    text = page.extract_text() or ""
+                    # Drop the page's parsed layout before moving on
+                    page.close()
+                    parts.append(text)
+                    collected += len(text)
+                    if collected >= max_chars:
+                        break
+            return _join(parts, max_chars)
+        except ImportError:
+            pass
+
+        # Fallback to PyPDF2
+        try:
+            from PyPDF2 import PdfReader
+            reader = PdfReader(io.BytesIO(content))
+            parts = []
+            collected = 0
+            for index in range(min(len(reader.pages), max_pages)):
+                text = reader.pages[index].extract_text() or ""
+                parts.append(text)
+                collected += len(text)
+                if collected >= max_chars:
+                    break
+            return _join(parts, max_chars)
+        except ImportError:
+            pass
+
+        logger.warning("No PDF library available for text extraction")
+        return None
+    except Exception as e:
+        logger.error(f"PDF extraction failed: {e}")
+        return None
+
+
+def _docx_text(content: bytes, max_chars: int) -> Optional[str]:
+    try:
+        from docx import Document
+        doc = Document(io.BytesIO(content))
+        parts: List[str] = []
+        collected = 0
+        for para in doc.paragraphs:
+            parts.append(para.text)
+            collected += len(para.text) + 1
+            if collected >= max_chars:
+                break
+        return _join(parts, max_chars)
+    except ImportError:
+        logger.warning("python-docx not available for DOCX extraction")
+        return None
+    except Exception as e:
+        logger.error(f"DOCX extraction failed: {e}")
+        return None
+
+
+def extract_text_sync(content: bytes, filename: str, max_pages: int = 20, max_chars: int = 100_000) -> Optional[str]:
+    """Extract text from a document based on its extension (blocking; runs in the pool)."""
+    ext = filename.lower().split('.')[-1]
+
+    if ext == 'pdf':
+        return _pdf_text(content, max_pages, max_chars)
+    elif ext in ('docx', 'doc'):
+        return _docx_text(content, max_chars)
+    elif ext == 'txt':
+        return content[:max_chars * 4].decode('utf-8', errors='ignore')[:max_chars]
+    logger.warning(f"Unsupported file type: {ext}")
+    return None
+
+
+class DocumentExtractor:
+    """Runs :func:`extract_text_sync` in worker processes with a per-file timeout."""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.pool = TimedProcessPool(
+            "Text extraction",
+            self.settings.document_extraction_processes,
+            tasks_per_process=TASKS_PER_PROCESS,
+        )
+
+    async def extract(self, content: bytes, filename: str) -> Optional[str]:
+        """Extract text from a document.
+
+        Returns None when the file type is unsupported or unreadable.
+
+        Raises:
+            DocumentExtractionError: the file timed out or its worker died
+        """
+        settings = self.settings
+        try:
+            return await self.pool.run(
+                settings.document_extraction_timeout_seconds, extract_text_sync,
+                content, filename, settings.document_extraction_max_pages, settings.document_extraction_max_chars
+            )
+        except WorkerTimeout as e:
+            raise DocumentExtractionError(f"Text extraction from {filename} timed out") from e
+        except WorkerExited as e:
+            raise DocumentExtractionError(f"Text extraction worker for {filename} exited", retryable=True) from e
+
+    async def extract_file(self, file_path: str) -> Optional[str]:
+        """Read a stored document and extract its text; None if the file is missing."""
+        path = Path(file_path)
+        try:
+            content = await asyncio.to_thread(path.read_bytes)
+        except OSError as e:
+            logger.warning(f"Document {file_path} unavailable: {e}")
+            return None
+        return await self.extract(content, path.name)
+
+    def shutdown(self):
+        """Stop the worker processes (called on application shutdown)."""
+        self.pool.shutdown()
+
+
+async def candidate_cv_text(candidate, file_path: Optional[str] = None) -> Optional[str]:
+    """Text of a candidate's resume, extracting and storing it on first use.
+
+    ``file_path`` defaults to ``candidate.resume_path``. The text is stored
+    on the candidate whenever the file is the candidate's current resume;
+    the caller commits.
+
+    Raises:
+        DocumentExtractionError: extraction timed out or its worker died
+    """
+    path = file_path or candidate.resume_path
+    if not path:
+        return None
+    current = path == candidate.resume_path
+    if current and candidate.resume_text is not None:
+        return candidate.resume_text
+
+    text = await get_document_extractor().extract_file(path)
+    if current and text is not None:
+        candidate.resume_text = text
+        candidate.resume_text_extracted_at = datetime.now(timezone.utc)
+    return text
+
+
+# Singleton instance
+_document_extractor: Optional[DocumentExtractor] = None
+
+
+def get_document_extractor() -> DocumentExtractor:
+    """Get or create the document extractor singleton."""
+    global _document_extractor
+    if _document_extractor is None:
+        _document_extractor = DocumentExtractor()
+    return _document_extractor
+
+
+def shutdown_document_extractor():
+    """Stop the extraction pool if it was started."""
+    if _document_extractor is not None:
+        _document_extractor.shutdown()
@@ -0,0 +1,244 @@
+"""Email outbox producer and background worker.
+
+Producers call :func:`enqueue_email` inside their own transaction; nothing
+touches SMTP until the worker picks the row up after commit. The worker is
+started from the application lifespan, wakes up on :func:`wake_outbox_worker`
+or every ``email_outbox_poll_seconds``, sends up to ``email_outbox_concurrency``
+messages at once over the email service's pooled SMTP connections, and
+retries failed sends with exponential backoff until
+``email_outbox_max_attempts`` is reached.
+
+Follow-up work that must only happen once an email is actually delivered
+(e.g. flagging a leave request as ``manager_notified``) is registered per
+category with :func:`register_sent_handler`; work that feeds the outbox on
+each cycle (notification digests) with :func:`register_drain_hook`.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.services.email_service import get_email_service
+
+logger = logging.getLogger(__name__)
+
+SentHandler = Callable[[AsyncSession, EmailOutbox], Awaitable[None]]
+DrainHook = Callable[..., Awaitable[None]]
+
+_sent_handlers: Dict[str, SentHandler] = {}
+_drain_hooks: List[DrainHook] = []
+
+
+def register_sent_handler(category: str, handler: SentHandler) -> None:
+    """Register a coroutine run (in the worker's session) after a message of this category is sent."""
+    _sent_handlers[category] = handler
+
+
+def register_drain_hook(hook: DrainHook) -> None:
+    """Register a coroutine run with the worker's session factory before each drain.
+
+    Used by producers that batch messages into the outbox on a schedule
+    (e.g. notification digests).
+    """
+    if hook not in _drain_hooks:
+        _drain_hooks.append(hook)
+
+
+def enqueue_email(
+    session: AsyncSession,
+    to_email: str,
+    subject: str,
+    html_body: str,
+    text_body: Optional[str] = None,
+    category: Optional[str] = None,
+    source_type: Optional[str] = None,
+    source_id: Optional[int] = None
+) -> EmailOutbox:
+    """Add an email to the outbox as part of the caller's transaction.
+
+    The caller is responsible for committing; call :func:`wake_outbox_worker`
+    afterwards to have it delivered without waiting for the next poll.
+    """
+    message = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        html_body=html_body,
+        text_body=text_body,
+        category=category,
+        source_type=source_type,
+        source_id=source_id,
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+    session.add(message)
+    return message
+
+
+class EmailOutboxWorker:
+    """Background task that drains the email outbox."""
+
+    def __init__(self, session_factory=AsyncSessionLocal, email_service=None):
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self.email_service = email_service or get_email_service()
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the worker loop on the running event loop."""
+        if self.is_running:
+            logger.warning("Email outbox worker already running")
+            return
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Email outbox worker started")
+
+    async def stop(self):
+        """Stop the worker loop, letting an in-flight batch finish."""
+        if not self.is_running:
+            return
+        self._stopping = True
+        self._wake.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=self.settings.email_outbox_shutdown_seconds)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        self._task = None
+        # Idle connections only: the service (and its sender threads) may be
+        # shared, and is shut down once from the application lifespan
+        self.email_service.pool.close()
+        logger.info("Email outbox worker stopped")
+
+    def wake(self):
+        """Signal that new messages were committed."""
+        self._wake.set()
+
+    async def _run(self):
+        while not self._stopping:
+            for hook in _drain_hooks:
+                try:
+                    await hook(self.session_factory)
+                except Exception as e:
+                    logger.error(f"Email outbox drain hook failed: {e}")
+            try:
+                if self.email_service.is_configured():
+                    # Keep draining while full batches come back
+                    while not self._stopping and await self.drain_once() >= self.settings.email_outbox_batch_size:
+                        pass
+            except Exception as e:
+                logger.error(f"Email outbox drain failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.settings.email_outbox_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _claim_batch(self, session: AsyncSession) -> List[EmailOutbox]:
+        """Claim due messages, including ones stuck in 'sending' after a crash."""
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=self.settings.email_outbox_lock_timeout_seconds)
+        result = await session.execute(
+            select(EmailOutbox).where(
+                or_(
+                    and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+                    and_(EmailOutbox.status == "sending", EmailOutbox.locked_at < stale_before)
+                )
+            ).order_by(EmailOutbox.id).limit(
+                self.settings.email_outbox_batch_size
+            ).with_for_update(skip_locked=True)
+        )
+        messages = list(result.scalars().all())
+        for message in messages:
+            message.status = "sending"
+            message.locked_at = now
+        await session.commit()
+        return messages
+
+    def _retry_delay(self, attempts: int) -> timedelta:
+        base = self.settings.email_outbox_retry_base_seconds
+        return timedelta(seconds=min(base * (2 ** (attempts - 1)), 3600))
+
+    async def _record_result(self, session: AsyncSession, message: EmailOutbox, sent: bool, error: Optional[str]):
+        now = datetime.now(timezone.utc)
+        message.attempts += 1
+        message.locked_at = None
+        if sent:
+            message.status = "sent"
+            message.sent_at = now
+            message.last_error = None
+            handler = _sent_handlers.get(message.category or "")
+            if handler:
+                try:
+                    await handler(session, message)
+                except Exception as e:
+                    logger.error(f"Outbox sent handler for {message.category} failed: {e}")
+        elif message.attempts >= self.settings.email_outbox_max_attempts:
+            message.status = "failed"
+            message.last_error = error
+            logger.error(f"Giving up on outbox email {message.id} to {message.to_email}: {error}")
+        else:
+            message.status = "pending"
+            message.last_error = error
+            message.next_attempt_at = now + self._retry_delay(message.attempts)
+
+    async def drain_once(self) -> int:
+        """Send one batch of due messages.
+
+        Up to ``email_outbox_concurrency`` messages are in flight at once;
+        each result is committed as soon as its send finishes.
+
+        Returns:
+            Number of messages processed
+        """
+        semaphore = asyncio.Semaphore(max(1, self.settings.email_outbox_concurrency))
+
+        async def send(message: EmailOutbox, envelope: tuple):
+            async with semaphore:
+                sent = await self.email_service.send_email(*envelope)
+            return message, sent
+
+        async with self.session_factory() as session:
+            messages = await self._claim_batch(session)
+            # Read the fields up front: committing a result may expire the
+            # attributes of messages still waiting for a send slot.
+            sends = [
+                send(m, (m.to_email, m.subject, m.html_body, m.text_body))
+                for m in messages
+            ]
+            for finished in asyncio.as_completed(sends):
+                message, sent = await finished
+                await self._record_result(
+                    session, message, sent, None if sent else "SMTP send failed"
+                )
+                await session.commit()
+            return len(messages)
+
+
+# Singleton instance
+_outbox_worker: Optional[EmailOutboxWorker] = None
+
+
+def get_outbox_worker() -> EmailOutboxWorker:
+    """Get or create the email outbox worker singleton."""
+    global _outbox_worker
+    if _outbox_worker is None:
+        _outbox_worker = EmailOutboxWorker()
+    return _outbox_worker
+
+
+def wake_outbox_worker():
+    """Nudge the worker after committing new outbox rows (no-op if it is not running)."""
+    if _outbox_worker is not None and _outbox_worker.is_running:
+        _outbox_worker.wake()
@@ -1,21 +1,134 @@
 """Email service for sending notifications via SMTP"""
 import asyncio
 import logging
+import queue
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Optional, Tuple
 
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Connections idle for less than this are reused without a NOOP round-trip
+NOOP_AFTER_IDLE_SECONDS = 5
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of authenticated SMTP connections.
+
+    Opening a connection costs a TCP connect, STARTTLS and AUTH; bulk sends
+    reuse connections across messages instead. At most ``size`` connections
+    are checked out at once, idle connections are verified with NOOP before
+    reuse and dropped after ``idle_seconds``.
+    """
+
+    def __init__(self, settings, size: int = 4, idle_seconds: int = 60):
+        self.settings = settings
+        self.size = size
+        self.idle_seconds = idle_seconds
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(
+            self.settings.smtp_host,
+            self.settings.smtp_port,
+            timeout=self.settings.smtp_timeout_seconds
+        )
+        try:
+            if self.settings.smtp_use_tls:
+                server.starttls()
+            if self.settings.smtp_user and self.settings.smtp_password:
+                server.login(self.settings.smtp_user, self.settings.smtp_password)
+        except Exception:
+            self._discard(server)
+            raise
+        self.connections_opened += 1
+        return server
+
+    def _discard(self, server: Optional[smtplib.SMTP]):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception as e:  # nosec B110
+            # Expected: SMTP quit may fail if connection already closed
+            logger.debug(f"SMTP server quit failed (non-critical): {e}")
+            server.close()
+
+    def _checkout(self) -> Tuple[smtplib.SMTP, bool]:
+        """Return a live connection and whether it was reused."""
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(), False
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.idle_seconds:
+                self._discard(server)
+                continue
+            if idle_for < NOOP_AFTER_IDLE_SECONDS:
+                return server, True
+            try:
+                if server.noop()[0] == 250:
+                    return server, True
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard(server)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection; it is returned to the pool unless the block raises."""
+        self._slots.acquire()
+        server = None
+        try:
+            server, reused = self._checkout()
+            yield server, reused
+        except smtplib.SMTPResponseException:
+            # The server rejected this message; the session itself is still usable
+            raise
+        except Exception:
+            self._discard(server)
+            server = None
+            raise
+        finally:
+            if server is not None:
+                self._idle.put((server, time.monotonic()))
+            self._slots.release()
+
+    def close(self):
+        """Quit every idle connection."""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(server)
+
 
 class EmailService:
     """Service for sending emails via SMTP"""
     
-    def __init__(self):
-        self.settings = get_settings()
+    def __init__(self, settings=None):
+        self.settings = settings or get_settings()
+        self.pool = SMTPConnectionPool(
+            self.settings,
+            size=self.settings.smtp_pool_size,
+            idle_seconds=self.settings.smtp_pool_idle_seconds
+        )
+        # One thread per pooled connection so sends never queue on a busy default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.settings.smtp_pool_size,
+            thread_name_prefix="smtp"
+        )
     
     def is_configured(self) -> bool:
         """Check if SMTP is properly configured"""
@@ -38,9 +151,9 @@ class EmailService:
         
         try:
             # Run SMTP in thread pool to not block async loop
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             return await loop.run_in_executor(
-                None,
+                self._executor,
                 self._send_email_sync,
                 to_email,
                 subject,
@@ -59,48 +172,42 @@ class EmailService:
         text_body: Optional[str] = None
     ) -> bool:
         """Synchronous email sending (runs in thread pool)"""
-        server = None
-        try:
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = f"{self.settings.smtp_from_name} <{self.settings.smtp_from_email}>"
-            msg["To"] = to_email
-            
-            # Add plain text version
-            if text_body:
-                msg.attach(MIMEText(text_body, "plain"))
-            
-            # Add HTML version
-            msg.attach(MIMEText(html_body, "html"))
-            
-            # Connect and send
-            server = smtplib.SMTP(self.settings.smtp_host, self.settings.smtp_port)
-            if self.settings.smtp_use_tls:
-                server.starttls()
-            
-            if self.settings.smtp_user and self.settings.smtp_password:
-                server.login(self.settings.smtp_user, self.settings.smtp_password)
-            
-            server.sendmail(
-                self.settings.smtp_from_email,
-                to_email,
-                msg.as_string()
-            )
-            
-            logger.info("Email sent successfully to %s", to_email)
-            return True
-            
-        except Exception as e:
-            logger.error("SMTP error sending to %s: %s", to_email, str(e))
-            return False
-        finally:
-            if server:
-                try:
-                    server.quit()
-                except Exception as e:  # nosec B110
-                    # Expected: SMTP quit may fail if connection already closed
-                    logger.debug(f"SMTP server quit failed (non-critical): {e}")
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = f"{self.settings.smtp_from_name} <{self.settings.smtp_from_email}>"
+        msg["To"] = to_email
+        
+        # Add plain text version
+        if text_body:
+            msg.attach(MIMEText(text_body, "plain"))
+        
+        # Add HTML version
+        msg.attach(MIMEText(html_body, "html"))
+        payload = msg.as_string()
+        
+        # A pooled connection may have been dropped by the server since its
+        # last use; retry once on a fresh connection in that case.
+        for attempt in range(2):
+            reused = False
+            try:
+                with self.pool.connection() as (server, reused):
+                    server.sendmail(self.settings.smtp_from_email, to_email, payload)
+                logger.info("Email sent successfully to %s", to_email)
+                return True
+            except smtplib.SMTPServerDisconnected as e:
+                if attempt == 0 and reused:
+                    continue
+                logger.error("SMTP error sending to %s: %s", to_email, str(e))
+                return False
+            except Exception as e:
+                logger.error("SMTP error sending to %s: %s", to_email, str(e))
+                return False
+        return False
 
+    def close(self):
+        """Close pooled SMTP connections and the sender threads."""
+        self.pool.close()
+        self._executor.shutdown(wait=False)
 
 
 # Singleton instance
@@ -115,19 +222,26 @@ def get_email_service() -> EmailService:
     return _email_service
 
 
-async def send_nomination_confirmation_email(
-    manager_email: str,
+def shutdown_email_service():
+    """Close the email service singleton's connections and threads if it was created."""
+    if _email_service is not None:
+        _email_service.close()
+
+
+def build_nomination_confirmation_email(
     manager_name: str,
     nominee_name: str,
     nomination_year: int,
     nomination_id: int
-) -> bool:
+) -> Tuple[str, str, str]:
     """
-    Send confirmation email to manager after nomination submission.
+    Build the confirmation email sent to a manager after nomination submission.
     Includes link to view/revise the nomination.
+    
+    Returns:
+        (subject, html_body, text_body)
     """
     settings = get_settings()
-    email_service = get_email_service()
     
     view_url = f"{settings.app_base_url}/nomination-pass?view={nomination_id}"
     
@@ -197,4 +311,22 @@ async def send_nomination_confirmation_email(
     For questions, contact hr@baynunah.ae
     """
     
-    return await email_service.send_email(manager_email, subject, html_body, text_body)
+    return subject, html_body, text_body
+
+
+async def send_nomination_confirmation_email(
+    manager_email: str,
+    manager_name: str,
+    nominee_name: str,
+    nomination_year: int,
+    nomination_id: int
+) -> bool:
+    """
+    Send confirmation email to manager after nomination submission.
+    Prefer queueing the message from build_nomination_confirmation_email
+    through the email outbox in the nomination's transaction.
+    """
+    subject, html_body, text_body = build_nomination_confirmation_email(
+        manager_name, nominee_name, nomination_year, nomination_id
+    )
+    return await get_email_service().send_email(manager_email, subject, html_body, text_body)
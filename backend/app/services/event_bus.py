@@ -0,0 +1,275 @@
+"""Per-user event fan-out for the server-sent events stream.
+
+Producers publish ``(channel, event, data)`` where the channel is a user key
+(employee ID or internal ID as stored on notifications). Every connected
+stream subscribes to its user's channels and receives events through a
+bounded queue; a slow client loses its oldest events rather than holding up
+publishers.
+
+The backend decides how events reach other workers:
+
+- ``memory``: in-process only (single worker / development).
+- ``postgres``: ``NOTIFY`` on a shared channel and ``LISTEN`` from every
+  worker, reusing the application's database. Select it with
+  ``EVENT_BUS_BACKEND=postgres``.
+
+Events tied to database writes should use :func:`publish_on_commit` so they
+are only sent once the transaction commits.
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = "hr_portal_events"
+# Postgres NOTIFY payloads must stay under 8000 bytes
+PG_MAX_PAYLOAD = 7900
+
+
+@dataclass(frozen=True)
+class BusEvent:
+    """An event addressed to one channel, with its JSON-encoded data."""
+    channel: str
+    event: str
+    data: str
+
+    def to_json(self) -> str:
+        return json.dumps({"channel": self.channel, "event": self.event, "data": self.data})
+
+    @classmethod
+    def from_json(cls, payload: str) -> "BusEvent":
+        message = json.loads(payload)
+        return cls(channel=message["channel"], event=message["event"], data=message["data"])
+
+
+class Subscription:
+    """Queue of events for one connected stream."""
+
+    def __init__(self, channels: Set[str], max_queued: int = 100):
+        self.channels = channels
+        self._queue: "asyncio.Queue[BusEvent]" = asyncio.Queue(maxsize=max_queued)
+        self.dropped = 0
+
+    def put(self, bus_event: BusEvent):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(bus_event)
+
+    async def get(self, timeout: float) -> Optional[BusEvent]:
+        """Wait for the next event; returns None on timeout."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InMemoryBackend:
+    """Delivers events to subscribers in this process only."""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[BusEvent], None]] = None
+
+    async def start(self, deliver: Callable[[BusEvent], None]):
+        self._deliver = deliver
+
+    async def stop(self):
+        self._deliver = None
+
+    async def publish(self, bus_event: BusEvent):
+        if self._deliver:
+            self._deliver(bus_event)
+
+
+class PostgresBackend:
+    """Fans events out across workers with Postgres LISTEN/NOTIFY.
+
+    Each worker keeps one pooled connection listening on ``PG_CHANNEL``;
+    its own notifications loop back through it, so local subscribers are
+    served the same way as remote ones.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._connection = None
+        self._driver = None
+        self._lock = asyncio.Lock()
+        self._deliver: Optional[Callable[[BusEvent], None]] = None
+
+    async def start(self, deliver: Callable[[BusEvent], None]):
+        self._deliver = deliver
+        self._connection = await self.engine.connect()
+        raw = await self._connection.get_raw_connection()
+        self._driver = raw.driver_connection
+        await self._driver.add_listener(PG_CHANNEL, self._on_notify)
+        logger.info("Event bus listening on Postgres channel %s", PG_CHANNEL)
+
+    async def stop(self):
+        if self._driver is not None:
+            try:
+                await self._driver.remove_listener(PG_CHANNEL, self._on_notify)
+            except Exception as e:
+                logger.debug(f"Removing event bus listener failed (non-critical): {e}")
+        if self._connection is not None:
+            await self._connection.close()
+        self._connection = None
+        self._driver = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            bus_event = BusEvent.from_json(payload)
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed event bus payload: {e}")
+            return
+        if self._deliver:
+            self._deliver(bus_event)
+
+    async def publish(self, bus_event: BusEvent):
+        payload = bus_event.to_json()
+        if len(payload.encode("utf-8")) > PG_MAX_PAYLOAD or self._driver is None:
+            # Too large for NOTIFY (or not connected): reach local subscribers only
+            if self._deliver:
+                self._deliver(bus_event)
+            return
+        async with self._lock:
+            await self._driver.execute("SELECT pg_notify($1, $2)", PG_CHANNEL, payload)
+
+
+class EventBus:
+    """Registry of subscriptions plus the backend that carries published events."""
+
+    def __init__(self, backend=None, max_queued: int = 100):
+        self.backend = backend or InMemoryBackend()
+        self.max_queued = max_queued
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._started = False
+
+    async def start(self):
+        await self.backend.start(self._deliver)
+        self._started = True
+
+    async def stop(self):
+        self._started = False
+        await self.backend.stop()
+
+    def subscribe(self, channels: Set[str]) -> Subscription:
+        subscription = Subscription(set(channels), self.max_queued)
+        for channel in subscription.channels:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for channel in subscription.channels:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[channel]
+
+    @property
+    def subscriber_count(self) -> int:
+        return len({s for subscribers in self._subscribers.values() for s in subscribers})
+
+    def _deliver(self, bus_event: BusEvent):
+        for subscription in self._subscribers.get(bus_event.channel, ()):
+            subscription.put(bus_event)
+
+    async def publish(self, channel: Optional[str], event: str, data: Any):
+        """Publish an event to every stream subscribed to ``channel``."""
+        if not channel:
+            return
+        bus_event = BusEvent(str(channel), event, json.dumps(data, default=str))
+        if not self._started:
+            # Not started (tests, scripts): still reach local subscribers
+            self._deliver(bus_event)
+            return
+        try:
+            await self.backend.publish(bus_event)
+        except Exception as e:
+            logger.error(f"Event bus publish failed, delivering locally: {e}")
+            self._deliver(bus_event)
+
+    def publish_nowait(self, channel: Optional[str], event: str, data: Any):
+        """Schedule :meth:`publish` from synchronous code running on the event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(self.publish(channel, event, data))
+
+
+# Singleton instance
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """Get or create the event bus singleton using the configured backend."""
+    global _event_bus
+    if _event_bus is None:
+        settings = get_settings()
+        backend = None
+        if settings.event_bus_backend == "postgres":
+            from app.database import engine, is_sqlite
+            if is_sqlite:
+                logger.warning("EVENT_BUS_BACKEND=postgres needs a Postgres database; using in-memory bus")
+            else:
+                backend = PostgresBackend(engine)
+        _event_bus = EventBus(backend, max_queued=settings.event_stream_queue_size)
+    return _event_bus
+
+
+# ==================== TRANSACTIONAL PUBLISHING ====================
+
+Payload = Union[Any, Callable[[], Any]]
+
+
+def publish_on_commit(session, channel: Optional[str], event: str, payload: Payload):
+    """Publish an event once the session's transaction commits.
+
+    ``payload`` may be a zero-argument callable; it is evaluated after the
+    next flush so generated values (ids, defaults) are available. Works with
+    both ``Session`` and ``AsyncSession``.
+    """
+    if not channel:
+        return
+    session.info.setdefault("_bus_pending", []).append((channel, event, payload))
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _resolve_pending_events(session, flush_context):
+    pending: List = session.info.pop("_bus_pending", [])
+    if not pending:
+        return
+    resolved = session.info.setdefault("_bus_ready", [])
+    for channel, event, payload in pending:
+        resolved.append((channel, event, payload() if callable(payload) else payload))
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _publish_committed_events(session):
+    ready = session.info.pop("_bus_ready", [])
+    # Events registered without any flush in between carry plain data
+    ready.extend(
+        (channel, event, payload() if callable(payload) else payload)
+        for channel, event, payload in session.info.pop("_bus_pending", [])
+    )
+    if not ready:
+        return
+    bus = get_event_bus()
+    for channel, event, data in ready:
+        bus.publish_nowait(channel, event, data)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_events(session):
+    session.info.pop("_bus_pending", None)
+    session.info.pop("_bus_ready", None)
@@ -0,0 +1,125 @@
+"""Content-addressed storage for uploaded files.
+
+Uploads are streamed to disk in chunks through async file I/O, hashed with
+SHA-256 as they stream, and never held in memory whole. A stream that goes
+over the size limit is abandoned at the first chunk past it.
+
+Finished files are named by content, ``<directory>/<2 hex>/<sha256><ext>``,
+so uploading the same file twice stores it once. Each upload is written to
+``<directory>/.incoming`` first and moved into place atomically, so a
+half-written file is never visible under its content name. Stored files may
+be shared between records; delete one only when no other record refers to
+its path.
+"""
+import hashlib
+import logging
+import secrets
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+import anyio
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+class UploadTooLarge(Exception):
+    """The upload exceeded the allowed size."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class StoredFile:
+    """A file saved by :func:`store_upload`."""
+    path: str
+    sha256: str
+    size: int
+    deduplicated: bool  # True when identical content was already stored
+
+
+async def read_upload(upload: UploadFile, max_bytes: int) -> bytes:
+    """Read a whole upload into memory, giving up at the first chunk past ``max_bytes``.
+
+    Raises:
+        UploadTooLarge: The upload is over ``max_bytes``
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    chunks = []
+    size = 0
+    while chunk := await upload.read(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def content_path(directory: Union[str, Path], sha256: str, suffix: str = "") -> Path:
+    """Where content with the given hash is stored under ``directory``."""
+    return Path(directory) / sha256[:2] / f"{sha256}{suffix.lower()}"
+
+
+async def store_upload(
+    upload: UploadFile,
+    directory: Union[str, Path],
+    max_bytes: int,
+    suffix: str = ""
+) -> StoredFile:
+    """Stream an upload into content-addressed storage.
+
+    Args:
+        upload: The uploaded file, read from its current position
+        directory: Storage area, e.g. ``storage/resumes``
+        max_bytes: Largest accepted size
+        suffix: File extension to keep (e.g. ``.pdf``), used by readers
+            that pick a parser by extension
+
+    Raises:
+        UploadTooLarge: The upload is over ``max_bytes``; nothing is stored.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    incoming = anyio.Path(directory) / ".incoming"
+    await incoming.mkdir(parents=True, exist_ok=True)
+    partial = incoming / f"{secrets.token_hex(16)}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with await anyio.open_file(partial, "wb") as out:
+            while chunk := await upload.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                await out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        target = anyio.Path(content_path(directory, sha256, suffix))
+        if await target.exists():
+            await partial.unlink()
+            logger.debug(f"Upload matches stored file {target}")
+            return StoredFile(path=str(target), sha256=sha256, size=size, deduplicated=True)
+        await target.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic; a concurrent upload of the same content writes identical bytes
+        await partial.replace(target)
+        return StoredFile(path=str(target), sha256=sha256, size=size, deduplicated=False)
+    except BaseException:
+        await partial.unlink(missing_ok=True)
+        raise
+
+
+async def discard_upload(stored: StoredFile):
+    """Remove a file just stored by :func:`store_upload` for a rejected upload.
+
+    A deduplicated file already belonged to another record and is kept.
+    """
+    if not stored.deduplicated:
+        await anyio.Path(stored.path).unlink(missing_ok=True)
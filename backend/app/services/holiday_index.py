@@ -0,0 +1,182 @@
+"""In-memory public holiday index.
+
+Public holidays are read on nearly every leave and attendance path but only
+change when HR edits them, so active holidays are loaded lazily, one query
+per year, into a process-wide index:
+
+- the holidays whose ``year`` column matches (for yearly listings),
+- the intervals overlapping the calendar year, sorted by start date
+  (for range queries), and
+- a date -> holiday map (for "is this day a holiday?" checks).
+
+The create/update/init endpoints in ``routers/public_holidays.py`` invalidate
+the index; a TTL bounds staleness across workers.
+"""
+import asyncio
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.public_holiday import PublicHoliday
+
+
+@dataclass(frozen=True)
+class HolidayEntry:
+    """Read-only copy of an active PublicHoliday row."""
+    id: int
+    name: str
+    name_arabic: Optional[str]
+    start_date: date
+    end_date: date
+    year: int
+    holiday_type: str
+    is_paid: bool
+    description: Optional[str]
+    is_active: bool
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, holiday: PublicHoliday) -> "HolidayEntry":
+        return cls(
+            id=holiday.id,
+            name=holiday.name,
+            name_arabic=holiday.name_arabic,
+            start_date=holiday.start_date,
+            end_date=holiday.end_date,
+            year=holiday.year,
+            holiday_type=holiday.holiday_type,
+            is_paid=holiday.is_paid,
+            description=holiday.description,
+            is_active=holiday.is_active,
+            created_at=holiday.created_at,
+        )
+
+
+@dataclass
+class YearIndex:
+    """Holidays for one calendar year."""
+    year: int
+    holidays: List[HolidayEntry] = field(default_factory=list)
+    intervals: List[HolidayEntry] = field(default_factory=list)
+    starts: List[date] = field(default_factory=list)
+    by_date: Dict[date, HolidayEntry] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    @classmethod
+    def build(cls, year: int, entries: List[HolidayEntry]) -> "YearIndex":
+        first_day, last_day = date(year, 1, 1), date(year, 12, 31)
+        intervals = sorted(
+            (e for e in entries if e.start_date <= last_day and e.end_date >= first_day),
+            key=lambda e: (e.start_date, e.id)
+        )
+        by_date: Dict[date, HolidayEntry] = {}
+        for entry in intervals:
+            day = max(entry.start_date, first_day)
+            while day <= min(entry.end_date, last_day):
+                # Earliest-starting holiday wins when definitions overlap
+                by_date.setdefault(day, entry)
+                day += timedelta(days=1)
+        return cls(
+            year=year,
+            holidays=sorted(
+                (e for e in entries if e.year == year),
+                key=lambda e: (e.start_date, e.id)
+            ),
+            intervals=intervals,
+            starts=[e.start_date for e in intervals],
+            by_date=by_date,
+            loaded_at=time.monotonic(),
+        )
+
+
+class HolidayIndex:
+    """Process-wide, year-keyed holiday index."""
+
+    def __init__(self, ttl_seconds: int = 600):
+        self.ttl_seconds = ttl_seconds
+        self._years: Dict[int, YearIndex] = {}
+        self._lock = asyncio.Lock()
+        self._generation = 0
+
+    async def get_year(self, session: AsyncSession, year: int) -> YearIndex:
+        """Return the index for a year, loading it on first use."""
+        index = self._years.get(year)
+        if index and (time.monotonic() - index.loaded_at) < self.ttl_seconds:
+            return index
+
+        async with self._lock:
+            generation = self._generation
+            result = await session.execute(
+                select(PublicHoliday).where(
+                    and_(
+                        PublicHoliday.is_active == True,
+                        or_(
+                            PublicHoliday.year == year,
+                            and_(
+                                PublicHoliday.start_date <= date(year, 12, 31),
+                                PublicHoliday.end_date >= date(year, 1, 1)
+                            )
+                        )
+                    )
+                )
+            )
+            index = YearIndex.build(
+                year, [HolidayEntry.from_model(h) for h in result.scalars().all()]
+            )
+            if generation == self._generation:
+                self._years[year] = index
+        return index
+
+    async def holiday_on(self, session: AsyncSession, check_date: date) -> Optional[HolidayEntry]:
+        """Return the holiday covering a date, if any."""
+        index = await self.get_year(session, check_date.year)
+        return index.by_date.get(check_date)
+
+    async def holidays_for_year(self, session: AsyncSession, year: int) -> List[HolidayEntry]:
+        """Return active holidays whose ``year`` is the given year, ordered by start date."""
+        index = await self.get_year(session, year)
+        return list(index.holidays)
+
+    async def holidays_in_range(
+        self,
+        session: AsyncSession,
+        start_date: date,
+        end_date: date
+    ) -> List[HolidayEntry]:
+        """Return active holidays overlapping a date range, ordered by start date."""
+        found: Dict[int, HolidayEntry] = {}
+        for year in range(start_date.year, end_date.year + 1):
+            index = await self.get_year(session, year)
+            upper = bisect_right(index.starts, end_date)
+            for entry in index.intervals[:upper]:
+                if entry.end_date >= start_date:
+                    found.setdefault(entry.id, entry)
+        return sorted(found.values(), key=lambda e: (e.start_date, e.id))
+
+    def invalidate(self, year: Optional[int] = None) -> None:
+        """Drop one year (or every year) from the index."""
+        self._generation += 1
+        if year is None:
+            self._years.clear()
+        else:
+            self._years.pop(year, None)
+
+
+# Singleton instance
+_holiday_index: Optional[HolidayIndex] = None
+
+
+def get_holiday_index() -> HolidayIndex:
+    """Get or create the public holiday index singleton."""
+    global _holiday_index
+    if _holiday_index is None:
+        _holiday_index = HolidayIndex(
+            ttl_seconds=get_settings().public_holiday_index_ttl_seconds
+        )
+    return _holiday_index
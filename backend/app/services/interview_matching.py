@@ -0,0 +1,120 @@
+"""Maximum assignment of candidates to interview time windows.
+
+Scheduling is a bipartite matching: candidates on one side, time windows on
+the other, an edge wherever the candidate is available for the window, and
+each window able to take up to its capacity (free panel seats).
+:func:`max_assignment` solves it with Hopcroft-Karp generalized to
+capacitated windows: each phase layers the graph with a BFS from unassigned
+candidates, then augments along vertex-disjoint shortest paths with an
+iterative DFS, so a requisition with hundreds of candidates and windows is
+matched in milliseconds. A greedy pass seeds the matching, preferring each
+candidate's earliest window.
+"""
+from collections import deque
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+_UNREACHED = -1
+
+
+def max_assignment(
+    candidate_windows: Sequence[Sequence[int]],
+    capacities: Sequence[int]
+) -> List[Optional[int]]:
+    """Assign as many candidates as possible to windows.
+
+    Args:
+        candidate_windows: for each candidate, the windows it can take, in
+            order of preference
+        capacities: how many candidates each window can take
+
+    Returns:
+        The window assigned to each candidate, or None.
+    """
+    assigned: List[List[int]] = [[] for _ in capacities]
+    match: List[Optional[int]] = [None] * len(candidate_windows)
+
+    def move(candidate: int, window: int):
+        previous = match[candidate]
+        if previous is not None:
+            assigned[previous].remove(candidate)
+        assigned[window].append(candidate)
+        match[candidate] = window
+
+    # Greedy seed: earliest window with room
+    for candidate, windows in enumerate(candidate_windows):
+        for window in windows:
+            if len(assigned[window]) < capacities[window]:
+                move(candidate, window)
+                break
+
+    while True:
+        depth = _layer(candidate_windows, capacities, assigned, match)
+        if depth is None:
+            return match
+        augmented = False
+        for candidate in range(len(candidate_windows)):
+            if match[candidate] is None and _augment(candidate, candidate_windows, capacities, assigned, depth, move):
+                augmented = True
+        if not augmented:
+            return match
+
+
+def _layer(candidate_windows, capacities, assigned, match) -> Optional[List[int]]:
+    """BFS layers from unassigned candidates; None if no window with room is reachable."""
+    depth = [_UNREACHED] * len(candidate_windows)
+    queue = deque()
+    for candidate, window in enumerate(match):
+        if window is None:
+            depth[candidate] = 0
+            queue.append(candidate)
+    reachable = False
+    while queue:
+        candidate = queue.popleft()
+        for window in candidate_windows[candidate]:
+            if len(assigned[window]) < capacities[window]:
+                reachable = True
+                continue
+            for holder in assigned[window]:
+                if depth[holder] == _UNREACHED:
+                    depth[holder] = depth[candidate] + 1
+                    queue.append(holder)
+    return depth if reachable else None
+
+
+def _options(candidate, candidate_windows, capacities, assigned) -> Iterator[Tuple[int, Optional[int]]]:
+    """(window, None) for a window with room, (window, holder) to displace a holder."""
+    for window in candidate_windows[candidate]:
+        if len(assigned[window]) < capacities[window]:
+            yield window, None
+        else:
+            for holder in list(assigned[window]):
+                yield window, holder
+
+
+def _augment(root, candidate_windows, capacities, assigned, depth, move) -> bool:
+    """Find an augmenting path from ``root`` along the layers and apply it."""
+    path = [root]        # candidates on the path
+    targets: List[int] = []  # window path[i] takes from path[i + 1]
+    options = [_options(root, candidate_windows, capacities, assigned)]
+    while path:
+        candidate = path[-1]
+        for window, holder in options[-1]:
+            if holder is None:
+                # Shift every candidate on the path into the window ahead of it
+                move(candidate, window)
+                for index in range(len(path) - 2, -1, -1):
+                    move(path[index], targets[index])
+                return True
+            if depth[holder] == depth[candidate] + 1:
+                path.append(holder)
+                targets.append(window)
+                options.append(_options(holder, candidate_windows, capacities, assigned))
+                break
+        else:
+            # Dead end: drop the candidate from this phase
+            depth[candidate] = _UNREACHED
+            path.pop()
+            options.pop()
+            if targets:
+                targets.pop()
+    return False
@@ -1,23 +1,35 @@
 """Interview scheduling service."""
 import secrets
+from time import perf_counter
 from datetime import datetime, date, time, timedelta
 from typing import Optional, List
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from app.models.interview import InterviewSetup, InterviewSlot, PassMessage, RecruitmentDocument
 from app.models.recruitment import Candidate, RecruitmentRequest
 from app.models.activity_log import ActivityLog
+from app.services.interview_matching import max_assignment
+from app.services.log_writer import get_log_writer
 from app.schemas.interview import (
     InterviewSetupCreate, InterviewSetupUpdate, InterviewSetupResponse,
     InterviewSlotCreate, InterviewSlotBulkCreate, InterviewSlotResponse,
     SlotBookingRequest, PassMessageCreate, PassMessageResponse,
     RecruitmentDocumentCreate, RecruitmentDocumentResponse,
-    CandidatePassData, ManagerPassData, ActivityLogResponse
+    CandidatePassData, ManagerPassData, ActivityLogResponse,
+    AvailabilityWindow, ScheduleOptimizeRequest, ScheduleOptimizeResponse, ScheduledInterview
 )
 
 
+def _covers(windows: List[AvailabilityWindow], start: datetime, end: datetime) -> bool:
+    """Whether any availability window contains [start, end] (compared as local times)."""
+    return any(
+        window.start.replace(tzinfo=None) <= start and window.end.replace(tzinfo=None) >= end
+        for window in windows
+    )
+
+
 class InterviewService:
     """Service for interview scheduling."""
     
@@ -223,6 +235,170 @@ class InterviewService:
         
         return InterviewSlotResponse.model_validate(slot)
     
+    async def optimize_schedule(
+        self, session: AsyncSession, data: ScheduleOptimizeRequest, performed_by_id: Optional[str] = None
+    ) -> ScheduleOptimizeResponse:
+        """Book as many candidates as possible into a round's open slots.
+
+        Slots sharing a date and time form one window. A window takes up to
+        ``slot_capacity`` interviews less those already booked in it; when
+        panel members are given, also no more than the interviewers available
+        for the whole window and not yet booked in it (slot times within a
+        round are expected not to overlap). Candidates are matched to windows
+        inside their availability with a maximum bipartite matching, earliest
+        windows first. Bookings reuse the window's open slots, add slots for
+        extra parallel seats, and are written in one transaction with an
+        activity entry per candidate.
+        """
+        started = perf_counter()
+        setup_result = await session.execute(
+            select(InterviewSetup).where(
+                InterviewSetup.recruitment_request_id == data.recruitment_request_id
+            )
+        )
+        setup = setup_result.scalar_one_or_none()
+        if not setup:
+            raise HTTPException(status_code=404, detail="Interview setup not found")
+
+        candidate_ids = list(dict.fromkeys(c.candidate_id for c in data.candidates))
+        known_result = await session.execute(
+            select(Candidate.id).where(
+                and_(
+                    Candidate.id.in_(candidate_ids),
+                    Candidate.recruitment_request_id == data.recruitment_request_id
+                )
+            )
+        )
+        unknown = sorted(set(candidate_ids) - set(known_result.scalars().all()))
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Candidates not in this recruitment request: {unknown}"
+            )
+
+        # Lock the round's slots so concurrent bookings wait for this transaction
+        result = await session.execute(
+            select(InterviewSlot).where(
+                and_(
+                    InterviewSlot.interview_setup_id == setup.id,
+                    InterviewSlot.round_number == data.round_number,
+                    InterviewSlot.status.in_(["available", "booked"]),
+                    InterviewSlot.slot_date >= date.today()
+                )
+            ).order_by(InterviewSlot.slot_date, InterviewSlot.start_time, InterviewSlot.id).with_for_update()
+        )
+        windows: dict = {}
+        already_scheduled = set()
+        for slot in result.scalars().all():
+            window = windows.setdefault(
+                (slot.slot_date, slot.start_time, slot.end_time), {"open": [], "booked": 0, "busy": set()}
+            )
+            if slot.status == "available" and slot.booked_by_candidate_id is None:
+                window["open"].append(slot)
+            else:
+                window["booked"] += 1
+                window["busy"].add(slot.interviewer_id)
+                already_scheduled.add(slot.booked_by_candidate_id)
+
+        keys = sorted(windows)
+        spans = [
+            (datetime.combine(slot_date, start_time), datetime.combine(slot_date, end_time))
+            for slot_date, start_time, end_time in keys
+        ]
+        seats: List[List[Optional[str]]] = []
+        for key, (start, end) in zip(keys, spans):
+            capacity = max(data.slot_capacity - windows[key]["booked"], 0)
+            if data.interviewers:
+                free = [
+                    interviewer.interviewer_id for interviewer in data.interviewers
+                    if interviewer.interviewer_id not in windows[key]["busy"]
+                    and _covers(interviewer.availability, start, end)
+                ]
+                seats.append(free[:capacity])
+            else:
+                seats.append([None] * capacity)
+
+        availability = {c.candidate_id: c.availability for c in reversed(data.candidates)}
+        to_schedule = [candidate_id for candidate_id in candidate_ids if candidate_id not in already_scheduled]
+        match = max_assignment(
+            [
+                [index for index, (start, end) in enumerate(spans) if seats[index] and _covers(availability[candidate_id], start, end)]
+                for candidate_id in to_schedule
+            ],
+            [len(window_seats) for window_seats in seats]
+        )
+
+        booked_at = datetime.utcnow()
+        bookings = []
+        for candidate_id, index in sorted(
+            ((candidate_id, index) for candidate_id, index in zip(to_schedule, match) if index is not None),
+            key=lambda pair: pair[1]
+        ):
+            key = keys[index]
+            window = windows[key]
+            slot = window["open"].pop(0) if window["open"] else None
+            if slot is None and not data.dry_run:
+                slot = InterviewSlot(
+                    interview_setup_id=setup.id,
+                    slot_date=key[0],
+                    start_time=key[1],
+                    end_time=key[2],
+                    round_number=data.round_number
+                )
+                session.add(slot)
+            interviewer_id = seats[index].pop(0)
+            if not data.dry_run:
+                slot.status = "booked"
+                slot.booked_by_candidate_id = candidate_id
+                slot.booked_at = booked_at
+                slot.interviewer_id = interviewer_id
+            bookings.append((candidate_id, slot, key, interviewer_id))
+
+        if not data.dry_run:
+            await session.flush()
+        # Read ids before commit/rollback expire the slots
+        assignments = [
+            ScheduledInterview(
+                candidate_id=candidate_id,
+                slot_id=slot.id if slot is not None else None,
+                slot_date=key[0],
+                start_time=key[1],
+                end_time=key[2],
+                interviewer_id=interviewer_id
+            )
+            for candidate_id, slot, key, interviewer_id in bookings
+        ]
+        if data.dry_run:
+            await session.rollback()
+        else:
+            if bookings:
+                await session.execute(insert(ActivityLog), [
+                    {
+                        "candidate_id": candidate_id,
+                        "stage": "Interview",
+                        "action_type": "interview_booked",
+                        "action_description": f"Interview slot booked for {key[0].strftime('%d %b %Y')} at {key[1].strftime('%H:%M')}",
+                        "performed_by": "hr",
+                        "performed_by_id": performed_by_id,
+                        "timestamp": booked_at,
+                        "visibility": "candidate",
+                    }
+                    for candidate_id, _, key, _ in bookings
+                ])
+            await session.commit()
+
+        scheduled = {candidate_id for candidate_id, *_ in bookings}
+        return ScheduleOptimizeResponse(
+            recruitment_request_id=data.recruitment_request_id,
+            round_number=data.round_number,
+            dry_run=data.dry_run,
+            scheduled=len(bookings),
+            assignments=assignments,
+            unscheduled_candidate_ids=[c for c in to_schedule if c not in scheduled],
+            already_scheduled_candidate_ids=[c for c in candidate_ids if c in already_scheduled],
+            elapsed_ms=round((perf_counter() - started) * 1000, 1)
+        )
+    
     async def get_confirmed_interviews(
         self, session: AsyncSession, recruitment_request_id: int
     ) -> List[InterviewSlotResponse]:
@@ -576,8 +752,13 @@ class InterviewService:
         performed_by_id: str = None,
         visibility: str = "internal"
     ) -> ActivityLog:
-        """Log an activity entry (immutable audit trail)."""
-        log = ActivityLog(
+        """Log an activity entry (immutable audit trail).
+
+        Buffered and bulk-inserted by the log writer while it is running.
+        """
+        return await get_log_writer().write(
+            session,
+            ActivityLog,
             candidate_id=candidate_id,
             stage=stage,
             action_type=action_type,
@@ -587,10 +768,6 @@ class InterviewService:
             visibility=visibility,
             timestamp=datetime.utcnow()
         )
-        session.add(log)
-        await session.commit()
-        await session.refresh(log)
-        return log
 
     async def get_candidate_activity_history(
         self, session: AsyncSession, candidate_id: int
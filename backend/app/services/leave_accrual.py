@@ -0,0 +1,265 @@
+"""Batch leave accrual and year-end carry-forward engine.
+
+Computes annual leave balances for every active employee in a handful of
+vectorized pandas passes instead of touching ``LeaveBalance`` rows one at a
+time:
+
+- Monthly accrual: ``annual_leave_entitlement`` (default 30 days, Article 29)
+  is earned pro rata per month of service in the year, starting from the
+  joining month (or the following month when joining after the 15th).
+- Carry-forward: the unused annual balance of the previous year is carried
+  into the new year, capped at ``leave_carry_forward_cap_days`` (Article 29.4).
+- Expiry: carried-forward days not consumed by the end of
+  ``leave_carry_forward_expiry_month`` are forfeited.
+
+Every value is derived from current data, so re-running the engine for the
+same date is idempotent. Results are bulk-upserted (one INSERT and one
+UPDATE statement), or returned without writing in dry-run mode.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import List
+
+import pandas as pd
+from sqlalchemy import and_, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.employee import Employee
+from app.models.leave import LeaveBalance
+
+logger = logging.getLogger(__name__)
+
+ACCRUAL_LEAVE_TYPE = "annual"
+DEFAULT_ANNUAL_ENTITLEMENT = 30
+# Joining after this day of the month starts accrual from the next month
+MID_MONTH_CUTOFF_DAY = 15
+
+_BALANCE_COLUMNS = ["id", "employee_id", "entitlement", "carried_forward", "used", "pending", "adjustment"]
+
+
+@dataclass
+class AccrualRunResult:
+    """Outcome of an accrual run."""
+    as_of: date
+    year: int
+    dry_run: bool
+    employees_processed: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    expired_days: Decimal = Decimal("0")
+    changes: List[dict] = field(default_factory=list)
+
+
+def _to_decimal(value: float) -> Decimal:
+    return Decimal(f"{float(value):.2f}")
+
+
+def _numeric_balances(balances: pd.DataFrame) -> pd.DataFrame:
+    frame = balances.copy()
+    frame["employee_id"] = frame["employee_id"].astype("int64")
+    for column in ["entitlement", "carried_forward", "used", "pending", "adjustment"]:
+        frame[column] = frame[column].astype(float)
+    return frame
+
+
+def compute_accruals(
+    employees: pd.DataFrame,
+    current: pd.DataFrame,
+    previous: pd.DataFrame,
+    as_of: date,
+    carry_forward_cap: float,
+    expiry_month: int
+) -> pd.DataFrame:
+    """Compute target annual leave balances for all employees at once.
+
+    Args:
+        employees: Columns ``employee_id``, ``name``, ``joining_date``, ``annual_leave_entitlement``
+        current: Current-year annual balances (``_BALANCE_COLUMNS``)
+        previous: Previous-year annual balances (``_BALANCE_COLUMNS``)
+        as_of: Date the accrual is computed for
+        carry_forward_cap: Maximum days carried into the new year
+        expiry_month: Carried-forward days expire after the end of this month (0 disables expiry)
+
+    Returns:
+        One row per employee with current and target ``entitlement``/``carried_forward``
+    """
+    year, month = as_of.year, as_of.month
+    frame = employees.copy()
+    frame["employee_id"] = frame["employee_id"].astype("int64")
+
+    # --- Monthly accrual -------------------------------------------------
+    annual = pd.to_numeric(frame["annual_leave_entitlement"], errors="coerce")
+    annual = annual.fillna(DEFAULT_ANNUAL_ENTITLEMENT).astype(float)
+
+    joining = pd.to_datetime(frame["joining_date"], errors="coerce")
+    join_index = (
+        (joining.dt.year - year) * 12
+        + joining.dt.month
+        + (joining.dt.day > MID_MONTH_CUTOFF_DAY).astype(int)
+    )
+    # Unknown joining date: treat as employed for the whole year
+    first_month = join_index.fillna(1).clip(lower=1, upper=13)
+    months_accrued = (month - first_month + 1).clip(lower=0, upper=12)
+    frame["target_entitlement"] = (annual * months_accrued / 12).round(2)
+
+    # --- Carry-forward from previous year -------------------------------
+    prev = _numeric_balances(previous)
+    prev["prev_available"] = (
+        prev["entitlement"] + prev["carried_forward"] + prev["adjustment"]
+        - prev["used"] - prev["pending"]
+    )
+    prev = prev.groupby("employee_id", as_index=False)["prev_available"].sum()
+    frame = frame.merge(prev, on="employee_id", how="left")
+    frame["target_carried_forward"] = (
+        frame["prev_available"].fillna(0).clip(lower=0, upper=carry_forward_cap).round(2)
+    )
+
+    # --- Existing current-year balances ---------------------------------
+    cur = _numeric_balances(current).drop_duplicates("employee_id").rename(columns={
+        "id": "balance_id",
+        "entitlement": "current_entitlement",
+        "carried_forward": "current_carried_forward",
+    })
+    frame = frame.merge(cur, on="employee_id", how="left")
+    consumed = frame["used"].fillna(0) + frame["pending"].fillna(0)
+
+    # --- Expiry of unused carried-forward days --------------------------
+    expired = pd.Series(0.0, index=frame.index)
+    if expiry_month and month > expiry_month:
+        kept = frame["target_carried_forward"].where(
+            frame["target_carried_forward"] <= consumed, consumed
+        )
+        expired = (frame["target_carried_forward"] - kept).round(2)
+        frame["target_carried_forward"] = kept.round(2)
+    frame["expired"] = expired
+
+    frame["is_new"] = frame["balance_id"].isna()
+    frame["is_changed"] = frame["is_new"] | (
+        (frame["current_entitlement"].round(2) != frame["target_entitlement"])
+        | (frame["current_carried_forward"].round(2) != frame["target_carried_forward"])
+    )
+    return frame
+
+
+class LeaveAccrualEngine:
+    """Runs accrual, carry-forward and expiry for all active employees."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.settings = get_settings()
+
+    async def _load_employees(self) -> pd.DataFrame:
+        result = await self.session.execute(
+            select(
+                Employee.id.label("employee_id"),
+                Employee.name,
+                Employee.joining_date,
+                Employee.annual_leave_entitlement
+            ).where(Employee.is_active == True)
+        )
+        return pd.DataFrame(
+            result.all(),
+            columns=["employee_id", "name", "joining_date", "annual_leave_entitlement"]
+        )
+
+    async def _load_balances(self, year: int) -> pd.DataFrame:
+        result = await self.session.execute(
+            select(
+                LeaveBalance.id,
+                LeaveBalance.employee_id,
+                LeaveBalance.entitlement,
+                LeaveBalance.carried_forward,
+                LeaveBalance.used,
+                LeaveBalance.pending,
+                LeaveBalance.adjustment
+            ).where(
+                and_(
+                    LeaveBalance.year == year,
+                    LeaveBalance.leave_type == ACCRUAL_LEAVE_TYPE
+                )
+            ).order_by(LeaveBalance.id)
+        )
+        return pd.DataFrame(result.all(), columns=_BALANCE_COLUMNS)
+
+    async def run(self, as_of: date, dry_run: bool = True) -> AccrualRunResult:
+        """Compute balances as of a date and upsert them unless dry_run.
+
+        Args:
+            as_of: Accrual date (balances are accrued to the end of its month)
+            dry_run: When True, only report what would change
+
+        Returns:
+            AccrualRunResult with counts and per-employee changes
+        """
+        year = as_of.year
+        employees = await self._load_employees()
+        result = AccrualRunResult(as_of=as_of, year=year, dry_run=dry_run)
+        if employees.empty:
+            return result
+
+        frame = compute_accruals(
+            employees,
+            current=await self._load_balances(year),
+            previous=await self._load_balances(year - 1),
+            as_of=as_of,
+            carry_forward_cap=float(self.settings.leave_carry_forward_cap_days),
+            expiry_month=self.settings.leave_carry_forward_expiry_month,
+        )
+
+        changed = frame[frame["is_changed"]]
+        result.employees_processed = len(frame)
+        result.created = int(changed["is_new"].sum())
+        result.updated = int(len(changed) - result.created)
+        result.unchanged = int(len(frame) - len(changed))
+        result.expired_days = _to_decimal(frame["expired"].sum())
+        result.changes = [
+            {
+                "employee_id": int(row.employee_id),
+                "employee_name": row.name,
+                "action": "create" if row.is_new else "update",
+                "entitlement_before": None if row.is_new else _to_decimal(row.current_entitlement),
+                "entitlement_after": _to_decimal(row.target_entitlement),
+                "carried_forward_before": None if row.is_new else _to_decimal(row.current_carried_forward),
+                "carried_forward_after": _to_decimal(row.target_carried_forward),
+                "expired_days": _to_decimal(row.expired),
+            }
+            for row in changed.itertuples(index=False)
+        ]
+
+        if dry_run or changed.empty:
+            return result
+
+        inserts = [
+            {
+                "employee_id": int(row.employee_id),
+                "year": year,
+                "leave_type": ACCRUAL_LEAVE_TYPE,
+                "entitlement": _to_decimal(row.target_entitlement),
+                "carried_forward": _to_decimal(row.target_carried_forward),
+            }
+            for row in changed[changed["is_new"]].itertuples(index=False)
+        ]
+        updates = [
+            {
+                "id": int(row.balance_id),
+                "entitlement": _to_decimal(row.target_entitlement),
+                "carried_forward": _to_decimal(row.target_carried_forward),
+            }
+            for row in changed[~changed["is_new"]].itertuples(index=False)
+        ]
+        if inserts:
+            await self.session.execute(insert(LeaveBalance), inserts)
+        if updates:
+            await self.session.execute(update(LeaveBalance), updates)
+        await self.session.commit()
+
+        logger.info(
+            "Leave accrual for %s: %d created, %d updated, %s days expired",
+            as_of, result.created, result.updated, result.expired_days
+        )
+        return result
+
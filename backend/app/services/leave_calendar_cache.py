@@ -0,0 +1,326 @@
+"""Per-month cache for the leave calendar.
+
+The calendar view joins approved leave requests with employees and overlays
+public holidays. Managers open it constantly while the underlying data only
+changes when leave is approved/cancelled or holidays are edited, so each
+calendar month is built once and kept in memory until one of those writes
+invalidates it (or the TTL expires, which bounds staleness across workers).
+
+Each month snapshot carries a content hash used as the HTTP ``ETag`` so
+clients, including iCal subscribers, can revalidate with ``If-None-Match``.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.employee import Employee
+from app.models.leave import LeaveRequest
+from app.services.holiday_index import get_holiday_index
+
+logger = logging.getLogger(__name__)
+
+MonthKey = Tuple[int, int]
+
+
+@dataclass
+class MonthSnapshot:
+    """Calendar entries overlapping a single month."""
+    year: int
+    month: int
+    entries: List[dict] = field(default_factory=list)
+    etag: str = ""
+    built_at: float = 0.0
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """Return the first and last day of a month."""
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+
+def months_in_range(start_date: date, end_date: date) -> List[MonthKey]:
+    """List the (year, month) keys covered by a date range, inclusive."""
+    keys: List[MonthKey] = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        keys.append((year, month))
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return keys
+
+
+def _hash_entries(entries: Iterable[dict]) -> str:
+    payload = json.dumps(list(entries), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an ``If-None-Match`` header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    for candidate in candidates:
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag.strip('"'):
+            return True
+    return False
+
+
+class LeaveCalendarCache:
+    """Process-wide cache of calendar month snapshots."""
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._months: Dict[MonthKey, MonthSnapshot] = {}
+        self._lock = asyncio.Lock()
+        # Bumped on every invalidation so a build that raced with a write
+        # is not stored over the fresher state.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _is_fresh(self, snapshot: MonthSnapshot) -> bool:
+        return (time.monotonic() - snapshot.built_at) < self.ttl_seconds
+
+    async def get_months(
+        self,
+        session: AsyncSession,
+        keys: List[MonthKey]
+    ) -> List[MonthSnapshot]:
+        """Return snapshots for the requested months, building any that are missing.
+
+        Missing months are loaded together with one leave query spanning
+        their combined range; holidays come from the in-memory holiday index.
+        """
+        snapshots: Dict[MonthKey, MonthSnapshot] = {}
+        missing: List[MonthKey] = []
+        for key in keys:
+            snapshot = self._months.get(key)
+            if snapshot and self._is_fresh(snapshot):
+                snapshots[key] = snapshot
+                self.hits += 1
+            else:
+                missing.append(key)
+
+        if missing:
+            self.misses += len(missing)
+            async with self._lock:
+                generation = self._generation
+                built = await self._build_months(session, missing)
+                if generation == self._generation:
+                    self._months.update(built)
+            snapshots.update(built)
+
+        return [snapshots[key] for key in keys]
+
+    async def _build_months(
+        self,
+        session: AsyncSession,
+        keys: List[MonthKey]
+    ) -> Dict[MonthKey, MonthSnapshot]:
+        range_start = month_bounds(*min(keys))[0]
+        range_end = month_bounds(*max(keys))[1]
+
+        leave_result = await session.execute(
+            select(LeaveRequest, Employee.name).join(
+                Employee, LeaveRequest.employee_id == Employee.id
+            ).where(
+                and_(
+                    LeaveRequest.status == "approved",
+                    LeaveRequest.start_date <= range_end,
+                    LeaveRequest.end_date >= range_start
+                )
+            ).order_by(LeaveRequest.start_date)
+        )
+        entries = [
+            {
+                "uid": f"leave-{leave.id}",
+                "employee_id": leave.employee_id,
+                "employee_name": employee_name,
+                "leave_type": leave.leave_type,
+                "start_date": leave.start_date,
+                "end_date": leave.end_date,
+                "status": leave.status,
+                "is_half_day": leave.is_half_day,
+                "is_holiday": False,
+            }
+            for leave, employee_name in leave_result.all()
+        ]
+
+        holidays = await get_holiday_index().holidays_in_range(
+            session, range_start, range_end
+        )
+        entries.extend(
+            {
+                "uid": f"holiday-{holiday.id}",
+                "employee_id": 0,  # System entry
+                "employee_name": holiday.name,
+                "leave_type": "public_holiday",
+                "start_date": holiday.start_date,
+                "end_date": holiday.end_date,
+                "status": "approved",
+                "is_half_day": False,
+                "is_holiday": True,
+            }
+            for holiday in holidays
+        )
+
+        now = time.monotonic()
+        built: Dict[MonthKey, MonthSnapshot] = {}
+        for key in keys:
+            first_day, last_day = month_bounds(*key)
+            month_entries = [
+                entry for entry in entries
+                if entry["start_date"] <= last_day and entry["end_date"] >= first_day
+            ]
+            built[key] = MonthSnapshot(
+                year=key[0],
+                month=key[1],
+                entries=month_entries,
+                etag=_hash_entries(month_entries),
+                built_at=now,
+            )
+        logger.debug("Built leave calendar months %s", keys)
+        return built
+
+    def invalidate_range(self, start_date: date, end_date: date) -> None:
+        """Drop cached months overlapping a date range."""
+        self._generation += 1
+        for key in months_in_range(start_date, end_date):
+            self._months.pop(key, None)
+
+    def invalidate_all(self) -> None:
+        """Drop every cached month."""
+        self._generation += 1
+        self._months.clear()
+
+
+def collect_entries(
+    snapshots: List[MonthSnapshot],
+    start_date: date,
+    end_date: date,
+    include_holidays: bool = True
+) -> List[dict]:
+    """Merge month snapshots into calendar entries for a date range.
+
+    Leave spanning several months appears in each month's snapshot, so
+    entries are de-duplicated by uid.
+    """
+    seen = set()
+    entries: List[dict] = []
+    for snapshot in snapshots:
+        for entry in snapshot.entries:
+            if entry["uid"] in seen:
+                continue
+            if entry["is_holiday"] and not include_holidays:
+                continue
+            if entry["start_date"] > end_date or entry["end_date"] < start_date:
+                continue
+            seen.add(entry["uid"])
+            entries.append(entry)
+    entries.sort(key=lambda entry: entry["start_date"])
+    return entries
+
+
+def calendar_etag(
+    snapshots: List[MonthSnapshot],
+    start_date: date,
+    end_date: date,
+    include_holidays: bool,
+    variant: str = "json"
+) -> str:
+    """Derive a response ETag from the month snapshots and request parameters."""
+    parts = [variant, start_date.isoformat(), end_date.isoformat(), str(include_holidays)]
+    parts.extend(snapshot.etag for snapshot in snapshots)
+    digest = hashlib.sha1("|".join(parts).encode("utf-8"), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def _ical_escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ical_fold(line: str) -> str:
+    """Fold a content line at 75 octets as required by RFC 5545."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    current = ""
+    limit = 75
+    for char in line:
+        if len((current + char).encode("utf-8")) > limit:
+            parts.append(current)
+            current = char
+            limit = 74  # continuation lines start with a space
+        else:
+            current += char
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def render_ical(entries: List[dict], calendar_name: str = "Leave Calendar") -> str:
+    """Render calendar entries as an iCalendar (RFC 5545) document."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Baynunah HR Portal//Leave Calendar//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_ical_escape(calendar_name)}",
+    ]
+    for entry in entries:
+        if entry["is_holiday"]:
+            summary = f"Public Holiday: {entry['employee_name']}"
+        else:
+            leave_label = entry["leave_type"].replace("_", " ").title()
+            summary = f"{entry['employee_name']} - {leave_label} Leave"
+            if entry["is_half_day"]:
+                summary += " (Half Day)"
+        lines.extend([
+            "BEGIN:VEVENT",
+            f"UID:{entry['uid']}@hr-portal",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{entry['start_date'].strftime('%Y%m%d')}",
+            # DTEND is exclusive for all-day events
+            f"DTEND;VALUE=DATE:{(entry['end_date'] + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{_ical_escape(summary)}",
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ])
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_ical_fold(line) for line in lines) + "\r\n"
+
+
+# Singleton instance
+_calendar_cache: Optional[LeaveCalendarCache] = None
+
+
+def get_leave_calendar_cache() -> LeaveCalendarCache:
+    """Get or create the leave calendar cache singleton."""
+    global _calendar_cache
+    if _calendar_cache is None:
+        _calendar_cache = LeaveCalendarCache(
+            ttl_seconds=get_settings().leave_calendar_cache_ttl_seconds
+        )
+    return _calendar_cache
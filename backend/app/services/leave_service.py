@@ -3,21 +3,26 @@
 This service handles:
 - Leave balance calculations including offset days
 - Overlap detection for leave requests
+- Team coverage (per-day absence counts) for managers
 - Public holiday integration
-- Manager notification coordination
+- Manager notification coordination (queued through the email outbox)
 - UAE compliance checks (Article 29, 30, 31)
 """
-from datetime import date, datetime, timezone
+import html
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.employee import Employee
 from app.models.leave import LeaveBalance, LeaveRequest, LEAVE_TYPES
-from app.models.public_holiday import PublicHoliday
+from app.models.email_outbox import EmailOutbox
+from app.services.email_outbox import enqueue_email, register_sent_handler
+from app.services.notification_digest import queue_digest_item
 from app.services.email_service import get_email_service
+from app.services.holiday_index import HolidayEntry, get_holiday_index
 
 
 class LeaveValidationError(Exception):
@@ -25,6 +30,72 @@ class LeaveValidationError(Exception):
     pass
 
 
+def _merge_intervals(intervals: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Merge overlapping or adjacent date intervals."""
+    merged: List[Tuple[date, date]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compute_daily_absence(
+    intervals: List[Tuple[int, date, date, str]],
+    start_date: date,
+    end_date: date
+) -> List[Tuple[date, int, int]]:
+    """Count absent employees per day with a sweep over interval endpoints.
+    
+    Each employee's intervals are merged first so overlapping requests from
+    the same person are counted once. Runs in O(n log n + days).
+    
+    Args:
+        intervals: (employee_id, start_date, end_date, status) tuples
+        start_date: First day to report
+        end_date: Last day to report
+    
+    Returns:
+        List of (day, absent_count, approved_count) for every day in range
+    """
+    all_by_employee: Dict[int, List[Tuple[date, date]]] = {}
+    approved_by_employee: Dict[int, List[Tuple[date, date]]] = {}
+    for employee_id, leave_start, leave_end, status in intervals:
+        clipped = (max(leave_start, start_date), min(leave_end, end_date))
+        if clipped[0] > clipped[1]:
+            continue
+        all_by_employee.setdefault(employee_id, []).append(clipped)
+        if status == "approved":
+            approved_by_employee.setdefault(employee_id, []).append(clipped)
+    
+    # Events are (day, absent_delta, approved_delta); ends fire the day after
+    events: List[Tuple[date, int, int]] = []
+    for employee_intervals in all_by_employee.values():
+        for start, end in _merge_intervals(employee_intervals):
+            events.append((start, 1, 0))
+            events.append((end + timedelta(days=1), -1, 0))
+    for employee_intervals in approved_by_employee.values():
+        for start, end in _merge_intervals(employee_intervals):
+            events.append((start, 0, 1))
+            events.append((end + timedelta(days=1), 0, -1))
+    events.sort()
+    
+    days: List[Tuple[date, int, int]] = []
+    absent = approved = 0
+    index = 0
+    day = start_date
+    while day <= end_date:
+        while index < len(events) and events[index][0] <= day:
+            absent += events[index][1]
+            approved += events[index][2]
+            index += 1
+        days.append((day, absent, approved))
+        day += timedelta(days=1)
+    return days
+
+
 class LeaveService:
     """Service for leave management operations."""
     
@@ -56,7 +127,7 @@ class LeaveService:
             exclude_request_id: Optional request ID to exclude (for updates)
         
         Returns:
-            LeaveRequest if overlap exists, None otherwise
+            Earliest overlapping LeaveRequest if any exists, None otherwise
         """
         query = select(LeaveRequest).where(
             and_(
@@ -70,14 +141,17 @@ class LeaveService:
         if exclude_request_id:
             query = query.where(LeaveRequest.id != exclude_request_id)
         
-        result = await self.session.execute(query)
-        return result.scalar_one_or_none()
+        # Several requests may overlap; report the earliest one
+        result = await self.session.execute(
+            query.order_by(LeaveRequest.start_date).limit(1)
+        )
+        return result.scalars().first()
     
     async def get_public_holidays_in_range(
         self,
         start_date: date,
         end_date: date
-    ) -> List[PublicHoliday]:
+    ) -> List[HolidayEntry]:
         """Get all public holidays within a date range.
         
         Args:
@@ -85,18 +159,11 @@ class LeaveService:
             end_date: Range end date
         
         Returns:
-            List of PublicHoliday objects
+            List of HolidayEntry objects from the in-memory holiday index
         """
-        query = select(PublicHoliday).where(
-            and_(
-                PublicHoliday.is_active == True,
-                PublicHoliday.start_date <= end_date,
-                PublicHoliday.end_date >= start_date
-            )
-        ).order_by(PublicHoliday.start_date)
-        
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+        return await get_holiday_index().holidays_in_range(
+            self.session, start_date, end_date
+        )
     
     async def calculate_working_days(
         self,
@@ -250,13 +317,13 @@ class LeaveService:
         
         return True, None, calculated_days
     
-    async def send_manager_notification(
+    async def build_manager_notification(
         self,
         leave_request: LeaveRequest,
         employee: Employee,
         manager: Employee
-    ) -> bool:
-        """Send email notification to manager about new leave request.
+    ) -> Tuple[str, str, str]:
+        """Build the manager email for a new leave request.
         
         Args:
             leave_request: The leave request
@@ -264,11 +331,8 @@ class LeaveService:
             manager: The manager to notify
         
         Returns:
-            True if email sent successfully, False otherwise
+            Tuple of (subject, html_body, text_body)
         """
-        if not manager.email:
-            return False
-        
         subject = f"Leave Request from {employee.name} - {leave_request.leave_type.title()}"
         
         # Calculate balance info
@@ -349,6 +413,33 @@ class LeaveService:
         For questions, contact HR at hr@baynunah.ae
         """
         
+        return subject, html_body, text_body
+    
+    async def send_manager_notification(
+        self,
+        leave_request: LeaveRequest,
+        employee: Employee,
+        manager: Employee
+    ) -> bool:
+        """Send email notification to manager about new leave request.
+        
+        Sends inline over SMTP; request handlers should use
+        enqueue_manager_notification instead.
+        
+        Args:
+            leave_request: The leave request
+            employee: The employee requesting leave
+            manager: The manager to notify
+        
+        Returns:
+            True if email sent successfully, False otherwise
+        """
+        if not manager.email:
+            return False
+        
+        subject, html_body, text_body = await self.build_manager_notification(
+            leave_request, employee, manager
+        )
         success = await self.email_service.send_email(
             manager.email,
             subject,
@@ -364,6 +455,203 @@ class LeaveService:
         
         return success
     
+    async def get_team_coverage(
+        self,
+        manager_id: int,
+        start_date: date,
+        end_date: date,
+        min_staffing: int
+    ) -> dict:
+        """Compute per-day absence counts for a manager's direct reports.
+        
+        Pending and approved requests are both counted as absences so
+        managers can see the impact before approving.
+        
+        Args:
+            manager_id: Line manager whose team is checked
+            start_date: Range start date
+            end_date: Range end date
+            min_staffing: Minimum number of team members that must be present
+        
+        Returns:
+            Dict with team size, per-day counts and understaffed dates
+        """
+        size_result = await self.session.execute(
+            select(func.count(Employee.id)).where(
+                and_(
+                    Employee.line_manager_id == manager_id,
+                    Employee.is_active == True
+                )
+            )
+        )
+        team_size = size_result.scalar() or 0
+        
+        interval_result = await self.session.execute(
+            select(
+                LeaveRequest.employee_id,
+                LeaveRequest.start_date,
+                LeaveRequest.end_date,
+                LeaveRequest.status
+            ).join(
+                Employee, LeaveRequest.employee_id == Employee.id
+            ).where(
+                and_(
+                    Employee.line_manager_id == manager_id,
+                    Employee.is_active == True,
+                    LeaveRequest.status.in_(["pending", "approved"]),
+                    LeaveRequest.start_date <= end_date,
+                    LeaveRequest.end_date >= start_date
+                )
+            )
+        )
+        intervals = [tuple(row) for row in interval_result.all()]
+        
+        days = []
+        understaffed = []
+        for day, absent, approved in compute_daily_absence(intervals, start_date, end_date):
+            present = max(team_size - absent, 0)
+            below_minimum = present < min_staffing
+            if below_minimum:
+                understaffed.append(day)
+            days.append({
+                "date": day,
+                "absent_count": absent,
+                "approved_count": approved,
+                "pending_count": absent - approved,
+                "present_count": present,
+                "below_minimum": below_minimum,
+            })
+        
+        return {
+            "manager_id": manager_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "team_size": team_size,
+            "min_staffing": min_staffing,
+            "days": days,
+            "understaffed_dates": understaffed,
+        }
+    
+    async def enqueue_manager_notification(
+        self,
+        leave_request: LeaveRequest,
+        employee: Employee,
+        manager: Employee
+    ) -> bool:
+        """Queue the manager email for a new leave request in the outbox.
+        
+        The message is added to the current transaction; the request is
+        flagged as manager_notified once the outbox worker delivers it.
+        
+        Args:
+            leave_request: The leave request (must have an id, i.e. be flushed)
+            employee: The employee requesting leave
+            manager: The manager to notify
+        
+        Returns:
+            True if a message was queued, False if the manager has no email
+        """
+        if not manager.email:
+            return False
+        
+        subject, html_body, text_body = await self.build_manager_notification(
+            leave_request, employee, manager
+        )
+        enqueue_email(
+            self.session,
+            manager.email,
+            subject,
+            html_body,
+            text_body,
+            category="leave_submitted",
+            source_type="leave_request",
+            source_id=leave_request.id
+        )
+        return True
+    
+    async def enqueue_decision_notification(
+        self,
+        leave_request: LeaveRequest,
+        employee: Employee,
+        approver: Employee
+    ) -> bool:
+        """Queue an approval/rejection email to the employee.
+        
+        The email goes through the employee's notification digest, so
+        several decisions made together reach them as one message.
+        
+        Args:
+            leave_request: The decided leave request
+            employee: The employee who requested leave
+            approver: Manager or HR user who made the decision
+        
+        Returns:
+            True if a message was queued, False if the employee has no email
+        """
+        if not employee.email:
+            return False
+        
+        approved = leave_request.status == "approved"
+        decision = "Approved" if approved else "Rejected"
+        period = (
+            f"{leave_request.start_date.strftime('%d %b %Y')} - "
+            f"{leave_request.end_date.strftime('%d %b %Y')}"
+        )
+        reason_line = (
+            f"Reason: {leave_request.rejection_reason}"
+            if not approved and leave_request.rejection_reason else ""
+        )
+        subject = f"Leave Request {decision} - {leave_request.leave_type.title()}"
+        # Names and the rejection reason are free text
+        employee_name = html.escape(employee.name or "")
+        approver_name = html.escape(approver.name or "")
+        reason_html = html.escape(leave_request.rejection_reason) if reason_line else ""
+        
+        html_body = f"""
+        <!DOCTYPE html>
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2 style="color: {'#16a34a' if approved else '#dc2626'};">Leave Request {decision}</h2>
+                <p>Dear {employee_name},</p>
+                <p>Your {leave_request.leave_type} leave request for {period}
+                ({leave_request.total_days} days) has been {decision.lower()} by {approver_name}.</p>
+                {f'<p><strong>Reason:</strong> {reason_html}</p>' if reason_line else ''}
+                <p style="font-size: 12px; color: #64748b;">This is an automated notification from Baynunah HR Portal.</p>
+            </div>
+        </body>
+        </html>
+        """
+        
+        text_body = f"""
+        Leave Request {decision}
+        
+        Dear {employee.name},
+        
+        Your {leave_request.leave_type} leave request for {period}
+        ({leave_request.total_days} days) has been {decision.lower()} by {approver.name}.
+        
+        {reason_line}
+        
+        ---
+        This is an automated notification from Baynunah HR Portal.
+        """
+        
+        await queue_digest_item(
+            self.session,
+            title=subject,
+            message=(
+                f"Your {leave_request.leave_type} leave for {period} was "
+                f"{decision.lower()} by {approver.name}."
+            ),
+            to_email=employee.email,
+            category=f"leave_{decision.lower()}",
+            email=(subject, html_body, text_body),
+            source_type="leave_request",
+            source_id=leave_request.id
+        )
+        return True
+    
     async def get_manager_for_employee(self, employee_id: int) -> Optional[Employee]:
         """Get the line manager for an employee.
         
@@ -392,3 +680,14 @@ class LeaveService:
 async def get_leave_service(session: AsyncSession) -> LeaveService:
     """Get leave service instance."""
     return LeaveService(session)
+
+
+async def _mark_manager_notified(session: AsyncSession, message: EmailOutbox) -> None:
+    """Flag the leave request once its manager email has been delivered."""
+    leave_request = await session.get(LeaveRequest, message.source_id)
+    if leave_request:
+        leave_request.manager_notified = True
+        leave_request.notification_sent_at = message.sent_at
+
+
+register_sent_handler("leave_submitted", _mark_manager_notified)
@@ -0,0 +1,202 @@
+"""Buffered, bulk writer for append-only log tables.
+
+Activity and audit log lines are written on nearly every recruitment
+action; committing each one inside the request costs a round trip and a
+commit per line. While the writer is running (it is started from the
+application lifespan), :meth:`BufferedLogWriter.write` only appends the row
+to an in-memory buffer. A background task inserts buffered rows with one
+bulk INSERT per table:
+
+- as soon as ``log_writer_batch_size`` rows are waiting, or
+- every ``log_writer_flush_interval_ms`` otherwise.
+
+Shutdown flushes whatever is left. Rows carry the timestamp of the action,
+not of the flush. If a flush fails because the database is unreachable, its
+rows are put back for the next attempt; once ``log_writer_max_buffer`` rows
+are waiting, the oldest are dropped (and logged) rather than growing without
+bound. If the database rejects the batch itself (a constraint or bad value),
+the rows are retried one at a time and only those still rejected are logged
+and dropped, so a single bad row cannot hold up the rest.
+
+When the writer is not running (scripts, tests, workers outside the app),
+``write`` falls back to adding the row to the caller's session and
+committing, as before.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed write is worth repeating unchanged later."""
+    if isinstance(error, (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+class BufferedLogWriter:
+    """Per-worker buffer of log rows flushed in bulk by a background task."""
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        max_buffer: Optional[int] = None
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.log_writer_batch_size
+        self.flush_interval = (flush_interval_ms or settings.log_writer_flush_interval_ms) / 1000
+        self.max_buffer = max_buffer or settings.log_writer_max_buffer
+        self._buffer: Deque[Tuple[Type, Dict[str, Any]]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def start(self):
+        """Start the flush loop on the running event loop."""
+        if self.is_running:
+            logger.warning("Log writer already running")
+            return
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Log writer started")
+
+    async def stop(self):
+        """Stop the flush loop and write everything still buffered."""
+        if not self.is_running:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+        logger.info(f"Log writer stopped ({self.written} rows written, {self.dropped} dropped)")
+
+    async def write(self, session: AsyncSession, model: Type, **values):
+        """Record one log row.
+
+        Buffered while the writer is running; the returned instance is then
+        not yet persisted (no ``id``). Otherwise the row is added to
+        ``session`` and committed immediately.
+        """
+        if not self.is_running:
+            entry = model(**values)
+            session.add(entry)
+            await session.commit()
+            await session.refresh(entry)
+            return entry
+        self._append([(model, values)])
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+        return model(**values)
+
+    def _append(self, rows: List[Tuple[Type, Dict[str, Any]]]):
+        self._buffer.extend(rows)
+        overflow = len(self._buffer) - self.max_buffer
+        if overflow > 0:
+            for _ in range(overflow):
+                self._buffer.popleft()
+            self.dropped += overflow
+            logger.error(f"Log writer buffer full; dropped {overflow} oldest rows")
+
+    def _requeue(self, rows: List[Tuple[Type, Dict[str, Any]]]):
+        # Keep them ahead of rows buffered meanwhile
+        newer = list(self._buffer)
+        self._buffer.clear()
+        self._append(rows + newer)
+
+    async def flush(self) -> int:
+        """Insert all buffered rows, one bulk INSERT per table.
+
+        Returns:
+            Number of rows written
+        """
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            rows = list(self._buffer)
+            self._buffer.clear()
+            by_model: Dict[Type, List[Dict[str, Any]]] = {}
+            for model, values in rows:
+                by_model.setdefault(model, []).append(values)
+            try:
+                async with self.session_factory() as session:
+                    for model, values in by_model.items():
+                        await session.execute(insert(model), values)
+                    await session.commit()
+            except Exception as e:
+                if _is_transient(e):
+                    logger.error(f"Log writer flush of {len(rows)} rows failed: {e}")
+                    self._requeue(rows)
+                    return 0
+                logger.warning(f"Log writer bulk insert of {len(rows)} rows rejected, retrying one by one: {e}")
+                return await self._flush_singly(rows)
+            self.written += len(rows)
+            return len(rows)
+
+    async def _flush_singly(self, rows: List[Tuple[Type, Dict[str, Any]]]) -> int:
+        """Insert rows one per transaction, dropping those the database rejects."""
+        written = 0
+        for index, (model, values) in enumerate(rows):
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(insert(model), values)
+                    await session.commit()
+            except Exception as e:
+                if _is_transient(e):
+                    logger.error(f"Log writer flush failed with {len(rows) - index} rows left: {e}")
+                    self._requeue(rows[index:])
+                    break
+                self.dropped += 1
+                logger.error(f"Log writer dropped a {model.__tablename__} row: {e} ({values})")
+                continue
+            written += 1
+        self.written += written
+        return written
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+        # Shutdown: one last attempt for anything still buffered
+        await self.flush()
+        if self._buffer:
+            logger.error(f"Log writer stopped with {len(self._buffer)} unwritten rows")
+
+
+# Singleton instance
+_log_writer: Optional[BufferedLogWriter] = None
+
+
+def get_log_writer() -> BufferedLogWriter:
+    """Get or create the log writer singleton."""
+    global _log_writer
+    if _log_writer is None:
+        _log_writer = BufferedLogWriter()
+    return _log_writer
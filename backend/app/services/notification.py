@@ -1,5 +1,7 @@
 from app.repositories.notification import NotificationRepository
-from app.schemas.notification import NotificationCreate, NotificationResponse
+from app.schemas.notification import (
+    NotificationCreate, NotificationResponse, NotificationPage, NotificationReadResult
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
@@ -15,6 +17,28 @@ class NotificationService:
         notifications = await self.repo.list(session, user_id, unread_only)
         return [NotificationResponse.from_orm(n) for n in notifications]
 
-    async def mark_read(self, session: AsyncSession, notification_id: int) -> Optional[NotificationResponse]:
-        notification = await self.repo.mark_read(session, notification_id)
+    async def page(self, session: AsyncSession, user_id: str, unread_only: bool = False, before_id: Optional[int] = None, limit: int = 50) -> NotificationPage:
+        # Fetch one extra row to know whether another page exists
+        notifications = await self.repo.list(session, user_id, unread_only, before_id, limit + 1)
+        has_more = len(notifications) > limit
+        items = [NotificationResponse.from_orm(n) for n in notifications[:limit]]
+        return NotificationPage(
+            items=items,
+            next_before_id=items[-1].id if has_more else None,
+            unread_count=await self.repo.unread_count(session, user_id)
+        )
+
+    async def unread_count(self, session: AsyncSession, user_id: str) -> int:
+        return await self.repo.unread_count(session, user_id)
+
+    async def mark_read(self, session: AsyncSession, notification_id: int, user_id: Optional[str] = None) -> Optional[NotificationResponse]:
+        notification = await self.repo.mark_read(session, notification_id, user_id)
         return NotificationResponse.from_orm(notification) if notification else None
+
+    async def mark_many_read(self, session: AsyncSession, user_id: str, notification_ids: List[int]) -> NotificationReadResult:
+        updated = await self.repo.mark_many_read(session, user_id, notification_ids)
+        return NotificationReadResult(updated=updated, unread_count=await self.repo.unread_count(session, user_id))
+
+    async def mark_all_read(self, session: AsyncSession, user_id: str, up_to_id: Optional[int] = None) -> NotificationReadResult:
+        updated = await self.repo.mark_all_read(session, user_id, up_to_id)
+        return NotificationReadResult(updated=updated, unread_count=await self.repo.unread_count(session, user_id))
@@ -0,0 +1,209 @@
+"""Coalesce per-event notifications into per-recipient digests.
+
+:func:`queue_digest_item` replaces direct ``add_notification`` /
+``enqueue_email`` calls for routine messages (attendance reminders, leave
+decisions, nomination confirmations, recruitment reminders). Items for the
+same recipient are buffered until ``notification_digest_window_minutes``
+after the first one arrived; :func:`dispatch_due_digests` then emits:
+
+- one item: the original notification and email, unchanged;
+- several items: one combined notification and one combined email.
+
+The dispatcher runs from the email outbox worker loop. A window of 0
+disables buffering and every item is delivered immediately.
+"""
+import html
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.notification_digest import NotificationDigestItem
+from app.repositories.notification import add_notification
+from app.services.email_outbox import enqueue_email, register_drain_hook, wake_outbox_worker
+from app.services.template_renderer import CompiledTemplate
+
+logger = logging.getLogger(__name__)
+
+EmailParts = Tuple[str, str, Optional[str]]  # (subject, html_body, text_body)
+
+DIGEST_ROW_TEMPLATE = CompiledTemplate.from_source("""
+                <tr>
+                    <td style="padding: 10px; border-bottom: 1px solid #e2e8f0;"><strong>{{ title }}</strong><br>
+                    <span style="color: #475569;">{{ message }}</span></td>
+                </tr>""")
+
+DIGEST_EMAIL_TEMPLATE = CompiledTemplate.from_source("""
+        <!DOCTYPE html>
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2 style="color: #1e293b;">You have {{ count }} new updates</h2>
+                <table style="border-collapse: collapse; width: 100%;">{{ rows|safe }}
+                </table>
+                <p style="font-size: 12px; color: #64748b;">This is an automated digest from Baynunah HR Portal.</p>
+            </div>
+        </body>
+        </html>
+        """)
+
+
+def _recipient_key(user_id: Optional[str], to_email: Optional[str]) -> str:
+    return f"user:{user_id}" if user_id else f"email:{to_email.lower()}"
+
+
+async def queue_digest_item(
+    session: AsyncSession,
+    title: str,
+    message: str,
+    user_id: Optional[str] = None,
+    to_email: Optional[str] = None,
+    category: Optional[str] = None,
+    link: Optional[str] = None,
+    email: Optional[EmailParts] = None,
+    source_type: Optional[str] = None,
+    source_id: Optional[int] = None
+) -> None:
+    """Buffer a notification (``user_id``) and/or email (``to_email``) for a recipient.
+
+    Added to the caller's transaction; the caller commits. ``email`` is the
+    full message used when the item ends up alone in its digest; without
+    it a plain email is built from ``title`` and ``message``.
+    """
+    if not user_id and not to_email:
+        return
+    if to_email and email is None:
+        email = (title, f"<p>{html.escape(message)}</p>", message)
+
+    window = get_settings().notification_digest_window_minutes
+    if window <= 0:
+        if user_id:
+            await add_notification(session, user_id=user_id, title=title, message=message, type=category, link=link)
+        if to_email:
+            subject, html_body, text_body = email
+            enqueue_email(
+                session, to_email, subject, html_body, text_body,
+                category=category, source_type=source_type, source_id=source_id
+            )
+        return
+
+    key = _recipient_key(user_id, to_email)
+    # Join the recipient's open window, or open a new one
+    result = await session.execute(
+        select(func.min(NotificationDigestItem.deliver_after)).where(
+            NotificationDigestItem.recipient_key == key,
+            NotificationDigestItem.dispatched_at.is_(None)
+        )
+    )
+    deliver_after = result.scalar() or datetime.now(timezone.utc) + timedelta(minutes=window)
+    subject, html_body, text_body = email if email else (None, None, None)
+    session.add(NotificationDigestItem(
+        recipient_key=key,
+        user_id=user_id,
+        to_email=to_email,
+        category=category,
+        title=title,
+        message=message,
+        link=link,
+        subject=subject,
+        html_body=html_body,
+        text_body=text_body,
+        source_type=source_type,
+        source_id=source_id,
+        deliver_after=deliver_after,
+    ))
+
+
+def build_digest_email(items: List[NotificationDigestItem]) -> EmailParts:
+    """Combine several items into one email."""
+    rows = "".join(DIGEST_ROW_TEMPLATE.render_many(
+        {"title": item.title, "message": item.message} for item in items
+    ))
+    html_body = DIGEST_EMAIL_TEMPLATE.render({"count": len(items), "rows": rows})
+    text_body = "\n\n".join(f"{item.title}\n{item.message}" for item in items)
+    text_body += "\n\n---\nThis is an automated digest from Baynunah HR Portal."
+    return f"You have {len(items)} new updates from Baynunah HR", html_body, text_body
+
+
+async def _emit(session: AsyncSession, items: List[NotificationDigestItem]) -> None:
+    in_app = [item for item in items if item.user_id]
+    if len(in_app) == 1:
+        item = in_app[0]
+        await add_notification(
+            session, user_id=item.user_id, title=item.title, message=item.message,
+            type=item.category, link=item.link
+        )
+    elif in_app:
+        links = {item.link for item in in_app}
+        await add_notification(
+            session,
+            user_id=in_app[0].user_id,
+            title=f"{len(in_app)} new updates",
+            message="\n".join(f"• {item.title}: {item.message}" for item in in_app),
+            type="digest",
+            link=links.pop() if len(links) == 1 else None
+        )
+
+    emails = [item for item in items if item.to_email]
+    if len(emails) == 1:
+        item = emails[0]
+        enqueue_email(
+            session, item.to_email, item.subject, item.html_body, item.text_body,
+            category=item.category, source_type=item.source_type, source_id=item.source_id
+        )
+    elif emails:
+        subject, html_body, text_body = build_digest_email(emails)
+        enqueue_email(session, emails[0].to_email, subject, html_body, text_body, category="digest")
+
+
+async def dispatch_due_digests(session: AsyncSession, limit: int = 500) -> int:
+    """Emit digests for every recipient whose window has closed.
+
+    Returns:
+        Number of digests emitted
+    """
+    now = datetime.now(timezone.utc)
+    due_keys = (await session.execute(
+        select(NotificationDigestItem.recipient_key).where(
+            NotificationDigestItem.dispatched_at.is_(None)
+        ).group_by(NotificationDigestItem.recipient_key).having(
+            func.min(NotificationDigestItem.deliver_after) <= now
+        ).limit(limit)
+    )).scalars().all()
+    if not due_keys:
+        return 0
+
+    result = await session.execute(
+        select(NotificationDigestItem).where(
+            NotificationDigestItem.recipient_key.in_(due_keys),
+            NotificationDigestItem.dispatched_at.is_(None)
+        ).order_by(NotificationDigestItem.id).with_for_update(skip_locked=True)
+    )
+    grouped: Dict[str, List[NotificationDigestItem]] = OrderedDict()
+    for item in result.scalars().all():
+        grouped.setdefault(item.recipient_key, []).append(item)
+
+    for items in grouped.values():
+        await _emit(session, items)
+    await session.execute(
+        update(NotificationDigestItem).where(
+            NotificationDigestItem.id.in_([item.id for items in grouped.values() for item in items])
+        ).values(dispatched_at=now).execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    if grouped:
+        wake_outbox_worker()
+        logger.info(f"Dispatched {len(grouped)} notification digests")
+    return len(grouped)
+
+
+async def _dispatch_hook(session_factory) -> None:
+    async with session_factory() as session:
+        await dispatch_due_digests(session)
+
+
+register_drain_hook(_dispatch_hook)
@@ -0,0 +1,344 @@
+"""Prebuilt candidate and manager pass pages.
+
+Pass links are opened (and refreshed) far more often than the data behind
+them changes, so each pass is stored as a ready-to-send JSON document in
+``pass_views`` together with its ETag. A read is then a single indexed
+lookup by pass token; the document is rebuilt with
+``InterviewService.get_candidate_pass_data`` / ``get_manager_pass_data``
+only when it is out of date.
+
+A view is out of date when its ``version`` has moved past the version it
+was built from, or after ``pass_view_max_age_seconds`` (which covers
+date-dependent fields such as upcoming slots and SLA days). Versions are
+bumped in the writing transaction by session event listeners:
+
+- requisition, interview setup and slot writes: every view of the requisition;
+- candidate writes: the candidate's view and the requisition's manager views;
+- documents and manager messages: the requisition's manager views;
+- candidate messages and activity entries: the candidate's view.
+
+Candidate writes that only touch columns not shown on a pass (CV scores,
+extracted resume text, rankings) bump nothing. Bulk UPDATE/DELETE
+statements take the rows they wrote from their RETURNING ids, or read the
+scope of the rows they match (by primary key for executemany, else with
+their WHERE clause) before running; only an unfiltered statement bumps
+every view.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from itertools import chain
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, event as sa_event, inspect, or_, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.activity_log import ActivityLog
+from app.models.interview import InterviewSetup, InterviewSlot, PassMessage, PassView, RecruitmentDocument
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.interview_service import interview_service
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_PASS = "candidate"
+MANAGER_PASS = "manager"
+
+
+def _is_current(view: PassView) -> bool:
+    if view.built_version != view.version:
+        return False
+    age = datetime.utcnow() - view.built_at.replace(tzinfo=None)
+    return age.total_seconds() < get_settings().pass_view_max_age_seconds
+
+
+async def _find(session: AsyncSession, pass_type: str, subject_id: int, holder_id: str) -> Optional[PassView]:
+    # Versions are bumped with Core UPDATEs, so refresh any instance already in the session
+    result = await session.execute(
+        select(PassView).where(
+            and_(
+                PassView.pass_type == pass_type,
+                PassView.subject_id == subject_id,
+                PassView.holder_id == holder_id
+            )
+        ).execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _store(
+    session: AsyncSession,
+    pass_type: str,
+    subject_id: int,
+    holder_id: str,
+    recruitment_request_id: int,
+    pass_token: str,
+    payload: str,
+    version: int
+) -> PassView:
+    """Upsert a built view, marking it current as of ``version``."""
+    values = {
+        "recruitment_request_id": recruitment_request_id,
+        "pass_token": pass_token,
+        "payload": payload,
+        "etag": hashlib.sha1(payload.encode("utf-8"), usedforsecurity=False).hexdigest(),
+        "built_version": version,
+        "built_at": datetime.utcnow(),
+    }
+    dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(PassView).values(
+        pass_type=pass_type, subject_id=subject_id, holder_id=holder_id, version=version, **values
+    )
+    # A write that bumped ``version`` while this view was being built
+    # leaves it out of date, so the next read rebuilds it.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PassView.pass_type, PassView.subject_id, PassView.holder_id],
+        set_={key: stmt.excluded[key] for key in values}
+    ).returning(PassView)
+    view = (await session.scalars(stmt, execution_options={"populate_existing": True})).one()
+    await session.commit()
+    return view
+
+
+async def get_candidate_pass_view(session: AsyncSession, candidate_id: int) -> PassView:
+    """Current pass view for a candidate, rebuilt if out of date."""
+    view = await _find(session, CANDIDATE_PASS, candidate_id, "")
+    if view is not None and _is_current(view):
+        return view
+    version = view.version if view is not None else 0
+    data = await interview_service.get_candidate_pass_data(session, candidate_id)
+    logger.debug("Rebuilt candidate pass view %s", candidate_id)
+    return await _store(
+        session, CANDIDATE_PASS, candidate_id, "", data.position_id,
+        data.pass_token, data.model_dump_json(), version
+    )
+
+
+async def get_manager_pass_view(session: AsyncSession, recruitment_request_id: int, manager_id: str) -> PassView:
+    """Current pass view for a hiring manager, rebuilt if out of date.
+
+    The manager's pass token is issued with the first view and kept across
+    rebuilds.
+    """
+    view = await _find(session, MANAGER_PASS, recruitment_request_id, manager_id)
+    if view is not None and _is_current(view):
+        return view
+    version = view.version if view is not None else 0
+    pass_token = view.pass_token if view is not None else interview_service.generate_pass_token()
+    data = await interview_service.get_manager_pass_data(session, recruitment_request_id, manager_id)
+    data = data.model_copy(update={"pass_token": pass_token})
+    logger.debug("Rebuilt manager pass view %s/%s", recruitment_request_id, manager_id)
+    return await _store(
+        session, MANAGER_PASS, recruitment_request_id, manager_id, recruitment_request_id,
+        pass_token, data.model_dump_json(), version
+    )
+
+
+async def get_pass_view_by_token(session: AsyncSession, pass_token: str) -> PassView:
+    """Pass view for a pass token (candidate or manager)."""
+    result = await session.execute(
+        select(PassView).where(PassView.pass_token == pass_token).execution_options(populate_existing=True)
+    )
+    view = result.scalar_one_or_none()
+    if view is None:
+        # Candidate tokens are issued with the candidate, before any view exists
+        result = await session.execute(select(Candidate.id).where(Candidate.pass_token == pass_token))
+        candidate_id = result.scalar_one_or_none()
+        if candidate_id is None:
+            raise HTTPException(status_code=404, detail="Pass not found")
+        return await get_candidate_pass_view(session, candidate_id)
+    if _is_current(view):
+        return view
+    if view.pass_type == CANDIDATE_PASS:
+        return await get_candidate_pass_view(session, view.subject_id)
+    return await get_manager_pass_view(session, view.subject_id, view.holder_id)
+
+
+# ==================== INVALIDATION ON WRITE ====================
+
+_PENDING = "_pass_views_pending"
+_HAS_TABLE = "_pass_views_table"
+
+# Columns of each tracked model that locate the views a row appears on
+_SCOPE_COLUMNS = {
+    RecruitmentRequest: ("id",),
+    InterviewSetup: ("recruitment_request_id",),
+    InterviewSlot: ("interview_setup_id",),
+    RecruitmentDocument: ("recruitment_request_id",),
+    Candidate: ("id", "recruitment_request_id"),
+    PassMessage: ("pass_type", "pass_holder_id"),
+    ActivityLog: ("candidate_id",),
+}
+_TRACKED = tuple(_SCOPE_COLUMNS)
+
+# Candidate columns shown on a pass. Writes that only touch other columns
+# (CV scores, extracted resume text, rankings, ...) leave the views alone.
+_CANDIDATE_PASS_COLUMNS = frozenset({
+    "id", "candidate_number", "recruitment_request_id", "full_name", "email", "phone",
+    "entity", "stage", "status", "pass_token", "current_location", "visa_status",
+    "notice_period_days", "expected_salary", "details_confirmed_by_candidate",
+})
+
+
+class _Scope:
+    """Views affected by a set of writes."""
+
+    def __init__(self):
+        self.requests, self.setups, self.managers, self.candidates = set(), set(), set(), set()
+        self.everything = False
+
+    def add(self, model, row) -> None:
+        """Record a written row, given as a mapping of its scope columns."""
+        if model is RecruitmentRequest:
+            self.requests.add(row.get("id"))
+        elif model is InterviewSetup:
+            self.requests.add(row.get("recruitment_request_id"))
+        elif model is InterviewSlot:
+            self.setups.add(row.get("interview_setup_id"))
+        elif model is RecruitmentDocument:
+            self.managers.add(row.get("recruitment_request_id"))
+        elif model is Candidate:
+            self.candidates.add(row.get("id"))
+            if row.get("recruitment_request_id") is not None:
+                self.managers.add(row.get("recruitment_request_id"))
+        elif model is PassMessage:
+            (self.candidates if row.get("pass_type") == CANDIDATE_PASS else self.managers).add(row.get("pass_holder_id"))
+        elif model is ActivityLog:
+            self.candidates.add(row.get("candidate_id"))
+
+    def conditions(self) -> list:
+        """WHERE clauses selecting the affected views."""
+        views = PassView.__table__.c
+        if self.everything:
+            return [true()]
+        requests, setups, managers, candidates = (
+            ids - {None} for ids in (self.requests, self.setups, self.managers, self.candidates)
+        )
+        conditions = []
+        if requests:
+            conditions.append(views.recruitment_request_id.in_(requests))
+        if setups:
+            conditions.append(views.recruitment_request_id.in_(
+                select(InterviewSetup.recruitment_request_id).where(InterviewSetup.id.in_(setups))
+            ))
+        if managers:
+            conditions.append(and_(views.pass_type == MANAGER_PASS, views.recruitment_request_id.in_(managers)))
+        if candidates:
+            conditions.append(and_(views.pass_type == CANDIDATE_PASS, views.subject_id.in_(candidates)))
+            # Pipeline counts on the requisition's manager passes
+            conditions.append(and_(views.pass_type == MANAGER_PASS, views.recruitment_request_id.in_(
+                select(Candidate.recruitment_request_id).where(Candidate.id.in_(candidates))
+            )))
+        return conditions
+
+
+def _shown_on_pass(model, columns) -> bool:
+    return model is not Candidate or not _CANDIDATE_PASS_COLUMNS.isdisjoint(columns)
+
+
+def _bump(session: Session, scope: _Scope) -> None:
+    conditions = scope.conditions()
+    if not conditions:
+        return
+    connection = session.connection()
+    # Trees (and test databases) without the pass_views table skip invalidation
+    has_table = connection.info.get(_HAS_TABLE)
+    if has_table is None:
+        has_table = connection.info[_HAS_TABLE] = connection.dialect.has_table(connection, PassView.__tablename__)
+    if has_table:
+        views = PassView.__table__
+        connection.execute(update(views).where(or_(*conditions)).values(version=views.c.version + 1))
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _bump_flushed_writes(session, flush_context):
+    scope = _Scope()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        model = type(obj)
+        if model not in _SCOPE_COLUMNS:
+            continue
+        if obj in session.dirty and obj not in session.deleted:
+            changed = [attr.key for attr in inspect(obj).attrs if attr.history.has_changes()]
+            if not _shown_on_pass(model, changed):
+                continue
+        scope.add(model, {key: getattr(obj, key, None) for key in _SCOPE_COLUMNS[model]})
+    _bump(session, scope)
+
+
+def _set_columns(orm_execute_state) -> set:
+    """Column names an UPDATE writes, from ``.values()`` or executemany rows."""
+    values = getattr(orm_execute_state.statement, "_values", None) or {}
+    columns = {getattr(key, "key", key) for key in values}
+    parameters = orm_execute_state.parameters
+    if isinstance(parameters, list):
+        for row in parameters:
+            columns.update(row)
+    elif parameters:
+        columns.update(parameters)
+    # Executemany rows carry the primary key to match on, not to write
+    columns.discard("id")
+    return columns
+
+
+@sa_event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    model = mapper.class_ if mapper is not None else None
+    if model not in _SCOPE_COLUMNS:
+        return
+    session = orm_execute_state.session
+    scope = session.info.setdefault(_PENDING, _Scope())
+    if scope.everything:
+        return
+    parameters = orm_execute_state.parameters
+    rows = parameters if isinstance(parameters, list) else [parameters] if parameters else []
+
+    if orm_execute_state.is_insert:
+        # New rows name their scope; inserted candidates have no views yet
+        if not rows:
+            rows = [orm_execute_state.statement.compile().params]
+        for row in rows:
+            scope.add(model, row)
+        return
+
+    if orm_execute_state.is_update and not _shown_on_pass(model, _set_columns(orm_execute_state)):
+        return
+    statement = orm_execute_state.statement
+    returns_id = "id" in {getattr(column, "key", None) for column in getattr(statement, "_returning", ())}
+    if returns_id and _SCOPE_COLUMNS[model][0] == "id":
+        # The statement reports the rows it wrote, and their ids are the scope:
+        # read them off its result
+        frozen = orm_execute_state.invoke_statement().freeze()
+        for row in frozen().mappings():
+            scope.add(model, {"id": row["id"]})
+        return frozen()
+    if rows and all("id" in row for row in rows):
+        # Executemany by primary key
+        criteria = mapper.primary_key[0].in_([row["id"] for row in rows])
+    elif statement.whereclause is not None:
+        criteria = statement.whereclause
+    else:
+        scope.everything = True
+        return
+    # Read the rows' scope before they change (or disappear)
+    columns = [getattr(model, key) for key in _SCOPE_COLUMNS[model]]
+    with session.no_autoflush:
+        for row in session.execute(select(*columns).where(criteria)).mappings():
+            scope.add(model, row)
+
+
+@sa_event.listens_for(Session, "before_commit")
+def _bump_bulk_writes(session):
+    scope = session.info.pop(_PENDING, None)
+    if scope is not None:
+        _bump(session, scope)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_bulk_writes(session):
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,121 @@
+"""Worker process pools for blocking, CPU-bound document work.
+
+:class:`TimedProcessPool` wraps ``ProcessPoolExecutor`` with what the text
+extraction and resume parsing pools both need:
+
+- spawned (not forked) workers, since the parent runs an event loop and
+  threads; an optional initializer loads per-worker state once;
+- a per-call timeout that starts when a worker picks the call up, so a
+  burst of submissions does not time out waiting in the queue;
+- termination of the workers when a call hangs (an executor cannot cancel a
+  running call), after which the next call starts a fresh pool.
+
+With ``processes=0`` calls run in threads instead, for environments where
+starting processes is not possible.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerTimeout(Exception):
+    """A call did not finish within its timeout; the pool was restarted."""
+
+
+class WorkerExited(Exception):
+    """The worker running a call died (or was terminated for another call)."""
+
+
+class TimedProcessPool:
+    """Process pool with per-call timeouts and restart of stuck workers."""
+
+    def __init__(
+        self,
+        name: str,
+        processes: int,
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = (),
+        tasks_per_process: Optional[int] = None
+    ):
+        self.name = name
+        self.processes = processes
+        self.initializer = initializer
+        self.initargs = initargs
+        self.tasks_per_process = tasks_per_process
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+                initargs=self.initargs,
+                max_tasks_per_child=self.tasks_per_process,
+            )
+        return self._pool
+
+    def _recycle(self, pool: ProcessPoolExecutor):
+        """Terminate a pool whose worker is stuck; the next call starts a new one."""
+        if self._pool is pool:
+            self._pool = None
+        # Executors cannot cancel a running call, so stop the processes themselves
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, timeout: float, fn: Callable, *args) -> Any:
+        """Run ``fn(*args)`` in a worker.
+
+        Raises:
+            WorkerTimeout: the call took longer than ``timeout`` seconds
+            WorkerExited: the worker died before returning
+        """
+        if self.processes <= 0:
+            try:
+                return await asyncio.wait_for(asyncio.to_thread(fn, *args), timeout)
+            except asyncio.TimeoutError as e:
+                raise WorkerTimeout(f"{self.name} call timed out after {timeout}s") from e
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.processes)
+        async with self._slots:
+            pool = self._get_pool()
+            future = asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError as e:
+                logger.warning(f"{self.name} call timed out after {timeout}s; restarting workers")
+                self._recycle(pool)
+                raise WorkerTimeout(f"{self.name} call timed out after {timeout}s") from e
+            except BrokenProcessPool as e:
+                self._recycle(pool)
+                raise WorkerExited(f"{self.name} worker exited") from e
+
+    async def warm_up(self, fn: Callable, timeout: float) -> int:
+        """Start every worker (running the initializer) by sending each a call to ``fn``.
+
+        Returns the number of calls that completed.
+        """
+        if self.processes <= 0:
+            return 0
+        results = await asyncio.gather(
+            *(self.run(timeout, fn) for _ in range(self.processes)), return_exceptions=True
+        )
+        return sum(1 for result in results if not isinstance(result, BaseException))
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,266 @@
+"""Cached snapshot of recruitment KPIs for the stats and metrics endpoints.
+
+All figures come from two grouped aggregate queries:
+
+- candidates grouped by (stage, status, source), with the count, recent
+  hires and the summed days from application to the current stage;
+- requisitions grouped by (status, priority), with the count and how many
+  are past their target hire date.
+
+Counts by stage, status and source, per-source conversion, pending
+interviews/offers and time-to-offer/time-to-hire are folded from those rows
+in Python. The snapshot is kept in memory for
+``recruitment_metrics_cache_ttl_seconds``. Any committed write to candidates
+or requisitions (ORM flushes and bulk UPDATE/DELETE statements alike)
+invalidates it; the TTL bounds staleness across workers.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, case, event as sa_event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.recruitment import Candidate, RecruitmentRequest, RECRUITMENT_STAGES
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_REQUEST_STATUSES = ('pending', 'approved')
+PENDING_OFFER_STATUSES = ('offer', 'in_preparation', 'released')
+RECENT_HIRE_DAYS = 30
+
+
+@dataclass
+class RecruitmentMetricsSnapshot:
+    """KPIs in the shapes returned by ``/stats`` and ``/metrics``."""
+    stats: Dict[str, Any] = field(default_factory=dict)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    built_at: float = 0.0
+
+
+def _days_between(dialect: str, end, start):
+    if dialect == "postgresql":
+        return func.extract('epoch', end - start) / 86400
+    return func.julianday(end) - func.julianday(start)
+
+
+def _rate(numerator: int, denominator: int) -> Optional[float]:
+    rate = (numerator / denominator * 100) if denominator > 0 else None
+    return round(rate, 1) if rate else None
+
+
+def _average(total: float, count: int) -> Optional[float]:
+    return round(total / count, 1) if count else None
+
+
+async def build_metrics_snapshot(session: AsyncSession) -> RecruitmentMetricsSnapshot:
+    """Compute every recruitment KPI from two grouped queries."""
+    now = datetime.now()
+    recent_since = now - timedelta(days=RECENT_HIRE_DAYS)
+    timed = Candidate.stage_changed_at.isnot(None)
+    days = _days_between(session.bind.dialect.name, Candidate.stage_changed_at, Candidate.created_at)
+
+    candidate_rows = (await session.execute(
+        select(
+            Candidate.stage,
+            Candidate.status,
+            Candidate.source,
+            func.count(Candidate.id),
+            func.count(case((and_(Candidate.stage == 'hired', Candidate.stage_changed_at >= recent_since), 1))),
+            func.sum(case((timed, days))),
+            func.count(case((timed, 1))),
+        ).group_by(Candidate.stage, Candidate.status, Candidate.source)
+    )).all()
+    request_rows = (await session.execute(
+        select(
+            RecruitmentRequest.status,
+            RecruitmentRequest.priority,
+            func.count(RecruitmentRequest.id),
+            func.count(case((RecruitmentRequest.target_hire_date < now.date(), 1))),
+        ).group_by(RecruitmentRequest.status, RecruitmentRequest.priority)
+    )).all()
+
+    by_stage: Dict[str, int] = {stage['key']: 0 for stage in RECRUITMENT_STAGES}
+    by_status: Dict[str, int] = {}
+    by_source: Dict[str, int] = {}
+    source_hired: Dict[str, int] = {}
+    stage_days: Dict[str, float] = {}
+    stage_timed: Dict[str, int] = {}
+    total_candidates = recent_hires = pending_interviews = pending_offers = 0
+
+    for stage, status, source, count, recent, days_total, days_count in candidate_rows:
+        total_candidates += count
+        recent_hires += recent
+        by_stage[stage] = by_stage.get(stage, 0) + count
+        by_status[status] = by_status.get(status, 0) + count
+        if source is not None:
+            by_source[source] = by_source.get(source, 0) + count
+            if stage == 'hired':
+                source_hired[source] = source_hired.get(source, 0) + count
+        if days_count:
+            stage_days[stage] = stage_days.get(stage, 0.0) + float(days_total or 0)
+            stage_timed[stage] = stage_timed.get(stage, 0) + days_count
+        if stage == 'interview' and status != 'completed':
+            pending_interviews += count
+        if stage == 'offer' and status in PENDING_OFFER_STATUSES:
+            pending_offers += count
+
+    total_requests = active_requests = filled_requests = cancelled_requests = overdue_requests = 0
+    by_priority: Dict[str, int] = {}
+    for status, priority, count, overdue in request_rows:
+        total_requests += count
+        if status == 'filled':
+            filled_requests += count
+        elif status == 'cancelled':
+            cancelled_requests += count
+        elif status in ACTIVE_REQUEST_STATUSES:
+            active_requests += count
+            overdue_requests += overdue
+            by_priority[priority or 'normal'] = by_priority.get(priority or 'normal', 0) + count
+
+    # Stage conversion: candidates at or past each stage
+    hired_count = by_stage.get('hired', 0)
+    offer_count = by_stage.get('offer', 0) + hired_count
+    interview_count = by_stage.get('interview', 0) + offer_count
+    screening_count = by_stage.get('screening', 0) + interview_count
+    applied_count = by_stage.get('applied', 0) + screening_count
+
+    source_effectiveness = {
+        source: {
+            "total": total,
+            "hired": source_hired.get(source, 0),
+            "conversion_rate": round(source_hired.get(source, 0) / total * 100, 1) if total else 0,
+        }
+        for source, total in by_source.items()
+    }
+
+    stats = {
+        "total_requests": total_requests,
+        "active_requests": active_requests,
+        "total_candidates": total_candidates,
+        "by_stage": by_stage,
+        "by_source": by_source,
+        "recent_hires": recent_hires,
+    }
+    metrics = {
+        "total_requests": total_requests,
+        "active_requests": active_requests,
+        "filled_requests": filled_requests,
+        "cancelled_requests": cancelled_requests,
+        "total_candidates": total_candidates,
+        "candidates_by_stage": by_stage,
+        "candidates_by_source": by_source,
+        "candidates_by_status": by_status,
+        "avg_time_to_fill": None,  # Would need historical data
+        "avg_time_in_screening": None,
+        "avg_time_to_offer": _average(stage_days.get('offer', 0.0), stage_timed.get('offer', 0)),
+        "avg_time_to_hire_days": _average(stage_days.get('hired', 0.0), stage_timed.get('hired', 0)),
+        "application_to_screening_rate": _rate(screening_count, applied_count),
+        "screening_to_interview_rate": _rate(interview_count, screening_count),
+        "interview_to_offer_rate": _rate(offer_count, interview_count),
+        "offer_acceptance_rate": _rate(hired_count, offer_count),
+        "recent_hires": recent_hires,
+        "pending_interviews": pending_interviews,
+        "pending_offers": pending_offers,
+        "overdue_requests": overdue_requests,
+        "requests_by_priority": by_priority,
+        "source_effectiveness": source_effectiveness,
+    }
+    return RecruitmentMetricsSnapshot(stats=stats, metrics=metrics, built_at=time.monotonic())
+
+
+class RecruitmentMetricsCache:
+    """Process-wide cache of the recruitment metrics snapshot."""
+
+    def __init__(self, ttl_seconds: int = 60):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[RecruitmentMetricsSnapshot] = None
+        self._lock = asyncio.Lock()
+        # Bumped on every invalidation so a build that raced with a write
+        # is not stored over the fresher state.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _fresh(self) -> Optional[RecruitmentMetricsSnapshot]:
+        snapshot = self._snapshot
+        if snapshot and (time.monotonic() - snapshot.built_at) < self.ttl_seconds:
+            return snapshot
+        return None
+
+    async def get(self, session: AsyncSession) -> RecruitmentMetricsSnapshot:
+        """Return the current snapshot, rebuilding it if stale or invalidated."""
+        snapshot = self._fresh()
+        if snapshot:
+            self.hits += 1
+            return snapshot
+        async with self._lock:
+            # Another request may have rebuilt it while we waited
+            snapshot = self._fresh()
+            if snapshot:
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+            generation = self._generation
+            snapshot = await build_metrics_snapshot(session)
+            if generation == self._generation:
+                self._snapshot = snapshot
+        logger.debug("Built recruitment metrics snapshot")
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next read rebuilds it."""
+        self._generation += 1
+        self._snapshot = None
+
+
+# Singleton instance
+_metrics_cache: Optional[RecruitmentMetricsCache] = None
+
+
+def get_recruitment_metrics_cache() -> RecruitmentMetricsCache:
+    """Get or create the recruitment metrics cache singleton."""
+    global _metrics_cache
+    if _metrics_cache is None:
+        _metrics_cache = RecruitmentMetricsCache(
+            ttl_seconds=get_settings().recruitment_metrics_cache_ttl_seconds
+        )
+    return _metrics_cache
+
+
+# ==================== INVALIDATION ON COMMIT ====================
+
+_TRACKED = (Candidate, RecruitmentRequest)
+_STALE = "_recruitment_metrics_stale"
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session, flush_context):
+    if any(isinstance(obj, _TRACKED) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[_STALE] = True
+
+
+@sa_event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _TRACKED):
+        orm_execute_state.session.info[_STALE] = True
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _invalidate_committed_writes(session):
+    if session.info.pop(_STALE, False) and _metrics_cache is not None:
+        _metrics_cache.invalidate()
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_writes(session):
+    session.info.pop(_STALE, None)
@@ -11,7 +11,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.recruitment import (
     RecruitmentRequest, Candidate, Interview, Offer
 )
-from app.services.email_service import EmailService
+from app.services.email_outbox import wake_outbox_worker
+from app.services.notification_digest import queue_digest_item
+from app.repositories.notification import NotificationRepository
 from app.services.notification import NotificationService
 
 logger = logging.getLogger(__name__)
@@ -21,8 +23,7 @@ class RecruitmentNotificationService:
     """Service for automated recruitment notifications."""
     
     def __init__(self):
-        self.email_service = EmailService()
-        self.notification_service = NotificationService()
+        self.notification_service = NotificationService(NotificationRepository())
     
     async def send_interview_reminder(
         self,
@@ -41,7 +42,7 @@ class RecruitmentNotificationService:
             hours_before: Hours before interview to send reminder
             
         Returns:
-            True if notification sent successfully
+            True if the notification was queued
         """
         if not interview.scheduled_date or not candidate.email:
             return False
@@ -131,18 +132,20 @@ class RecruitmentNotificationService:
         HR Team
         """
         
-        # Send email
-        success = await self.email_service.send_email(
+        # Queue email (coalesced into the candidate's digest once the session commits)
+        await queue_digest_item(
+            session,
+            title=subject,
+            message=f"Your {request.position_title} interview is on {interview_date} at {interview_time}.",
             to_email=candidate.email,
-            subject=subject,
-            html_body=html_body,
-            text_body=text_body
+            category="interview_reminder",
+            email=(subject, html_body, text_body),
+            source_type="interview",
+            source_id=interview.id
         )
+        logger.info(f"Interview reminder queued for {candidate.email} for interview {interview.interview_number}")
         
-        if success:
-            logger.info(f"Interview reminder sent to {candidate.email} for interview {interview.interview_number}")
-        
-        return success
+        return True
     
     async def send_offer_expiry_alert(
         self,
@@ -161,7 +164,7 @@ class RecruitmentNotificationService:
             days_before: Days before expiry to send alert
             
         Returns:
-            True if notification sent successfully
+            True if the notification was queued
         """
         if not offer.expires_at or not candidate.email:
             return False
@@ -224,18 +227,20 @@ class RecruitmentNotificationService:
         HR Team
         """
         
-        # Send email to candidate
-        success = await self.email_service.send_email(
+        # Queue email to candidate (coalesced into the candidate's digest once the session commits)
+        await queue_digest_item(
+            session,
+            title=subject,
+            message=f"Your offer for {offer.position_title} expires on {offer.expires_at.strftime('%B %d, %Y')}.",
             to_email=candidate.email,
-            subject=subject,
-            html_body=html_body,
-            text_body=text_body
+            category="offer_expiry_alert",
+            email=(subject, html_body, text_body),
+            source_type="offer",
+            source_id=offer.id
         )
+        logger.info(f"Offer expiry alert queued for {candidate.email} for offer {offer.offer_number}")
         
-        if success:
-            logger.info(f"Offer expiry alert sent to {candidate.email} for offer {offer.offer_number}")
-        
-        return success
+        return True
     
     async def check_and_send_interview_reminders(
         self,
@@ -284,7 +289,10 @@ class RecruitmentNotificationService:
                 if success:
                     sent_count += 1
         
-        logger.info(f"Sent {sent_count} interview reminders")
+        if sent_count:
+            await session.commit()
+            wake_outbox_worker()
+        logger.info(f"Queued {sent_count} interview reminders")
         return sent_count
     
     async def check_and_send_offer_expiry_alerts(
@@ -334,7 +342,10 @@ class RecruitmentNotificationService:
                 if success:
                     sent_count += 1
         
-        logger.info(f"Sent {sent_count} offer expiry alerts")
+        if sent_count:
+            await session.commit()
+            wake_outbox_worker()
+        logger.info(f"Queued {sent_count} offer expiry alerts")
         return sent_count
     
     async def mark_expired_offers(self, session: AsyncSession) -> int:
@@ -1,29 +1,45 @@
 """Business logic for recruitment operations."""
 import logging
-import uuid
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select, and_, func
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy import select, and_, or_, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.recruitment import (
-    RecruitmentRequest, Candidate, Interview, Evaluation,
+    RecruitmentRequest, Candidate, Interview, InterviewTimeSlot, Evaluation,
     RECRUITMENT_STAGES, INTERVIEW_TYPES, EMPLOYMENT_TYPES
 )
 from app.models.passes import Pass
+from app.models.activity_log import ActivityLog
+from app.repositories.document_sequences import next_document_number
+from app.services.recruitment_metrics import get_recruitment_metrics_cache
 from app.schemas.recruitment import (
     RecruitmentRequestCreate, RecruitmentRequestUpdate,
     CandidateCreate, CandidateUpdate,
     InterviewCreate, InterviewUpdate,
     EvaluationCreate, EvaluationUpdate,
-    InterviewSlotsProvide, InterviewSlotConfirm
+    InterviewSlotsProvide, InterviewSlotConfirm, InterviewResponse
 )
 
 logger = logging.getLogger(__name__)
 
-# Constants for slot booking status
-SLOT_BOOKED_BY_OTHER = "__SLOT_UNAVAILABLE__"  # Marks slot as taken by another candidate
+
+def _append_note(entry: str):
+    """SQL expression appending a line to ``Candidate.recruiter_notes``."""
+    return func.coalesce(Candidate.recruiter_notes + "\n", "") + entry
+
+
+def _slot_key(value: datetime) -> datetime:
+    """Slot time as stored in ``interview_time_slots`` (naive UTC for timezone-aware values).
+
+    SQLite drops the UTC offset of ``DateTime(timezone=True)`` values, so slot
+    times are normalized before they are written or compared.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
 
 class RecruitmentService:
     """Service for recruitment operations."""
@@ -337,12 +353,15 @@ class RecruitmentService:
         recruitment_request_id: Optional[int] = None
     ) -> Dict[str, int]:
         """Get count of candidates by stage."""
-        query = select(Candidate.stage, func.count(Candidate.id))
-
-        if recruitment_request_id:
-            query = query.where(Candidate.recruitment_request_id == recruitment_request_id)
+        if not recruitment_request_id:
+            snapshot = await get_recruitment_metrics_cache().get(session)
+            return dict(snapshot.stats["by_stage"])
 
-        query = query.group_by(Candidate.stage)
+        query = (
+            select(Candidate.stage, func.count(Candidate.id))
+            .where(Candidate.recruitment_request_id == recruitment_request_id)
+            .group_by(Candidate.stage)
+        )
 
         result = await session.execute(query)
         counts = {row[0]: row[1] for row in result.all()}
@@ -425,21 +444,41 @@ class RecruitmentService:
         """
         Provide available interview slots (by hiring manager).
         
-        Once slots are provided, the interview status changes to 'slots_provided'
-        and the candidate can select from these slots via their pass.
+        Slots are stored once per requisition and time range in
+        ``interview_time_slots`` (times already offered are reused). Once slots
+        are provided, the interview status changes to 'slots_provided' and the
+        candidate can select from these slots via their pass.
         """
         interview = await self.get_interview(session, interview_id)
         if not interview:
             raise ValueError("Interview not found")
 
-        # Convert slots to JSON-serializable format with booking status
+        if slots.available_slots:
+            dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+            await session.execute(
+                dialect.insert(InterviewTimeSlot).values([
+                    {
+                        "recruitment_request_id": interview.recruitment_request_id,
+                        "start_at": _slot_key(slot.start),
+                        "end_at": _slot_key(slot.end),
+                    }
+                    for slot in slots.available_slots
+                ]).on_conflict_do_nothing(
+                    index_elements=[
+                        InterviewTimeSlot.recruitment_request_id,
+                        InterviewTimeSlot.start_at,
+                        InterviewTimeSlot.end_at,
+                    ]
+                )
+            )
+
+        # Offered slots in JSON-serializable format; booking state is kept in
+        # interview_time_slots and added when the interview is serialized
         slots_data = [
             {
                 "id": f"slot-{i}",
                 "start": slot.start.isoformat(),
-                "end": slot.end.isoformat(),
-                "is_booked": False,
-                "booked_by": None
+                "end": slot.end.isoformat()
             }
             for i, slot in enumerate(slots.available_slots)
         ]
@@ -470,10 +509,11 @@ class RecruitmentService:
         Confirm an interview slot (by candidate).
         
         Once a slot is confirmed:
-        1. The slot is marked as booked by this candidate
-        2. The interview status changes to 'scheduled'
-        3. The candidate status is updated
-        4. The slot becomes unavailable to other candidates for the same recruitment request
+        1. The slot is booked for this interview with one conditional UPDATE,
+           which fails if another interview of the requisition holds it
+        2. Any slot this interview booked earlier is released
+        3. The interview status changes to 'scheduled'
+        4. The candidate status is updated
         """
         interview = await self.get_interview(session, interview_id)
         if not interview:
@@ -483,86 +523,138 @@ class RecruitmentService:
         if not interview.available_slots or 'slots' not in interview.available_slots:
             raise ValueError("No available slots for this interview")
         
-        # Find and validate the selected slot
-        selected_start = confirmation.selected_slot.start.isoformat()
-        selected_end = confirmation.selected_slot.end.isoformat()
-        candidate_id_str = str(interview.candidate_id)
-        
-        slot_found = False
-        for slot in interview.available_slots['slots']:
-            if slot['start'] == selected_start and slot['end'] == selected_end:
-                # Check if booked by another candidate (compare as strings)
-                if slot.get('is_booked') and slot.get('booked_by') != candidate_id_str:
-                    raise ValueError("This slot has already been booked by another candidate")
-                slot_found = True
-                # Mark this slot as booked
-                slot['is_booked'] = True
-                slot['booked_by'] = candidate_id_str
-                break
-        
-        if not slot_found:
+        # The selected slot must be one offered for this interview
+        selected_start = _slot_key(confirmation.selected_slot.start)
+        selected_end = _slot_key(confirmation.selected_slot.end)
+        offered = [
+            slot for slot in interview.available_slots['slots']
+            if _slot_key(datetime.fromisoformat(slot['start'])) == selected_start
+            and _slot_key(datetime.fromisoformat(slot['end'])) == selected_end
+        ]
+        if not offered:
             raise ValueError("Selected slot is not available")
 
+        now = datetime.now()
+        # An interview holds at most one slot: release an earlier booking first
+        await session.execute(
+            update(InterviewTimeSlot)
+            .where(
+                InterviewTimeSlot.booked_interview_id == interview.id,
+                or_(InterviewTimeSlot.start_at != selected_start, InterviewTimeSlot.end_at != selected_end)
+            )
+            .values(booked_interview_id=None, booked_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        booked = await session.execute(
+            update(InterviewTimeSlot)
+            .where(
+                InterviewTimeSlot.recruitment_request_id == interview.recruitment_request_id,
+                InterviewTimeSlot.start_at == selected_start,
+                InterviewTimeSlot.end_at == selected_end,
+                or_(
+                    InterviewTimeSlot.booked_interview_id.is_(None),
+                    InterviewTimeSlot.booked_interview_id == interview.id
+                )
+            )
+            .values(booked_interview_id=interview.id, booked_at=func.coalesce(InterviewTimeSlot.booked_at, now))
+            .returning(InterviewTimeSlot.id)
+            .execution_options(synchronize_session=False)
+        )
+        if booked.scalar_one_or_none() is None:
+            await session.rollback()
+            raise ValueError("This slot has already been booked by another candidate")
+
         interview.scheduled_date = confirmation.selected_slot.start
         interview.status = 'scheduled'
         interview.confirmed_by_candidate = True
-        interview.confirmed_at = datetime.now()
+        interview.confirmed_at = now
 
         # Update candidate status
         if interview.candidate_id:
             candidate = await self.get_candidate(session, interview.candidate_id)
             if candidate:
                 candidate.status = 'scheduled'
-                candidate.last_activity_at = datetime.now()
-        
-        # Mark this slot as unavailable in other interviews for the same recruitment request
-        # This prevents double-booking of manager's time
-        await self._mark_slot_unavailable_for_request(
-            session,
-            interview.recruitment_request_id,
-            selected_start,
-            selected_end,
-            interview.id
-        )
+                candidate.last_activity_at = now
 
         await session.commit()
         await session.refresh(interview)
 
         return interview
-    
-    async def _mark_slot_unavailable_for_request(
+
+    async def interview_responses(
         self,
         session: AsyncSession,
-        recruitment_request_id: int,
-        slot_start: str,
-        slot_end: str,
-        exclude_interview_id: int
-    ) -> None:
+        interviews: List[Interview]
+    ) -> List[InterviewResponse]:
         """
-        Mark a time slot as unavailable in all other interviews for the same recruitment request.
-        
-        This ensures that once a candidate books a slot, no other candidate can book
-        the same time slot for the same position.
+        Serialize interviews with the current booking of each offered slot.
+
+        ``is_booked`` and ``booked_by`` (the booking candidate's ID) come from
+        ``interview_time_slots``, read with one query for all the interviews'
+        requisitions, so a slot booked through another interview shows as taken.
         """
-        # Get all interviews for this recruitment request
-        result = await session.execute(
-            select(Interview).where(
-                and_(
-                    Interview.recruitment_request_id == recruitment_request_id,
-                    Interview.id != exclude_interview_id,
-                    Interview.status.in_(['pending', 'slots_provided'])
+        request_ids = {
+            interview.recruitment_request_id for interview in interviews
+            if interview.available_slots and interview.available_slots.get('slots')
+        }
+        bookings: Dict[tuple, str] = {}
+        if request_ids:
+            result = await session.execute(
+                select(
+                    InterviewTimeSlot.recruitment_request_id,
+                    InterviewTimeSlot.start_at,
+                    InterviewTimeSlot.end_at,
+                    Interview.candidate_id
                 )
+                .join(Interview, Interview.id == InterviewTimeSlot.booked_interview_id)
+                .where(InterviewTimeSlot.recruitment_request_id.in_(request_ids))
             )
-        )
-        interviews = result.scalars().all()
-        
+            bookings = {
+                (request_id, _slot_key(start_at), _slot_key(end_at)): str(candidate_id)
+                for request_id, start_at, end_at, candidate_id in result
+            }
+
+        responses = []
         for interview in interviews:
-            if interview.available_slots and 'slots' in interview.available_slots:
+            response = InterviewResponse.model_validate(interview)
+            if interview.recruitment_request_id in request_ids:
+                slots = []
                 for slot in interview.available_slots['slots']:
-                    if slot['start'] == slot_start and slot['end'] == slot_end:
-                        slot['is_booked'] = True
-                        slot['booked_by'] = SLOT_BOOKED_BY_OTHER
-                        break
+                    booked_by = bookings.get((
+                        interview.recruitment_request_id,
+                        _slot_key(datetime.fromisoformat(slot['start'])),
+                        _slot_key(datetime.fromisoformat(slot['end']))
+                    ))
+                    slots.append({**slot, "is_booked": booked_by is not None, "booked_by": booked_by})
+                response.available_slots = {**interview.available_slots, "slots": slots}
+            responses.append(response)
+        return responses
+
+    async def interview_response(self, session: AsyncSession, interview: Interview) -> InterviewResponse:
+        """Serialize one interview; see :meth:`interview_responses`."""
+        return (await self.interview_responses(session, [interview]))[0]
+
+    async def list_interview_time_slots(
+        self,
+        session: AsyncSession,
+        recruitment_request_id: int,
+        available_only: bool = True,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[InterviewTimeSlot]:
+        """List a requisition's interview slots starting in [start, end), by start time."""
+        query = select(InterviewTimeSlot).where(
+            InterviewTimeSlot.recruitment_request_id == recruitment_request_id
+        )
+        if start:
+            query = query.where(InterviewTimeSlot.start_at >= _slot_key(start))
+        if end:
+            query = query.where(InterviewTimeSlot.start_at < _slot_key(end))
+        if available_only:
+            query = query.where(InterviewTimeSlot.booked_interview_id.is_(None))
+
+        result = await session.execute(query.order_by(InterviewTimeSlot.start_at, InterviewTimeSlot.end_at))
+        return list(result.scalars().all())
 
     async def complete_interview(
         self,
@@ -650,215 +742,29 @@ class RecruitmentService:
     # =========================================================================
 
     async def get_stats(self, session: AsyncSession) -> Dict[str, Any]:
-        """Get recruitment statistics."""
-        # Count requests
-        total_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id))
-        )
-        active_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                RecruitmentRequest.status.in_(['pending', 'approved'])
-            )
-        )
-
-        # Count candidates
-        total_candidates = await session.execute(
-            select(func.count(Candidate.id))
-        )
-
-        # Get pipeline counts
-        pipeline_counts = await self.get_pipeline_counts(session)
-
-        # Count by source
-        source_result = await session.execute(
-            select(Candidate.source, func.count(Candidate.id))
-            .where(Candidate.source.isnot(None))
-            .group_by(Candidate.source)
-        )
-        by_source = {row[0]: row[1] for row in source_result.all()}
-
-        # Recent hires (last 30 days)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_hires = await session.execute(
-            select(func.count(Candidate.id)).where(
-                and_(
-                    Candidate.stage == 'hired',
-                    Candidate.stage_changed_at >= thirty_days_ago
-                )
-            )
-        )
-
-        return {
-            "total_requests": total_requests.scalar() or 0,
-            "active_requests": active_requests.scalar() or 0,
-            "total_candidates": total_candidates.scalar() or 0,
-            "by_stage": pipeline_counts,
-            "by_source": by_source,
-            "recent_hires": recent_hires.scalar() or 0
-        }
+        """Get recruitment statistics (from the cached metrics snapshot)."""
+        snapshot = await get_recruitment_metrics_cache().get(session)
+        return dict(snapshot.stats)
 
     # =========================================================================
     # HELPER METHODS
     # =========================================================================
 
     async def _generate_request_number(self, session: AsyncSession) -> str:
-        """
-        Generate unique request number: RRF-YYYYMMDD-XXXX.
-        Uses retry logic with max attempts to handle race conditions.
-        Falls back to UUID suffix if unable to generate sequential number.
-        """
-        today = date.today().strftime('%Y%m%d')
-        max_attempts = 5
-        
-        for attempt in range(max_attempts):
-            try:
-                # Get max sequence number for today using MAX instead of COUNT
-                # This is more race-condition resistant
-                result = await session.execute(
-                    select(func.max(RecruitmentRequest.request_number)).where(
-                        RecruitmentRequest.request_number.like(f'RRF-{today}-%')
-                    )
-                )
-                max_number = result.scalar()
-                
-                if max_number:
-                    # Extract sequence number from last requisition
-                    try:
-                        last_seq = int(max_number.split('-')[-1])
-                        next_seq = last_seq + 1
-                    except (ValueError, IndexError):
-                        next_seq = 1
-                else:
-                    next_seq = 1
-                
-                # Try this number - if it fails due to unique constraint, retry
-                return f"RRF-{today}-{next_seq:04d}"
-                
-            except IntegrityError:
-                # Race condition detected - another request got this number
-                # Retry with next iteration
-                await session.rollback()
-                continue
-        
-        # Fallback: Use UUID suffix to guarantee uniqueness
-        unique_suffix = str(uuid.uuid4())[:8].upper()
-        logging.warning(f"Failed to generate sequential request number after {max_attempts} attempts. Using UUID fallback.")
-        return f"RRF-{today}-{unique_suffix}"
+        """Generate unique request number: RRF-YYYYMMDD-XXXX."""
+        return await next_document_number(session, "RRF")
 
     async def _generate_candidate_number(self, session: AsyncSession) -> str:
-        """
-        Generate unique candidate number: CAN-YYYYMMDD-XXXX.
-        Uses retry logic with max attempts to handle race conditions.
-        Falls back to UUID suffix if unable to generate sequential number.
-        """
-        today = date.today().strftime('%Y%m%d')
-        max_attempts = 5
-        
-        for attempt in range(max_attempts):
-            try:
-                # Get max sequence number for today
-                result = await session.execute(
-                    select(func.max(Candidate.candidate_number)).where(
-                        Candidate.candidate_number.like(f'CAN-{today}-%')
-                    )
-                )
-                max_number = result.scalar()
-                
-                if max_number:
-                    try:
-                        last_seq = int(max_number.split('-')[-1])
-                        next_seq = last_seq + 1
-                    except (ValueError, IndexError):
-                        next_seq = 1
-                else:
-                    next_seq = 1
-                
-                return f"CAN-{today}-{next_seq:04d}"
-                
-            except IntegrityError:
-                await session.rollback()
-                continue
-        
-        # Fallback: Use UUID suffix
-        unique_suffix = str(uuid.uuid4())[:8].upper()
-        logging.warning(f"Failed to generate sequential candidate number after {max_attempts} attempts. Using UUID fallback.")
-        return f"CAN-{today}-{unique_suffix}"
+        """Generate unique candidate number: CAN-YYYYMMDD-XXXX."""
+        return await next_document_number(session, "CAN")
 
     async def _generate_interview_number(self, session: AsyncSession) -> str:
-        """
-        Generate unique interview number: INT-YYYYMMDD-XXXX.
-        Uses retry logic with max attempts to handle race conditions.
-        Falls back to UUID suffix if unable to generate sequential number.
-        """
-        today = date.today().strftime('%Y%m%d')
-        max_attempts = 5
-        
-        for attempt in range(max_attempts):
-            try:
-                result = await session.execute(
-                    select(func.max(Interview.interview_number)).where(
-                        Interview.interview_number.like(f'INT-{today}-%')
-                    )
-                )
-                max_number = result.scalar()
-                
-                if max_number:
-                    try:
-                        last_seq = int(max_number.split('-')[-1])
-                        next_seq = last_seq + 1
-                    except (ValueError, IndexError):
-                        next_seq = 1
-                else:
-                    next_seq = 1
-                
-                return f"INT-{today}-{next_seq:04d}"
-                
-            except IntegrityError:
-                await session.rollback()
-                continue
-        
-        # Fallback: Use UUID suffix
-        unique_suffix = str(uuid.uuid4())[:8].upper()
-        logging.warning(f"Failed to generate sequential interview number after {max_attempts} attempts. Using UUID fallback.")
-        return f"INT-{today}-{unique_suffix}"
+        """Generate unique interview number: INT-YYYYMMDD-XXXX."""
+        return await next_document_number(session, "INT")
 
     async def _generate_evaluation_number(self, session: AsyncSession) -> str:
-        """
-        Generate unique evaluation number: EVL-YYYYMMDD-XXXX.
-        Uses retry logic with max attempts to handle race conditions.
-        Falls back to UUID suffix if unable to generate sequential number.
-        """
-        today = date.today().strftime('%Y%m%d')
-        max_attempts = 5
-        
-        for attempt in range(max_attempts):
-            try:
-                result = await session.execute(
-                    select(func.max(Evaluation.evaluation_number)).where(
-                        Evaluation.evaluation_number.like(f'EVL-{today}-%')
-                    )
-                )
-                max_number = result.scalar()
-                
-                if max_number:
-                    try:
-                        last_seq = int(max_number.split('-')[-1])
-                        next_seq = last_seq + 1
-                    except (ValueError, IndexError):
-                        next_seq = 1
-                else:
-                    next_seq = 1
-                
-                return f"EVL-{today}-{next_seq:04d}"
-                
-            except IntegrityError:
-                await session.rollback()
-                continue
-        
-        # Fallback: Use UUID suffix
-        unique_suffix = str(uuid.uuid4())[:8].upper()
-        logging.warning(f"Failed to generate sequential evaluation number after {max_attempts} attempts. Using UUID fallback.")
-        return f"EVL-{today}-{unique_suffix}"
+        """Generate unique evaluation number: EVL-YYYYMMDD-XXXX."""
+        return await next_document_number(session, "EVL")
 
     async def _create_manager_pass(
         self,
@@ -866,43 +772,8 @@ class RecruitmentService:
         request: RecruitmentRequest,
         created_by: str
     ) -> Pass:
-        """
-        Create manager pass for hiring manager.
-        Uses MAX-based approach with retry logic to avoid race conditions.
-        """
-        today = date.today().strftime('%Y%m%d')
-        max_attempts = 5
-        
-        for attempt in range(max_attempts):
-            try:
-                # Get max sequence number for today
-                result = await session.execute(
-                    select(func.max(Pass.pass_number)).where(
-                        Pass.pass_number.like(f'MGR-{today}-%')
-                    )
-                )
-                max_number = result.scalar()
-                
-                if max_number:
-                    try:
-                        last_seq = int(max_number.split('-')[-1])
-                        next_seq = last_seq + 1
-                    except (ValueError, IndexError):
-                        next_seq = 1
-                else:
-                    next_seq = 1
-                
-                pass_number = f"MGR-{today}-{next_seq:04d}"
-                break  # Exit loop if successful
-                
-            except IntegrityError:
-                await session.rollback()
-                if attempt == max_attempts - 1:
-                    # Fallback: Use UUID suffix
-                    unique_suffix = str(uuid.uuid4())[:8].upper()
-                    logging.warning(f"Failed to generate sequential manager pass number after {max_attempts} attempts. Using UUID fallback.")
-                    pass_number = f"MGR-{today}-{unique_suffix}"
-                continue
+        """Create manager pass for hiring manager."""
+        pass_number = await next_document_number(session, "MGR")
 
         # Create pass
         # pass_type is an enum value, not a password
@@ -931,43 +802,8 @@ class RecruitmentService:
         candidate: Candidate,
         created_by: str
     ) -> Pass:
-        """
-        Create recruitment pass for candidate.
-        Uses MAX-based approach with retry logic to avoid race conditions.
-        """
-        today = date.today().strftime('%Y%m%d')
-        max_attempts = 5
-        
-        for attempt in range(max_attempts):
-            try:
-                # Get max sequence number for today
-                result = await session.execute(
-                    select(func.max(Pass.pass_number)).where(
-                        Pass.pass_number.like(f'REC-{today}-%')
-                    )
-                )
-                max_number = result.scalar()
-                
-                if max_number:
-                    try:
-                        last_seq = int(max_number.split('-')[-1])
-                        next_seq = last_seq + 1
-                    except (ValueError, IndexError):
-                        next_seq = 1
-                else:
-                    next_seq = 1
-                
-                pass_number = f"REC-{today}-{next_seq:04d}"
-                break  # Exit loop if successful
-                
-            except IntegrityError:
-                await session.rollback()
-                if attempt == max_attempts - 1:
-                    # Fallback: Use UUID suffix
-                    unique_suffix = str(uuid.uuid4())[:8].upper()
-                    logging.warning(f"Failed to generate sequential candidate pass number after {max_attempts} attempts. Using UUID fallback.")
-                    pass_number = f"REC-{today}-{unique_suffix}"
-                continue
+        """Create recruitment pass for candidate."""
+        pass_number = await next_document_number(session, "REC")
 
         # Create pass
         # pass_type is an enum value, not a password
@@ -1007,393 +843,133 @@ class RecruitmentService:
     # BULK OPERATIONS
     # =========================================================================
 
-    async def bulk_update_stage(
+    async def bulk_update_candidate_stage(
         self,
         session: AsyncSession,
         candidate_ids: List[int],
         new_stage: str,
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        performed_by: str = "system",
+        performed_by_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Bulk update candidate stages for efficiency."""
-        # Validate stage
+        """
+        Bulk update candidate stages in one UPDATE ... RETURNING, logging a
+        ``stage_changed`` activity per updated candidate in one bulk insert.
+
+        Returns:
+            {"success_count": int, "failed_count": int, "failed_ids": List[int], "message": str}
+        """
         valid_stages = [s['key'] for s in RECRUITMENT_STAGES]
         if new_stage not in valid_stages:
             raise ValueError(f"Invalid stage: {new_stage}")
 
-        success_count = 0
-        failed_ids = []
-
-        for candidate_id in candidate_ids:
-            try:
-                candidate = await self.get_candidate(session, candidate_id)
-                if candidate:
-                    candidate.stage = new_stage
-                    candidate.stage_changed_at = datetime.now()
-                    # Update status based on stage
-                    stage_status_map = {
-                        'applied': 'applied',
-                        'screening': 'screening',
-                        'interview': 'interview',
-                        'offer': 'offer',
-                        'hired': 'hired',
-                        'rejected': 'rejected'
-                    }
-                    candidate.status = stage_status_map.get(new_stage, candidate.status)
-                    if notes:
-                        existing_notes = candidate.recruiter_notes or ""
-                        candidate.recruiter_notes = f"{existing_notes}\n[{datetime.now().strftime('%Y-%m-%d')}] Stage changed to {new_stage}: {notes}".strip()
-                    success_count += 1
-                else:
-                    failed_ids.append(candidate_id)
-            except SQLAlchemyError as e:
-                logger.warning(f"Database error updating candidate {candidate_id}: {e}")
-                failed_ids.append(candidate_id)
-
-        await session.commit()
+        now = datetime.now()
+        values = {"stage": new_stage, "status": new_stage, "stage_changed_at": now}
+        description = f"Stage changed to {new_stage}"
+        if notes:
+            values["recruiter_notes"] = _append_note(f"[{now:%Y-%m-%d %H:%M}] {description}: {notes}")
+            description = f"{description}: {notes}"
 
+        updated_ids = await self._bulk_update_candidates(
+            session, candidate_ids, values, description, new_stage, performed_by, performed_by_id
+        )
+        failed_ids = [candidate_id for candidate_id in dict.fromkeys(candidate_ids) if candidate_id not in updated_ids]
         return {
-            "success_count": success_count,
+            "success_count": len(updated_ids),
             "failed_count": len(failed_ids),
             "failed_ids": failed_ids,
-            "message": f"Successfully updated {success_count} candidates to stage '{new_stage}'"
+            "message": f"Successfully updated {len(updated_ids)} candidates, {len(failed_ids)} failed"
         }
 
     async def bulk_reject_candidates(
         self,
         session: AsyncSession,
         candidate_ids: List[int],
-        rejection_reason: str
-    ) -> Dict[str, Any]:
-        """Bulk reject candidates for efficiency."""
-        success_count = 0
-        failed_ids = []
-
-        for candidate_id in candidate_ids:
-            try:
-                candidate = await self.get_candidate(session, candidate_id)
-                if candidate and candidate.stage != 'hired':
-                    candidate.stage = 'rejected'
-                    candidate.status = 'rejected'
-                    candidate.rejection_reason = rejection_reason
-                    candidate.stage_changed_at = datetime.now()
-                    success_count += 1
-                else:
-                    failed_ids.append(candidate_id)
-            except SQLAlchemyError as e:
-                logger.warning(f"Database error rejecting candidate {candidate_id}: {e}")
-                failed_ids.append(candidate_id)
-
-        await session.commit()
-
-        return {
-            "success_count": success_count,
-            "failed_count": len(failed_ids),
-            "failed_ids": failed_ids,
-            "message": f"Successfully rejected {success_count} candidates"
-        }
-
-    # =========================================================================
-    # ENHANCED ANALYTICS
-    # =========================================================================
-
-    async def get_recruitment_metrics(self, session: AsyncSession) -> Dict[str, Any]:
-        """Get detailed recruitment metrics for dashboard and analytics."""
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-
-        # Request counts
-        total_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id))
-        )
-        active_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                RecruitmentRequest.status.in_(['pending', 'approved'])
-            )
-        )
-        filled_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                RecruitmentRequest.status == 'filled'
-            )
-        )
-        cancelled_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                RecruitmentRequest.status == 'cancelled'
-            )
-        )
-
-        # Total candidates
-        total_candidates = await session.execute(
-            select(func.count(Candidate.id))
-        )
-
-        # Pipeline counts
-        pipeline_counts = await self.get_pipeline_counts(session)
-
-        # By source
-        source_result = await session.execute(
-            select(Candidate.source, func.count(Candidate.id))
-            .where(Candidate.source.isnot(None))
-            .group_by(Candidate.source)
-        )
-        by_source = {row[0]: row[1] for row in source_result.all()}
-
-        # By status
-        status_result = await session.execute(
-            select(Candidate.status, func.count(Candidate.id))
-            .group_by(Candidate.status)
-        )
-        by_status = {row[0]: row[1] for row in status_result.all()}
-
-        # Recent hires
-        recent_hires = await session.execute(
-            select(func.count(Candidate.id)).where(
-                and_(
-                    Candidate.stage == 'hired',
-                    Candidate.stage_changed_at >= thirty_days_ago
-                )
-            )
-        )
-
-        # Pending interviews
-        pending_interviews = await session.execute(
-            select(func.count(Candidate.id)).where(
-                and_(
-                    Candidate.stage == 'interview',
-                    Candidate.status != 'completed'
-                )
-            )
-        )
-
-        # Pending offers
-        pending_offers = await session.execute(
-            select(func.count(Candidate.id)).where(
-                and_(
-                    Candidate.stage == 'offer',
-                    Candidate.status.in_(['offer', 'in_preparation', 'released'])
-                )
-            )
-        )
-
-        # Priority counts
-        priority_result = await session.execute(
-            select(RecruitmentRequest.priority, func.count(RecruitmentRequest.id))
-            .where(RecruitmentRequest.status.in_(['pending', 'approved']))
-            .group_by(RecruitmentRequest.priority)
-        )
-        by_priority = {row[0] or 'normal': row[1] for row in priority_result.all()}
-
-        # Calculate conversion rates
-        total_cand = total_candidates.scalar() or 0
-        screening_count = pipeline_counts.get('screening', 0) + pipeline_counts.get('interview', 0) + pipeline_counts.get('offer', 0) + pipeline_counts.get('hired', 0)
-        interview_count = pipeline_counts.get('interview', 0) + pipeline_counts.get('offer', 0) + pipeline_counts.get('hired', 0)
-        offer_count = pipeline_counts.get('offer', 0) + pipeline_counts.get('hired', 0)
-        hired_count = pipeline_counts.get('hired', 0)
-
-        applied_count = pipeline_counts.get('applied', 0) + screening_count
-
-        app_to_screen_rate = (screening_count / applied_count * 100) if applied_count > 0 else None
-        screen_to_interview_rate = (interview_count / screening_count * 100) if screening_count > 0 else None
-        interview_to_offer_rate = (offer_count / interview_count * 100) if interview_count > 0 else None
-        offer_accept_rate = (hired_count / offer_count * 100) if offer_count > 0 else None
-
-        # Overdue requests (past target hire date)
-        overdue = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                and_(
-                    RecruitmentRequest.target_hire_date < date.today(),
-                    RecruitmentRequest.status.in_(['pending', 'approved'])
-                )
-            )
-        )
-
-        return {
-            "total_requests": total_requests.scalar() or 0,
-            "active_requests": active_requests.scalar() or 0,
-            "filled_requests": filled_requests.scalar() or 0,
-            "cancelled_requests": cancelled_requests.scalar() or 0,
-            "total_candidates": total_cand,
-            "candidates_by_stage": pipeline_counts,
-            "candidates_by_source": by_source,
-            "candidates_by_status": by_status,
-            "avg_time_to_fill": None,  # Would need historical data
-            "avg_time_in_screening": None,
-            "avg_time_to_offer": None,
-            "application_to_screening_rate": round(app_to_screen_rate, 1) if app_to_screen_rate else None,
-            "screening_to_interview_rate": round(screen_to_interview_rate, 1) if screen_to_interview_rate else None,
-            "interview_to_offer_rate": round(interview_to_offer_rate, 1) if interview_to_offer_rate else None,
-            "offer_acceptance_rate": round(offer_accept_rate, 1) if offer_accept_rate else None,
-            "recent_hires": recent_hires.scalar() or 0,
-            "pending_interviews": pending_interviews.scalar() or 0,
-            "pending_offers": pending_offers.scalar() or 0,
-            "overdue_requests": overdue.scalar() or 0,
-            "requests_by_priority": by_priority
-        }
-
-
-    async def bulk_update_candidate_stage(
-        self,
-        session: AsyncSession,
-        candidate_ids: List[int],
-        new_stage: str,
-        notes: Optional[str] = None
+        rejection_reason: str,
+        performed_by: str = "system",
+        performed_by_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Bulk update candidate stages.
-        
+        Bulk reject candidates with reason in one UPDATE ... RETURNING.
+        Hired candidates are left unchanged and reported as failed.
+
         Returns:
             {"success_count": int, "failed_count": int, "failed_ids": List[int], "message": str}
         """
-        success_count = 0
-        failed_count = 0
-        failed_ids = []
         now = datetime.now()
-        
-        for candidate_id in candidate_ids:
-            try:
-                candidate = await self.get_candidate(session, candidate_id)
-                if not candidate:
-                    failed_count += 1
-                    failed_ids.append(candidate_id)
-                    continue
-                
-                candidate.stage = new_stage
-                candidate.stage_changed_at = now
-                candidate.status = new_stage  # Sync status with stage
-                
-                if notes:
-                    # Append notes to recruiter_notes
-                    timestamp = now.strftime("%Y-%m-%d %H:%M")
-                    note_entry = f"[{timestamp}] Stage changed to {new_stage}: {notes}"
-                    if candidate.recruiter_notes:
-                        candidate.recruiter_notes += f"\n{note_entry}"
-                    else:
-                        candidate.recruiter_notes = note_entry
-                
-                success_count += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to update candidate {candidate_id}: {str(e)}")
-                failed_count += 1
-                failed_ids.append(candidate_id)
-        
-        await session.commit()
-        
+        values = {
+            "stage": "rejected",
+            "status": "rejected",
+            "stage_changed_at": now,
+            "rejection_reason": rejection_reason,
+            "recruiter_notes": _append_note(f"[{now:%Y-%m-%d %H:%M}] Rejected: {rejection_reason}"),
+        }
+        updated_ids = await self._bulk_update_candidates(
+            session, candidate_ids, values, f"Rejected: {rejection_reason}", "rejected",
+            performed_by, performed_by_id, Candidate.stage != 'hired'
+        )
+        failed_ids = [candidate_id for candidate_id in dict.fromkeys(candidate_ids) if candidate_id not in updated_ids]
         return {
-            "success_count": success_count,
-            "failed_count": failed_count,
+            "success_count": len(updated_ids),
+            "failed_count": len(failed_ids),
             "failed_ids": failed_ids,
-            "message": f"Successfully updated {success_count} candidates, {failed_count} failed"
+            "message": f"Successfully rejected {len(updated_ids)} candidates, {len(failed_ids)} failed"
         }
 
-    async def bulk_reject_candidates(
+    async def _bulk_update_candidates(
         self,
         session: AsyncSession,
         candidate_ids: List[int],
-        rejection_reason: str
-    ) -> Dict[str, Any]:
-        """
-        Bulk reject candidates with reason.
-        
-        Returns:
-            {"success_count": int, "failed_count": int, "failed_ids": List[int], "message": str}
-        """
-        success_count = 0
-        failed_count = 0
-        failed_ids = []
-        now = datetime.now()
-        
-        for candidate_id in candidate_ids:
-            try:
-                candidate = await self.get_candidate(session, candidate_id)
-                if not candidate:
-                    failed_count += 1
-                    failed_ids.append(candidate_id)
-                    continue
-                
-                candidate.stage = "rejected"
-                candidate.status = "rejected"
-                candidate.stage_changed_at = now
-                candidate.rejection_reason = rejection_reason
-                
-                # Add note to recruiter_notes
-                timestamp = now.strftime("%Y-%m-%d %H:%M")
-                note_entry = f"[{timestamp}] Rejected: {rejection_reason}"
-                if candidate.recruiter_notes:
-                    candidate.recruiter_notes += f"\n{note_entry}"
-                else:
-                    candidate.recruiter_notes = note_entry
-                
-                success_count += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to reject candidate {candidate_id}: {str(e)}")
-                failed_count += 1
-                failed_ids.append(candidate_id)
-        
+        values: Dict[str, Any],
+        description: str,
+        stage: str,
+        performed_by: str,
+        performed_by_id: Optional[str],
+        *criteria
+    ) -> set:
+        """Apply ``values`` to the given candidates and log the change; returns the updated ids."""
+        if not candidate_ids:
+            return set()
+        result = await session.execute(
+            update(Candidate)
+            .where(Candidate.id.in_(set(candidate_ids)), *criteria)
+            .values(**values)
+            .returning(Candidate.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids = set(result.scalars().all())
+        if updated_ids:
+            timestamp = datetime.utcnow()
+            await session.execute(insert(ActivityLog), [
+                {
+                    "candidate_id": candidate_id,
+                    "stage": stage,
+                    "action_type": "stage_changed",
+                    "action_description": description,
+                    "performed_by": performed_by,
+                    "performed_by_id": performed_by_id,
+                    "timestamp": timestamp,
+                    "visibility": "internal",
+                }
+                for candidate_id in sorted(updated_ids)
+            ])
         await session.commit()
-        
-        return {
-            "success_count": success_count,
-            "failed_count": failed_count,
-            "failed_ids": failed_ids,
-            "message": f"Successfully rejected {success_count} candidates, {failed_count} failed"
-        }
+        return updated_ids
+
+    # =========================================================================
+    # ENHANCED ANALYTICS
+    # =========================================================================
 
     async def get_recruitment_metrics(self, session: AsyncSession) -> Dict[str, Any]:
         """
-        Get detailed recruitment metrics including time-to-hire and source effectiveness.
-        
-        Enhanced version of get_stats with additional analytics.
+        Get detailed recruitment metrics for dashboard and analytics,
+        including time-to-hire and source effectiveness.
+
+        Served from the cached metrics snapshot, which candidate and
+        requisition writes invalidate.
         """
-        # Get basic stats first
-        stats = await self.get_stats(session)
-        
-        # Calculate time-to-hire average (from created_at to offer stage)
-        time_to_hire_query = select(
-            func.avg(
-                func.extract('epoch', Candidate.stage_changed_at - Candidate.created_at) / 86400
-            )
-        ).where(
-            and_(
-                Candidate.stage == "offer",
-                Candidate.stage_changed_at.isnot(None)
-            )
-        )
-        time_to_hire_result = await session.execute(time_to_hire_query)
-        avg_time_to_hire = time_to_hire_result.scalar()
-        
-        # Calculate source effectiveness (conversion rate from applied to hired by source)
-        source_effectiveness = {}
-        
-        # Get all unique sources
-        sources_query = select(Candidate.source).distinct().where(Candidate.source.isnot(None))
-        sources_result = await session.execute(sources_query)
-        sources = [row[0] for row in sources_result.fetchall()]
-        
-        for source in sources:
-            total_count = (await session.execute(
-                select(func.count()).select_from(Candidate).where(Candidate.source == source)
-            )).scalar() or 0
-            
-            hired_count = (await session.execute(
-                select(func.count()).select_from(Candidate).where(
-                    and_(Candidate.source == source, Candidate.stage == "hired")
-                )
-            )).scalar() or 0
-            
-            conversion_rate = round((hired_count / total_count * 100), 1) if total_count > 0 else 0
-            
-            source_effectiveness[source] = {
-                "total": total_count,
-                "hired": hired_count,
-                "conversion_rate": conversion_rate
-            }
-        
-        # Merge with basic stats
-        return {
-            **stats,
-            "avg_time_to_hire_days": round(avg_time_to_hire, 1) if avg_time_to_hire else None,
-            "source_effectiveness": source_effectiveness
-        }
+        snapshot = await get_recruitment_metrics_cache().get(session)
+        return dict(snapshot.metrics)
 
 
 # Singleton instance
@@ -1,9 +1,26 @@
-"""Automated resume parsing service using pyresparser."""
+"""Automated resume parsing service using pyresparser.
+
+pyresparser loads two spaCy models every time a ``ResumeParser`` is built.
+Parsing therefore runs in a pool of ``resume_parser_processes`` long-lived
+worker processes (:class:`~app.services.process_pool.TimedProcessPool`)
+whose initializer loads the models once; uploads are sent to the workers as
+bytes (no temp file in the API process) and each parse is bounded by
+``resume_parser_timeout_seconds``. The pool is warmed up at application
+startup. ``scripts/benchmark_resume_parser.py`` measures the throughput.
+"""
+import asyncio
+import functools
+import io
+import os
+import tempfile
 from typing import Dict, Optional
 from pathlib import Path
 import re
 import logging
 
+from app.core.config import get_settings
+from app.services.process_pool import TimedProcessPool, WorkerExited, WorkerTimeout
+
 # Try to import pyresparser - it's optional and may not be installed
 try:
     from pyresparser import ResumeParser
@@ -13,30 +30,105 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Formats pyresparser reads from memory; others go through a temp file in the worker
+IN_MEMORY_FORMATS = ('.pdf', '.docx')
+
+
+def _init_parser_worker():
+    """Load the spaCy models once per worker process.
+
+    ``ResumeParser`` calls ``spacy.load`` for both models on every instance;
+    caching the loader makes every parse after the first reuse them.
+    """
+    import spacy
+    from pyresparser import resume_parser
+
+    spacy.load = functools.lru_cache(maxsize=None)(spacy.load)
+    spacy.load("en_core_web_sm")
+    spacy.load(os.path.dirname(os.path.abspath(resume_parser.__file__)))
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _parse_in_worker(content: bytes, filename: str) -> Optional[Dict]:
+    """Run pyresparser on an uploaded file (in a worker process)."""
+    ext = Path(filename).suffix.lower()
+    if ext in IN_MEMORY_FORMATS:
+        resume = io.BytesIO(content)
+        resume.name = f"resume{ext}"
+        return ResumeParser(resume).get_extracted_data()
+
+    with tempfile.NamedTemporaryFile(suffix=ext) as tmp_file:
+        tmp_file.write(content)
+        tmp_file.flush()
+        return ResumeParser(tmp_file.name).get_extracted_data()
+
 
 class ResumeParserService:
     """Service for parsing resumes using NLP."""
 
     SUPPORTED_FORMATS = ['.pdf', '.docx', '.doc', '.txt']
 
-    def __init__(self):
+    def __init__(self, processes: Optional[int] = None, warm: bool = True):
         if not PYRESPARSER_AVAILABLE:
             logger.warning(
                 "Resume parsing functionality disabled - pyresparser not installed. "
                 "Install with: pip install pyresparser spacy && python -m spacy download en_core_web_sm"
             )
+        self.settings = get_settings()
+        self.pool = TimedProcessPool(
+            "Resume parsing",
+            self.settings.resume_parser_processes if processes is None else processes,
+            # Without the initializer every parse reloads the models (benchmark baseline)
+            initializer=_init_parser_worker if warm else None,
+        )
 
     def is_available(self) -> bool:
         """Check if resume parsing is available."""
         return PYRESPARSER_AVAILABLE
 
+    async def warm_up(self) -> int:
+        """Start the workers and load the NLP models; returns workers ready."""
+        if not PYRESPARSER_AVAILABLE:
+            return 0
+        ready = await self.pool.warm_up(_ping, timeout=self.settings.resume_parser_timeout_seconds * 4)
+        logger.info(f"Resume parser pool ready: {ready}/{self.pool.processes} workers")
+        return ready
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        self.pool.shutdown()
+
     async def parse_resume(self, file_path: str) -> Dict:
         """
-        Parse resume and extract structured data.
+        Parse a stored resume and extract structured data.
 
         Args:
             file_path: Path to resume file
 
+        Returns:
+            Dict with extracted data (name, email, phone, skills, etc.)
+        """
+        try:
+            content = await asyncio.to_thread(Path(file_path).read_bytes)
+        except OSError as e:
+            logger.error(f"Resume parsing error: {str(e)}")
+            return {
+                'error': str(e),
+                'parsed': False
+            }
+        return await self.parse_resume_bytes(content, Path(file_path).name)
+
+    async def parse_resume_bytes(self, content: bytes, filename: str) -> Dict:
+        """
+        Parse an uploaded resume in the worker pool.
+
+        Args:
+            content: Raw file content
+            filename: Original filename (for determining type)
+
         Returns:
             Dict with extracted data (name, email, phone, skills, etc.)
         """
@@ -48,26 +140,29 @@ class ResumeParserService:
 
         try:
             # Validate file format
-            file_ext = Path(file_path).suffix.lower()
+            file_ext = Path(filename).suffix.lower()
             if file_ext not in self.SUPPORTED_FORMATS:
                 raise ValueError(f"Unsupported format: {file_ext}. Supported: {', '.join(self.SUPPORTED_FORMATS)}")
 
-            # Parse using pyresparser (NLP-powered)
-            parser = ResumeParser(file_path)
-            data = parser.get_extracted_data()
+            # Parse using pyresparser (NLP-powered) in a warm worker
+            try:
+                data = await self.pool.run(
+                    self.settings.resume_parser_timeout_seconds, _parse_in_worker, content, filename
+                )
+            except WorkerTimeout:
+                raise ValueError("Resume parsing timed out")
+            except WorkerExited:
+                raise ValueError("Resume parser worker stopped unexpectedly; please retry")
 
             # Clean and structure data
             cleaned_data = self._clean_parsed_data(data)
 
             # Try to extract UAE-specific data from text content
             try:
-                # Try to read file as text with different encodings
                 text_content = ""
-                file_ext = Path(file_path).suffix.lower()
-                
+
                 if file_ext == '.txt':
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        text_content = f.read()
+                    text_content = content.decode('utf-8', errors='ignore')
                 else:
                     # For PDF/DOCX, try to get text from parsed data
                     # pyresparser extracts text internally
@@ -1,8 +1,12 @@
 from app.repositories.template import TemplateRepository
-from app.schemas.template import TemplateCreate, TemplateUpdate, TemplateResponse
+from app.schemas.template import (
+    TemplateCreate, TemplateUpdate, TemplateResponse,
+    TemplateRenderResponse, TemplateBatchRenderResponse
+)
 from app.models.template import Template
+from app.services.template_renderer import get_template_renderer
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 class TemplateService:
     def __init__(self, repo: TemplateRepository):
@@ -25,6 +29,7 @@ class TemplateService:
         if not template:
             return None
         updated = await self.repo.update(session, template, **data.dict(exclude_unset=True))
+        get_template_renderer().invalidate(template_id)
         return TemplateResponse.from_orm(updated)
 
     async def create_revision(self, session: AsyncSession, template_id: int, data: TemplateCreate, created_by: str) -> Optional[TemplateResponse]:
@@ -39,4 +44,19 @@ class TemplateService:
         if not template:
             return None
         deactivated = await self.repo.deactivate(session, template)
+        get_template_renderer().invalidate(template_id)
         return TemplateResponse.from_orm(deactivated)
+
+    async def render(self, session: AsyncSession, template_id: int, context: Mapping[str, Any], autoescape: bool = True, strict: bool = False) -> Optional[TemplateRenderResponse]:
+        template = await self.repo.get(session, template_id)
+        if not template or not template.is_active:
+            return None
+        content = get_template_renderer().render(template, context, autoescape, strict)
+        return TemplateRenderResponse(template_id=template.id, version=template.version, content=content)
+
+    async def render_batch(self, session: AsyncSession, template_id: int, contexts: List[Dict[str, Any]], autoescape: bool = True, strict: bool = False) -> Optional[TemplateBatchRenderResponse]:
+        template = await self.repo.get(session, template_id)
+        if not template or not template.is_active:
+            return None
+        rendered = get_template_renderer().render_batch(template, contexts, autoescape, strict)
+        return TemplateBatchRenderResponse(template_id=template.id, version=template.version, count=len(rendered), rendered=rendered)
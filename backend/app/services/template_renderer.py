@@ -0,0 +1,213 @@
+"""Compiled rendering for stored templates.
+
+Template content uses ``{{ field }}`` placeholders, with dotted paths for
+nested values (``{{ candidate.full_name }}``). Values are HTML-escaped when
+rendering with ``autoescape=True`` unless the placeholder is marked
+``{{ field|safe }}`` (for pre-rendered fragments such as tables).
+
+Parsing happens once per template version: content is split into literal
+and lookup segments, and the compiled form is cached by ``(id, version)``.
+Rendering a recipient is then a single pass over the segments, so batch
+jobs can render thousands of contexts against one compiled template.
+"""
+import html
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.core.config import get_settings
+from app.models.template import Template
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][\w.]*)\s*(\|\s*safe\s*)?\}\}")
+
+# A segment is either a literal string or a (path, safe) lookup
+Segment = Any
+
+
+class TemplateSyntaxError(ValueError):
+    """Raised when template content contains a malformed placeholder."""
+    pass
+
+
+class TemplateRenderError(KeyError):
+    """Raised in strict mode when a placeholder has no value in the context."""
+    pass
+
+
+def compile_segments(content: str) -> Tuple[Segment, ...]:
+    """Split template content into literal strings and field lookups."""
+    segments: List[Segment] = []
+    position = 0
+    for match in _PLACEHOLDER.finditer(content):
+        literal = content[position:match.start()]
+        if "{{" in literal or "}}" in literal:
+            raise TemplateSyntaxError(f"Malformed placeholder near position {position}")
+        if literal:
+            segments.append(literal)
+        path = tuple(match.group(1).split("."))
+        # Lookups fall back to getattr, so names starting with "_" are rejected:
+        # templates must not reach private or dunder attributes (``__class__``...)
+        if any(not part or part.startswith("_") for part in path):
+            raise TemplateSyntaxError(f"Invalid field name {match.group(1)!r} near position {match.start()}")
+        segments.append((path, bool(match.group(2))))
+        position = match.end()
+    tail = content[position:]
+    if "{{" in tail or "}}" in tail:
+        raise TemplateSyntaxError(f"Malformed placeholder near position {position}")
+    if tail:
+        segments.append(tail)
+    return tuple(segments)
+
+
+def _lookup(context: Mapping[str, Any], path: Tuple[str, ...]) -> Any:
+    value: Any = context
+    for part in path:
+        if isinstance(value, Mapping):
+            value = value[part]
+        else:
+            try:
+                value = getattr(value, part)
+            except AttributeError:
+                raise KeyError(part) from None
+    return value
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Parsed form of one template version."""
+    source: str
+    segments: Tuple[Segment, ...]
+    template_id: Optional[int] = None
+    version: Optional[int] = None
+
+    @classmethod
+    def from_source(
+        cls,
+        source: str,
+        template_id: Optional[int] = None,
+        version: Optional[int] = None
+    ) -> "CompiledTemplate":
+        return cls(
+            source=source,
+            segments=compile_segments(source),
+            template_id=template_id,
+            version=version,
+        )
+
+    @property
+    def fields(self) -> List[str]:
+        """Placeholder names used by the template, in order of first use."""
+        names: Dict[str, None] = {}
+        for segment in self.segments:
+            if not isinstance(segment, str):
+                names.setdefault(".".join(segment[0]))
+        return list(names)
+
+    def render(
+        self,
+        context: Mapping[str, Any],
+        autoescape: bool = True,
+        strict: bool = False
+    ) -> str:
+        """Render the template for one context.
+
+        Missing fields render as an empty string unless ``strict`` is set.
+        """
+        parts: List[str] = []
+        append = parts.append
+        for segment in self.segments:
+            if isinstance(segment, str):
+                append(segment)
+                continue
+            path, safe = segment
+            try:
+                value = _lookup(context, path)
+            except KeyError:
+                if strict:
+                    raise TemplateRenderError(".".join(path)) from None
+                continue
+            if value is None:
+                continue
+            text = value if isinstance(value, str) else str(value)
+            append(text if safe or not autoescape else html.escape(text))
+        return "".join(parts)
+
+    def render_many(
+        self,
+        contexts: Iterable[Mapping[str, Any]],
+        autoescape: bool = True,
+        strict: bool = False
+    ) -> List[str]:
+        """Render the template once per context."""
+        return [self.render(context, autoescape, strict) for context in contexts]
+
+
+class TemplateRenderer:
+    """Process-wide LRU cache of compiled templates keyed by ``(id, version)``.
+
+    Template content can be edited in place without a version bump, so a
+    cached entry is only reused while its source still matches the row.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._compiled: "OrderedDict[Tuple[int, int], CompiledTemplate]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_compiled(self, template: Template) -> CompiledTemplate:
+        """Return the compiled form of a template row, compiling it on first use."""
+        key = (template.id, template.version)
+        compiled = self._compiled.get(key)
+        if compiled is not None and compiled.source == template.content:
+            self._compiled.move_to_end(key)
+            self.hits += 1
+            return compiled
+
+        self.misses += 1
+        compiled = CompiledTemplate.from_source(template.content, template.id, template.version)
+        self._compiled[key] = compiled
+        self._compiled.move_to_end(key)
+        while len(self._compiled) > self.max_entries:
+            self._compiled.popitem(last=False)
+        return compiled
+
+    def render(
+        self,
+        template: Template,
+        context: Mapping[str, Any],
+        autoescape: bool = True,
+        strict: bool = False
+    ) -> str:
+        """Render a template row for one context."""
+        return self.get_compiled(template).render(context, autoescape, strict)
+
+    def render_batch(
+        self,
+        template: Template,
+        contexts: Iterable[Mapping[str, Any]],
+        autoescape: bool = True,
+        strict: bool = False
+    ) -> List[str]:
+        """Render a template row for many contexts with a single compile."""
+        return self.get_compiled(template).render_many(contexts, autoescape, strict)
+
+    def invalidate(self, template_id: int) -> None:
+        """Drop every cached version of a template."""
+        for key in [key for key in self._compiled if key[0] == template_id]:
+            del self._compiled[key]
+
+
+# Singleton instance
+_template_renderer: Optional[TemplateRenderer] = None
+
+
+def get_template_renderer() -> TemplateRenderer:
+    """Get or create the template renderer singleton."""
+    global _template_renderer
+    if _template_renderer is None:
+        _template_renderer = TemplateRenderer(
+            max_entries=get_settings().template_cache_max_entries
+        )
+    return _template_renderer
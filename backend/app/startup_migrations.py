@@ -30,6 +30,7 @@ async def run_startup_migrations(session: AsyncSession):
         await ensure_admin_access(session)
         await backfill_line_manager_ids(session)
         await seed_nomination_settings(session)
+        await ensure_candidate_search(session)
         await session.commit()
         logger.info("Startup migrations completed successfully")
     except Exception as e:
@@ -38,6 +39,18 @@ async def run_startup_migrations(session: AsyncSession):
         raise
 
 
+async def ensure_candidate_search(session: AsyncSession):
+    """Create the candidate full-text index (tsvector/FTS5) and its sync triggers."""
+    from app.services.candidate_search import ensure_candidate_search_index
+    try:
+        # Savepoint: an unsupported database must not abort the other migrations
+        async with session.begin_nested():
+            await ensure_candidate_search_index(session)
+        logger.info("Candidate search index verified")
+    except Exception as e:
+        logger.warning(f"Candidate search index unavailable: {e}")
+
+
 async def seed_empty_database(session: AsyncSession):
     """Seed the database with initial employee data if it's empty."""
     result = await session.execute(text("SELECT COUNT(*) FROM employees"))
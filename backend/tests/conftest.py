@@ -5,8 +5,31 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
+
+
+@pytest.fixture
+async def sqlite_session_factory(tmp_path):
+    """Make a session factory over a fresh SQLite database with the given models' tables.
+
+    ``factory = await sqlite_session_factory(RecruitmentRequest, Candidate)``;
+    the engine is ``factory.kw["bind"]`` and is disposed after the test.
+    """
+    engines = []
+
+    async def make(*models):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'test_{len(engines)}.db'}")
+        engines.append(engine)
+        tables = [model.__table__ for model in models]
+        async with engine.begin() as conn:
+            await conn.run_sync(tables[0].metadata.create_all, tables=tables)
+        return async_sessionmaker(engine, expire_on_commit=False)
+
+    yield make
+    for engine in engines:
+        await engine.dispose()
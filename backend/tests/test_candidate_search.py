@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import delete, update
+
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.candidate_search import ensure_candidate_search_index, query_terms, search_candidates
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory):
+    factory = await sqlite_session_factory(RecruitmentRequest, Candidate)
+    async with factory() as session:
+        for request_id in (1, 2):
+            session.add(RecruitmentRequest(
+                id=request_id, request_number=f"RRF-{request_id}", position_title="Engineer",
+                department="Engineering", requested_by="EMP001", employment_type="Full-time",
+            ))
+        # Created before the index exists: picked up by the backfill
+        session.add(Candidate(
+            id=1, candidate_number="CAN-1", recruitment_request_id=1, full_name="Sara Python",
+            email="c1@example.com", core_skills=["Go"],
+        ))
+        await session.flush()
+        await ensure_candidate_search_index(session)
+        await session.commit()
+    return factory
+
+
+def _add(session, candidate_id, request_id=1, **fields):
+    session.add(Candidate(
+        id=candidate_id, candidate_number=f"CAN-{candidate_id}", recruitment_request_id=request_id,
+        full_name=fields.pop("full_name", f"Candidate {candidate_id}"), email=f"c{candidate_id}@example.com",
+        **fields
+    ))
+
+
+def test_query_terms_strip_search_syntax():
+    assert query_terms('python "OR" NEAR(c++ -rtos)*') == ["python", "or", "near", "c", "rtos"]
+    assert query_terms("  ") == []
+
+
+@pytest.mark.anyio
+async def test_search_ranks_skills_above_resume_text(session_factory):
+    async with session_factory() as session:
+        _add(session, 2, core_skills=["Python", "Django"])
+        _add(session, 3, resume_text="Ten years of embedded C; some Python scripting for test rigs.")
+        _add(session, 4, technical_skills={"kubernetes": 4}, recruiter_notes="Strong on Python tooling")
+        _add(session, 5, resume_text="Sales and account management")
+        await session.commit()
+
+        hits, total = await search_candidates(session, "python")
+
+    assert total == 4
+    ids = [candidate.id for candidate, _ in hits]
+    # Name (1) and skills (2) outrank notes (4), which outrank resume text (3)
+    assert set(ids[:2]) == {1, 2}
+    assert ids[2:] == [4, 3]
+    assert hits[0][1] >= hits[-1][1]
+
+
+@pytest.mark.anyio
+async def test_index_follows_updates_and_bulk_writes(session_factory):
+    async with session_factory() as session:
+        _add(session, 2, request_id=2, recruiter_notes="Prefers remote work")
+        await session.commit()
+        assert (await search_candidates(session, "firmware"))[1] == 0
+
+        # Bulk UPDATE bypasses the ORM; the trigger still re-indexes
+        await session.execute(update(Candidate), [{"id": 2, "resume_text": "Firmware engineer, FreeRTOS"}])
+        await session.commit()
+        hits, total = await search_candidates(session, "firmw freertos")
+        assert total == 1 and hits[0][0].id == 2
+
+        assert (await search_candidates(session, "firmware", recruitment_request_id=1))[1] == 0
+        await session.execute(delete(Candidate).where(Candidate.id == 2))
+        await session.commit()
+        assert (await search_candidates(session, "firmware"))[1] == 0
+
+
+@pytest.mark.anyio
+async def test_search_is_paginated(session_factory):
+    async with session_factory() as session:
+        for candidate_id in range(2, 8):
+            _add(session, candidate_id, core_skills=["RTOS"])
+        await session.commit()
+
+        first, total = await search_candidates(session, "rtos", page=1, page_size=4)
+        second, _ = await search_candidates(session, "rtos", page=2, page_size=4)
+
+    assert total == 6
+    assert len(first) == 4 and len(second) == 2
+    assert {c.id for c, _ in first}.isdisjoint({c.id for c, _ in second})
@@ -0,0 +1,447 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import select
+
+from app.models.cv_analysis_cache import CVAnalysisCacheEntry
+from app.models.cv_scoring_job import CVScoringBatch, CVScoringJob
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services import (
+    cv_analysis_cache, cv_scoring_batch, cv_scoring_jobs, cv_scoring_service, document_extraction
+)
+from app.services.cv_analysis_cache import analysis_input_hash, get_cv_analysis_cache
+from app.services.cv_ranking import rank_documents, rank_request_candidates
+from app.services.cv_scoring_batch import BatchAlreadyActive, batch_progress, create_rescore_batch
+from app.services.cv_scoring_jobs import CVScoringWorker, enqueue_cv_scoring
+from app.services.cv_scoring_service import request_cv_analysis
+
+CV_TEXT = (
+    "Jane Doe - Senior Embedded Engineer. Eight years of firmware development in C and "
+    "Python, RTOS, CAN bus and hardware bring-up. Bachelor's Degree in Electrical Engineering."
+)
+
+ANALYSIS = {
+    "cv_scoring": 82,
+    "skills_match_score": 140,  # Out of range on purpose: must be clamped
+    "education_level": "Bachelor's Degree",
+    "years_experience": 8,
+    "current_position": "Senior Embedded Engineer",
+    "key_strengths": ["Firmware"],
+    "areas_of_concern": [],
+}
+
+
+class _StubLLMHandler(BaseHTTPRequestHandler):
+    """Answers /v1/chat/completions like the OpenAI API."""
+
+    def do_POST(self):
+        stub = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with stub.lock:
+            stub.requests.append(body)
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+            status = stub.statuses.pop(0) if stub.statuses else 200
+        try:
+            time.sleep(stub.delay)
+            if status != 200:
+                payload = {"error": {"message": "upstream unavailable", "type": "server_error"}}
+            else:
+                payload = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "```json\n" + json.dumps(ANALYSIS) + "\n```"},
+                    }],
+                }
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with stub.lock:
+                stub.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def llm_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubLLMHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.statuses = []
+    server.delay = 0.0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    monkeypatch.setattr(cv_scoring_service, "_client", None)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = cv_scoring_service.get_settings().model_copy(update={
+        "cv_scoring_llm_retries": 0,
+        "cv_scoring_retry_base_seconds": 0,
+        "cv_scoring_concurrency": 2,
+        "cv_scoring_poll_seconds": 0.05,
+        "cv_scoring_timeout_seconds": 5.0,
+        "cv_scoring_batch_concurrency": 2,
+        "cv_scoring_batch_chunk_size": 2,
+        "document_extraction_processes": 0,
+    })
+    monkeypatch.setattr(cv_scoring_service, "get_settings", lambda: settings)
+    monkeypatch.setattr(cv_scoring_jobs, "get_settings", lambda: settings)
+    monkeypatch.setattr(cv_analysis_cache, "get_settings", lambda: settings)
+    monkeypatch.setattr(cv_scoring_batch, "get_settings", lambda: settings)
+    monkeypatch.setattr(cv_analysis_cache, "_cv_analysis_cache", None)
+    monkeypatch.setattr(document_extraction, "get_settings", lambda: settings)
+    monkeypatch.setattr(document_extraction, "_document_extractor", None)
+    return settings
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory):
+    factory = await sqlite_session_factory(
+        RecruitmentRequest, Candidate, CVScoringJob, CVScoringBatch, CVAnalysisCacheEntry
+    )
+    async with factory() as session:
+        session.add(RecruitmentRequest(
+            id=1, request_number="RRF-1", position_title="Embedded Engineer",
+            department="Engineering", requested_by="EMP001", employment_type="Full-time",
+            job_description="Firmware for industrial controllers", required_skills=["C", "RTOS"],
+        ))
+        for i in range(1, 5):
+            session.add(Candidate(
+                id=i, candidate_number=f"CAN-{i}", recruitment_request_id=1,
+                full_name=f"Candidate {i}", email=f"c{i}@example.com",
+            ))
+        await session.commit()
+    return factory
+
+
+async def _queue(session_factory, tmp_path, candidate_id, text=CV_TEXT):
+    path = tmp_path / f"cv_{candidate_id}.txt"
+    path.write_text(text)
+    async with session_factory() as session:
+        job = enqueue_cv_scoring(session, candidate_id, str(path), path.name, requested_by="EMP001")
+        await session.commit()
+        return job.id
+
+
+async def _wait_for(session_factory, job_ids, statuses=("completed", "failed"), timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        async with session_factory() as session:
+            jobs = (await session.execute(
+                select(CVScoringJob).where(CVScoringJob.id.in_(job_ids))
+            )).scalars().all()
+        if all(job.status in statuses for job in jobs):
+            return {job.id: job for job in jobs}
+        assert asyncio.get_running_loop().time() < deadline, [job.status for job in jobs]
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.anyio
+async def test_analysis_uses_async_client_against_stub(llm_server, settings):
+    scores = await request_cv_analysis(CV_TEXT, "Embedded Engineer", "Firmware", ["C"])
+
+    assert scores["cv_scoring"] == 82
+    assert scores["skills_match_score"] == 100
+    assert scores["current_position"] == "Senior Embedded Engineer"
+    assert llm_server.requests[0]["model"] == settings.cv_scoring_model
+    assert "REQUIRED SKILLS: C" in llm_server.requests[0]["messages"][1]["content"]
+
+
+@pytest.mark.anyio
+async def test_worker_scores_queued_cv_and_updates_candidate(llm_server, settings, session_factory, tmp_path):
+    worker = CVScoringWorker(session_factory)
+    job_id = await _queue(session_factory, tmp_path, 1)
+    worker.start()
+    try:
+        jobs = await _wait_for(session_factory, [job_id])
+    finally:
+        await worker.stop()
+
+    job = jobs[job_id]
+    assert job.status == "completed"
+    assert job.attempts == 1
+    assert job.result["cv_scoring"] == 82
+    async with session_factory() as session:
+        candidate = await session.get(Candidate, 1)
+    assert candidate.cv_scoring == 82
+    assert candidate.education_level == "Bachelor's Degree"
+    assert candidate.cv_scored_at is not None
+
+
+@pytest.mark.anyio
+async def test_transient_llm_failure_is_retried(llm_server, settings, session_factory, tmp_path):
+    llm_server.statuses = [503]
+    worker = CVScoringWorker(session_factory)
+    job_id = await _queue(session_factory, tmp_path, 1)
+
+    worker.start()
+    try:
+        jobs = await _wait_for(session_factory, [job_id])
+    finally:
+        await worker.stop()
+
+    assert jobs[job_id].status == "completed"
+    assert jobs[job_id].attempts == 2
+    assert len(llm_server.requests) == 2
+
+
+@pytest.mark.anyio
+async def test_unscorable_cv_fails_without_retry(llm_server, settings, session_factory, tmp_path):
+    worker = CVScoringWorker(session_factory)
+    job_id = await _queue(session_factory, tmp_path, 1, text="too short")
+
+    worker.start()
+    try:
+        jobs = await _wait_for(session_factory, [job_id])
+    finally:
+        await worker.stop()
+
+    assert jobs[job_id].status == "failed"
+    assert jobs[job_id].attempts == 1
+    assert "Insufficient text" in jobs[job_id].last_error
+    assert llm_server.requests == []
+
+
+@pytest.mark.anyio
+async def test_failed_statement_is_rolled_back_before_recording_outcome(settings, session_factory, tmp_path):
+    worker = CVScoringWorker(session_factory)
+    job_id = await _queue(session_factory, tmp_path, 1)
+
+    async def broken_score(session, job):
+        session.add(Candidate(id=1, candidate_number="CAN-1", recruitment_request_id=1,
+                              full_name="Duplicate", email="dup@example.com"))
+        await session.flush()
+
+    worker._score = broken_score
+    job = await worker.run_job(job_id)
+
+    assert job.status == "queued"
+    assert "Unexpected error" in job.last_error
+    async with session_factory() as session:
+        stored = await session.get(CVScoringJob, job_id)
+    assert stored.status == "queued"
+    assert stored.last_error == job.last_error
+
+
+@pytest.mark.anyio
+async def test_worker_limits_concurrent_llm_requests(llm_server, settings, session_factory, tmp_path):
+    llm_server.delay = 0.2
+    worker = CVScoringWorker(session_factory)
+    job_ids = [await _queue(session_factory, tmp_path, i) for i in range(1, 5)]
+
+    worker.start()
+    try:
+        jobs = await _wait_for(session_factory, job_ids)
+    finally:
+        await worker.stop()
+
+    assert all(job.status == "completed" for job in jobs.values())
+    assert llm_server.max_in_flight == settings.cv_scoring_concurrency
+
+
+def test_analysis_hash_ignores_formatting_but_not_content():
+    base = analysis_input_hash("gpt-4o-mini", CV_TEXT, "Embedded Engineer", "Firmware", ["C", "RTOS"])
+    reformatted = analysis_input_hash(
+        "gpt-4o-mini", "  " + CV_TEXT.replace(". ", ".\n\n  "), " Embedded  Engineer", "Firmware\n",
+        ["RTOS", "C", "C"]
+    )
+    assert reformatted == base
+    assert analysis_input_hash("gpt-4o-mini", CV_TEXT, "Embedded Engineer", "Firmware v2", ["C", "RTOS"]) != base
+    assert analysis_input_hash("gpt-4o", CV_TEXT, "Embedded Engineer", "Firmware", ["C", "RTOS"]) != base
+
+
+@pytest.mark.anyio
+async def test_repeat_scoring_is_served_from_cache(llm_server, settings, session_factory, tmp_path):
+    worker = CVScoringWorker(session_factory)
+    first = await _queue(session_factory, tmp_path, 1)
+    worker.start()
+    try:
+        await _wait_for(session_factory, [first])
+        # Same CV re-uploaded (re-wrapped) for another candidate on the same requisition
+        second = await _queue(session_factory, tmp_path, 2, text=CV_TEXT.replace(". ", ".\n"))
+        worker.wake()
+        jobs = await _wait_for(session_factory, [second])
+    finally:
+        await worker.stop()
+
+    assert jobs[second].status == "completed"
+    assert jobs[second].result["cv_scoring"] == 82
+    assert len(llm_server.requests) == 1
+    async with session_factory() as session:
+        assert (await session.get(Candidate, 2)).cv_scoring == 82
+        stats = await get_cv_analysis_cache().stats(session)
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["total_hits"] == 1
+
+
+def test_batch_progress_estimates_remaining_time():
+    now = datetime.now(timezone.utc)
+    batch = CVScoringBatch(
+        id=1, recruitment_request_id=1, status="running", total=20, processed=5,
+        scored=5, skipped=0, failed=0, cache_hits=0, started_at=now - timedelta(seconds=10),
+    )
+    progress = batch_progress(batch, now=now)
+    assert progress["percent_complete"] == 25.0
+    assert progress["candidates_per_second"] == 0.5
+    assert progress["eta_seconds"] == 30.0
+
+
+@pytest.mark.anyio
+async def test_batch_rescores_every_candidate_with_a_resume(llm_server, settings, session_factory, tmp_path):
+    other_cv = CV_TEXT.replace("Jane Doe", "John Roe")
+    texts = {1: CV_TEXT, 2: other_cv, 3: "unreadable", 4: CV_TEXT}
+    async with session_factory() as session:
+        for candidate_id, text in texts.items():
+            path = tmp_path / f"resume_{candidate_id}.txt"
+            path.write_text(text)
+            (await session.get(Candidate, candidate_id)).resume_path = str(path)
+        await session.commit()
+
+        batch = await create_rescore_batch(session, 1, requested_by="EMP001")
+        assert batch.total == 4
+        with pytest.raises(BatchAlreadyActive):
+            await create_rescore_batch(session, 1)
+
+    worker = CVScoringWorker(session_factory)
+    worker.start()
+    try:
+        deadline = asyncio.get_running_loop().time() + 10
+        while True:
+            async with session_factory() as session:
+                batch = await session.get(CVScoringBatch, batch.id)
+            if batch.status in ("completed", "failed"):
+                break
+            assert asyncio.get_running_loop().time() < deadline
+            await asyncio.sleep(0.05)
+    finally:
+        await worker.stop()
+
+    assert batch.status == "completed"
+    assert (batch.processed, batch.scored, batch.skipped, batch.failed) == (4, 3, 1, 0)
+    # Candidate 4 has the same CV as candidate 1: served from the cache
+    assert batch.cache_hits == 1
+    assert len(llm_server.requests) == 2
+    assert batch_progress(batch)["percent_complete"] == 100.0
+    async with session_factory() as session:
+        scores = (await session.execute(
+            select(Candidate.id, Candidate.cv_scoring).order_by(Candidate.id)
+        )).all()
+    assert [tuple(row) for row in scores] == [(1, 82), (2, 82), (3, None), (4, 82)]
+
+
+def test_local_ranking_orders_by_skill_coverage_then_relevance():
+    documents = [
+        "Accountant with IFRS and Excel reporting",
+        "Embedded engineer: C, FreeRTOS, machine  learning on microcontrollers",
+        "Firmware engineer writing C and C++ for an RTOS, machine learning at the edge",
+        "Firmware engineer writing C for an RTOS",
+    ]
+    ranked = rank_documents(documents, ["C", "RTOS", "Machine Learning"], "Firmware for industrial controllers")
+
+    assert [result.index for result in ranked] == [2, 3, 1, 0]
+    assert [result.rank for result in ranked] == [1, 2, 3, 4]
+    assert ranked[0].skills_match_score == 100
+    assert ranked[0].matched_skills == ["c", "rtos", "machine learning"]
+    # "FreeRTOS" is not "RTOS"; the phrase matches across irregular spacing
+    assert ranked[2].matched_skills == ["c", "machine learning"]
+    assert ranked[3].skills_match_score == 0
+    # Same coverage: the firmware CV is closer to the description
+    assert ranked[1].relevance > 0
+
+
+@pytest.fixture
+def no_llm(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("AI_INTEGRATIONS_OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(cv_scoring_service, "_client", None)
+
+
+@pytest.mark.anyio
+async def test_worker_falls_back_to_local_ranking_without_api_key(no_llm, settings, session_factory, tmp_path):
+    worker = CVScoringWorker(session_factory)
+    job_id = await _queue(session_factory, tmp_path, 1, text=CV_TEXT.replace(", RTOS", ""))
+    worker.start()
+    try:
+        jobs = await _wait_for(session_factory, [job_id])
+    finally:
+        await worker.stop()
+
+    assert jobs[job_id].status == "completed"
+    assert jobs[job_id].result == {"method": "local", "skills_match_score": 50, "matched_skills": ["c"]}
+    async with session_factory() as session:
+        candidate = await session.get(Candidate, 1)
+    assert candidate.skills_match_score == 50
+    assert candidate.cv_scoring is None
+
+
+@pytest.mark.anyio
+async def test_rank_request_candidates_persists_ranks(no_llm, settings, session_factory, tmp_path):
+    texts = {1: CV_TEXT.replace(", RTOS", ""), 2: "Sales manager, retail and CRM experience", 3: CV_TEXT}
+    async with session_factory() as session:
+        for candidate_id, text in texts.items():
+            path = tmp_path / f"resume_{candidate_id}.txt"
+            path.write_text(text)
+            (await session.get(Candidate, candidate_id)).resume_path = str(path)
+        (await session.get(Candidate, 4)).core_skills = ["RTOS"]
+        request = await session.get(RecruitmentRequest, 1)
+
+        ranked = await rank_request_candidates(session, request)
+        await session.commit()
+
+    assert [(candidate.id, result.skills_match_score) for candidate, result in ranked] == [
+        (3, 100), (4, 50), (1, 50), (2, 0)
+    ]
+    async with session_factory() as session:
+        rows = (await session.execute(
+            select(Candidate.id, Candidate.screening_rank, Candidate.skills_match_score).order_by(Candidate.id)
+        )).all()
+    assert [tuple(row) for row in rows] == [(1, 3, 50), (2, 4, 0), (3, 1, 100), (4, 2, 50)]
+
+
+@pytest.mark.anyio
+async def test_batch_prefilter_keeps_low_coverage_cvs_from_the_llm(llm_server, settings, session_factory, tmp_path):
+    settings.cv_scoring_prefilter_min_skills_match = 60
+    texts = {1: CV_TEXT, 2: CV_TEXT.replace(", RTOS", "").replace("Jane", "Ann")}
+    async with session_factory() as session:
+        for candidate_id, text in texts.items():
+            path = tmp_path / f"resume_{candidate_id}.txt"
+            path.write_text(text)
+            (await session.get(Candidate, candidate_id)).resume_path = str(path)
+        await session.commit()
+        batch = await create_rescore_batch(session, 1)
+
+    batch = await cv_scoring_batch.run_batch(session_factory, batch.id)
+
+    assert batch.status == "completed"
+    assert (batch.scored, batch.filtered) == (1, 1)
+    assert len(llm_server.requests) == 1
+    async with session_factory() as session:
+        filtered = await session.get(Candidate, 2)
+    assert (filtered.skills_match_score, filtered.cv_scoring) == (50, None)
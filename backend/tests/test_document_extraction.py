@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services import document_extraction
+from app.services.document_extraction import (
+    DocumentExtractionError, DocumentExtractor, candidate_cv_text, extract_text_sync
+)
+from app.services.process_pool import TimedProcessPool, WorkerTimeout
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = document_extraction.get_settings().model_copy(update={
+        "document_extraction_processes": 1,
+        "document_extraction_timeout_seconds": 30.0,
+        "document_extraction_max_chars": 1000,
+    })
+    monkeypatch.setattr(document_extraction, "get_settings", lambda: settings)
+    monkeypatch.setattr(document_extraction, "_document_extractor", None)
+    yield settings
+    document_extraction.shutdown_document_extractor()
+
+
+def test_text_is_capped_at_max_chars():
+    text = extract_text_sync(("word " * 100).encode(), "cv.txt", max_chars=50)
+    assert len(text) == 50
+    assert extract_text_sync(b"data", "cv.exe") is None
+
+
+@pytest.mark.anyio
+async def test_extraction_runs_in_worker_process(settings):
+    extractor = DocumentExtractor()
+    try:
+        texts = [await extractor.extract(f"Resume {i} ".encode() * 500, f"cv_{i}.txt") for i in range(3)]
+    finally:
+        extractor.shutdown()
+
+    assert [len(text) for text in texts] == [1000, 1000, 1000]
+    assert texts[2].startswith("Resume 2 ")
+
+
+def _slow_extract(content, filename, max_pages, max_chars):
+    time.sleep(0.5)
+    return "never"
+
+
+@pytest.mark.anyio
+async def test_extraction_timeout_raises(settings, monkeypatch):
+    settings.document_extraction_processes = 0
+    settings.document_extraction_timeout_seconds = 0.05
+    monkeypatch.setattr(document_extraction, "extract_text_sync", _slow_extract)
+
+    with pytest.raises(DocumentExtractionError, match="timed out"):
+        await DocumentExtractor().extract(b"%PDF", "cv.pdf")
+
+
+@pytest.mark.anyio
+async def test_candidate_text_is_extracted_once(settings, sqlite_session_factory, tmp_path, monkeypatch):
+    factory = await sqlite_session_factory(RecruitmentRequest, Candidate)
+    resume = tmp_path / "cv.txt"
+    resume.write_text("Firmware engineer, C and RTOS")
+    settings.document_extraction_processes = 0
+    async with factory() as session:
+        session.add(RecruitmentRequest(
+            id=1, request_number="RRF-1", position_title="Engineer", department="Engineering",
+            requested_by="EMP001", employment_type="Full-time",
+        ))
+        candidate = Candidate(
+            id=1, candidate_number="CAN-1", recruitment_request_id=1, full_name="Candidate 1",
+            email="c1@example.com", resume_path=str(resume),
+        )
+        session.add(candidate)
+        assert await candidate_cv_text(candidate) == "Firmware engineer, C and RTOS"
+        await session.commit()
+
+    resume.unlink()
+    async with factory() as session:
+        candidate = await session.get(Candidate, 1)
+        assert candidate.resume_text_extracted_at is not None
+        # Served from the stored text: the file is gone
+        assert await candidate_cv_text(candidate) == "Firmware engineer, C and RTOS"
+
+
+@pytest.mark.anyio
+async def test_stuck_worker_is_replaced():
+    pool = TimedProcessPool("Test", 1)
+    try:
+        assert await pool.warm_up(os.getpid, timeout=30) == 1
+        first = await pool.run(30, os.getpid)
+        with pytest.raises(WorkerTimeout):
+            await pool.run(0.2, time.sleep, 5)
+        assert await pool.run(30, os.getpid) != first
+    finally:
+        pool.shutdown()
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.models.document_sequence import DocumentSequence
+from app.models.passes import Pass
+from app.repositories.document_sequences import next_document_number
+from app.repositories.passes import PassRepository
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory):
+    return await sqlite_session_factory(DocumentSequence, Pass)
+
+
+@pytest.mark.anyio
+async def test_numbers_are_sequential_per_prefix_and_day(session_factory):
+    day = date(2026, 4, 7)
+    async with session_factory() as session:
+        numbers = [await next_document_number(session, "CAN", day) for _ in range(3)]
+        other_prefix = await next_document_number(session, "INT", day)
+        next_day = await next_document_number(session, "CAN", date(2026, 4, 8))
+        await session.commit()
+
+    assert numbers == ["CAN-20260407-0001", "CAN-20260407-0002", "CAN-20260407-0003"]
+    assert other_prefix == "INT-20260407-0001"
+    assert next_day == "CAN-20260408-0001"
+
+
+@pytest.mark.anyio
+async def test_rolled_back_numbers_are_reissued(session_factory):
+    day = date(2026, 4, 7)
+    async with session_factory() as session:
+        assert await next_document_number(session, "RRF", day) == "RRF-20260407-0001"
+        await session.commit()
+        assert await next_document_number(session, "RRF", day) == "RRF-20260407-0002"
+        await session.rollback()
+        assert await next_document_number(session, "RRF", day) == "RRF-20260407-0002"
+
+
+@pytest.mark.anyio
+async def test_concurrent_sessions_never_share_a_number(session_factory):
+    async def allocate():
+        async with session_factory() as session:
+            number = await next_document_number(session, "EVL")
+            await session.commit()
+            return number
+
+    numbers = await asyncio.gather(*(allocate() for _ in range(10)))
+
+    assert len(set(numbers)) == 10
+    assert sorted(int(number.rsplit("-", 1)[1]) for number in numbers) == list(range(1, 11))
+
+
+@pytest.mark.anyio
+async def test_pass_numbers_use_type_prefix(session_factory):
+    repo = PassRepository()
+    async with session_factory() as session:
+        first = await repo.get_next_pass_number(session, "visitor")
+        second = await repo.get_next_pass_number(session, "visitor")
+        unknown = await repo.get_next_pass_number(session, "other")
+
+    today = date.today().strftime("%Y%m%d")
+    assert (first, second) == (f"VIS-{today}-0001", f"VIS-{today}-0002")
+    assert unknown == f"PAS-{today}-0001"
@@ -0,0 +1,238 @@
+import socketserver
+import threading
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.models.email_outbox import EmailOutbox
+from app.services.email_outbox import EmailOutboxWorker, enqueue_email, register_sent_handler
+from app.services import leave_service
+from app.services.email_service import EmailService
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory):
+    return await sqlite_session_factory(EmailOutbox)
+
+
+def _email_service(send_result):
+    service = MagicMock()
+    service.is_configured.return_value = True
+    service.send_email = AsyncMock(return_value=send_result)
+    return service
+
+
+@pytest.mark.anyio
+async def test_drain_sends_committed_messages_and_runs_sent_handler(session_factory):
+    delivered = []
+
+    async def handler(session, message):
+        delivered.append(message.source_id)
+
+    register_sent_handler("test_sent", handler)
+    async with session_factory() as session:
+        enqueue_email(session, "a@example.com", "Hello", "<p>Hi</p>", "Hi", category="test_sent", source_id=42)
+        await session.commit()
+
+    worker = EmailOutboxWorker(session_factory=session_factory, email_service=_email_service(True))
+    assert await worker.drain_once() == 1
+    assert delivered == [42]
+
+    async with session_factory() as session:
+        message = (await session.execute(select(EmailOutbox))).scalar_one()
+        assert message.status == "sent"
+        assert message.attempts == 1
+        assert message.sent_at is not None
+    assert await worker.drain_once() == 0
+
+
+@pytest.mark.anyio
+async def test_failed_send_is_retried_with_backoff_then_marked_failed(session_factory):
+    async with session_factory() as session:
+        enqueue_email(session, "b@example.com", "Hello", "<p>Hi</p>")
+        await session.commit()
+
+    worker = EmailOutboxWorker(session_factory=session_factory, email_service=_email_service(False))
+    worker.settings = worker.settings.model_copy(update={"email_outbox_max_attempts": 2})
+    assert await worker.drain_once() == 1
+
+    async with session_factory() as session:
+        message = (await session.execute(select(EmailOutbox))).scalar_one()
+        assert message.status == "pending"
+        assert message.next_attempt_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+        # Not due yet, so nothing is claimed
+        assert await worker.drain_once() == 0
+        message.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        await session.commit()
+
+    assert await worker.drain_once() == 1
+    async with session_factory() as session:
+        message = (await session.execute(select(EmailOutbox))).scalar_one()
+        assert message.status == "failed"
+        assert message.attempts == 2
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: EHLO, AUTH PLAIN, MAIL/RCPT/DATA, NOOP, QUIT."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 localhost test SMTP")
+        served = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode().strip().split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.wfile.write(b"250-localhost\r\n250 AUTH PLAIN\r\n")
+            elif verb == "AUTH":
+                with server.lock:
+                    server.logins += 1
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                body = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    body.append(data)
+                server.messages.append(b"".join(body).decode())
+                self.reply("250 OK queued")
+                served += 1
+                if server.max_messages_per_connection and served >= server.max_messages_per_connection:
+                    return  # Drop the connection without QUIT
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self.max_messages_per_connection = 0
+
+
+@pytest.fixture
+def smtp_server():
+    server = _SMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def smtp_email_service(smtp_server):
+    settings = get_settings().model_copy(update={
+        "smtp_host": "127.0.0.1",
+        "smtp_port": smtp_server.server_address[1],
+        "smtp_user": "hr",
+        "smtp_password": "secret",
+        "smtp_use_tls": False,
+        "smtp_timeout_seconds": 5.0,
+        "smtp_pool_size": 3,
+    })
+    service = EmailService(settings=settings)
+    yield service
+    service.close()
+
+
+@pytest.mark.anyio
+async def test_pooled_connection_is_reused_across_messages(smtp_server, smtp_email_service):
+    for i in range(5):
+        assert await smtp_email_service.send_email(f"user{i}@example.com", "Hello", "<p>Hi</p>", "Hi")
+
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 1
+    assert smtp_server.logins == 1
+    assert smtp_email_service.pool.connections_opened == 1
+
+
+@pytest.mark.anyio
+async def test_dropped_pooled_connection_is_replaced(smtp_server, smtp_email_service):
+    smtp_server.max_messages_per_connection = 1
+
+    assert await smtp_email_service.send_email("a@example.com", "One", "<p>1</p>")
+    assert await smtp_email_service.send_email("b@example.com", "Two", "<p>2</p>")
+
+    assert len(smtp_server.messages) == 2
+    assert smtp_server.connections == 2
+
+
+@pytest.mark.anyio
+async def test_worker_drains_concurrently_over_pooled_connections(session_factory, smtp_server, smtp_email_service):
+    async with session_factory() as session:
+        for i in range(12):
+            enqueue_email(session, f"user{i}@example.com", f"Message {i}", "<p>Hi</p>")
+        await session.commit()
+
+    worker = EmailOutboxWorker(session_factory=session_factory, email_service=smtp_email_service)
+    worker.settings = worker.settings.model_copy(update={"email_outbox_concurrency": 3})
+    assert await worker.drain_once() == 12
+
+    async with session_factory() as session:
+        statuses = (await session.execute(select(EmailOutbox.status))).scalars().all()
+    assert statuses == ["sent"] * 12
+    assert len(smtp_server.messages) == 12
+    # Connections are bounded by the pool, not by the number of messages
+    assert 1 <= smtp_server.connections <= 3
+    assert smtp_server.logins == smtp_server.connections
+
+
+@pytest.mark.anyio
+async def test_stopping_worker_leaves_shared_email_service_usable(session_factory, smtp_server, smtp_email_service):
+    worker = EmailOutboxWorker(session_factory=session_factory, email_service=smtp_email_service)
+    worker.start()
+    await worker.stop()
+
+    assert await smtp_email_service.send_email("a@example.com", "After stop", "<p>Hi</p>")
+    assert len(smtp_server.messages) == 1
+
+
+@pytest.mark.anyio
+async def test_decision_email_escapes_names_and_reason(monkeypatch):
+    queued = {}
+
+    async def capture(session, **item):
+        queued.update(item)
+
+    monkeypatch.setattr(leave_service, "queue_digest_item", capture)
+    leave_request = SimpleNamespace(
+        id=9, status="rejected", leave_type="annual", total_days=2,
+        start_date=date(2026, 3, 2), end_date=date(2026, 3, 3),
+        rejection_reason='<a href="https://evil.example">Overlaps</a> & more',
+    )
+    employee = SimpleNamespace(name="<b>Sara</b>", email="sara@example.com")
+    approver = SimpleNamespace(name="O'Neil <Manager>", email="boss@example.com")
+
+    assert await leave_service.LeaveService(None).enqueue_decision_notification(leave_request, employee, approver)
+
+    _, html_body, text_body = queued["email"]
+    assert "<b>Sara</b>" not in html_body and "&lt;b&gt;Sara&lt;/b&gt;" in html_body
+    assert "O&#x27;Neil &lt;Manager&gt;" in html_body
+    assert "&lt;a href=&quot;https://evil.example&quot;&gt;Overlaps&lt;/a&gt; &amp; more" in html_body
+    assert "<a href" not in html_body
+    assert "Reason: <a href" in text_body
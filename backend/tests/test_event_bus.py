@@ -0,0 +1,93 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.notification import Notification, NotificationCounter
+from app.repositories.notification import add_notification
+from app.routers.events import event_stream, format_sse
+from app.services import event_bus
+from app.services.event_bus import EventBus
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(event_bus, "_event_bus", bus)
+    return bus
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory):
+    return await sqlite_session_factory(Notification, NotificationCounter)
+
+
+@pytest.mark.anyio
+async def test_publish_reaches_only_subscribed_channels(bus):
+    mine = bus.subscribe({"EMP1", "7"})
+    other = bus.subscribe({"EMP2"})
+
+    await bus.publish("7", "notification", {"id": 1})
+
+    received = await mine.get(timeout=0.1)
+    assert (received.event, json.loads(received.data)) == ("notification", {"id": 1})
+    assert await other.get(timeout=0.01) is None
+
+    bus.unsubscribe(mine)
+    bus.unsubscribe(other)
+    assert bus.subscriber_count == 0
+
+
+@pytest.mark.anyio
+async def test_slow_subscriber_drops_oldest_events():
+    bus = EventBus(max_queued=2)
+    subscription = bus.subscribe({"EMP1"})
+    for i in range(3):
+        await bus.publish("EMP1", "tick", i)
+
+    assert subscription.dropped == 1
+    assert [json.loads((await subscription.get(0.1)).data) for _ in range(2)] == [1, 2]
+
+
+@pytest.mark.anyio
+async def test_notification_event_is_published_only_after_commit(bus, session_factory):
+    subscription = bus.subscribe({"EMP1"})
+
+    async with session_factory() as session:
+        await add_notification(session, user_id="EMP1", title="Rolled back", message="m")
+        await session.flush()
+        await session.rollback()
+        await add_notification(session, user_id="EMP1", title="Leave approved", message="m")
+        await asyncio.sleep(0)
+        assert await subscription.get(timeout=0.01) is None
+        await session.commit()
+
+    received = await subscription.get(timeout=0.5)
+    payload = json.loads(received.data)
+    assert received.event == "notification"
+    assert payload["title"] == "Leave approved"
+    assert payload["id"] is not None
+    assert await subscription.get(timeout=0.01) is None
+
+
+def test_format_sse_splits_multiline_data():
+    assert format_sse("notification", '{"a": 1}\nx') == 'event: notification\ndata: {"a": 1}\ndata: x\n\n'
+
+
+@pytest.mark.anyio
+async def test_event_stream_sends_events_and_keepalives_until_disconnect(bus, monkeypatch):
+    settings = event_bus.get_settings().model_copy(update={"event_stream_heartbeat_seconds": 0.05})
+    monkeypatch.setattr("app.routers.events.get_settings", lambda: settings)
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(side_effect=[False, False, True])
+    subscription = bus.subscribe({"EMP1"})
+    await bus.publish("EMP1", "attendance", {"status": "present"})
+
+    frames = [frame async for frame in event_stream(request, subscription)]
+
+    assert frames[0].startswith("retry:")
+    assert frames[1].startswith("event: ready")
+    assert frames[2] == 'event: attendance\ndata: {"status": "present"}\n\n'
+    assert frames[3] == ": keepalive\n\n"
+    assert bus.subscriber_count == 0
@@ -0,0 +1,64 @@
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+from app.services.file_storage import (
+    CHUNK_SIZE, UploadTooLarge, content_path, discard_upload, read_upload, store_upload
+)
+
+
+def _upload(content: bytes, size=None) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename="cv.pdf", size=size)
+
+
+@pytest.mark.anyio
+async def test_store_upload_is_content_addressed_and_deduplicated(tmp_path):
+    content = b"%PDF-1.4 " + b"x" * (CHUNK_SIZE * 2 + 17)
+    digest = hashlib.sha256(content).hexdigest()
+
+    first = await store_upload(_upload(content), tmp_path, max_bytes=len(content), suffix=".PDF")
+    second = await store_upload(_upload(content), tmp_path, max_bytes=len(content), suffix=".pdf")
+
+    assert first.path == second.path == str(content_path(tmp_path, digest, ".pdf"))
+    assert first.sha256 == digest and first.size == len(content)
+    assert not first.deduplicated and second.deduplicated
+    assert (tmp_path / digest[:2] / f"{digest}.pdf").read_bytes() == content
+    assert list((tmp_path / ".incoming").iterdir()) == []
+
+
+@pytest.mark.anyio
+async def test_store_upload_rejects_oversized_stream(tmp_path):
+    content = b"y" * (CHUNK_SIZE + 1)
+
+    # Size unknown up front: stopped while streaming, partial file removed
+    with pytest.raises(UploadTooLarge):
+        await store_upload(_upload(content), tmp_path, max_bytes=CHUNK_SIZE)
+    # Declared size: rejected before reading
+    with pytest.raises(UploadTooLarge):
+        await store_upload(_upload(content, size=len(content)), tmp_path, max_bytes=CHUNK_SIZE)
+
+    assert list((tmp_path / ".incoming").iterdir()) == []
+    assert [p.name for p in tmp_path.iterdir()] == [".incoming"]
+
+
+@pytest.mark.anyio
+async def test_read_upload_stops_past_limit():
+    content = b"z" * (CHUNK_SIZE + 1)
+
+    assert await read_upload(_upload(content), max_bytes=len(content)) == content
+    with pytest.raises(UploadTooLarge):
+        await read_upload(_upload(content), max_bytes=CHUNK_SIZE)
+
+
+@pytest.mark.anyio
+async def test_discard_keeps_files_shared_with_earlier_uploads(tmp_path):
+    first = await store_upload(_upload(b"shared"), tmp_path, max_bytes=100)
+    second = await store_upload(_upload(b"shared"), tmp_path, max_bytes=100)
+
+    await discard_upload(second)
+    assert Path(first.path).exists()
+    await discard_upload(first)
+    assert not Path(first.path).exists()
@@ -0,0 +1,60 @@
+from datetime import date, datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.holiday_index import HolidayEntry, HolidayIndex, YearIndex
+
+
+def _holiday(holiday_id, name, start, end, year=None):
+    return HolidayEntry(
+        id=holiday_id,
+        name=name,
+        name_arabic=None,
+        start_date=start,
+        end_date=end,
+        year=year or start.year,
+        holiday_type="uae_official",
+        is_paid=True,
+        description=None,
+        is_active=True,
+        created_at=datetime(2026, 1, 1),
+    )
+
+
+def _index_with(years):
+    index = HolidayIndex(ttl_seconds=600)
+    for year, entries in years.items():
+        index._years[year] = YearIndex.build(year, entries)
+    return index
+
+
+@pytest.mark.anyio
+async def test_holiday_on_uses_date_map_without_queries():
+    eid = _holiday(1, "Eid Al Fitr", date(2026, 3, 20), date(2026, 3, 23))
+    index = _index_with({2026: [eid]})
+    session = AsyncMock()
+
+    assert await index.holiday_on(session, date(2026, 3, 22)) == eid
+    assert await index.holiday_on(session, date(2026, 3, 24)) is None
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_range_spanning_years_is_deduplicated_and_sorted():
+    new_year = _holiday(1, "New Year's Day", date(2027, 1, 1), date(2027, 1, 1))
+    bridge = _holiday(2, "Year End", date(2026, 12, 31), date(2027, 1, 1), year=2026)
+    national = _holiday(3, "National Day", date(2026, 12, 2), date(2026, 12, 3))
+    index = _index_with({2026: [bridge, national], 2027: [new_year, bridge]})
+
+    found = await index.holidays_in_range(AsyncMock(), date(2026, 12, 3), date(2027, 1, 1))
+    assert [h.id for h in found] == [3, 2, 1]
+    assert [h.id for h in await index.holidays_for_year(AsyncMock(), 2027)] == [1]
+
+
+def test_invalidate_drops_year():
+    index = _index_with({2026: [], 2027: []})
+    index.invalidate(2026)
+    assert list(index._years) == [2027]
+    index.invalidate()
+    assert index._years == {}
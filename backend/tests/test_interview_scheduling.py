@@ -0,0 +1,147 @@
+import random
+import time as timer
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.models.activity_log import ActivityLog
+from app.models.interview import InterviewSetup, InterviewSlot
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.schemas.interview import ScheduleOptimizeRequest
+from app.services.interview_matching import max_assignment
+from app.services.interview_service import InterviewService
+
+DAY = date.today() + timedelta(days=1)
+
+
+def _window(start_hour, end_hour):
+    return {
+        "start": datetime.combine(DAY, time(start_hour)).isoformat(),
+        "end": datetime.combine(DAY, time(end_hour)).isoformat(),
+    }
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory):
+    factory = await sqlite_session_factory(
+        RecruitmentRequest, Candidate, ActivityLog, InterviewSetup, InterviewSlot
+    )
+    async with factory() as session:
+        session.add(RecruitmentRequest(
+            id=1, request_number="RRF-1", position_title="Engineer", department="Engineering",
+            requested_by="EMP001", employment_type="Full-time",
+        ))
+        for candidate_id in range(1, 5):
+            session.add(Candidate(
+                id=candidate_id, candidate_number=f"CAN-{candidate_id}", recruitment_request_id=1,
+                full_name=f"Candidate {candidate_id}", email=f"c{candidate_id}@example.com",
+            ))
+        session.add(InterviewSetup(id=1, recruitment_request_id=1, created_by="EMP001"))
+        # Hourly slots 09:00-12:00
+        for hour in (9, 10, 11):
+            session.add(InterviewSlot(
+                interview_setup_id=1, slot_date=DAY, start_time=time(hour), end_time=time(hour + 1)
+            ))
+        await session.commit()
+    return factory
+
+
+def test_max_assignment_beats_greedy_order():
+    # Greedy gives candidate 0 window 0 and leaves candidate 1 without a slot
+    assert max_assignment([[0, 1], [0]], [1, 1]) == [1, 0]
+    assert max_assignment([[0], [0], [0]], [2]).count(0) == 2
+    assert max_assignment([[], [1]], [1, 0]) == [None, None]
+
+
+def test_max_assignment_handles_hundreds_of_candidates():
+    rng = random.Random(7)
+    windows = 120
+    candidate_windows = [
+        sorted(rng.sample(range(windows), rng.randint(1, 6))) for _ in range(800)
+    ]
+    started = timer.perf_counter()
+    match = max_assignment(candidate_windows, [3] * windows)
+    assert timer.perf_counter() - started < 1
+    for candidate, window in enumerate(match):
+        assert window is None or window in candidate_windows[candidate]
+    assert all(match.count(window) <= 3 for window in range(windows))
+
+
+@pytest.mark.anyio
+async def test_optimize_books_maximum_schedule(session_factory):
+    async with session_factory() as session:
+        result = await InterviewService().optimize_schedule(session, ScheduleOptimizeRequest(
+            recruitment_request_id=1,
+            candidates=[
+                {"candidate_id": 1, "availability": [_window(9, 11)]},
+                {"candidate_id": 2, "availability": [_window(9, 10)]},
+                {"candidate_id": 3, "availability": [_window(9, 10)]},
+                {"candidate_id": 4, "availability": [_window(14, 16)]},
+            ],
+        ), performed_by_id="EMP001")
+
+        assert result.scheduled == 2
+        assert {(a.candidate_id, a.start_time.hour) for a in result.assignments} in (
+            {(1, 10), (2, 9)}, {(1, 10), (3, 9)}
+        )
+        assert 4 in result.unscheduled_candidate_ids
+
+        booked = (await session.execute(
+            select(InterviewSlot.booked_by_candidate_id).where(InterviewSlot.status == "booked")
+        )).scalars().all()
+        assert sorted(booked) == sorted(a.candidate_id for a in result.assignments)
+        assert (await session.execute(select(func.count(ActivityLog.id)))).scalar_one() == 2
+
+        # Running again leaves existing bookings alone
+        again = await InterviewService().optimize_schedule(session, ScheduleOptimizeRequest(
+            recruitment_request_id=1,
+            candidates=[{"candidate_id": 1, "availability": [_window(9, 12)]}],
+        ))
+        assert again.scheduled == 0 and again.already_scheduled_candidate_ids == [1]
+
+
+@pytest.mark.anyio
+async def test_optimize_respects_panel_and_dry_run(session_factory):
+    async with session_factory() as session:
+        request = ScheduleOptimizeRequest(
+            recruitment_request_id=1,
+            slot_capacity=2,
+            candidates=[
+                {"candidate_id": candidate_id, "availability": [_window(9, 10)]}
+                for candidate_id in (1, 2, 3)
+            ],
+            interviewers=[
+                {"interviewer_id": "EMP010", "availability": [_window(9, 12)]},
+                {"interviewer_id": "EMP011", "availability": [_window(9, 12)]},
+                {"interviewer_id": "EMP012", "availability": [_window(10, 12)]},
+            ],
+            dry_run=True,
+        )
+        preview = await InterviewService().optimize_schedule(session, request)
+        assert preview.scheduled == 2
+        assert {a.interviewer_id for a in preview.assignments} == {"EMP010", "EMP011"}
+        assert sorted(a.slot_id is None for a in preview.assignments) == [False, True]
+        assert (await session.execute(select(func.count(InterviewSlot.id)))).scalar_one() == 3
+
+        result = await InterviewService().optimize_schedule(
+            session, request.model_copy(update={"dry_run": False})
+        )
+        assert result.scheduled == 2 and result.unscheduled_candidate_ids == [3]
+        # The second seat at 09:00 is a new slot row
+        slots = (await session.execute(
+            select(InterviewSlot).where(InterviewSlot.start_time == time(9))
+        )).scalars().all()
+        assert len(slots) == 2 and all(slot.status == "booked" for slot in slots)
+
+
+@pytest.mark.anyio
+async def test_optimize_rejects_foreign_candidates(session_factory):
+    async with session_factory() as session:
+        with pytest.raises(HTTPException) as exc:
+            await InterviewService().optimize_schedule(session, ScheduleOptimizeRequest(
+                recruitment_request_id=1,
+                candidates=[{"candidate_id": 99, "availability": [_window(9, 10)]}],
+            ))
+    assert exc.value.status_code == 400
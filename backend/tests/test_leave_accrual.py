@@ -0,0 +1,67 @@
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+
+from app.services.leave_accrual import _BALANCE_COLUMNS, compute_accruals
+
+
+def _employees(rows):
+    return pd.DataFrame(rows, columns=["employee_id", "name", "joining_date", "annual_leave_entitlement"])
+
+
+def _balances(rows):
+    return pd.DataFrame(rows, columns=_BALANCE_COLUMNS)
+
+
+def _by_employee(frame):
+    return frame.set_index("employee_id")
+
+
+def test_monthly_accrual_is_pro_rata_from_joining_month():
+    employees = _employees([
+        (1, "Veteran", date(2020, 5, 1), 30),
+        (2, "Joined March", date(2026, 3, 10), None),
+        (3, "Joined late March", date(2026, 3, 20), 24),
+        (4, "Not yet joined", date(2026, 9, 1), 30),
+    ])
+    frame = _by_employee(compute_accruals(
+        employees, _balances([]), _balances([]), date(2026, 6, 15),
+        carry_forward_cap=30, expiry_month=3,
+    ))
+    assert frame.loc[1, "target_entitlement"] == 15.0
+    assert frame.loc[2, "target_entitlement"] == 10.0
+    assert frame.loc[3, "target_entitlement"] == 6.0
+    assert frame.loc[4, "target_entitlement"] == 0.0
+    assert frame["is_new"].all()
+
+
+def test_carry_forward_is_capped_and_unchanged_rows_are_skipped():
+    employees = _employees([(1, "A", date(2020, 1, 1), 30), (2, "B", date(2020, 1, 1), 30)])
+    previous = _balances([
+        (10, 1, Decimal("30"), Decimal("25"), Decimal("5"), Decimal("0"), Decimal("0")),
+        (11, 2, Decimal("30"), Decimal("0"), Decimal("28"), Decimal("0"), Decimal("0")),
+    ])
+    current = _balances([
+        (20, 1, Decimal("2.5"), Decimal("30"), Decimal("0"), Decimal("0"), Decimal("0")),
+    ])
+    frame = _by_employee(compute_accruals(
+        employees, current, previous, date(2026, 1, 20),
+        carry_forward_cap=30, expiry_month=3,
+    ))
+    assert frame.loc[1, "target_carried_forward"] == 30.0
+    assert not frame.loc[1, "is_changed"]
+    assert frame.loc[2, "target_carried_forward"] == 2.0
+    assert frame.loc[2, "is_new"]
+
+
+def test_unused_carry_forward_expires_after_expiry_month():
+    employees = _employees([(1, "A", date(2020, 1, 1), 30)])
+    previous = _balances([(10, 1, Decimal("30"), Decimal("0"), Decimal("20"), Decimal("0"), Decimal("0"))])
+    current = _balances([(20, 1, Decimal("7.5"), Decimal("10"), Decimal("3"), Decimal("1"), Decimal("0"))])
+    frame = _by_employee(compute_accruals(
+        employees, current, previous, date(2026, 4, 1),
+        carry_forward_cap=30, expiry_month=3,
+    ))
+    assert frame.loc[1, "target_carried_forward"] == 4.0
+    assert frame.loc[1, "expired"] == 6.0
@@ -0,0 +1,123 @@
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services import leave_calendar_cache
+from app.services.leave_calendar_cache import (
+    LeaveCalendarCache,
+    calendar_etag,
+    collect_entries,
+    etag_matches,
+    months_in_range,
+    render_ical,
+)
+
+
+class DummyResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        return self
+
+
+def _leave(leave_id, start, end):
+    return SimpleNamespace(
+        id=leave_id,
+        employee_id=7,
+        leave_type="annual",
+        start_date=start,
+        end_date=end,
+        status="approved",
+        is_half_day=False,
+    )
+
+
+def _session(monkeypatch, leaves, holidays):
+    """Session returning leave rows, with holidays served by a stub index."""
+    index = SimpleNamespace(holidays_in_range=AsyncMock(return_value=holidays))
+    monkeypatch.setattr(leave_calendar_cache, "get_holiday_index", lambda: index)
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=DummyResult(leaves))
+    return session
+
+
+def test_months_in_range_crosses_year_boundary():
+    assert months_in_range(date(2025, 11, 15), date(2026, 2, 1)) == [
+        (2025, 11), (2025, 12), (2026, 1), (2026, 2)
+    ]
+
+
+def test_etag_matches_handles_weak_and_lists():
+    assert etag_matches('W/"abc", "def"', '"def"')
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"xyz"', '"abc"')
+
+
+@pytest.mark.anyio
+async def test_cache_builds_once_and_dedupes_cross_month_leave(monkeypatch):
+    leaves = [(_leave(1, date(2026, 1, 28), date(2026, 2, 3)), "Test Employee")]
+    holidays = [SimpleNamespace(id=5, name="New Year's Day", start_date=date(2026, 1, 1), end_date=date(2026, 1, 1))]
+    session = _session(monkeypatch, leaves, holidays)
+    cache = LeaveCalendarCache(ttl_seconds=300)
+    keys = months_in_range(date(2026, 1, 1), date(2026, 2, 28))
+
+    snapshots = await cache.get_months(session, keys)
+    again = await cache.get_months(session, keys)
+
+    assert session.execute.await_count == 1
+    assert [s.etag for s in snapshots] == [s.etag for s in again]
+    entries = collect_entries(snapshots, date(2026, 1, 1), date(2026, 2, 28))
+    assert [e["uid"] for e in entries] == ["holiday-5", "leave-1"]
+    without_holidays = collect_entries(snapshots, date(2026, 1, 1), date(2026, 2, 28), include_holidays=False)
+    assert [e["uid"] for e in without_holidays] == ["leave-1"]
+
+
+@pytest.mark.anyio
+async def test_invalidate_range_rebuilds_only_touched_months(monkeypatch):
+    session = _session(monkeypatch, [], [])
+    cache = LeaveCalendarCache(ttl_seconds=300)
+    keys = [(2026, 1), (2026, 2)]
+    await cache.get_months(session, keys)
+
+    cache.invalidate_range(date(2026, 2, 10), date(2026, 2, 12))
+    await cache.get_months(session, keys)
+
+    assert cache.misses == 3
+    assert cache.hits == 1
+
+
+def test_calendar_etag_varies_with_parameters():
+    snapshots = []
+    a = calendar_etag(snapshots, date(2026, 1, 1), date(2026, 1, 31), True)
+    b = calendar_etag(snapshots, date(2026, 1, 1), date(2026, 1, 31), False)
+    c = calendar_etag(snapshots, date(2026, 1, 1), date(2026, 1, 31), True, variant="ical")
+    assert len({a, b, c}) == 3
+
+
+def test_render_ical_uses_exclusive_all_day_end():
+    body = render_ical([
+        {
+            "uid": "leave-1",
+            "employee_id": 7,
+            "employee_name": "Doe, Jane",
+            "leave_type": "annual",
+            "start_date": date(2026, 3, 1),
+            "end_date": date(2026, 3, 3),
+            "status": "approved",
+            "is_half_day": False,
+            "is_holiday": False,
+        }
+    ])
+    assert body.startswith("BEGIN:VCALENDAR\r\n")
+    assert "DTSTART;VALUE=DATE:20260301" in body
+    assert "DTEND;VALUE=DATE:20260304" in body
+    assert "SUMMARY:Doe\\, Jane - Annual Leave" in body
+    assert body.endswith("END:VCALENDAR\r\n")
@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.activity_log import ActivityLog
+from app.services.interview_service import InterviewService
+from app.services.log_writer import BufferedLogWriter
+
+
+@pytest.fixture
+async def engine(sqlite_session_factory):
+    return (await sqlite_session_factory(ActivityLog)).kw["bind"]
+
+
+def _row(candidate_id, timestamp=None):
+    return dict(
+        candidate_id=candidate_id, stage="Interview", action_type="note", action_description="x",
+        performed_by="hr", visibility="internal", timestamp=timestamp or datetime.utcnow(),
+    )
+
+
+async def _count(factory):
+    async with factory() as session:
+        return (await session.execute(select(func.count(ActivityLog.id)))).scalar_one()
+
+
+@pytest.mark.anyio
+async def test_writer_buffers_and_flushes_in_bulk(engine):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    inserts = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statement.startswith("INSERT") and inserts.append(statement)
+    )
+    writer = BufferedLogWriter(factory, batch_size=50, flush_interval_ms=60_000)
+    writer.start()
+    earlier = datetime.utcnow() - timedelta(minutes=5)
+    async with factory() as session:
+        entry = await writer.write(session, ActivityLog, **_row(1, earlier))
+        assert entry.id is None and writer.pending == 1
+        for candidate_id in range(2, 51):
+            await writer.write(session, ActivityLog, **_row(candidate_id))
+
+    # Batch size reached: flushed without waiting for the interval
+    for _ in range(100):
+        if writer.written:
+            break
+        await asyncio.sleep(0.01)
+    assert writer.written == 50 and len(inserts) == 1
+    assert await _count(factory) == 50
+
+    async with factory() as session:
+        await writer.write(session, ActivityLog, **_row(99))
+    await writer.stop()
+    assert await _count(factory) == 51
+    async with factory() as session:
+        stored = (await session.execute(select(ActivityLog.timestamp).where(ActivityLog.candidate_id == 1))).scalar_one()
+    assert stored.replace(tzinfo=None) == earlier
+
+
+@pytest.mark.anyio
+async def test_failed_flush_keeps_rows_up_to_limit(engine):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    calls = []
+
+    def flaky_factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("database unavailable")
+        return factory()
+
+    writer = BufferedLogWriter(flaky_factory, batch_size=100, flush_interval_ms=60_000, max_buffer=3)
+    writer.start()
+    async with factory() as session:
+        for candidate_id in (1, 2):
+            await writer.write(session, ActivityLog, **_row(candidate_id))
+        assert await writer.flush() == 0 and writer.pending == 2
+        for candidate_id in (3, 4):
+            await writer.write(session, ActivityLog, **_row(candidate_id))
+    assert writer.dropped == 1
+    await writer.stop()
+
+    async with factory() as session:
+        ids = (await session.execute(select(ActivityLog.candidate_id).order_by(ActivityLog.id))).scalars().all()
+    assert ids == [2, 3, 4]
+
+
+@pytest.mark.anyio
+async def test_log_activity_writes_directly_without_running_writer(engine, monkeypatch):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr("app.services.log_writer._log_writer", BufferedLogWriter(factory))
+    async with factory() as session:
+        entry = await InterviewService().log_activity(
+            session, candidate_id=7, stage="Interview", action_type="interview_booked",
+            action_description="Booked", performed_by="candidate", visibility="candidate",
+        )
+    assert entry.id is not None
+    assert await _count(factory) == 1
+
+
+@pytest.mark.anyio
+async def test_rejected_row_is_dropped_without_blocking_the_batch(engine):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    writer = BufferedLogWriter(factory, batch_size=100, flush_interval_ms=60_000)
+    writer.start()
+    async with factory() as session:
+        await writer.write(session, ActivityLog, **_row(1))
+        await writer.write(session, ActivityLog, **{**_row(2), "action_type": None})
+        await writer.write(session, ActivityLog, **_row(3))
+
+    assert await writer.flush() == 2
+    assert writer.pending == 0 and writer.dropped == 1
+    await writer.stop()
+
+    async with factory() as session:
+        ids = (await session.execute(select(ActivityLog.candidate_id).order_by(ActivityLog.id))).scalars().all()
+    assert ids == [1, 3]
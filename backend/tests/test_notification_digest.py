@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.models.email_outbox import EmailOutbox
+from app.models.notification import Notification, NotificationCounter
+from app.models.notification_digest import NotificationDigestItem
+from app.services import notification_digest
+from app.services.notification_digest import dispatch_due_digests, queue_digest_item
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory):
+    return await sqlite_session_factory(Notification, NotificationCounter, EmailOutbox, NotificationDigestItem)
+
+
+def _window(monkeypatch, minutes):
+    settings = notification_digest.get_settings().model_copy(
+        update={"notification_digest_window_minutes": minutes}
+    )
+    monkeypatch.setattr(notification_digest, "get_settings", lambda: settings)
+
+
+async def _close_windows(session):
+    await session.execute(
+        update(NotificationDigestItem).values(
+            deliver_after=datetime.now(timezone.utc) - timedelta(seconds=1)
+        )
+    )
+    await session.commit()
+
+
+@pytest.mark.anyio
+async def test_items_in_one_window_become_one_notification_and_email(session_factory, monkeypatch):
+    _window(monkeypatch, 15)
+    async with session_factory() as session:
+        for i in range(3):
+            await queue_digest_item(
+                session, title=f"Update {i}", message=f"Message {i}",
+                user_id="42", to_email="emp@example.com", link="/leave"
+            )
+        await session.commit()
+
+        # Window still open: nothing is emitted yet
+        assert await dispatch_due_digests(session) == 0
+        await _close_windows(session)
+        assert await dispatch_due_digests(session) == 1
+
+        notifications = (await session.execute(select(Notification))).scalars().all()
+        emails = (await session.execute(select(EmailOutbox))).scalars().all()
+        assert len(notifications) == 1
+        assert notifications[0].title == "3 new updates"
+        assert notifications[0].link == "/leave"
+        assert len(emails) == 1
+        assert emails[0].category == "digest"
+        assert "Update 2" in emails[0].html_body
+
+        assert await dispatch_due_digests(session) == 0
+
+
+@pytest.mark.anyio
+async def test_single_item_is_delivered_unchanged(session_factory, monkeypatch):
+    _window(monkeypatch, 15)
+    async with session_factory() as session:
+        await queue_digest_item(
+            session, title="Leave Approved", message="Approved",
+            to_email="emp@example.com", category="leave_approved",
+            email=("Leave Request Approved", "<p>Rich</p>", "Plain"),
+            source_type="leave_request", source_id=9
+        )
+        await session.commit()
+        await _close_windows(session)
+        assert await dispatch_due_digests(session) == 1
+
+        email = (await session.execute(select(EmailOutbox))).scalar_one()
+        assert (email.subject, email.html_body, email.category, email.source_id) == (
+            "Leave Request Approved", "<p>Rich</p>", "leave_approved", 9
+        )
+        assert (await session.execute(select(Notification))).scalars().all() == []
+
+
+@pytest.mark.anyio
+async def test_later_items_join_the_open_window(session_factory, monkeypatch):
+    _window(monkeypatch, 15)
+    async with session_factory() as session:
+        await queue_digest_item(session, title="A", message="a", user_id="7")
+        await session.commit()
+        await queue_digest_item(session, title="B", message="b", user_id="7")
+        await queue_digest_item(session, title="C", message="c", user_id="8")
+        await session.commit()
+
+        items = (await session.execute(
+            select(NotificationDigestItem).order_by(NotificationDigestItem.id)
+        )).scalars().all()
+        assert items[0].deliver_after == items[1].deliver_after
+        assert {item.recipient_key for item in items} == {"user:7", "user:8"}
+
+
+@pytest.mark.anyio
+async def test_zero_window_delivers_immediately(session_factory, monkeypatch):
+    _window(monkeypatch, 0)
+    async with session_factory() as session:
+        await queue_digest_item(session, title="Now", message="now", user_id="7", to_email="e@example.com")
+        await session.commit()
+
+        assert len((await session.execute(select(Notification))).scalars().all()) == 1
+        assert len((await session.execute(select(EmailOutbox))).scalars().all()) == 1
+        assert (await session.execute(select(NotificationDigestItem))).scalars().all() == []
@@ -0,0 +1,83 @@
+import pytest
+
+from app.models.notification import Notification, NotificationCounter
+from app.repositories.notification import NotificationRepository, add_notification
+from app.services.notification import NotificationService
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory):
+    return await sqlite_session_factory(Notification, NotificationCounter)
+
+
+async def _seed(session_factory, user_id, count):
+    async with session_factory() as session:
+        for i in range(count):
+            await add_notification(session, user_id=user_id, title=f"N{i}", message="m")
+        await session.commit()
+
+
+@pytest.mark.anyio
+async def test_keyset_pages_cover_inbox_without_overlap(session_factory):
+    await _seed(session_factory, "EMP1", 7)
+    await _seed(session_factory, "EMP2", 2)
+    service = NotificationService(NotificationRepository())
+
+    seen = []
+    before_id = None
+    async with session_factory() as session:
+        while True:
+            page = await service.page(session, "EMP1", before_id=before_id, limit=3)
+            seen.extend(item.id for item in page.items)
+            assert page.unread_count == 7
+            if page.next_before_id is None:
+                break
+            before_id = page.next_before_id
+
+    assert len(seen) == 7
+    assert seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.anyio
+async def test_unread_counter_follows_reads(session_factory):
+    await _seed(session_factory, "EMP1", 5)
+    repo = NotificationRepository()
+
+    async with session_factory() as session:
+        assert await repo.unread_count(session, "EMP1") == 5
+        ids = [n.id for n in await repo.list(session, "EMP1")]
+
+        await repo.mark_read(session, ids[0], "EMP1")
+        await repo.mark_read(session, ids[0], "EMP1")  # Already read: no double decrement
+        assert await repo.unread_count(session, "EMP1") == 4
+
+        assert await repo.mark_many_read(session, "EMP1", ids[:3]) == 2
+        assert await repo.unread_count(session, "EMP1") == 2
+
+        assert await repo.mark_all_read(session, "EMP1") == 2
+        assert await repo.unread_count(session, "EMP1") == 0
+        assert await repo.list(session, "EMP1", unread_only=True) == []
+
+
+@pytest.mark.anyio
+async def test_bulk_read_ignores_other_users_notifications(session_factory):
+    await _seed(session_factory, "EMP1", 1)
+    await _seed(session_factory, "EMP2", 1)
+    repo = NotificationRepository()
+
+    async with session_factory() as session:
+        other_id = (await repo.list(session, "EMP2"))[0].id
+        assert await repo.mark_many_read(session, "EMP1", [other_id]) == 0
+        assert await repo.mark_read(session, other_id, "EMP1") is None
+        assert await repo.unread_count(session, "EMP2") == 1
+
+
+@pytest.mark.anyio
+async def test_mark_all_read_stops_at_up_to_id(session_factory):
+    await _seed(session_factory, "EMP1", 4)
+    repo = NotificationRepository()
+
+    async with session_factory() as session:
+        ids = sorted(n.id for n in await repo.list(session, "EMP1"))
+        assert await repo.mark_all_read(session, "EMP1", up_to_id=ids[1]) == 2
+        assert await repo.unread_count(session, "EMP1") == 2
@@ -0,0 +1,146 @@
+import json
+from datetime import date, time, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.models.activity_log import ActivityLog
+from app.models.interview import InterviewSetup, InterviewSlot, PassMessage, PassView, RecruitmentDocument
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.routers.interview import _pass_view_response
+from app.services.pass_views import get_candidate_pass_view, get_manager_pass_view, get_pass_view_by_token
+
+TOKEN = "a" * 64
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory):
+    factory = await sqlite_session_factory(
+        RecruitmentRequest, Candidate, ActivityLog, InterviewSetup, InterviewSlot, PassMessage,
+        RecruitmentDocument, PassView
+    )
+    async with factory() as session:
+        session.add(RecruitmentRequest(
+            id=1, request_number="RRF-1", position_title="Engineer", department="Engineering",
+            requested_by="EMP001", employment_type="Full-time",
+        ))
+        for candidate_id in (1, 2):
+            session.add(Candidate(
+                id=candidate_id, candidate_number=f"CAN-{candidate_id}", recruitment_request_id=1,
+                full_name=f"Candidate {candidate_id}", email=f"c{candidate_id}@example.com",
+                stage="interview", pass_token=TOKEN if candidate_id == 1 else "b" * 64,
+            ))
+        session.add(InterviewSetup(id=1, recruitment_request_id=1, created_by="EMP001"))
+        await session.commit()
+    return factory
+
+
+@pytest.mark.anyio
+async def test_candidate_view_is_reused_until_relevant_write(session_factory):
+    async with session_factory() as session:
+        view = await get_pass_view_by_token(session, TOKEN)
+        assert view.pass_type == "candidate" and view.subject_id == 1
+        assert json.loads(view.payload)["next_actions"][0]["action_id"] == "book_interview"
+        etag = view.etag
+
+        # Unrelated write: another candidate's activity
+        session.add(ActivityLog(
+            candidate_id=2, stage="Interview", action_type="note", action_description="x",
+            performed_by="hr", visibility="candidate",
+        ))
+        await session.commit()
+        again = await get_candidate_pass_view(session, 1)
+        assert again.built_version == again.version == view.version and again.etag == etag
+
+        # A new slot for the requisition changes what the candidate sees
+        session.add(InterviewSlot(
+            interview_setup_id=1, slot_date=date.today() + timedelta(days=2),
+            start_time=time(9), end_time=time(10),
+        ))
+        await session.commit()
+        rebuilt = await get_pass_view_by_token(session, TOKEN)
+        assert rebuilt.etag != etag
+        assert len(json.loads(rebuilt.payload)["interview_slots"]) == 1
+
+        session.add(PassMessage(
+            pass_type="candidate", pass_holder_id=1, recruitment_request_id=1, sender_type="hr",
+            subject="Welcome",
+        ))
+        await session.commit()
+        assert json.loads((await get_candidate_pass_view(session, 1)).payload)["unread_messages"] == 1
+
+
+@pytest.mark.anyio
+async def test_manager_view_keeps_token_and_follows_bulk_writes(session_factory):
+    async with session_factory() as session:
+        view = await get_manager_pass_view(session, 1, "EMP002")
+        token = view.pass_token
+        assert json.loads(view.payload)["pipeline_stats"] == {"interview": 2}
+
+        session.add(RecruitmentDocument(recruitment_request_id=1, document_type="job_description", document_name="JD", status="submitted"))
+        await session.commit()
+        assert json.loads((await get_pass_view_by_token(session, token)).payload)["jd_status"] == "submitted"
+
+        await session.execute(update(Candidate).where(Candidate.id == 2).values(stage="offer"))
+        await session.commit()
+        rebuilt = await get_manager_pass_view(session, 1, "EMP002")
+        assert rebuilt.pass_token == token
+        assert json.loads(rebuilt.payload)["pipeline_stats"] == {"interview": 1, "offer": 1}
+
+        with pytest.raises(HTTPException) as exc:
+            await get_pass_view_by_token(session, "c" * 64)
+        assert exc.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_pass_response_honours_if_none_match(session_factory):
+    async with session_factory() as session:
+        view = await get_candidate_pass_view(session, 1)
+
+    response = _pass_view_response(view, None)
+    assert response.status_code == 200 and response.body == view.payload.encode()
+    etag = response.headers["ETag"]
+    assert _pass_view_response(view, f"W/{etag}").status_code == 304
+
+
+@pytest.mark.anyio
+async def test_bulk_writes_bump_only_rows_shown_on_a_pass(session_factory):
+    async with session_factory() as session:
+        first = (await get_candidate_pass_view(session, 1)).version
+        second = (await get_candidate_pass_view(session, 2)).version
+
+        # Score-only writes are not shown on a pass
+        await session.execute(update(Candidate).where(Candidate.id == 1).values(cv_scoring=80.0))
+        await session.execute(update(Candidate), [{"id": 2, "resume_text": "Python"}])
+        await session.commit()
+        assert (await get_candidate_pass_view(session, 1)).version == first
+        assert (await get_candidate_pass_view(session, 2)).version == second
+
+        # Executemany by primary key: only candidate 2
+        await session.execute(update(Candidate), [{"id": 2, "stage": "offer"}])
+        await session.commit()
+        assert (await get_candidate_pass_view(session, 1)).version == first
+        assert (await get_candidate_pass_view(session, 2)).version == second + 1
+
+        # RETURNING ids are still handed back to the caller
+        result = await session.execute(
+            update(Candidate).where(Candidate.full_name == "Candidate 1").values(status="shortlisted")
+            .returning(Candidate.id).execution_options(synchronize_session=False)
+        )
+        assert result.scalars().all() == [1]
+        await session.commit()
+        assert (await get_candidate_pass_view(session, 1)).version == first + 1
+        assert (await get_candidate_pass_view(session, 2)).version == second + 1
+
+        # RETURNING ids of rows scoped by another column: the scope is read from the rows
+        session.add(InterviewSlot(interview_setup_id=1, slot_date=date.today(), start_time=time(9), end_time=time(10)))
+        await session.commit()
+        manager = (await get_manager_pass_view(session, 1, "EMP002")).version
+        result = await session.execute(
+            update(InterviewSlot).where(InterviewSlot.interview_setup_id == 1).values(start_time=time(10))
+            .returning(InterviewSlot.id).execution_options(synchronize_session=False)
+        )
+        assert len(result.scalars().all()) == 1
+        await session.commit()
+        assert (await get_manager_pass_view(session, 1, "EMP002")).version == manager + 1
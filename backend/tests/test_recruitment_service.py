@@ -0,0 +1,225 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.activity_log import ActivityLog
+from app.models.recruitment import Candidate, Interview, InterviewTimeSlot, RecruitmentRequest
+from app.schemas.recruitment import InterviewSlot, InterviewSlotConfirm, InterviewSlotsProvide
+from app.services.recruitment_service import RecruitmentService
+
+
+@pytest.fixture
+async def engine(sqlite_session_factory):
+    factory = await sqlite_session_factory(
+        RecruitmentRequest, Candidate, ActivityLog, Interview, InterviewTimeSlot
+    )
+    async with factory() as session:
+        session.add(RecruitmentRequest(
+            id=1, request_number="RRF-1", position_title="Engineer", department="Engineering",
+            requested_by="EMP001", employment_type="Full-time",
+        ))
+        for candidate_id in range(1, 6):
+            session.add(Candidate(
+                id=candidate_id, candidate_number=f"CAN-{candidate_id}", recruitment_request_id=1,
+                full_name=f"Candidate {candidate_id}", email=f"c{candidate_id}@example.com",
+                stage="hired" if candidate_id == 5 else "applied",
+                recruiter_notes="Referred by team lead" if candidate_id == 1 else None,
+            ))
+        await session.commit()
+    return factory.kw["bind"]
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+@pytest.mark.anyio
+async def test_bulk_stage_update_is_set_based(engine):
+    statements = _count_statements(engine)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        result = await RecruitmentService().bulk_update_candidate_stage(
+            session, [1, 2, 3, 99, 2], "screening", notes="CV review", performed_by="hr", performed_by_id="EMP001"
+        )
+
+    assert result["success_count"] == 3
+    assert result["failed_ids"] == [99]
+    # One UPDATE ... RETURNING and one bulk INSERT of activity rows
+    assert [sql.split()[0] for sql in statements] == ["UPDATE", "INSERT"]
+
+    async with factory() as session:
+        candidates = {c.id: c for c in (await session.execute(select(Candidate))).scalars()}
+        logs = (await session.execute(select(ActivityLog).order_by(ActivityLog.candidate_id))).scalars().all()
+
+    assert {candidates[i].stage for i in (1, 2, 3)} == {"screening"}
+    assert candidates[4].stage == "applied"
+    assert candidates[1].recruiter_notes.startswith("Referred by team lead\n[")
+    assert candidates[1].recruiter_notes.endswith("Stage changed to screening: CV review")
+    assert candidates[2].recruiter_notes.endswith("Stage changed to screening: CV review")
+    assert [log.candidate_id for log in logs] == [1, 2, 3]
+    assert {(log.action_type, log.performed_by_id) for log in logs} == {("stage_changed", "EMP001")}
+
+
+@pytest.mark.anyio
+async def test_bulk_stage_update_rejects_unknown_stage(engine):
+    async with async_sessionmaker(engine)() as session:
+        with pytest.raises(ValueError):
+            await RecruitmentService().bulk_update_candidate_stage(session, [1], "limbo")
+
+
+@pytest.mark.anyio
+async def test_bulk_reject_skips_hired_candidates(engine):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        result = await RecruitmentService().bulk_reject_candidates(session, [3, 4, 5], "Role filled")
+
+    assert result["success_count"] == 2
+    assert result["failed_ids"] == [5]
+
+    async with factory() as session:
+        candidates = {c.id: c for c in (await session.execute(select(Candidate))).scalars()}
+        logged = (await session.execute(select(ActivityLog.candidate_id))).scalars().all()
+
+    assert (candidates[3].status, candidates[3].rejection_reason) == ("rejected", "Role filled")
+    assert candidates[4].recruiter_notes.endswith("Rejected: Role filled")
+    assert candidates[5].stage == "hired"
+    assert sorted(logged) == [3, 4]
+
+
+@pytest.fixture
+def metrics_cache(monkeypatch):
+    from app.services import recruitment_metrics
+
+    cache = recruitment_metrics.RecruitmentMetricsCache(ttl_seconds=600)
+    monkeypatch.setattr(recruitment_metrics, "_metrics_cache", cache)
+    return cache
+
+
+@pytest.mark.anyio
+async def test_metrics_come_from_two_grouped_queries(engine, metrics_cache):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        for candidate_id, source in ((1, "LinkedIn"), (2, "LinkedIn"), (5, "Referral")):
+            (await session.get(Candidate, candidate_id)).source = source
+        (await session.get(Candidate, 3)).stage = "interview"
+        (await session.get(RecruitmentRequest, 1)).status = "approved"
+        await session.commit()
+
+    statements = _count_statements(engine)
+    async with factory() as session:
+        metrics = await RecruitmentService().get_recruitment_metrics(session)
+        stats = await RecruitmentService().get_stats(session)
+
+    assert len(statements) == 2
+    assert metrics["total_candidates"] == stats["total_candidates"] == 5
+    assert metrics["candidates_by_stage"]["applied"] == 3
+    assert metrics["candidates_by_stage"]["interview"] == 1
+    assert metrics["candidates_by_stage"]["hired"] == 1
+    assert metrics["pending_interviews"] == 1
+    assert (metrics["active_requests"], metrics["requests_by_priority"]) == (1, {"normal": 1})
+    assert metrics["offer_acceptance_rate"] == 100.0
+    assert metrics["source_effectiveness"] == {
+        "LinkedIn": {"total": 2, "hired": 0, "conversion_rate": 0.0},
+        "Referral": {"total": 1, "hired": 1, "conversion_rate": 100.0},
+    }
+    assert stats["by_source"] == {"LinkedIn": 2, "Referral": 1}
+    assert (metrics_cache.hits, metrics_cache.misses) == (1, 1)
+
+
+@pytest.mark.anyio
+async def test_candidate_writes_invalidate_metrics(engine, metrics_cache):
+    service = RecruitmentService()
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        assert (await service.get_stats(session))["by_stage"]["screening"] == 0
+
+        await service.bulk_update_candidate_stage(session, [1, 2], "screening")
+        assert (await service.get_stats(session))["by_stage"]["screening"] == 2
+
+        (await session.get(Candidate, 3)).stage = "screening"
+        await session.commit()
+        assert (await service.get_pipeline_counts(session))["screening"] == 3
+
+        # Uncommitted changes keep the snapshot
+        (await session.get(Candidate, 4)).stage = "screening"
+        await session.flush()
+        await session.rollback()
+        assert (await service.get_stats(session))["by_stage"]["screening"] == 3
+
+    assert metrics_cache.misses == 3
+
+
+async def _add_interviews(factory, *candidate_ids):
+    async with factory() as session:
+        for candidate_id in candidate_ids:
+            session.add(Interview(
+                id=candidate_id, interview_number=f"INT-{candidate_id}", candidate_id=candidate_id,
+                recruitment_request_id=1, interview_type="technical",
+            ))
+        await session.commit()
+
+
+@pytest.mark.anyio
+async def test_slots_are_shared_per_request_and_booked_once(engine):
+    service = RecruitmentService()
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    await _add_interviews(factory, 1, 2)
+    monday = datetime(2026, 5, 4, 9, 0)
+    times = [InterviewSlot(start=monday + timedelta(hours=h), end=monday + timedelta(hours=h + 1)) for h in range(3)]
+
+    async with factory() as session:
+        await service.provide_interview_slots(session, 1, InterviewSlotsProvide(available_slots=times))
+        await service.provide_interview_slots(session, 2, InterviewSlotsProvide(available_slots=times[1:]))
+        assert len(await service.list_interview_time_slots(session, 1)) == 3
+
+        interview = await service.confirm_interview_slot(session, 1, InterviewSlotConfirm(selected_slot=times[1]))
+        assert interview.status == "scheduled"
+        # Booking state is read from the shared slots, so the other interview sees it too
+        responses = await service.interview_responses(session, [interview, await service.get_interview(session, 2)])
+        assert [slot["is_booked"] for slot in responses[0].available_slots["slots"]] == [False, True, False]
+        assert [slot["booked_by"] for slot in responses[1].available_slots["slots"]] == ["1", None]
+
+        with pytest.raises(ValueError, match="already been booked"):
+            await service.confirm_interview_slot(session, 2, InterviewSlotConfirm(selected_slot=times[1]))
+        with pytest.raises(ValueError, match="not available"):
+            await service.confirm_interview_slot(session, 2, InterviewSlotConfirm(selected_slot=times[0]))
+
+        # Rebooking releases the earlier slot
+        await service.confirm_interview_slot(session, 1, InterviewSlotConfirm(selected_slot=times[2]))
+        await service.confirm_interview_slot(session, 2, InterviewSlotConfirm(selected_slot=times[1]))
+
+        available = await service.list_interview_time_slots(session, 1)
+        booked = await service.list_interview_time_slots(
+            session, 1, available_only=False, start=monday + timedelta(hours=1)
+        )
+
+    assert [slot.start_at for slot in available] == [monday]
+    assert [(slot.start_at, slot.booked_interview_id) for slot in booked] == [
+        (monday + timedelta(hours=1), 2), (monday + timedelta(hours=2), 1)
+    ]
+
+
+@pytest.mark.anyio
+async def test_slot_booking_matches_across_utc_offsets(engine):
+    service = RecruitmentService()
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    await _add_interviews(factory, 1)
+    gst = timezone(timedelta(hours=4))
+    offered = InterviewSlot(start=datetime(2026, 5, 4, 9, 0, tzinfo=gst), end=datetime(2026, 5, 4, 10, 0, tzinfo=gst))
+    # The same slot, sent back in UTC
+    selected = InterviewSlot(
+        start=datetime(2026, 5, 4, 5, 0, tzinfo=timezone.utc), end=datetime(2026, 5, 4, 6, 0, tzinfo=timezone.utc)
+    )
+
+    async with factory() as session:
+        await service.provide_interview_slots(session, 1, InterviewSlotsProvide(available_slots=[offered]))
+        interview = await service.confirm_interview_slot(session, 1, InterviewSlotConfirm(selected_slot=selected))
+        response = await service.interview_response(session, interview)
+        slots = await service.list_interview_time_slots(session, 1, available_only=False)
+
+    assert response.available_slots["slots"][0]["is_booked"] is True
+    assert [(slot.start_at, slot.booked_interview_id) for slot in slots] == [(datetime(2026, 5, 4, 5, 0), 1)]
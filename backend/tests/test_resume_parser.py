@@ -0,0 +1,81 @@
+import io
+import time
+
+import pytest
+
+from app.services import resume_parser
+from app.services.resume_parser import ResumeParserService
+
+
+class _FakeResumeParser:
+    """Stands in for pyresparser.ResumeParser (which needs spaCy models)."""
+    calls = []
+    delay = 0.0
+
+    def __init__(self, resume):
+        self.resume = resume
+        _FakeResumeParser.calls.append(resume)
+
+    def get_extracted_data(self):
+        time.sleep(self.delay)
+        if isinstance(self.resume, io.BytesIO):
+            text = self.resume.getvalue().decode()
+        else:
+            with open(self.resume) as f:
+                text = f.read()
+        return {"name": "Jane Doe", "email": "jane@example.com", "mobile_number": "050 123 4567",
+                "skills": ["Python"], "total_experience": "7 years", "designation": [text]}
+
+
+@pytest.fixture
+def parser(monkeypatch):
+    settings = resume_parser.get_settings().model_copy(update={
+        "resume_parser_processes": 0,
+        "resume_parser_timeout_seconds": 5.0,
+    })
+    monkeypatch.setattr(resume_parser, "get_settings", lambda: settings)
+    monkeypatch.setattr(resume_parser, "PYRESPARSER_AVAILABLE", True)
+    monkeypatch.setattr(resume_parser, "ResumeParser", _FakeResumeParser, raising=False)
+    monkeypatch.setattr(_FakeResumeParser, "calls", [])
+    service = ResumeParserService()
+    yield service
+    service.shutdown()
+
+
+@pytest.mark.anyio
+async def test_upload_bytes_are_parsed_without_a_temp_file(parser):
+    result = await parser.parse_resume_bytes(b"Senior Engineer", "cv.pdf")
+
+    assert result["parsed"] is True
+    assert result["mobile_number"] == "+971501234567"
+    assert result["total_experience"] == 7
+    assert result["designation"] == ["Senior Engineer"]
+    resume = _FakeResumeParser.calls[0]
+    assert isinstance(resume, io.BytesIO) and resume.name == "resume.pdf"
+
+
+@pytest.mark.anyio
+async def test_text_resume_gets_uae_fields(parser):
+    result = await parser.parse_resume_bytes(b"Emirates ID 784-1990-1234567-1, employment visa holder", "cv.txt")
+
+    assert result["parsed"] is True
+    assert result["emirates_id"] == "784-1990-1234567-1"
+    assert "employment visa" in result["visa_status"]
+
+
+@pytest.mark.anyio
+async def test_slow_parse_times_out(parser, monkeypatch):
+    parser.settings.resume_parser_timeout_seconds = 0.05
+    monkeypatch.setattr(_FakeResumeParser, "delay", 0.5)
+
+    result = await parser.parse_resume_bytes(b"Engineer", "cv.docx")
+
+    assert result == {"error": "Resume parsing timed out", "parsed": False}
+
+
+@pytest.mark.anyio
+async def test_unsupported_format_is_rejected(parser):
+    result = await parser.parse_resume_bytes(b"MZ", "cv.exe")
+    assert result["parsed"] is False
+    assert "Unsupported format" in result["error"]
+    assert _FakeResumeParser.calls == []
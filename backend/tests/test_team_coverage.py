@@ -0,0 +1,29 @@
+from datetime import date
+
+from app.services.leave_service import compute_daily_absence
+
+
+def test_overlapping_requests_from_same_employee_count_once():
+    intervals = [
+        (1, date(2026, 3, 1), date(2026, 3, 3), "approved"),
+        (1, date(2026, 3, 2), date(2026, 3, 4), "pending"),
+    ]
+    days = compute_daily_absence(intervals, date(2026, 3, 1), date(2026, 3, 5))
+    assert [absent for _, absent, _ in days] == [1, 1, 1, 1, 0]
+    assert [approved for _, _, approved in days] == [1, 1, 1, 0, 0]
+
+
+def test_team_absences_are_summed_per_day():
+    intervals = [
+        (1, date(2026, 3, 1), date(2026, 3, 2), "approved"),
+        (2, date(2026, 3, 2), date(2026, 3, 3), "pending"),
+        (3, date(2026, 2, 20), date(2026, 3, 1), "approved"),
+    ]
+    days = compute_daily_absence(intervals, date(2026, 3, 1), date(2026, 3, 4))
+    assert [(day.day, absent) for day, absent, _ in days] == [(1, 2), (2, 2), (3, 1), (4, 0)]
+
+
+def test_intervals_outside_range_are_ignored():
+    intervals = [(1, date(2026, 1, 1), date(2026, 1, 5), "approved")]
+    days = compute_daily_absence(intervals, date(2026, 2, 1), date(2026, 2, 2))
+    assert all(absent == 0 for _, absent, _ in days)
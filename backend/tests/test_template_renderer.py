@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.attendance_service import SUMMARY_EMAIL_TEMPLATE
+from app.services.template_renderer import (
+    CompiledTemplate,
+    TemplateRenderError,
+    TemplateRenderer,
+    TemplateSyntaxError,
+)
+
+
+def _template(template_id=1, version=1, content="Dear {{ name }},"):
+    return SimpleNamespace(id=template_id, version=version, content=content)
+
+
+def test_render_escapes_values_and_resolves_dotted_paths():
+    compiled = CompiledTemplate.from_source(
+        "<p>{{ candidate.full_name }} - {{ offer.title }}</p>{{ footer|safe }}"
+    )
+    rendered = compiled.render({
+        "candidate": SimpleNamespace(full_name="Tom & Jerry"),
+        "offer": {"title": "<Engineer>"},
+        "footer": "<hr>",
+    })
+    assert rendered == "<p>Tom &amp; Jerry - &lt;Engineer&gt;</p><hr>"
+    assert compiled.fields == ["candidate.full_name", "offer.title", "footer"]
+
+
+def test_missing_fields_are_blank_unless_strict():
+    compiled = CompiledTemplate.from_source("Hi {{ name }}{{ missing }}!")
+    assert compiled.render({"name": "Ana"}) == "Hi Ana!"
+    with pytest.raises(TemplateRenderError):
+        compiled.render({"name": "Ana"}, strict=True)
+
+
+def test_malformed_placeholder_is_rejected():
+    with pytest.raises(TemplateSyntaxError):
+        CompiledTemplate.from_source("Hello {{ name")
+
+
+@pytest.mark.parametrize("content", ["{{ _secret }}", "{{ candidate.__class__ }}", "{{ a.__init__.__globals__ }}"])
+def test_private_attribute_paths_are_rejected(content):
+    with pytest.raises(TemplateSyntaxError):
+        CompiledTemplate.from_source(content)
+
+
+def test_renderer_compiles_each_version_once():
+    renderer = TemplateRenderer()
+    template = _template()
+
+    rendered = renderer.render_batch(template, [{"name": f"User {i}"} for i in range(1000)])
+
+    assert len(rendered) == 1000
+    assert rendered[999] == "Dear User 999,"
+    renderer.render(template, {"name": "Again"})
+    assert (renderer.misses, renderer.hits) == (1, 1)
+
+    renderer.render(_template(version=2, content="Hello {{ name }}"), {"name": "New"})
+    assert renderer.misses == 2
+
+
+def test_renderer_recompiles_when_content_is_edited_in_place():
+    renderer = TemplateRenderer()
+    template = _template()
+    assert renderer.render(template, {"name": "A"}) == "Dear A,"
+
+    template.content = "Hi {{ name }}"
+    assert renderer.render(template, {"name": "A"}) == "Hi A"
+
+
+def test_renderer_evicts_least_recently_used():
+    renderer = TemplateRenderer(max_entries=2)
+    first, second, third = _template(1), _template(2), _template(3)
+    renderer.get_compiled(first)
+    renderer.get_compiled(second)
+    renderer.get_compiled(first)
+    renderer.get_compiled(third)
+
+    renderer.get_compiled(first)
+    renderer.get_compiled(second)
+    assert renderer.misses == 4
+
+
+def test_manager_summary_template_keeps_table_markup():
+    html_body = SUMMARY_EMAIL_TEMPLATE.render({
+        "manager_name": "Sara",
+        "table_html": "<table></table>",
+        "present_count": 3,
+    })
+    assert "<table></table>" in html_body
+    assert "Good morning Sara," in html_body
+    assert ".container { max-width: 800px;" in html_body
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark resume parsing throughput (resumes per second).
+
+Usage:
+    cd backend
+    uv run python ../scripts/benchmark_resume_parser.py path/to/resumes [--processes 4] [--rounds 3] [--cold]
+
+Parses every PDF/DOCX/DOC/TXT file in the directory ``--rounds`` times
+through the resume parser worker pool and reports:
+
+1. Warm-up time (worker start + NLP model load, paid once per worker)
+2. Throughput of the warm pool in resumes per second
+3. With ``--cold``, the same run on a pool without the model preload,
+   where every parse reloads the spaCy models (the old behaviour)
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# Add parent to path so we can import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.resume_parser import PYRESPARSER_AVAILABLE, ResumeParserService
+
+
+def load_resumes(directory: Path) -> List[Tuple[bytes, str]]:
+    """Read every supported resume in a directory."""
+    formats = set(ResumeParserService.SUPPORTED_FORMATS)
+    return [
+        (path.read_bytes(), path.name)
+        for path in sorted(directory.iterdir())
+        if path.is_file() and path.suffix.lower() in formats
+    ]
+
+
+async def run(service: ResumeParserService, resumes: List[Tuple[bytes, str]], rounds: int) -> dict:
+    """Warm the pool, then parse all resumes ``rounds`` times concurrently."""
+    started = time.perf_counter()
+    ready = await service.warm_up()
+    warm_up_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        service.parse_resume_bytes(content, filename)
+        for _ in range(rounds)
+        for content, filename in resumes
+    ))
+    elapsed = time.perf_counter() - started
+    service.shutdown()
+
+    parsed = sum(1 for result in results if result.get("parsed"))
+    return {
+        "workers": ready,
+        "warm_up_seconds": warm_up_seconds,
+        "parsed": parsed,
+        "failed": len(results) - parsed,
+        "seconds": elapsed,
+        "resumes_per_second": len(results) / elapsed if elapsed else 0.0,
+    }
+
+
+def report(label: str, stats: dict):
+    print(f"\n{label}")
+    print(f"  Workers ready:      {stats['workers']}")
+    print(f"  Warm-up:            {stats['warm_up_seconds']:.2f}s")
+    print(f"  Parsed / failed:    {stats['parsed']} / {stats['failed']}")
+    print(f"  Elapsed:            {stats['seconds']:.2f}s")
+    print(f"  Throughput:         {stats['resumes_per_second']:.2f} resumes/sec")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume parsing throughput")
+    parser.add_argument("directory", type=Path, help="Directory of sample resumes")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: RESUME_PARSER_PROCESSES)")
+    parser.add_argument("--rounds", type=int, default=3, help="Times each resume is parsed")
+    parser.add_argument("--cold", action="store_true", help="Also run without the model preload for comparison")
+    args = parser.parse_args()
+
+    if not PYRESPARSER_AVAILABLE:
+        print("pyresparser is not installed; install pyresparser and spaCy (en_core_web_sm) first.")
+        sys.exit(1)
+
+    resumes = load_resumes(args.directory)
+    if not resumes:
+        print(f"No resumes found in {args.directory}")
+        sys.exit(1)
+    print(f"Benchmarking {len(resumes)} resumes x {args.rounds} rounds")
+
+    warm = await run(ResumeParserService(processes=args.processes), resumes, args.rounds)
+    report("Warm pool (models loaded once per worker)", warm)
+
+    if args.cold:
+        cold = await run(ResumeParserService(processes=args.processes, warm=False), resumes, args.rounds)
+        report("Cold pool (models reloaded per resume)", cold)
+        if cold["resumes_per_second"]:
+            print(f"\nSpeed-up: {warm['resumes_per_second'] / cold['resumes_per_second']:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())